@@ -24,10 +24,15 @@ This program annotates sequences (nucleotides or proteins) using the TOA databas
 #-------------------------------------------------------------------------------
 
 import argparse
-import gzip
+import copy
+import json
+import multiprocessing
 import os
+import shutil
 import sys
+import tempfile
 
+import xfasta
 import xlib
 import xsqlite
 
@@ -47,7 +52,7 @@ def main(argv):
     check_args(args)
 
     # connect to the TOA database
-    conn = xsqlite.connect_database(args.toa_database)
+    conn = xsqlite.connect_database(args.toa_database, args.db_profile)
 
     # check the dataset identification
     if not xsqlite.is_dataset_id_found(conn, args.dataset_id):
@@ -62,18 +67,28 @@ def main(argv):
     else:
         toa_transdecoder_relationship_dict = xlib.get_id_relationship_dict(args.toa_transdecoder_relationship_file)
 
-    # annotate sequences depending of the dataset identification
-    if args.dataset_id in ['gymno_01', 'dicots_04', 'monocots_04']: 
-        annotate_sequences_plaza(conn, args.dataset_id, args.aligner_tool, args.seq_file, toa_transcriptome_relationship_dict, toa_transdecoder_relationship_dict, args.annotation_file, args.nonann_seq_file, type='PLAZA')
-    elif args.dataset_id in ['refseq_plant']: 
-        annotate_sequences_refseq(conn, args.dataset_id, args.aligner_tool, args.seq_file, toa_transcriptome_relationship_dict, toa_transdecoder_relationship_dict, args.annotation_file, args.nonann_seq_file, type='REFSEQ')
-    elif args.dataset_id in ['nt']: 
-        annotate_sequences_nx(conn, args.dataset_id, args.aligner_tool, args.seq_file, toa_transcriptome_relationship_dict, toa_transdecoder_relationship_dict, args.annotation_file, args.contamination_annotation_file, args.nonann_seq_file, type='NT')
-    elif args.dataset_id in ['nr']: 
-        annotate_sequences_nx(conn, args.dataset_id, args.aligner_tool, args.seq_file, toa_transcriptome_relationship_dict, toa_transdecoder_relationship_dict, args.annotation_file, args.contamination_annotation_file, args.nonann_seq_file, type='NR')
+    # annotate again only the sequences whose hits have changed reference annotation data since the previous annotation
+    if args.changed_since != 'NONE' and check_previous_annotation(conn, args):
+        reannotate_changed_sequences(conn, args, toa_transcriptome_relationship_dict, toa_transdecoder_relationship_dict)
+        conn.close()
 
-    # close connection to TOA database
-    conn.close()
+    # annotate sequences in the current process
+    elif args.workers == 1:
+        summary_dict = annotate_sequences(conn, args, toa_transcriptome_relationship_dict, toa_transdecoder_relationship_dict, args.seq_file, args.annotation_file, args.contamination_annotation_file, args.classification_file, args.nonann_seq_file)
+        print_annotation_summary(args, summary_dict)
+        conn.close()
+        save_pending_species(args.toa_database, conn.pending_species_row_list, conn.pending_taxonomy_not_found_list)
+
+    # annotate sequences splitting the sequence file in shards annotated by worker processes
+    else:
+        conn.close()
+        annotate_sequences_sharded(args, toa_transcriptome_relationship_dict, toa_transdecoder_relationship_dict)
+
+    # save the annotation files in the results database
+    if args.results_db != 'NONE':
+        xlib.save_annotation_file_in_results_db(args.results_db, args.annotation_file, get_annotation_type(args.dataset_id))
+        if args.contamination_annotation_file != 'NONE':
+            xlib.save_annotation_file_in_results_db(args.results_db, args.contamination_annotation_file, get_annotation_type(args.dataset_id))
 
 #-------------------------------------------------------------------------------
 
@@ -96,7 +111,16 @@ def build_parser():
     parser.add_argument('--relationships2', dest='toa_transdecoder_relationship_file', help='CSV file path with TOA-TransDecoder identification relationships or NONE (mandatory)')
     parser.add_argument('--annotation', dest='annotation_file', help='Path of annotation file in CSV format (mandatory).')
     parser.add_argument('--annotation2', dest='contamination_annotation_file', help='Path of contamination annotation file in CSV format when NCBI NT or NR; else: NONE.')
+    parser.add_argument('--clade', dest='target_clade', help=f'Taxonomic clade (family, phylum, kingdom or superkingdom name) of the annotation file when NCBI NT or NR; the annotations of other clades are written in the contamination annotation file; default: {xlib.Const.DEFAULT_TARGET_CLADE}.')
+    parser.add_argument('--classification', dest='classification_file', help='Path of the file in CSV format with the classification of each sequence when NCBI NT or NR; else: NONE; default: NONE.')
     parser.add_argument('--nonann', dest='nonann_seq_file', help='Path of file with non-annotated sequences (mandatory).')
+    parser.add_argument('--results-db', dest='results_db', help='Path of the results database where the annotation files are also saved or NONE; default: NONE.')
+    parser.add_argument('--batch', dest='batch_size', help=f'Number of sequences annotated per batch of database queries; default: {xlib.Const.DEFAULT_BATCH_SIZE}.')
+    parser.add_argument('--cache', dest='cache_mode', help=f'Memory cache of PLAZA GO, InterPro and MapMan data: {xlib.get_cache_mode_code_list_text()}; default: {xlib.Const.DEFAULT_CACHE_MODE}.')
+    parser.add_argument('--cache-size', dest='cache_size', help=f'Maximum number of genes kept in memory when the cache is LRU; default: {xlib.Const.DEFAULT_CACHE_SIZE}.')
+    parser.add_argument('--workers', dest='workers', help=f'Number of worker processes annotating shards of the sequence file; default: {xlib.Const.DEFAULT_WORKERS}.')
+    parser.add_argument('--db-profile', dest='db_profile', help=f'Profile of the connection to the TOA database: {xlib.get_db_profile_code_list_text()}; default: {xlib.Const.DEFAULT_DB_PROFILE}.')
+    parser.add_argument('--changed-since', dest='changed_since', help='Time (seconds since the epoch) of the previous annotation of the sequence file: only the sequences whose hits have reference annotation data changed after it are annotated again (PLAZA datasets), or NONE; default: NONE.')
     parser.add_argument('--verbose', dest='verbose', help=f'Additional job status info during the run: {xlib.get_verbose_code_list_text()}; default: {xlib.Const.DEFAULT_VERBOSE}.')
     parser.add_argument('--trace', dest='trace', help=f'Additional info useful to the developer team: {xlib.get_trace_code_list_text()}; default: {xlib.Const.DEFAULT_TRACE}.')
 
@@ -170,11 +194,83 @@ def check_args(args):
     elif args.contamination_annotation_file.upper() == 'NONE':
         args.contamination_annotation_file = args.contamination_annotation_file.upper()
 
+    # check "target_clade"
+    if args.target_clade is None:
+        args.target_clade = xlib.Const.DEFAULT_TARGET_CLADE
+
+    # check "classification_file"
+    if args.classification_file is None:
+        args.classification_file = 'NONE'
+    elif args.classification_file.upper() == 'NONE':
+        args.classification_file = args.classification_file.upper()
+
+    # check "results_db"
+    if args.results_db is None:
+        args.results_db = 'NONE'
+    elif args.results_db.upper() == 'NONE':
+        args.results_db = args.results_db.upper()
+
     # check "nonann_seq_file"
     if args.nonann_seq_file is None:
         xlib.Message.print('error', '*** The file with non-annotated sequences is not indicated in the input arguments.')
         OK = False
 
+    # check "batch_size"
+    if args.batch_size is None:
+        args.batch_size = xlib.Const.DEFAULT_BATCH_SIZE
+    elif not xlib.check_int(args.batch_size, minimum=1):
+        xlib.Message.print('error', '*** The number of sequences per batch has to be an integer number greater than 0.')
+        OK = False
+    else:
+        args.batch_size = int(args.batch_size)
+
+    # check "cache_mode"
+    if args.cache_mode is None:
+        args.cache_mode = xlib.Const.DEFAULT_CACHE_MODE
+    elif not xlib.check_code(args.cache_mode, xlib.get_cache_mode_code_list(), case_sensitive=False):
+        xlib.Message.print('error', f'*** The cache mode has to be {xlib.get_cache_mode_code_list_text()}.')
+        OK = False
+    else:
+        args.cache_mode = args.cache_mode.upper()
+
+    # check "cache_size"
+    if args.cache_size is None:
+        args.cache_size = xlib.Const.DEFAULT_CACHE_SIZE
+    elif not xlib.check_int(args.cache_size, minimum=1):
+        xlib.Message.print('error', '*** The cache size has to be an integer number greater than 0.')
+        OK = False
+    else:
+        args.cache_size = int(args.cache_size)
+
+    # check "workers"
+    if args.workers is None:
+        args.workers = xlib.Const.DEFAULT_WORKERS
+    elif not xlib.check_int(args.workers, minimum=1):
+        xlib.Message.print('error', '*** The number of worker processes has to be an integer number greater than 0.')
+        OK = False
+    else:
+        args.workers = int(args.workers)
+
+    # check "db_profile"
+    if args.db_profile is None:
+        args.db_profile = xlib.Const.DEFAULT_DB_PROFILE
+    elif not xlib.check_code(args.db_profile, xlib.get_db_profile_code_list(), case_sensitive=False):
+        xlib.Message.print('error', f'*** db-profile has to be {xlib.get_db_profile_code_list_text()}.')
+        OK = False
+    else:
+        args.db_profile = args.db_profile.upper()
+
+    # check "changed_since"
+    if args.changed_since is None:
+        args.changed_since = 'NONE'
+    elif args.changed_since.upper() == 'NONE':
+        args.changed_since = 'NONE'
+    elif not xlib.check_float(args.changed_since, minimum=0.):
+        xlib.Message.print('error', '*** The time of the previous annotation has to be a float number greater than or equal to 0.0 or NONE.')
+        OK = False
+    else:
+        args.changed_since = float(args.changed_since)
+
     # check "verbose"
     if args.verbose is None:
         args.verbose = xlib.Const.DEFAULT_VERBOSE
@@ -199,7 +295,190 @@ def check_args(args):
 
 #-------------------------------------------------------------------------------
 
-def annotate_sequences_plaza(conn, dataset_id, aligner_tool, seq_file, toa_transcriptome_relationship_dict, toa_transdecoder_relationship_dict, annotation_file, nonann_seq_file, type):
+def annotate_sequences(conn, args, toa_transcriptome_relationship_dict, toa_transdecoder_relationship_dict, seq_file, annotation_file, contamination_annotation_file, classification_file, nonann_seq_file):
+    '''
+    Annotate the sequences of a file depending of the dataset identification and return the summary counters.
+    '''
+
+    # initialize the summary counters
+    summary_dict = {}
+
+    # annotate sequences depending of the dataset identification
+    if args.dataset_id in ['gymno_01', 'dicots_04', 'monocots_04']: 
+        summary_dict = annotate_sequences_plaza(conn, args.dataset_id, args.aligner_tool, seq_file, toa_transcriptome_relationship_dict, toa_transdecoder_relationship_dict, annotation_file, nonann_seq_file, type='PLAZA', batch_size=args.batch_size, cache_mode=args.cache_mode, cache_size=args.cache_size)
+    elif args.dataset_id in ['refseq_plant']: 
+        summary_dict = annotate_sequences_refseq(conn, args.dataset_id, args.aligner_tool, seq_file, toa_transcriptome_relationship_dict, toa_transdecoder_relationship_dict, annotation_file, nonann_seq_file, type='REFSEQ', batch_size=args.batch_size)
+    elif args.dataset_id in ['nt']: 
+        summary_dict = annotate_sequences_nx(conn, args.dataset_id, args.aligner_tool, seq_file, toa_transcriptome_relationship_dict, toa_transdecoder_relationship_dict, annotation_file, contamination_annotation_file, classification_file, nonann_seq_file, type='NT', batch_size=args.batch_size, target_clade=args.target_clade)
+    elif args.dataset_id in ['nr']: 
+        summary_dict = annotate_sequences_nx(conn, args.dataset_id, args.aligner_tool, seq_file, toa_transcriptome_relationship_dict, toa_transdecoder_relationship_dict, annotation_file, contamination_annotation_file, classification_file, nonann_seq_file, type='NR', batch_size=args.batch_size, target_clade=args.target_clade)
+
+    # return the summary counters
+    return summary_dict
+
+#-------------------------------------------------------------------------------
+
+def print_annotation_summary(args, summary_dict):
+    '''
+    Print the summary counters of an annotation.
+    '''
+
+    # get the annotated sequence number
+    total_seq_counter = summary_dict.get('total_seq_counter', 0)
+    non_annotated_seq_counter = summary_dict.get('non_annotated_seq_counter', 0)
+
+    # print the summary depending of the annotation type
+    if get_annotation_type(args.dataset_id) in ['NT', 'NR']:
+        xlib.Message.print('info', f'Total seqs: {total_seq_counter}')
+        xlib.Message.print('info', f'{args.target_clade} seqs: {summary_dict.get("target_seq_counter", 0)} - Contamination seqs: {summary_dict.get("contamination_seq_counter", 0)} - {args.target_clade}&contamination seqs : {summary_dict.get("both_seq_counter", 0)}')
+        xlib.Message.print('info', f'Not annotate seqs: {non_annotated_seq_counter}')
+    else:
+        xlib.Message.print('info', f'Total seqs: {total_seq_counter} - Annotated seqs: {total_seq_counter - non_annotated_seq_counter} - Non-annotated seqs: {non_annotated_seq_counter}.')
+    if 'cache_hit_counter' in summary_dict:
+        xlib.Message.print('info', f'PLAZA cache ({args.cache_mode}) - Gene hits: {summary_dict["cache_hit_counter"]} - Gene misses: {summary_dict["cache_miss_counter"]}.')
+
+#-------------------------------------------------------------------------------
+
+def save_pending_species(toa_database, species_row_list, species_name_list):
+    '''
+    Save into the TOA database the species data got by the annotation with read-only connections.
+    '''
+
+    # insert the pending species with a writable connection
+    if species_row_list != [] or species_name_list != []:
+        conn = xsqlite.connect_database(toa_database)
+        xsqlite.save_pending_species(conn, species_row_list, species_name_list)
+        conn.close()
+
+#-------------------------------------------------------------------------------
+
+def get_annotation_type(dataset_id):
+    '''
+    Get the annotation type of a dataset identification.
+    '''
+
+    # get the annotation type depending of the dataset identification
+    if dataset_id in ['gymno_01', 'dicots_04', 'monocots_04']:
+        type = 'PLAZA'
+    elif dataset_id in ['refseq_plant']:
+        type = 'REFSEQ'
+    elif dataset_id in ['nt']:
+        type = 'NT'
+    elif dataset_id in ['nr']:
+        type = 'NR'
+    else:
+        type = 'NONE'
+
+    # return the annotation type
+    return type
+
+#-------------------------------------------------------------------------------
+
+def annotate_sequences_sharded(args, toa_transcriptome_relationship_dict, toa_transdecoder_relationship_dict):
+    '''
+    Annotate the sequences splitting the sequence file in contiguous shards, annotating each shard
+    in a worker process and merging the shard annotation files by the merge key.
+    '''
+
+    # get the shard number (there is not any shard without sequences)
+    seq_number = get_seq_number(args.seq_file)
+    shard_number = max(1, min(args.workers, seq_number))
+
+    # create the temporal directory of the shard files
+    shard_dir = tempfile.mkdtemp(prefix='toa-shards-', dir=os.path.dirname(os.path.abspath(args.annotation_file)))
+
+    # set the shard file lists
+    shard_seq_file_list = [f'{shard_dir}/shard-{i}-seqs.fasta' for i in range(shard_number)]
+    shard_annotation_file_list = [f'{shard_dir}/shard-{i}-annotation.csv' for i in range(shard_number)]
+    shard_contamination_annotation_file_list = [f'{shard_dir}/shard-{i}-contamination-annotation.csv' if args.contamination_annotation_file != 'NONE' else 'NONE' for i in range(shard_number)]
+    shard_classification_file_list = [f'{shard_dir}/shard-{i}-classification.csv' if args.classification_file != 'NONE' else 'NONE' for i in range(shard_number)]
+    shard_nonann_seq_file_list = [f'{shard_dir}/shard-{i}-nonann-seqs.fasta' for i in range(shard_number)]
+    shard_summary_file_list = [f'{shard_dir}/shard-{i}-summary.json' for i in range(shard_number)]
+
+    # split the sequence file in shards
+    xlib.Message.print('verbose', f'Splitting {seq_number} sequences in {shard_number} shards ...\n')
+    split_seq_file(args.seq_file, seq_number, shard_seq_file_list)
+    xlib.Message.print('verbose', 'The sequence file is split.\n')
+
+    # annotate each shard in a worker process
+    process_list = []
+    for i in range(shard_number):
+        process = multiprocessing.Process(target=annotate_shard, args=(args, toa_transcriptome_relationship_dict, toa_transdecoder_relationship_dict, shard_seq_file_list[i], shard_annotation_file_list[i], shard_contamination_annotation_file_list[i], shard_classification_file_list[i], shard_nonann_seq_file_list[i], shard_summary_file_list[i]))
+        process.start()
+        process_list.append(process)
+
+    # wait for the end of the worker processes
+    for process in process_list:
+        process.join()
+
+    # check the return code of the worker processes
+    for i in range(shard_number):
+        if process_list[i].exitcode != 0:
+            shutil.rmtree(shard_dir, ignore_errors=True)
+            raise xlib.ProgramException('S002', i, process_list[i].exitcode)
+
+    # add up the summary counters of the shards and get their pending species
+    summary_dict = {}
+    species_row_list = []
+    species_name_list = []
+    for shard_summary_file in shard_summary_file_list:
+        try:
+            with open(shard_summary_file, mode='r', encoding='iso-8859-1') as shard_summary_file_id:
+                shard_summary_dict = json.load(shard_summary_file_id)
+        except Exception as e:
+            shutil.rmtree(shard_dir, ignore_errors=True)
+            raise xlib.ProgramException('F001', shard_summary_file)
+        for key, value in shard_summary_dict['counters'].items():
+            summary_dict[key] = summary_dict.get(key, 0) + value
+        species_row_list.extend(shard_summary_dict['species_rows'])
+        species_name_list.extend(shard_summary_dict['taxonomy_not_found'])
+
+    # merge the annotation shard files by the merge key and concatenate the rest of shard files in the original order
+    xlib.Message.print('verbose', 'Merging the shard files ...\n')
+    merge_shard_annotation_files(shard_annotation_file_list, args.annotation_file)
+    if args.contamination_annotation_file != 'NONE':
+        merge_shard_annotation_files(shard_contamination_annotation_file_list, args.contamination_annotation_file)
+    if args.classification_file != 'NONE':
+        concatenate_shard_files(shard_classification_file_list, args.classification_file, is_header=True)
+    concatenate_shard_files(shard_nonann_seq_file_list, args.nonann_seq_file, is_header=False)
+    xlib.Message.print('verbose', 'The shard files are merged.\n')
+
+    # delete the temporal directory of the shard files
+    shutil.rmtree(shard_dir, ignore_errors=True)
+
+    # print the summary of all shards and save the species got by the workers into the TOA database
+    print_annotation_summary(args, summary_dict)
+    save_pending_species(args.toa_database, species_row_list, sorted(set(species_name_list)))
+
+#-------------------------------------------------------------------------------
+
+def annotate_shard(args, toa_transcriptome_relationship_dict, toa_transdecoder_relationship_dict, seq_file, annotation_file, contamination_annotation_file, classification_file, nonann_seq_file, summary_file):
+    '''
+    Annotate the sequences of a shard in a worker process with a read-only connection to the TOA database and
+    write the summary counters and the species pending to be inserted into the TOA database in the summary file.
+    '''
+
+    # connect to the TOA database in read-only and immutable mode (the pipeline steps that change
+    # the TOA database do not run while the sequences are annotated and the species are inserted
+    # by the parent process when all workers are ended)
+    conn = xsqlite.connect_database(args.toa_database, 'READ-ONLY', is_immutable=True)
+
+    # annotate the sequences of the shard
+    summary_dict = annotate_sequences(conn, args, toa_transcriptome_relationship_dict, toa_transdecoder_relationship_dict, seq_file, annotation_file, contamination_annotation_file, classification_file, nonann_seq_file)
+
+    # close connection to TOA database
+    conn.close()
+
+    # write the summary file
+    try:
+        with open(summary_file, mode='w', encoding='iso-8859-1', newline='\n') as summary_file_id:
+            json.dump({'counters': summary_dict, 'species_rows': conn.pending_species_row_list, 'taxonomy_not_found': conn.pending_taxonomy_not_found_list}, summary_file_id)
+    except Exception as e:
+        raise xlib.ProgramException('F003', summary_file)
+
+#-------------------------------------------------------------------------------
+
+def annotate_sequences_plaza(conn, dataset_id, aligner_tool, seq_file, toa_transcriptome_relationship_dict, toa_transdecoder_relationship_dict, annotation_file, nonann_seq_file, type, batch_size, cache_mode, cache_size):
     '''
     '''
 
@@ -209,10 +488,16 @@ def annotate_sequences_plaza(conn, dataset_id, aligner_tool, seq_file, toa_trans
     # get the PLAZA gene description dictionary
     gene_description_dict = xsqlite.get_gene_description_dict(conn, dataset_id, 'all')
 
+    # initialize the cache of PLAZA Gene Ontology, InterPro and MapMan data
+    plaza_annotation_cache = xsqlite.PlazaAnnotationCache(conn, dataset_id, cache_mode, cache_size)
+
+    # initialize the resolver of Gene Ontology cross references
+    go_cross_reference_resolver = xsqlite.GoCrossReferenceResolver(conn)
+
     # open the sequence file
     if seq_file.endswith('.gz'):
         try:
-            seq_file_id = gzip.open(seq_file, mode='rt', encoding='iso-8859-1')
+            seq_file_id = xlib.open_gzip(seq_file, mode='rt', encoding='iso-8859-1')
         except Exception as e:
             raise xlib.ProgramException('F002', seq_file)
     else:
@@ -224,7 +509,7 @@ def annotate_sequences_plaza(conn, dataset_id, aligner_tool, seq_file, toa_trans
     # open the annotation file
     if annotation_file.endswith('.gz'):
         try:
-            annotation_file_id = gzip.open(annotation_file, mode='wt', encoding='iso-8859-1', newline='\n')
+            annotation_file_id = xlib.open_gzip(annotation_file, mode='wt', encoding='iso-8859-1', newline='\n')
         except Exception as e:
             raise xlib.ProgramException('F004', annotation_file)
     else:
@@ -236,7 +521,7 @@ def annotate_sequences_plaza(conn, dataset_id, aligner_tool, seq_file, toa_trans
     # open the file with non-annotated sequences
     if nonann_seq_file.endswith('.gz'):
         try:
-            nonann_seq_file_id = gzip.open(nonann_seq_file, mode='wt', encoding='iso-8859-1', newline='\n')
+            nonann_seq_file_id = xlib.open_gzip(nonann_seq_file, mode='wt', encoding='iso-8859-1', newline='\n')
         except Exception as e:
             raise xlib.ProgramException('F004', nonann_seq_file)
     else:
@@ -249,8 +534,14 @@ def annotate_sequences_plaza(conn, dataset_id, aligner_tool, seq_file, toa_trans
     total_seq_counter = 0
     non_annotated_seq_counter = 0
 
+    # initialize the output buffer of the annotation file
+    annotation_buffer = xlib.AnnotationOutputBuffer(annotation_file_id)
+
     # write header record of the annotation file
-    xlib.write_annotation_header(annotation_file_id, type)
+    xlib.write_annotation_header(annotation_buffer, type)
+
+    # initialize the writer of the annotation file sorted by the merge key
+    annotation_writer = xlib.SortedAnnotationWriter(annotation_buffer, type)
 
     # read the first record
     record = seq_file_id.readline()
@@ -258,19 +549,48 @@ def annotate_sequences_plaza(conn, dataset_id, aligner_tool, seq_file, toa_trans
     # while there are records
     while record != '':
 
-        # process the header record 
-        if record.startswith('>'):
+        # read the next batch of sequences
+        (seq_batch_list, record) = read_seq_batch(seq_file, seq_file_id, record, batch_size)
+
+        # get the BLAST dictionary of each sequence identification of the batch
+        x_seq_id_list = [header_record[1:].strip() for (header_record, _) in seq_batch_list]
+        blast_batch_dict = xsqlite.get_blast_batch_dict(conn, dataset_id, x_seq_id_list)
+
+        # get the gene identification list of the batch
+        gene_id_set = set()
+        for blast_dict in blast_batch_dict.values():
+            for hsp_dict in blast_dict.values():
+                gene_id_set.add(get_plaza_gene_id(dataset_id, hsp_dict['hit_def'], hsp_dict['hit_accession']))
+        gene_id_list = sorted(gene_id_set)
+
+        # get the Gene Ontology, InterPro and Mapman dictionaries of each gene identification of the batch
+        (go_batch_dict, interpro_batch_dict, mapman_batch_dict) = plaza_annotation_cache.get_batch_dicts(gene_id_list)
+
+        # get the interpro2go dictionary of the last InterPro identification of each gene identification without Gene Ontology data
+        interpro_id_list = sorted({interpro_dict[len(interpro_dict) - 1]['motif_id'] for (gene_id, interpro_dict) in interpro_batch_dict.items() if gene_id not in go_batch_dict})
+        interpro2go_batch_dict = xsqlite.get_interpro2go_batch_dict(conn, interpro_id_list)
+
+        # get the cross references of the Gene Ontology identifications of the batch
+        go_id_set = set()
+        for go_dict in go_batch_dict.values():
+            go_id_set.update([go_row_dict['go_id'] for go_row_dict in go_dict.values()])
+        for interpro2go_dict in interpro2go_batch_dict.values():
+            go_id_set.update([interpro2go_row_dict['go_id'] for interpro2go_row_dict in interpro2go_dict.values()])
+        go_cross_reference_resolver.add_go_id_list(go_id_set)
+
+        # for each sequence of the batch
+        for (header_record, seq_record_list) in seq_batch_list:
 
             # get the sequence identifiers
-            x_seq_id = record[1:].strip()
+            x_seq_id = header_record[1:].strip()
             (transcript_seq_id, nt_seq_id, aa_seq_id) = xlib.get_seq_ids(x_seq_id, toa_transcriptome_relationship_dict, toa_transdecoder_relationship_dict)
             xlib.Message.print('trace', f'transcript_seq_id: {transcript_seq_id} - nt_seq_id: {nt_seq_id} - aa_seq_id: {aa_seq_id}')
 
             # initialize the sequence annotation control variable
             is_seq_annotated = False
 
-            # find the BLAST dictionary with data corresponding to the sequence identification
-            blast_dict = xsqlite.get_blast_dict(conn, dataset_id, x_seq_id)
+            # get the BLAST dictionary with data corresponding to the sequence identification
+            blast_dict = blast_batch_dict.get(x_seq_id, {})
             
             # annotate the sequence for each hit-hsp if the dictionary has data
             if blast_dict != {}:
@@ -305,18 +625,7 @@ def annotate_sequences_plaza(conn, dataset_id, aligner_tool, seq_file, toa_trans
                     xlib.Message.print('trace', f'hsp_qseq: {data_dict["hsp_qseq"]}')
 
                     # get the gene identification
-                    # case 1:
-                    if xlib.check_int(data_dict['hit_accession']):
-                        if dataset_id in ['gymno_01']:
-                            gene_id = data_dict['hit_def'].strip()
-                        elif dataset_id in ['dicots_04', 'monocots_04']:
-                            gene_id = data_dict['hit_def'][data_dict['hit_def'].find('|')+1:].strip()
-                    # case 2:
-                    else:
-                        if dataset_id in ['gymno_01']:
-                            gene_id = data_dict['hit_accession'].strip()
-                        elif dataset_id in ['dicots_04', 'monocots_04']:
-                            gene_id = data_dict['hit_accession'][data_dict['hit_accession'].find('|')+1:].strip()
+                    gene_id = get_plaza_gene_id(dataset_id, data_dict['hit_def'], data_dict['hit_accession'])
 
                     # get the PLAZA species identification
                     description_plaza_species_id = gene_description_dict.get(gene_id, {}).get('plaza_species_id', xlib.get_na())
@@ -350,7 +659,7 @@ def annotate_sequences_plaza(conn, dataset_id, aligner_tool, seq_file, toa_trans
                     data_dict['accum_metacyc_id'] = ''
 
                     # get Gene Ontology dictionary with data corresponding to the gene identification
-                    go_dict = xsqlite.get_go_dict(conn, dataset_id, gene_id)
+                    go_dict = go_batch_dict.get(gene_id, {})
 
                     # annotate using Gene Ontology data
                     if go_dict != {}:
@@ -385,7 +694,7 @@ def annotate_sequences_plaza(conn, dataset_id, aligner_tool, seq_file, toa_trans
                             data_dict['accum_go_desc'] = go_desc if data_dict['accum_go_desc'] == '' else f'{data_dict["accum_go_desc"]}*{go_desc}'
 
                     # get InterPro dictionary with data corresponding to the gene identification
-                    interpro_dict = xsqlite.get_interpro_dict(conn, dataset_id, gene_id)
+                    interpro_dict = interpro_batch_dict.get(gene_id, {})
 
                     # annotate using Interpro data
                     if interpro_dict != {}:
@@ -423,7 +732,7 @@ def annotate_sequences_plaza(conn, dataset_id, aligner_tool, seq_file, toa_trans
                         if go_dict == {}:
 
                             # get data from InterPro interpro2go
-                            interpro2go_dict = xsqlite.get_interpro2go_dict(conn, interpro_id)
+                            interpro2go_dict = interpro2go_batch_dict.get(interpro_id, {})
 
                             # annotate using Interpro interpro2go
                             if interpro2go_dict != {}:
@@ -444,7 +753,7 @@ def annotate_sequences_plaza(conn, dataset_id, aligner_tool, seq_file, toa_trans
                                     data_dict['accum_go_desc'] = go_desc if data_dict['accum_go_desc'] == '' else f'{data_dict["accum_go_desc"]}*{go_desc}'
 
                     # get Mapman dictionary with data corresponding to the gene identification
-                    mapman_dict = xsqlite.get_mapman_dict(conn, dataset_id, gene_id)
+                    mapman_dict = mapman_batch_dict.get(gene_id, {})
 
                     # annotate using Mapman data
                     if mapman_dict != {}:
@@ -484,8 +793,11 @@ def annotate_sequences_plaza(conn, dataset_id, aligner_tool, seq_file, toa_trans
                         # get the Gene Ontology identification list
                         go_id_list = data_dict['accum_go_id'].split('*')
 
+                        # get the cross references dictionaries of all external databases corresponding to the Gene Onlology identification list
+                        cross_references_item_dicts = go_cross_reference_resolver.get_item_dicts(go_id_list)
+
                         # get Enzyme Commission dictionary with data corresponding to the Gene Onlology identification list
-                        ec_dict = xsqlite.get_cross_references_dict(conn, go_id_list, 'ec')
+                        ec_dict = cross_references_item_dicts.get('ec', {})
 
                         # annotate using Enzyme Commission data
                         if ec_dict != {}:
@@ -504,7 +816,7 @@ def annotate_sequences_plaza(conn, dataset_id, aligner_tool, seq_file, toa_trans
                                 data_dict['accum_ec_id'] = ec_id if data_dict['accum_ec_id'] == '' else f'{data_dict["accum_ec_id"]}*{ec_id}'
 
                         # get KEGG dictionary with data corresponding to the Gene Onlology identification list
-                        kegg_dict = xsqlite.get_cross_references_dict(conn, go_id_list, 'kegg')
+                        kegg_dict = cross_references_item_dicts.get('kegg', {})
 
                         # annotate using KEGG data
                         if kegg_dict != {}:
@@ -523,7 +835,7 @@ def annotate_sequences_plaza(conn, dataset_id, aligner_tool, seq_file, toa_trans
                                 data_dict['accum_kegg_id'] = kegg_id if data_dict['accum_kegg_id'] == '' else f'{data_dict["accum_kegg_id"]}*{kegg_id}'
 
                         # get MetaCyc dictionary with data corresponding to the Gene Onlology identification list
-                        metacyc_dict = xsqlite.get_cross_references_dict(conn, go_id_list, 'metacyc')
+                        metacyc_dict = cross_references_item_dicts.get('metacyc', {})
 
                         # annotate using MetaCyc data
                         if metacyc_dict != {}:
@@ -543,55 +855,54 @@ def annotate_sequences_plaza(conn, dataset_id, aligner_tool, seq_file, toa_trans
 
                     # if there are annotation data for the hsp, write in annotation file
                     if is_hsp_annotated:
-                        xlib.write_annotation_record(annotation_file_id, type, data_dict)
+                        annotation_writer.add(data_dict)
 
             # if there are not annotation data to the sequence identification, write in non-annotated sequence file
             if not is_seq_annotated:
                 non_annotated_seq_counter += 1
-                nonann_seq_file_id.write(record)
-
-            # read the next record
-            record = seq_file_id.readline()
-
-        else:
-
-            # control the FASTA format
-            raise xlib.ProgramException('F005', seq_file, 'FASTA')
-
-        # while there are records and they are sequence
-        while record != '' and not record.startswith('>'):
+                nonann_seq_file_id.write(header_record)
+                nonann_seq_file_id.writelines(seq_record_list)
 
-            # write the sequence record in file with non-annotated sequences
-            if not is_seq_annotated:
-                nonann_seq_file_id.write(record)
-
-            # read the next record
-            record = seq_file_id.readline()
+            # write the annotation data of the sequence sorted by the merge key
+            annotation_writer.flush()
 
-        # add 1 to sequence counter
-        total_seq_counter += 1
-        xlib.Message.print('verbose', f'\rProcessed sequences... {total_seq_counter}')
+            # add 1 to sequence counter
+            total_seq_counter += 1
+            xlib.Message.print('verbose', f'\rProcessed sequences... {total_seq_counter}')
 
     xlib.Message.print('verbose', '\n')
-    xlib.Message.print('info', f'Total seqs: {total_seq_counter} - Annotated seqs: {total_seq_counter - non_annotated_seq_counter} - Non-annotated seqs: {non_annotated_seq_counter}.')
 
     # close files
     seq_file_id.close()
+    annotation_buffer.close()
     nonann_seq_file_id.close()
 
+    # sort the annotation file (if it is necessary) and write its manifest
+    annotation_writer.write_manifest(annotation_file)
+
+    # return the summary counters
+    summary_dict = {'total_seq_counter': total_seq_counter, 'non_annotated_seq_counter': non_annotated_seq_counter}
+    if cache_mode != 'NONE':
+        summary_dict['cache_hit_counter'] = plaza_annotation_cache.hit_counter
+        summary_dict['cache_miss_counter'] = plaza_annotation_cache.miss_counter
+    return summary_dict
+
 #-------------------------------------------------------------------------------
 
-def annotate_sequences_refseq(conn, dataset_id, aligner_tool, seq_file, toa_transcriptome_relationship_dict, toa_transdecoder_relationship_dict, annotation_file, nonann_seq_file, type):
+def annotate_sequences_refseq(conn, dataset_id, aligner_tool, seq_file, toa_transcriptome_relationship_dict, toa_transdecoder_relationship_dict, annotation_file, nonann_seq_file, type, batch_size):
     '''
     '''
 
     # get species dictionary
     species_dict = xsqlite.get_species_dict(conn)
 
+    # initialize the resolver of Gene Ontology cross references
+    go_cross_reference_resolver = xsqlite.GoCrossReferenceResolver(conn)
+
     # open the sequence file
     if seq_file.endswith('.gz'):
         try:
-            seq_file_id = gzip.open(seq_file, mode='rt', encoding='iso-8859-1')
+            seq_file_id = xlib.open_gzip(seq_file, mode='rt', encoding='iso-8859-1')
         except Exception as e:
             raise xlib.ProgramException('F002', seq_file)
     else:
@@ -603,7 +914,7 @@ def annotate_sequences_refseq(conn, dataset_id, aligner_tool, seq_file, toa_tran
     # open the annotation file
     if annotation_file.endswith('.gz'):
         try:
-            annotation_file_id = gzip.open(annotation_file, mode='wt', encoding='iso-8859-1', newline='\n')
+            annotation_file_id = xlib.open_gzip(annotation_file, mode='wt', encoding='iso-8859-1', newline='\n')
         except Exception as e:
             raise xlib.ProgramException('F004', annotation_file)
     else:
@@ -615,7 +926,7 @@ def annotate_sequences_refseq(conn, dataset_id, aligner_tool, seq_file, toa_tran
     # open the file with non-annotated sequences
     if nonann_seq_file.endswith('.gz'):
         try:
-            nonann_seq_file_id = gzip.open(nonann_seq_file, mode='wt', encoding='iso-8859-1', newline='\n')
+            nonann_seq_file_id = xlib.open_gzip(nonann_seq_file, mode='wt', encoding='iso-8859-1', newline='\n')
         except Exception as e:
             raise xlib.ProgramException('F004', nonann_seq_file)
     else:
@@ -628,8 +939,14 @@ def annotate_sequences_refseq(conn, dataset_id, aligner_tool, seq_file, toa_tran
     total_seq_counter = 0
     non_annotated_seq_counter = 0
 
+    # initialize the output buffer of the annotation file
+    annotation_buffer = xlib.AnnotationOutputBuffer(annotation_file_id)
+
     # write header record of the annotation file
-    xlib.write_annotation_header(annotation_file_id, type)
+    xlib.write_annotation_header(annotation_buffer, type)
+
+    # initialize the writer of the annotation file sorted by the merge key
+    annotation_writer = xlib.SortedAnnotationWriter(annotation_buffer, type)
 
     # read the first record
     record = seq_file_id.readline()
@@ -637,19 +954,48 @@ def annotate_sequences_refseq(conn, dataset_id, aligner_tool, seq_file, toa_tran
     # while there are records
     while record != '':
 
-        # process the header record 
-        if record.startswith('>'):
+        # read the next batch of sequences
+        (seq_batch_list, record) = read_seq_batch(seq_file, seq_file_id, record, batch_size)
+
+        # get the BLAST dictionary of each sequence identification of the batch
+        x_seq_id_list = [header_record[1:].strip() for (header_record, _) in seq_batch_list]
+        blast_batch_dict = xsqlite.get_blast_batch_dict(conn, dataset_id, x_seq_id_list)
+
+        # get the protein accession list of the batch
+        protein_accession_set = set()
+        for blast_dict in blast_batch_dict.values():
+            for hsp_dict in blast_dict.values():
+                (protein_accession, _, _) = get_refseq_hit_data(aligner_tool, hsp_dict['hit_id'], hsp_dict['hit_def'], hsp_dict['hit_accession'])
+                protein_accession_set.add(protein_accession)
+
+        # get the gene2refseq dictionary of each protein accession of the batch
+        gene2refseq_batch_dict = xsqlite.get_gene2refseq_batch_dict(conn, sorted(protein_accession_set))
+
+        # get the gene2go dictionary of each gene identification of the batch
+        gene_id_set = set()
+        for gene2refseq_dict in gene2refseq_batch_dict.values():
+            gene_id_set.update([gene2refseq_row_dict['gene_id'] for gene2refseq_row_dict in gene2refseq_dict.values()])
+        gene2go_batch_dict = xsqlite.get_gene2go_batch_dict(conn, sorted(gene_id_set))
+
+        # get the cross references of the Gene Ontology identifications of the batch
+        go_id_set = set()
+        for gene2go_dict in gene2go_batch_dict.values():
+            go_id_set.update([gene2go_row_dict['go_id'] for gene2go_row_dict in gene2go_dict.values()])
+        go_cross_reference_resolver.add_go_id_list(go_id_set)
+
+        # for each sequence of the batch
+        for (header_record, seq_record_list) in seq_batch_list:
 
             # get the sequence identifiers
-            x_seq_id = record[1:].strip()
+            x_seq_id = header_record[1:].strip()
             (transcript_seq_id, nt_seq_id, aa_seq_id) = xlib.get_seq_ids(x_seq_id, toa_transcriptome_relationship_dict, toa_transdecoder_relationship_dict)
             xlib.Message.print('trace', f'transcript_seq_id: {transcript_seq_id} - nt_seq_id: {nt_seq_id} - aa_seq_id: {aa_seq_id}')
 
             # initialize the sequence annotation control variable
             is_seq_annotated = False
 
-            # find the BLAST dictionary with data corresponding to the sequence identification
-            blast_dict = xsqlite.get_blast_dict(conn, dataset_id, x_seq_id)
+            # get the BLAST dictionary with data corresponding to the sequence identification
+            blast_dict = blast_batch_dict.get(x_seq_id, {})
             
             # annotate the sequence for each hit-hsp if the dictionary has data
             if blast_dict != {}:
@@ -684,43 +1030,8 @@ def annotate_sequences_refseq(conn, dataset_id, aligner_tool, seq_file, toa_tran
                     xlib.Message.print('trace', f'hsp_num: {data_dict["hsp_num"]} - hsp_evalue:{data_dict["hsp_evalue"]} - hsp_identity: {data_dict["hsp_identity"]} - hsp_positive: {data_dict["hsp_positive"]} - hsp_gaps: {data_dict["hsp_gaps"]} - hsp_align_len: {data_dict["hsp_align_len"]}')
                     xlib.Message.print('trace', f'hsp_qseq: {data_dict["hsp_qseq"]}')
 
-                    # get the protein accession value, description and species name for aligner BLAST+
-                    if aligner_tool == xlib.get_blastplus_name():
-                        # case 1:
-                        # "hit_id" format: ref|protein_accession.version|
-                        # "hit_def" format: desc [species_name]
-                        pos1 = data_dict['hit_id'].find('|')
-                        if data_dict['hit_id'] == 'ref':
-                            # get protein accession value
-                            pos2 = data_dict['hit_id'].find('|', pos1+1)
-                            data_dict['protein_accession'] = data_dict['hit_id'][pos1+1:pos2].strip()
-                            # get the description and species name
-                            pos3 = data_dict['hit_def'].find('[')
-                            pos4 = data_dict['hit_def'].find(']')
-                            data_dict['desc'] = data_dict['hit_def'][:pos3].strip()
-                            data_dict['species'] = data_dict['hit_def'][pos3+1:pos4].strip().capitalize()
-                        # case 2:
-                        # "hit_def" format: protein_accession.version desc [species_name]
-                        else:
-                            # get protein accession value
-                            pos5 = data_dict['hit_def'].find(' ')
-                            data_dict['protein_accession'] = data_dict['hit_def'][:pos5].strip()
-                            # get the description and species name
-                            pos6 = data_dict['hit_def'][pos5:].find('[')
-                            pos7 = data_dict['hit_def'][pos5:].find(']')
-                            data_dict['desc'] = data_dict['hit_def'][pos5+1:pos5+1+pos6-1].strip()
-                            data_dict['species'] = data_dict['hit_def'][pos5+pos6+1:pos5+1+pos7-1].strip().capitalize()
-
-                    # get the protein accession value, description and species name for aligner DIAMOND
-                    elif aligner_tool == xlib.get_diamond_name():
-                        # "hit_def" format: desc [species_name]
-                        # get protein accession value
-                        data_dict['protein_accession'] = data_dict['hit_accession']
-                        # get the description and species name
-                        pos8 = data_dict['hit_def'].find('[')
-                        pos9 = data_dict['hit_def'].find(']')
-                        data_dict['desc'] = data_dict['hit_def'][:pos8].strip()
-                        data_dict['species'] = data_dict['hit_def'][pos8+1:pos9].strip().capitalize()
+                    # get the protein accession value, description and species name
+                    (data_dict['protein_accession'], data_dict['desc'], data_dict['species']) = get_refseq_hit_data(aligner_tool, data_dict['hit_id'], data_dict['hit_def'], data_dict['hit_accession'])
 
                     # get the protein accession value, description, species name and taxonomy data
                     (species_dict, family_name, phylum_name, kingdom_name, superkingdom_name) = xlib.get_species_data(conn, species_dict, data_dict['species'])
@@ -730,8 +1041,7 @@ def annotate_sequences_refseq(conn, dataset_id, aligner_tool, seq_file, toa_tran
                     data_dict['superkingdom'] = superkingdom_name
 
                     # get gene2refseq dictionary with data corresponding to the "hit_id" value (gene identification)
-                    # -- gene2refseq_dict = xsqlite.get_gene2refseq_dict(conn, data_dict['protein_accession'])
-                    gene2refseq_dict = xsqlite.get_gene2refseq_dict(conn, data_dict['protein_accession'])
+                    gene2refseq_dict = gene2refseq_batch_dict.get(data_dict['protein_accession'], {})
 
                     # annotate using gene2refseq data
                     if gene2refseq_dict != {}:
@@ -772,7 +1082,7 @@ def annotate_sequences_refseq(conn, dataset_id, aligner_tool, seq_file, toa_tran
                             xlib.Message.print('trace', f'gene2refseq -> gene_id: {gene_id} - protein_accession: {data_dict["protein_accession"]}')
 
                             # get gene2go dictionary with data corresponding to the "gene_id"
-                            gene2go_dict = xsqlite.get_gene2go_dict(conn, gene_id)
+                            gene2go_dict = gene2go_batch_dict.get(gene_id, {})
 
                             # if there are not data for the "gene_id" in gene2go
                             if gene2go_dict != {}:
@@ -796,8 +1106,11 @@ def annotate_sequences_refseq(conn, dataset_id, aligner_tool, seq_file, toa_tran
                                 # get the Gene Ontology identification list
                                 go_id_list = data_dict['accum_go_id'].split('*')
 
+                                # get the cross references dictionaries of all external databases corresponding to the Gene Onlology identification list
+                                cross_references_item_dicts = go_cross_reference_resolver.get_item_dicts(go_id_list)
+
                                 # get InterPro dictionary with data corresponding to the Gene Onlology identification list
-                                interpro_dict = xsqlite.get_cross_references_dict(conn, go_id_list, 'interpro')
+                                interpro_dict = cross_references_item_dicts.get('interpro', {})
 
                                 # annotate using InterPro data
                                 if interpro_dict != {}:
@@ -818,7 +1131,7 @@ def annotate_sequences_refseq(conn, dataset_id, aligner_tool, seq_file, toa_tran
                                         data_dict['accum_interpro_desc'] = interpro_id if data_dict['accum_interpro_desc'] == '' else f'{data_dict["accum_interpro_desc"]}*{interpro_desc}'
 
                                 # get Enzyme Commission dictionary with data corresponding to the Gene Onlology identification list
-                                ec_dict = xsqlite.get_cross_references_dict(conn, go_id_list, 'ec')
+                                ec_dict = cross_references_item_dicts.get('ec', {})
 
                                 # annotate using Enzyme Commission data
                                 if ec_dict != {}:
@@ -837,7 +1150,7 @@ def annotate_sequences_refseq(conn, dataset_id, aligner_tool, seq_file, toa_tran
                                         data_dict['accum_ec_id'] = ec_id if data_dict['accum_ec_id'] == '' else f'{data_dict["accum_ec_id"]}*{ec_id}'
 
                                 # get KEGG dictionary with data corresponding to the Gene Onlology identification list
-                                kegg_dict = xsqlite.get_cross_references_dict(conn, go_id_list, 'kegg')
+                                kegg_dict = cross_references_item_dicts.get('kegg', {})
 
                                 # annotate using KEGG data
                                 if kegg_dict != {}:
@@ -856,7 +1169,7 @@ def annotate_sequences_refseq(conn, dataset_id, aligner_tool, seq_file, toa_tran
                                         data_dict['accum_kegg_id'] = kegg_id if data_dict['accum_kegg_id'] == '' else f'{data_dict["accum_kegg_id"]}*{kegg_id}'
 
                                 # get MetaCyc dictionary with data corresponding to the Gene Onlology identification list
-                                metacyc_dict = xsqlite.get_cross_references_dict(conn, go_id_list, 'metacyc')
+                                metacyc_dict = cross_references_item_dicts.get('metacyc', {})
 
                                 # annotate using MetaCyc data
                                 if metacyc_dict != {}:
@@ -876,46 +1189,37 @@ def annotate_sequences_refseq(conn, dataset_id, aligner_tool, seq_file, toa_tran
 
                     # write in annotation file
                     if is_hsp_annotated:
-                        xlib.write_annotation_record(annotation_file_id, type, data_dict)
+                        annotation_writer.add(data_dict)
             
             # write in file with non-annotated sequences
             if not is_seq_annotated:
                 non_annotated_seq_counter += 1
-                nonann_seq_file_id.write(record)
-
-            # read the next record
-            record = seq_file_id.readline()
-
-        else:
-
-            # control the FASTA format
-            raise xlib.ProgramException('F005', seq_file, 'FASTA')
-
-        # while there are records and they are sequence
-        while record != '' and not record.startswith('>'):
-
-            # write the sequence record in file with non-annotated sequences
-            if not is_seq_annotated:
-                nonann_seq_file_id.write(record)
+                nonann_seq_file_id.write(header_record)
+                nonann_seq_file_id.writelines(seq_record_list)
 
-            # read the next record
-            record = seq_file_id.readline()
+            # write the annotation data of the sequence sorted by the merge key
+            annotation_writer.flush()
 
-        # add 1 to sequence counter
-        total_seq_counter += 1
-        xlib.Message.print('verbose', f'\rProcessed sequences... {total_seq_counter}')
+            # add 1 to sequence counter
+            total_seq_counter += 1
+            xlib.Message.print('verbose', f'\rProcessed sequences... {total_seq_counter}')
 
-    # print summary
     xlib.Message.print('verbose', '\n')
-    xlib.Message.print('info', f'Total seqs: {total_seq_counter} - Annotated seqs: {total_seq_counter - non_annotated_seq_counter} - Non-annotated seqs: {non_annotated_seq_counter}.')
 
     # close files
     seq_file_id.close()
+    annotation_buffer.close()
     nonann_seq_file_id.close()
 
+    # sort the annotation file (if it is necessary) and write its manifest
+    annotation_writer.write_manifest(annotation_file)
+
+    # return the summary counters
+    return {'total_seq_counter': total_seq_counter, 'non_annotated_seq_counter': non_annotated_seq_counter}
+
 #-------------------------------------------------------------------------------
 
-def annotate_sequences_nx(conn, dataset_id, aligner_tool, seq_file, toa_transcriptome_relationship_dict, toa_transdecoder_relationship_dict, viridiplantae_annotation_file, contamination_annotation_file, nonann_seq_file, type):
+def annotate_sequences_nx(conn, dataset_id, aligner_tool, seq_file, toa_transcriptome_relationship_dict, toa_transdecoder_relationship_dict, viridiplantae_annotation_file, contamination_annotation_file, classification_file, nonann_seq_file, type, batch_size, target_clade):
     '''
     '''
 
@@ -925,7 +1229,7 @@ def annotate_sequences_nx(conn, dataset_id, aligner_tool, seq_file, toa_transcri
     # open the sequence file
     if seq_file.endswith('.gz'):
         try:
-            seq_file_id = gzip.open(seq_file, mode='rt', encoding='iso-8859-1')
+            seq_file_id = xlib.open_gzip(seq_file, mode='rt', encoding='iso-8859-1')
         except Exception as e:
             raise xlib.ProgramException('F002', seq_file)
     else:
@@ -937,7 +1241,7 @@ def annotate_sequences_nx(conn, dataset_id, aligner_tool, seq_file, toa_transcri
     # open the Viridiplantae annotation file
     if viridiplantae_annotation_file.endswith('.gz'):
         try:
-            viridiplantae_annotation_file_id = gzip.open(viridiplantae_annotation_file, mode='wt', encoding='iso-8859-1', newline='\n')
+            viridiplantae_annotation_file_id = xlib.open_gzip(viridiplantae_annotation_file, mode='wt', encoding='iso-8859-1', newline='\n')
         except Exception as e:
             raise xlib.ProgramException('F004', viridiplantae_annotation_file)
     else:
@@ -949,7 +1253,7 @@ def annotate_sequences_nx(conn, dataset_id, aligner_tool, seq_file, toa_transcri
     # open the contamination annotation file
     if contamination_annotation_file.endswith('.gz'):
         try:
-            contamination_annotation_file_id = gzip.open(contamination_annotation_file, mode='wt', encoding='iso-8859-1', newline='\n')
+            contamination_annotation_file_id = xlib.open_gzip(contamination_annotation_file, mode='wt', encoding='iso-8859-1', newline='\n')
         except Exception as e:
             raise xlib.ProgramException('F004', contamination_annotation_file)
     else:
@@ -961,7 +1265,7 @@ def annotate_sequences_nx(conn, dataset_id, aligner_tool, seq_file, toa_transcri
     # open the file with non-annotated sequences
     if nonann_seq_file.endswith('.gz'):
         try:
-            nonann_seq_file_id = gzip.open(nonann_seq_file, mode='wt', encoding='iso-8859-1', newline='\n')
+            nonann_seq_file_id = xlib.open_gzip(nonann_seq_file, mode='wt', encoding='iso-8859-1', newline='\n')
         except Exception as e:
             raise xlib.ProgramException('F004', nonann_seq_file)
     else:
@@ -974,15 +1278,22 @@ def annotate_sequences_nx(conn, dataset_id, aligner_tool, seq_file, toa_transcri
     total_seq_counter = 0
     non_annotated_seq_counter = 0
 
-    # initialize the sequence lists
-    viridiplantae_seq_list = []
-    contamination_seq_list = []
+    # initialize the sequence classifier
+    seq_classifier = SeqClassifier(target_clade, classification_file)
+
+    # initialize the output buffers of the annotation files
+    viridiplantae_annotation_buffer = xlib.AnnotationOutputBuffer(viridiplantae_annotation_file_id)
+    contamination_annotation_buffer = xlib.AnnotationOutputBuffer(contamination_annotation_file_id)
 
     # write header record of the Viridiplantae annotation file
-    xlib.write_annotation_header(viridiplantae_annotation_file_id, type)
+    xlib.write_annotation_header(viridiplantae_annotation_buffer, type)
 
     # write header record of the contamination annotation file
-    xlib.write_annotation_header(contamination_annotation_file_id, type)
+    xlib.write_annotation_header(contamination_annotation_buffer, type)
+
+    # initialize the writers of the annotation files sorted by the merge key
+    viridiplantae_annotation_writer = xlib.SortedAnnotationWriter(viridiplantae_annotation_buffer, type)
+    contamination_annotation_writer = xlib.SortedAnnotationWriter(contamination_annotation_buffer, type)
 
     # read the first record
     record = seq_file_id.readline()
@@ -990,28 +1301,33 @@ def annotate_sequences_nx(conn, dataset_id, aligner_tool, seq_file, toa_transcri
     # while there are records
     while record != '':
 
-        # process the header record 
-        if record.startswith('>'):
+        # read the next batch of sequences
+        (seq_batch_list, record) = read_seq_batch(seq_file, seq_file_id, record, batch_size)
+
+        # get the BLAST dictionary of each sequence identification of the batch
+        x_seq_id_list = [header_record[1:].strip() for (header_record, _) in seq_batch_list]
+        blast_batch_dict = xsqlite.get_blast_batch_dict(conn, dataset_id, x_seq_id_list)
+
+        # for each sequence of the batch
+        for (header_record, seq_record_list) in seq_batch_list:
 
             # get the sequence identifiers
-            x_seq_id = record[1:].strip()
+            x_seq_id = header_record[1:].strip()
             (transcript_seq_id, nt_seq_id, aa_seq_id) = xlib.get_seq_ids(x_seq_id, toa_transcriptome_relationship_dict, toa_transdecoder_relationship_dict)
             xlib.Message.print('trace', f'transcript_seq_id: {transcript_seq_id} - nt_seq_id: {nt_seq_id} - aa_seq_id: {aa_seq_id}')
 
-            # initialize the sequence annotation control variable
-            is_seq_annotated = False
+            # initialize the hit-hsp counters of the target clade and contamination
+            target_hsp_counter = 0
+            contamination_hsp_counter = 0
 
-            # find the BLAST dictionary with data corresponding to the sequence identification
-            blast_dict = xsqlite.get_blast_dict(conn, dataset_id, x_seq_id)
+            # get the BLAST dictionary with data corresponding to the sequence identification
+            blast_dict = blast_batch_dict.get(x_seq_id, {})
             
             # annotate the sequence for each hit-hsp if the dictionary has data
             if blast_dict != {}:
                 for key in blast_dict.keys():
 
                     xlib.Message.print('trace', f'key: {key}')
- 
-                    # set annotation control variable
-                    is_seq_annotated = True
 
                     # initialize data dictionary
                     data_dict = {}
@@ -1070,24 +1386,591 @@ def annotate_sequences_nx(conn, dataset_id, aligner_tool, seq_file, toa_transcri
                     elif type == 'NR':
                         data_dict['accum_databases'] = 'nr'
 
-                    # when the kingdom is Viridiplantae, write in the Viridiplantae annotation file
-                    if data_dict['kingdom'] == 'Viridiplantae':
-                        xlib.write_annotation_record(viridiplantae_annotation_file_id, type, data_dict)
-                        if data_dict['seq_id'] not in viridiplantae_seq_list:
-                            viridiplantae_seq_list.append(data_dict['seq_id'])
+                    # when the taxonomy belongs to the target clade (by default, Viridiplantae), write in the Viridiplantae annotation file
+                    if seq_classifier.is_target(data_dict):
+                        viridiplantae_annotation_writer.add(data_dict)
+                        target_hsp_counter += 1
 
                     # otherwise, write in the the contamination annotation file
                     else:
-                        xlib.write_annotation_record(contamination_annotation_file_id, type, data_dict)
-                        if data_dict['seq_id'] not in contamination_seq_list:
-                            contamination_seq_list.append(data_dict['seq_id'])
+                        contamination_annotation_writer.add(data_dict)
+                        contamination_hsp_counter += 1
           
             # write in file with non-annotated sequneces
             else:
                 non_annotated_seq_counter += 1
-                nonann_seq_file_id.write(record)
+                nonann_seq_file_id.write(header_record)
+                nonann_seq_file_id.writelines(seq_record_list)
+
+            # classify the sequence once all its hit-hsps are processed
+            seq_classifier.classify(transcript_seq_id, nt_seq_id, aa_seq_id, target_hsp_counter, contamination_hsp_counter)
+
+            # write the annotation data of the sequence sorted by the merge key
+            viridiplantae_annotation_writer.flush()
+            contamination_annotation_writer.flush()
+
+            # add 1 to sequence counter
+            total_seq_counter += 1
+            xlib.Message.print('verbose', f'\rProcessed sequences... {total_seq_counter}')
+
+    xlib.Message.print('verbose', '\n')
+    (target_seq_counter, contamination_seq_counter, both_seq_counter) = seq_classifier.get_seq_counters()
+
+    # close files
+    seq_file_id.close()
+    viridiplantae_annotation_buffer.close()
+    contamination_annotation_buffer.close()
+    nonann_seq_file_id.close()
+    seq_classifier.close()
+
+    # sort the annotation files (if it is necessary) and write their manifests
+    viridiplantae_annotation_writer.write_manifest(viridiplantae_annotation_file)
+    contamination_annotation_writer.write_manifest(contamination_annotation_file)
+
+    # return the summary counters
+    return {'total_seq_counter': total_seq_counter, 'non_annotated_seq_counter': non_annotated_seq_counter, 'target_seq_counter': target_seq_counter, 'contamination_seq_counter': contamination_seq_counter, 'both_seq_counter': both_seq_counter}
+
+#-------------------------------------------------------------------------------
+
+class SeqClassifier():
+    '''
+    Classifier of the sequences annotated with NCBI NT or NR: each sequence is classified once all its
+    hit-hsps are processed and its classification is written in the classification file (when it is not NONE).
+    '''
+
+    #---------------
+
+    def __init__(self, target_clade, classification_file):
+        '''
+        Initialize the classifier and write the header record of the classification file.
+        '''
+
+        self.target_clade = target_clade
+
+        # initialize the dictionary of the classification flags of each transcript
+        # (1: annotated with the target clade; 2: annotated with other clades; 3: both)
+        self.seq_flags_dict = {}
+
+        # set the classification of each combination of flags
+        self.classification_list = ['NONANNOTATED', 'TARGET', 'CONTAMINATION', 'TARGET&CONTAMINATION']
+
+        # open the classification file
+        if classification_file == 'NONE':
+            self.classification_file_id = None
+        elif classification_file.endswith('.gz'):
+            try:
+                self.classification_file_id = xlib.open_gzip(classification_file, mode='wt', encoding='iso-8859-1', newline='\n')
+            except Exception as e:
+                raise xlib.ProgramException('F004', classification_file)
+        else:
+            try:
+                self.classification_file_id = open(classification_file, mode='w', encoding='iso-8859-1', newline='\n')
+            except Exception as e:
+                raise xlib.ProgramException('F003', classification_file)
+
+        # write header record of the classification file
+        if self.classification_file_id is not None:
+            self.classification_file_id.write('"seq_id";"nt_seq_id";"aa_seq_id";"clade";"classification";"clade_hsp_number";"contamination_hsp_number"\n')
+
+    #---------------
+
+    def is_target(self, data_dict):
+        '''
+        Check if the taxonomy of an annotation belongs to the target clade.
+        '''
+
+        return self.target_clade in (data_dict['family'], data_dict['phylum'], data_dict['kingdom'], data_dict['superkingdom'])
+
+    #---------------
+
+    def classify(self, seq_id, nt_seq_id, aa_seq_id, target_hsp_counter, contamination_hsp_counter):
+        '''
+        Classify a sequence from its hit-hsp counters of the target clade and contamination.
+        '''
+
+        # get the classification flags of the sequence
+        flags = (1 if target_hsp_counter > 0 else 0) | (2 if contamination_hsp_counter > 0 else 0)
+
+        # accumulate the flags of the transcript
+        if flags != 0:
+            self.seq_flags_dict[seq_id] = self.seq_flags_dict.get(seq_id, 0) | flags
+
+        # write the classification record
+        if self.classification_file_id is not None:
+            self.classification_file_id.write(f'"{seq_id}";"{nt_seq_id}";"{aa_seq_id}";"{self.target_clade}";"{self.classification_list[flags]}";"{target_hsp_counter}";"{contamination_hsp_counter}"\n')
+
+    #---------------
+
+    def get_seq_counters(self):
+        '''
+        Get the numbers of transcripts annotated only with the target clade, only with other clades and with both.
+        '''
+
+        seq_counter_list = [0, 0, 0, 0]
+        for flags in self.seq_flags_dict.values():
+            seq_counter_list[flags] += 1
+
+        return seq_counter_list[1], seq_counter_list[2], seq_counter_list[3]
+
+    #---------------
+
+    def close(self):
+        '''
+        Close the classification file.
+        '''
+
+        if self.classification_file_id is not None:
+            self.classification_file_id.close()
+
+    #---------------
+
+#-------------------------------------------------------------------------------
+
+def check_previous_annotation(conn, args):
+    '''
+    Check if the sequences of the previous annotation whose hits have not changed reference annotation data can be
+    kept: the dataset is a PLAZA one, the previous annotation file (with a valid manifest) and file with non-annotated
+    sequences exist and the Gene Ontology and InterPro data did not change.
+    '''
+
+    # initialize the control variable
+    OK = True
+
+    # check the annotation type
+    if get_annotation_type(args.dataset_id) != 'PLAZA':
+        xlib.Message.print('info', 'The annotation of the changed sequences is only available with PLAZA datasets: all sequences are annotated.')
+        OK = False
+
+    # check the previous annotation files
+    elif not xlib.check_annotation_manifest(args.annotation_file) or not os.path.isfile(args.nonann_seq_file):
+        xlib.Message.print('info', 'The previous annotation files are not found or they changed: all sequences are annotated.')
+        OK = False
+
+    # check the changes of the reference annotation data
+    elif not xsqlite.check_reference_changes(conn):
+        xlib.Message.print('info', 'The changes of the reference annotation data are not found: all sequences are annotated.')
+        OK = False
+
+    # check the changes of the Gene Ontology and InterPro data
+    elif set(xsqlite.get_reference_group_change_list(conn, args.changed_since)).intersection(['go', 'interpro']) != set():
+        xlib.Message.print('info', 'The Gene Ontology or InterPro data changed: all sequences are annotated.')
+        OK = False
+
+    # return the control variable
+    return OK
+
+#-------------------------------------------------------------------------------
+
+def reannotate_changed_sequences(conn, args, toa_transcriptome_relationship_dict, toa_transdecoder_relationship_dict):
+    '''
+    Annotate again the sequences not annotated previously or whose hits have changed reference annotation data and keep
+    the previous annotation of the rest of sequences: the new annotation file is the merge by the merge key of the kept
+    records and the new ones, and the file with non-annotated sequences keeps the order of the sequence file.
+    '''
+
+    # get the genes with changed reference annotation data
+    changed_gene_id_set = xsqlite.get_reference_changed_gene_id_set(conn, args.dataset_id, args.changed_since)
+    xlib.Message.print('verbose', f'Genes with changed annotation data: {len(changed_gene_id_set)}.\n')
+
+    # get the sequence identifiers of the previous annotation
+    previous_annotated_seq_id_set = get_annotation_seq_id_set(args.annotation_file)
+    previous_nonann_seq_id_set = get_fasta_seq_id_set(args.nonann_seq_file, toa_transcriptome_relationship_dict, toa_transdecoder_relationship_dict)
+
+    # create the temporal directory
+    update_dir = tempfile.mkdtemp(prefix='toa-update-', dir=os.path.dirname(os.path.abspath(args.annotation_file)))
+
+    # set the arguments of the annotation of the changed sequences
+    changed_args = copy.copy(args)
+    changed_args.seq_file = f'{update_dir}/changed-seqs.fasta'
+    changed_args.annotation_file = f'{update_dir}/changed-annotation.csv'
+    changed_args.nonann_seq_file = f'{update_dir}/changed-nonann-seqs.fasta'
+    kept_annotation_file = f'{update_dir}/kept-annotation.csv'
+
+    # write the changed sequences and get the sequence identifiers of the kept ones
+    kept_seq_id_set = write_changed_seq_file(conn, args, changed_gene_id_set, previous_annotated_seq_id_set.union(previous_nonann_seq_id_set), changed_args.seq_file, toa_transcriptome_relationship_dict, toa_transdecoder_relationship_dict)
+
+    # annotate the changed sequences
+    if args.workers == 1:
+        summary_dict = annotate_sequences(conn, changed_args, toa_transcriptome_relationship_dict, toa_transdecoder_relationship_dict, changed_args.seq_file, changed_args.annotation_file, changed_args.contamination_annotation_file, changed_args.classification_file, changed_args.nonann_seq_file)
+        print_annotation_summary(changed_args, summary_dict)
+        save_pending_species(args.toa_database, conn.pending_species_row_list, conn.pending_taxonomy_not_found_list)
+        conn.pending_species_row_list = []
+        conn.pending_taxonomy_not_found_list = []
+    else:
+        annotate_sequences_sharded(changed_args, toa_transcriptome_relationship_dict, toa_transdecoder_relationship_dict)
+
+    # write the kept records of the previous annotation file
+    write_kept_annotation_file(args.annotation_file, kept_seq_id_set, kept_annotation_file)
+
+    # merge the kept and the new records in the annotation file
+    (record_number, first_key, last_key) = xlib.merge_sorted_annotation_files([kept_annotation_file, changed_args.annotation_file], args.annotation_file, is_header=True)
+    xlib.write_annotation_manifest(args.annotation_file, get_annotation_type(args.dataset_id), True, True, record_number, first_key, last_key)
+
+    # write the file with non-annotated sequences: the kept ones non-annotated previously and the changed ones non-annotated now
+    changed_nonann_seq_id_set = get_fasta_seq_id_set(changed_args.nonann_seq_file, toa_transcriptome_relationship_dict, toa_transdecoder_relationship_dict)
+    nonann_seq_id_set = kept_seq_id_set.intersection(previous_nonann_seq_id_set).union(changed_nonann_seq_id_set)
+    write_nonann_seq_file(args.seq_file, nonann_seq_id_set, args.nonann_seq_file, toa_transcriptome_relationship_dict, toa_transdecoder_relationship_dict)
+
+    # delete the temporal directory
+    shutil.rmtree(update_dir, ignore_errors=True)
 
-            # read the next record
+    # print summary
+    xlib.Message.print('info', f'Kept seqs: {len(kept_seq_id_set)} - Non-annotated seqs: {len(nonann_seq_id_set)}.')
+
+#-------------------------------------------------------------------------------
+
+def write_changed_seq_file(conn, args, changed_gene_id_set, previous_seq_id_set, changed_seq_file, toa_transcriptome_relationship_dict, toa_transdecoder_relationship_dict):
+    '''
+    Write the sequences of the sequence file to be annotated again (not annotated previously or with any hit
+    of a changed gene) in the changed sequence file and return the sequence identifiers of the kept ones.
+    '''
+
+    # initialize the kept sequence identifier set
+    kept_seq_id_set = set()
+
+    # open the sequence file
+    if args.seq_file.endswith('.gz'):
+        try:
+            seq_file_id = xlib.open_gzip(args.seq_file, mode='rt', encoding='iso-8859-1')
+        except Exception as e:
+            raise xlib.ProgramException('F002', args.seq_file)
+    else:
+        try:
+            seq_file_id = open(args.seq_file, mode='r', encoding='iso-8859-1')
+        except Exception as e:
+            raise xlib.ProgramException('F001', args.seq_file)
+
+    # open the changed sequence file
+    try:
+        changed_seq_file_id = open(changed_seq_file, mode='w', encoding='iso-8859-1', newline='\n')
+    except Exception as e:
+        raise xlib.ProgramException('F003', changed_seq_file)
+
+    # read the first record
+    record = seq_file_id.readline()
+
+    # while there are records
+    while record != '':
+
+        # read the next batch of sequences
+        (seq_batch_list, record) = read_seq_batch(args.seq_file, seq_file_id, record, args.batch_size)
+
+        # get the BLAST dictionary of each sequence identification of the batch
+        x_seq_id_list = [header_record[1:].strip() for (header_record, _) in seq_batch_list]
+        blast_batch_dict = xsqlite.get_blast_batch_dict(conn, args.dataset_id, x_seq_id_list)
+
+        # for each sequence of the batch
+        for (header_record, seq_record_list) in seq_batch_list:
+
+            # get the sequence identifiers
+            x_seq_id = header_record[1:].strip()
+            seq_ids = xlib.get_seq_ids(x_seq_id, toa_transcriptome_relationship_dict, toa_transdecoder_relationship_dict)
+
+            # get the gene identification set of the hits of the sequence
+            gene_id_set = {get_plaza_gene_id(args.dataset_id, hsp_dict['hit_def'], hsp_dict['hit_accession']) for hsp_dict in blast_batch_dict.get(x_seq_id, {}).values()}
+
+            # keep the sequence or write it in the changed sequence file
+            if seq_ids in previous_seq_id_set and gene_id_set.isdisjoint(changed_gene_id_set):
+                kept_seq_id_set.add(seq_ids)
+            else:
+                changed_seq_file_id.write(header_record)
+                changed_seq_file_id.writelines(seq_record_list)
+
+    # close files
+    seq_file_id.close()
+    changed_seq_file_id.close()
+
+    # return the kept sequence identifier set
+    return kept_seq_id_set
+
+#-------------------------------------------------------------------------------
+
+def get_annotation_seq_id_set(annotation_file):
+    '''
+    Get the set of sequence identifiers (sequence, nucleotide sequence and amino acid sequence identifications)
+    of the records of an annotation file with a header record.
+    '''
+
+    # initialize the sequence identifier set
+    seq_id_set = set()
+
+    # open the annotation file
+    if annotation_file.endswith('.gz'):
+        try:
+            annotation_file_id = xlib.open_gzip(annotation_file, mode='rt', encoding='iso-8859-1')
+        except Exception as e:
+            raise xlib.ProgramException('F002', annotation_file)
+    else:
+        try:
+            annotation_file_id = open(annotation_file, mode='r', encoding='iso-8859-1')
+        except Exception as e:
+            raise xlib.ProgramException('F001', annotation_file)
+
+    # skip the header record and add the sequence identifiers of the rest of records
+    annotation_file_id.readline()
+    for record in annotation_file_id:
+        seq_id_set.add(get_annotation_record_seq_ids(record))
+
+    # close the annotation file
+    annotation_file_id.close()
+
+    # return the sequence identifier set
+    return seq_id_set
+
+#-------------------------------------------------------------------------------
+
+def get_annotation_record_seq_ids(record):
+    '''
+    Get the sequence identifiers (sequence, nucleotide sequence and amino acid sequence identifications) of a record of an annotation file.
+    '''
+
+    # split the first columns of the record
+    value_list = record.split(';', 3)
+
+    # return the sequence identifiers
+    return (value_list[0].strip('"'), value_list[1].strip('"'), value_list[2].strip('"'))
+
+#-------------------------------------------------------------------------------
+
+def get_fasta_seq_id_set(fasta_file, toa_transcriptome_relationship_dict, toa_transdecoder_relationship_dict):
+    '''
+    Get the set of sequence identifiers (sequence, nucleotide sequence and amino acid sequence identifications)
+    of the sequences of a FASTA file.
+    '''
+
+    # initialize the sequence identifier set
+    seq_id_set = set()
+
+    # open the FASTA file
+    if fasta_file.endswith('.gz'):
+        try:
+            fasta_file_id = xlib.open_gzip(fasta_file, mode='rt', encoding='iso-8859-1')
+        except Exception as e:
+            raise xlib.ProgramException('F002', fasta_file)
+    else:
+        try:
+            fasta_file_id = open(fasta_file, mode='r', encoding='iso-8859-1')
+        except Exception as e:
+            raise xlib.ProgramException('F001', fasta_file)
+
+    # add the sequence identifiers of the header records
+    for record in fasta_file_id:
+        if record.startswith('>'):
+            seq_id_set.add(xlib.get_seq_ids(record[1:].strip(), toa_transcriptome_relationship_dict, toa_transdecoder_relationship_dict))
+
+    # close the FASTA file
+    fasta_file_id.close()
+
+    # return the sequence identifier set
+    return seq_id_set
+
+#-------------------------------------------------------------------------------
+
+def write_kept_annotation_file(annotation_file, kept_seq_id_set, kept_annotation_file):
+    '''
+    Write the header record and the records of the kept sequences of an annotation file (the order is kept).
+    '''
+
+    # open the annotation file
+    if annotation_file.endswith('.gz'):
+        try:
+            annotation_file_id = xlib.open_gzip(annotation_file, mode='rt', encoding='iso-8859-1')
+        except Exception as e:
+            raise xlib.ProgramException('F002', annotation_file)
+    else:
+        try:
+            annotation_file_id = open(annotation_file, mode='r', encoding='iso-8859-1')
+        except Exception as e:
+            raise xlib.ProgramException('F001', annotation_file)
+
+    # open the kept annotation file
+    try:
+        kept_annotation_file_id = open(kept_annotation_file, mode='w', encoding='iso-8859-1', newline='\n')
+    except Exception as e:
+        raise xlib.ProgramException('F003', kept_annotation_file)
+
+    # write the header record and the records of the kept sequences
+    kept_annotation_file_id.write(annotation_file_id.readline())
+    for record in annotation_file_id:
+        if get_annotation_record_seq_ids(record) in kept_seq_id_set:
+            kept_annotation_file_id.write(record)
+
+    # close files
+    annotation_file_id.close()
+    kept_annotation_file_id.close()
+
+#-------------------------------------------------------------------------------
+
+def write_nonann_seq_file(seq_file, nonann_seq_id_set, nonann_seq_file, toa_transcriptome_relationship_dict, toa_transdecoder_relationship_dict):
+    '''
+    Write the non-annotated sequences in the file with non-annotated sequences in the order of the sequence file.
+    '''
+
+    # open the sequence file
+    if seq_file.endswith('.gz'):
+        try:
+            seq_file_id = xlib.open_gzip(seq_file, mode='rt', encoding='iso-8859-1')
+        except Exception as e:
+            raise xlib.ProgramException('F002', seq_file)
+    else:
+        try:
+            seq_file_id = open(seq_file, mode='r', encoding='iso-8859-1')
+        except Exception as e:
+            raise xlib.ProgramException('F001', seq_file)
+
+    # open the file with non-annotated sequences
+    if nonann_seq_file.endswith('.gz'):
+        try:
+            nonann_seq_file_id = xlib.open_gzip(nonann_seq_file, mode='wt', encoding='iso-8859-1', newline='\n')
+        except Exception as e:
+            raise xlib.ProgramException('F004', nonann_seq_file)
+    else:
+        try:
+            nonann_seq_file_id = open(nonann_seq_file, mode='w', encoding='iso-8859-1', newline='\n')
+        except Exception as e:
+            raise xlib.ProgramException('F003', nonann_seq_file)
+
+    # write the records of the non-annotated sequences
+    is_nonann_seq = False
+    for record in seq_file_id:
+        if record.startswith('>'):
+            is_nonann_seq = xlib.get_seq_ids(record[1:].strip(), toa_transcriptome_relationship_dict, toa_transdecoder_relationship_dict) in nonann_seq_id_set
+        if is_nonann_seq:
+            nonann_seq_file_id.write(record)
+
+    # close files
+    seq_file_id.close()
+    nonann_seq_file_id.close()
+
+#-------------------------------------------------------------------------------
+
+def get_seq_number(seq_file):
+    '''
+    Get the sequence number of a FASTA file (it is got from the FASTA index, which is built when it is necessary).
+    '''
+
+    return xfasta.get_seq_number(seq_file)
+
+#-------------------------------------------------------------------------------
+
+def split_seq_file(seq_file, seq_number, shard_seq_file_list):
+    '''
+    Split a FASTA file in contiguous shards with a similar sequence number.
+    '''
+
+    # get the sequence number of each shard
+    shard_number = len(shard_seq_file_list)
+    shard_seq_number_list = [seq_number // shard_number + (1 if i < seq_number % shard_number else 0) for i in range(shard_number)]
+
+    # open the sequence file
+    if seq_file.endswith('.gz'):
+        try:
+            seq_file_id = xlib.open_gzip(seq_file, mode='rt', encoding='iso-8859-1')
+        except Exception as e:
+            raise xlib.ProgramException('F002', seq_file)
+    else:
+        try:
+            seq_file_id = open(seq_file, mode='r', encoding='iso-8859-1')
+        except Exception as e:
+            raise xlib.ProgramException('F001', seq_file)
+
+    # read the first record
+    record = seq_file_id.readline()
+
+    # write the sequences of each shard
+    for i in range(shard_number):
+
+        # open the shard file
+        try:
+            shard_seq_file_id = open(shard_seq_file_list[i], mode='w', encoding='iso-8859-1', newline='\n')
+        except Exception as e:
+            raise xlib.ProgramException('F003', shard_seq_file_list[i])
+
+        # read the sequences of the shard and write them in the shard file
+        (seq_batch_list, record) = read_seq_batch(seq_file, seq_file_id, record, shard_seq_number_list[i])
+        for (header_record, seq_record_list) in seq_batch_list:
+            shard_seq_file_id.write(header_record)
+            shard_seq_file_id.writelines(seq_record_list)
+
+        # close the shard file
+        shard_seq_file_id.close()
+
+    # close the sequence file
+    seq_file_id.close()
+
+#-------------------------------------------------------------------------------
+
+def concatenate_shard_files(shard_file_list, output_file, is_header):
+    '''
+    Concatenate the shard files in the output file; when the files have a header record, only the one of the first shard is written.
+    '''
+
+    # open the output file
+    if output_file.endswith('.gz'):
+        try:
+            output_file_id = xlib.open_gzip(output_file, mode='wt', encoding='iso-8859-1', newline='\n')
+        except Exception as e:
+            raise xlib.ProgramException('F004', output_file)
+    else:
+        try:
+            output_file_id = open(output_file, mode='w', encoding='iso-8859-1', newline='\n')
+        except Exception as e:
+            raise xlib.ProgramException('F003', output_file)
+
+    # write the records of each shard file
+    for i in range(len(shard_file_list)):
+
+        # open the shard file
+        try:
+            shard_file_id = open(shard_file_list[i], mode='r', encoding='iso-8859-1', newline='\n')
+        except Exception as e:
+            raise xlib.ProgramException('F001', shard_file_list[i])
+
+        # skip the header record of all shard files except the first one
+        if is_header and i > 0:
+            shard_file_id.readline()
+
+        # copy the rest of records
+        shutil.copyfileobj(shard_file_id, output_file_id)
+
+        # close the shard file
+        shard_file_id.close()
+
+    # close the output file
+    output_file_id.close()
+
+
+#-------------------------------------------------------------------------------
+
+def merge_shard_annotation_files(shard_annotation_file_list, annotation_file):
+    '''
+    Merge the shard annotation files (each one sorted by the merge key) in the annotation file and write its manifest.
+    '''
+
+    # get the type of the annotation file from the manifest of the first shard annotation file
+    type = xlib.get_annotation_manifest_dict(shard_annotation_file_list[0]).get('type', 'NONE')
+
+    # merge the shard annotation files
+    (record_number, first_key, last_key) = xlib.merge_sorted_annotation_files(shard_annotation_file_list, annotation_file, is_header=True)
+
+    # write the manifest of the annotation file
+    xlib.write_annotation_manifest(annotation_file, type, True, True, record_number, first_key, last_key)
+#-------------------------------------------------------------------------------
+
+def read_seq_batch(seq_file, seq_file_id, record, batch_size):
+    '''
+    Read a batch of sequences (header record and sequence records) from a FASTA file starting at the current record.
+    '''
+
+    # initialize the sequence batch list
+    seq_batch_list = []
+
+    # while there are records and the batch is not full
+    while record != '' and len(seq_batch_list) < batch_size:
+
+        # process the header record
+        if record.startswith('>'):
+            header_record = record
             record = seq_file_id.readline()
 
         else:
@@ -1096,31 +1979,92 @@ def annotate_sequences_nx(conn, dataset_id, aligner_tool, seq_file, toa_transcri
             raise xlib.ProgramException('F005', seq_file, 'FASTA')
 
         # while there are records and they are sequence
+        seq_record_list = []
         while record != '' and not record.startswith('>'):
+            seq_record_list.append(record)
+            record = seq_file_id.readline()
 
-            # write the sequence record in file with non-annotated sequences
-            if not is_seq_annotated:
-                nonann_seq_file_id.write(record)
+        # add the sequence to the batch
+        seq_batch_list.append((header_record, seq_record_list))
 
-            # read the next record
-            record = seq_file_id.readline()
+    # return the sequence batch list and the next record
+    return seq_batch_list, record
 
-        # add 1 to sequence counter
-        total_seq_counter += 1
-        xlib.Message.print('verbose', f'\rProcessed sequences... {total_seq_counter}')
+#-------------------------------------------------------------------------------
 
-    # print summary
-    xlib.Message.print('verbose', '\n')
-    both_seq_list = set(viridiplantae_seq_list).intersection(contamination_seq_list)
-    xlib.Message.print('info', f'Total seqs: {total_seq_counter}')
-    xlib.Message.print('info', f'Viridiplantae seqs: {len(viridiplantae_seq_list) - len(both_seq_list)} - Contamination seqs: {len(contamination_seq_list)- len(both_seq_list)} - Viridiplantae&contamination seqs : {len(both_seq_list)}')
-    xlib.Message.print('info', f'Not annotate seqs: {non_annotated_seq_counter}')
+def get_plaza_gene_id(dataset_id, hit_def, hit_accession):
+    '''
+    Get the PLAZA gene identification from the hit data.
+    '''
 
-    # close files
-    seq_file_id.close()
-    viridiplantae_annotation_file_id.close()
-    contamination_annotation_file_id.close()
-    nonann_seq_file_id.close()
+    # case 1:
+    if xlib.check_int(hit_accession):
+        if dataset_id in ['gymno_01']:
+            gene_id = hit_def.strip()
+        elif dataset_id in ['dicots_04', 'monocots_04']:
+            gene_id = hit_def[hit_def.find('|')+1:].strip()
+    # case 2:
+    else:
+        if dataset_id in ['gymno_01']:
+            gene_id = hit_accession.strip()
+        elif dataset_id in ['dicots_04', 'monocots_04']:
+            gene_id = hit_accession[hit_accession.find('|')+1:].strip()
+
+    # return the gene identification
+    return gene_id
+
+#-------------------------------------------------------------------------------
+
+def get_refseq_hit_data(aligner_tool, hit_id, hit_def, hit_accession):
+    '''
+    Get the protein accession value, description and species name from the RefSeq hit data.
+    '''
+
+    # initialize the hit data
+    protein_accession = xlib.get_na()
+    desc = xlib.get_na()
+    species = xlib.get_na()
+
+    # get the protein accession value, description and species name for aligner BLAST+
+    if aligner_tool == xlib.get_blastplus_name():
+        # case 1:
+        # "hit_id" format: ref|protein_accession.version|
+        # "hit_def" format: desc [species_name]
+        pos1 = hit_id.find('|')
+        if hit_id == 'ref':
+            # get protein accession value
+            pos2 = hit_id.find('|', pos1+1)
+            protein_accession = hit_id[pos1+1:pos2].strip()
+            # get the description and species name
+            pos3 = hit_def.find('[')
+            pos4 = hit_def.find(']')
+            desc = hit_def[:pos3].strip()
+            species = hit_def[pos3+1:pos4].strip().capitalize()
+        # case 2:
+        # "hit_def" format: protein_accession.version desc [species_name]
+        else:
+            # get protein accession value
+            pos5 = hit_def.find(' ')
+            protein_accession = hit_def[:pos5].strip()
+            # get the description and species name
+            pos6 = hit_def[pos5:].find('[')
+            pos7 = hit_def[pos5:].find(']')
+            desc = hit_def[pos5+1:pos5+1+pos6-1].strip()
+            species = hit_def[pos5+pos6+1:pos5+1+pos7-1].strip().capitalize()
+
+    # get the protein accession value, description and species name for aligner DIAMOND
+    elif aligner_tool == xlib.get_diamond_name():
+        # "hit_def" format: desc [species_name]
+        # get protein accession value
+        protein_accession = hit_accession
+        # get the description and species name
+        pos8 = hit_def.find('[')
+        pos9 = hit_def.find(']')
+        desc = hit_def[:pos8].strip()
+        species = hit_def[pos8+1:pos9].strip().capitalize()
+
+    # return the hit data
+    return protein_accession, desc, species
 
 #-------------------------------------------------------------------------------
 
@@ -24,11 +24,10 @@ This program calculates annotation statistics.
 #-------------------------------------------------------------------------------
 
 import argparse
-import gzip
 import os
-import re
 import sys
 
+import xfasta
 import xlib
 import xsqlite
 
@@ -48,14 +47,14 @@ def main(argv):
     check_args(args)
 
     # connect to the TOA database
-    conn = xsqlite.connect_database(args.toa_database)
+    conn = xsqlite.connect_database(args.toa_database, args.db_profile)
 
     # calculate general statistics
     if args.transcriptome_file != 'NONE':
         calculate_general_stats(conn, args.transcriptome_file, args.peptide_file, args.dataset_list, args.non_annotation_file_list, args.stats_file)
 
     # calculate functional statistics
-    calculate_functional_stats(conn, args.annotation_file, args.type, args.stats_file)
+    calculate_functional_stats(conn, args.annotation_file, args.type, args.stats_file, args.results_db)
 
 #-------------------------------------------------------------------------------
 
@@ -78,6 +77,8 @@ def build_parser():
     parser.add_argument('--annotation', dest='annotation_file', help='Path of annotation file in CSV format (mandatory).')
     parser.add_argument('--type', dest='type', help=f'Type of the annotation file (mandatory): {xlib.get_type_code_list_text()}.')
     parser.add_argument('--stats', dest='stats_file', help='Path of statistics file in CSV format (mandatory).')
+    parser.add_argument('--db-profile', dest='db_profile', help=f'Profile of the connection to the TOA database: {xlib.get_db_profile_code_list_text()}; default: {xlib.Const.DEFAULT_DB_PROFILE}.')
+    parser.add_argument('--results-db', dest='results_db', help='Path of the results database where the annotation file can be saved or NONE (when the annotation file is saved in it, the annotations are read from the database); default: NONE.')
     parser.add_argument('--verbose', dest='verbose', help=f'Additional job status info during the run: {xlib.get_verbose_code_list_text()}; default: {xlib.Const.DEFAULT_VERBOSE}.')
     parser.add_argument('--trace', dest='trace', help=f'Additional info useful to the developer team: {xlib.get_trace_code_list_text()}; default: {xlib.Const.DEFAULT_TRACE}.')
 
@@ -176,6 +177,21 @@ def check_args(args):
         xlib.Message.print('error', '*** The statistics file is not indicated in the input arguments.')
         OK = False
 
+    # check "db_profile"
+    if args.db_profile is None:
+        args.db_profile = xlib.Const.DEFAULT_DB_PROFILE
+    elif not xlib.check_code(args.db_profile, xlib.get_db_profile_code_list(), case_sensitive=False):
+        xlib.Message.print('error', f'*** db-profile has to be {xlib.get_db_profile_code_list_text()}.')
+        OK = False
+    else:
+        args.db_profile = args.db_profile.upper()
+
+    # check "results_db"
+    if args.results_db is None:
+        args.results_db = 'NONE'
+    elif args.results_db.upper() == 'NONE':
+        args.results_db = args.results_db.upper()
+
     # check "verbose"
     if args.verbose is None:
         args.verbose = xlib.Const.DEFAULT_VERBOSE
@@ -244,7 +260,7 @@ def calculate_general_stats(conn, transcriptome_file, peptide_file, dataset_list
 
 #-------------------------------------------------------------------------------
 
-def calculate_functional_stats(conn, annotation_file, type, stats_file):
+def calculate_functional_stats(conn, annotation_file, type, stats_file, results_db):
     '''
     Calculate distribution statistics.
     '''
@@ -274,26 +290,40 @@ def calculate_functional_stats(conn, annotation_file, type, stats_file):
     kegg_desc_dict = xsqlite.get_kegg_id_dict(conn)
     metacyc_desc_dict = {}
 
-    # open the annotation file
-    if annotation_file.endswith('.gz'):
-        try:
-            annotation_file_id = gzip.open(annotation_file, mode='rt', encoding='iso-8859-1')
-        except Exception as e:
-            raise xlib.ProgramException('F002', annotation_file)
+    # connect to the results database when the annotation file is saved in it
+    results_conn = xlib.connect_results_db(results_db, annotation_file)
+
+    # when the annotation file is saved in the results database, initialize the annotation reader of its rows
+    # (the rows are got in the order of the file because the statistics of every sequence depend on it)
+    if results_conn is not None:
+        annotation_reader = xlib.ResultsAnnotationReader(results_conn, annotation_file)
+
+    # otherwise, open the annotation file, initialize the annotation reader and read the first record (header)
     else:
-        try:
-            annotation_file_id = open(annotation_file, mode='r', encoding='iso-8859-1')
-        except Exception as e:
-            raise xlib.ProgramException('F001', annotation_file)
+
+        # open the annotation file
+        if annotation_file.endswith('.gz'):
+            try:
+                annotation_file_id = xlib.open_gzip(annotation_file, mode='rt', encoding='iso-8859-1')
+            except Exception as e:
+                raise xlib.ProgramException('F002', annotation_file)
+        else:
+            try:
+                annotation_file_id = open(annotation_file, mode='r', encoding='iso-8859-1')
+            except Exception as e:
+                raise xlib.ProgramException('F001', annotation_file)
+
+        # initialize the annotation reader
+        annotation_reader = xlib.AnnotationReader(annotation_file, annotation_file_id, type)
+
+        # read the first record of the annotation file (header)
+        (record, key, data_dict) = annotation_reader.read()
 
     # initialize the annotation counter
     annotation_counter = 0
 
-    # read the first record of the annotation file (header)
-    (record, key, data_dict) = xlib.read_annotation_record(annotation_file, annotation_file_id, type, annotation_counter)
-
     # read the secord record of the annotation file (first data record)
-    (record, key, data_dict) = xlib.read_annotation_record(annotation_file, annotation_file_id, type, annotation_counter)
+    (record, key, data_dict) = annotation_reader.read()
     xlib.Message.print('trace', f'key: {key} - record: {record}')
 
     # while there are records
@@ -521,7 +551,7 @@ def calculate_functional_stats(conn, annotation_file, type, stats_file):
                 xlib.Message.print('verbose', f'\rProcessed annotations: {annotation_counter}')
 
                 # read the next record of the annotation file
-                (record, key, data_dict) = xlib.read_annotation_record(annotation_file, annotation_file_id, type, annotation_counter)
+                (record, key, data_dict) = annotation_reader.read()
                 xlib.Message.print('trace', f'key: {key} - record: {record}')
 
             # increase the HIT number per HSP number in the corresponding statistics dictionary
@@ -609,7 +639,10 @@ def calculate_functional_stats(conn, annotation_file, type, stats_file):
     xlib.Message.print('info', f'{annotation_counter} annotation records in annotation file.')
 
     # close files
-    annotation_file_id.close()
+    if results_conn is not None:
+        results_conn.close()
+    else:
+        annotation_file_id.close()
 
     # write alignment statistics files
     write_x_per_y_stats(hit_num_per_hsp_num_stats_dict, stats_file, stats_code='hit_per_hsp')
@@ -640,63 +673,10 @@ def calculate_functional_stats(conn, annotation_file, type, stats_file):
 
 def calculate_seq_number(fasta_file):
     '''
-    Calculate the sequence number of a FASTA file.
+    Calculate the sequence number of a FASTA file (it is got from the FASTA index, which is built when it is necessary).
     '''
 
-
-    # set the pattern of the header records (>sequence_info)
-    pattern = r'^>(.*)$'
-
-    # open the FASTA file
-    if fasta_file.endswith('.gz'):
-        try:
-            fasta_file_id = gzip.open(fasta_file, mode='rt', encoding='iso-8859-1')
-        except Exception as e:
-            raise xlib.ProgramException('F002', fasta_file)
-    else:
-        try:
-            fasta_file_id = open(fasta_file, mode='r', encoding='iso-8859-1')
-        except Exception as e:
-            raise xlib.ProgramException('F001', fasta_file)
-
-    # initialize the sequence counter
-    seq_counter = 0
-
-    # read the first record
-    record = fasta_file_id.readline()
-
-    # while there are records
-    while record != '':
-
-        # process the header record 
-        if record.startswith('>'):
-
-            # extract the data 
-            mo = re.search(pattern, record)
-            sequence_id = mo.group(1).strip()
-
-            # read the next record
-            record = fasta_file_id.readline()
-
-        else:
-
-            # control the FASTA format
-            raise xlib.ProgramException('F005', fasta_file, 'FASTA')
-
-        # while there are records and they are sequence
-        while record != '' and not record.startswith('>'):
-
-            # read the next record
-            record = fasta_file_id.readline()
-
-        # add 1 to sequence counter and print it
-        seq_counter += 1
-
-    # close file
-    fasta_file_id.close()
-
-    # return the sequence counter
-    return seq_counter
+    return xfasta.get_seq_number(fasta_file)
 
 #-------------------------------------------------------------------------------
 
@@ -712,7 +692,7 @@ def write_dataset_stats(stats_dict, generic_stats_file):
     # open the statistics file
     if stats_file.endswith('.gz'):
         try:
-            stats_file_id = gzip.open(stats_file, mode='wt', encoding='iso-8859-1', newline='\n')
+            stats_file_id = xlib.open_gzip(stats_file, mode='wt', encoding='iso-8859-1', newline='\n')
         except Exception as e:
             raise xlib.ProgramException('F004', stats_file)
     else:
@@ -745,7 +725,7 @@ def write_x_per_y_stats(stats_dict, generic_stats_file, stats_code):
     # open the statistics file
     if stats_file.endswith('.gz'):
         try:
-            stats_file_id = gzip.open(stats_file, mode='wt', encoding='iso-8859-1', newline='\n')
+            stats_file_id = xlib.open_gzip(stats_file, mode='wt', encoding='iso-8859-1', newline='\n')
         except Exception as e:
             raise xlib.ProgramException('F004', stats_file)
     else:
@@ -791,7 +771,7 @@ def write_phylogenic_data_frecuency(stats_dict, generic_stats_file, stats_code):
     # open the statistics file
     if stats_file.endswith('.gz'):
         try:
-            stats_file_id = gzip.open(stats_file, mode='wt', encoding='iso-8859-1', newline='\n')
+            stats_file_id = xlib.open_gzip(stats_file, mode='wt', encoding='iso-8859-1', newline='\n')
         except Exception as e:
             raise xlib.ProgramException('F004', stats_file)
     else:
@@ -829,7 +809,7 @@ def write_ontologic_data_frecuency(stats_dict, desc_dict, generic_stats_file, st
     # open the statistics file
     if stats_file.endswith('.gz'):
         try:
-            stats_file_id = gzip.open(stats_file, mode='wt', encoding='iso-8859-1', newline='\n')
+            stats_file_id = xlib.open_gzip(stats_file, mode='wt', encoding='iso-8859-1', newline='\n')
         except Exception as e:
             raise xlib.ProgramException('F004', stats_file)
     else:
@@ -885,7 +865,7 @@ def write_go_data_frecuency(conn, go_id_stats_dict, generic_stats_file):
     # open the file of statistics by GO identifier
     if go_id_stats_file.endswith('.gz'):
         try:
-            go_id_stats_file_id = gzip.open(go_id_stats_file, mode='wt', encoding='iso-8859-1', newline='\n')
+            go_id_stats_file_id = xlib.open_gzip(go_id_stats_file, mode='wt', encoding='iso-8859-1', newline='\n')
         except Exception as e:
             raise xlib.ProgramException('F004', go_id_stats_file)
     else:
@@ -920,7 +900,7 @@ def write_go_data_frecuency(conn, go_id_stats_dict, generic_stats_file):
     # open the file of statistics by namespace
     if namespace_stats_file.endswith('.gz'):
         try:
-            namespace_stats_file_id = gzip.open(namespace_stats_file, mode='wt', encoding='iso-8859-1', newline='\n')
+            namespace_stats_file_id = xlib.open_gzip(namespace_stats_file, mode='wt', encoding='iso-8859-1', newline='\n')
         except Exception as e:
             raise xlib.ProgramException('F004', namespace_stats_file)
     else:
@@ -25,7 +25,6 @@ from a file with transcript read counts.
 #-------------------------------------------------------------------------------
 
 import argparse
-import gzip
 import os
 import sys
 
@@ -48,7 +47,7 @@ def main(argv):
     check_args(args)
 
     # connect to the TOA database
-    conn = xsqlite.connect_database(args.toa_database)
+    conn = xsqlite.connect_database(args.toa_database, args.db_profile)
 
     # get the taxonomy dictionary of the species name from taxonomy server
     taxonomy_dict = xlib.get_taxonomy_dict('name', args.species_name)
@@ -85,6 +84,7 @@ def build_parser():
     parser.add_argument('--tc', dest='transcript_count_file', help='Path of the transcript read count file (mandatory).')
     parser.add_argument('--out-tc', dest='out_transcriptome_count_file', help='Path of the output transcript read count file (mandatory).')
     parser.add_argument('--out-gc', dest='out_gene_count_file', help='Path of the gene read count file (mandatory).')
+    parser.add_argument('--db-profile', dest='db_profile', help=f'Profile of the connection to the TOA database: {xlib.get_db_profile_code_list_text()}; default: {xlib.Const.DEFAULT_DB_PROFILE}.')
     parser.add_argument('--verbose', dest='verbose', help=f'Additional job status info during the run: {xlib.get_verbose_code_list_text()}; default: {xlib.Const.DEFAULT_VERBOSE}.')
     parser.add_argument('--trace', dest='trace', help=f'Additional info useful to the developer team: {xlib.get_trace_code_list_text()}; default: {xlib.Const.DEFAULT_TRACE}.')
     parser.add_argument('--tsi', dest='tsi_list', help='Sequence identification list to trace with format seq_id,seq_id_2,...,seq_id_n or NONE; default: NONE.')
@@ -147,6 +147,15 @@ def check_args(args):
         xlib.Message.print('error', '*** The output gene read count file is not indicated in the input arguments.')
         OK = False
 
+    # check "db_profile"
+    if args.db_profile is None:
+        args.db_profile = xlib.Const.DEFAULT_DB_PROFILE
+    elif not xlib.check_code(args.db_profile, xlib.get_db_profile_code_list(), case_sensitive=False):
+        xlib.Message.print('error', f'*** db-profile has to be {xlib.get_db_profile_code_list_text()}.')
+        OK = False
+    else:
+        args.db_profile = args.db_profile.upper()
+
     # check "verbose"
     if args.verbose is None:
         args.verbose = xlib.Const.DEFAULT_VERBOSE
@@ -188,7 +197,7 @@ def calculate_gene_counts(conn, species_name, gff_file, gff_format, transcript_c
     # open the transcript GFF file
     if gff_file.endswith('.gz'):
         try:
-            gff_file_id = gzip.open(gff_file, mode='rt', encoding='iso-8859-1')
+            gff_file_id = xlib.open_gzip(gff_file, mode='rt', encoding='iso-8859-1')
         except Exception as e:
             raise xlib.ProgramException('F002', gff_file)
     else:
@@ -279,7 +288,7 @@ def calculate_gene_counts(conn, species_name, gff_file, gff_format, transcript_c
     # open the transcript read count file
     if transcript_count_file.endswith('.gz'):
         try:
-            transcript_count_file_id = gzip.open(transcript_count_file, mode='rt', encoding='iso-8859-1')
+            transcript_count_file_id = xlib.open_gzip(transcript_count_file, mode='rt', encoding='iso-8859-1')
         except Exception as e:
             raise xlib.ProgramException('F002', transcript_count_file)
     else:
@@ -291,7 +300,7 @@ def calculate_gene_counts(conn, species_name, gff_file, gff_format, transcript_c
     # open the output transcript read count file which has the gene data added
     if out_transcriptome_count_file.endswith('.gz'):
         try:
-            out_transcriptome_count_file_id = gzip.open(out_transcriptome_count_file, mode='wt', encoding='iso-8859-1', newline='\n')
+            out_transcriptome_count_file_id = xlib.open_gzip(out_transcriptome_count_file, mode='wt', encoding='iso-8859-1', newline='\n')
         except Exception as e:
             raise xlib.ProgramException('F004', out_transcriptome_count_file)
     else:
@@ -366,7 +375,7 @@ def calculate_gene_counts(conn, species_name, gff_file, gff_format, transcript_c
     # open the output gene read count file
     if out_gene_count_file.endswith('.gz'):
         try:
-            out_gene_count_file_id = gzip.open(out_gene_count_file, mode='wt', encoding='iso-8859-1', newline='\n')
+            out_gene_count_file_id = xlib.open_gzip(out_gene_count_file, mode='wt', encoding='iso-8859-1', newline='\n')
         except Exception as e:
             raise xlib.ProgramException('F004', out_gene_count_file)
     else:
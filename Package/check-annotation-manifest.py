@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+#-------------------------------------------------------------------------------
+
+'''
+This software has been developed by:
+
+    GI Sistemas Naturales e Historia Forestal (formerly known as GI Genetica, Fisiologia e Historia Forestal)
+    Dpto. Sistemas y Recursos Naturales
+    ETSI Montes, Forestal y del Medio Natural
+    Universidad Politecnica de Madrid
+    https://github.com/ggfhf/
+
+Licence: GNU General Public Licence Version 3.
+'''
+
+#-------------------------------------------------------------------------------
+
+'''
+This program checks if an annotation file has a valid manifest declaring that its records are sorted by the merge key
+(nt_seq_id, aa_seq_id, hit_num, hsp_num). The exit code is 0 when the manifest is valid and 1 otherwise.
+'''
+
+#-------------------------------------------------------------------------------
+
+import argparse
+import os
+import sys
+
+import xlib
+
+#-------------------------------------------------------------------------------
+
+def main(argv):
+    '''
+    Main line of the program.
+    '''
+
+    # check the operating system
+    xlib.check_os()
+
+    # get and check the arguments
+    parser = build_parser()
+    args = parser.parse_args()
+    check_args(args)
+
+    # check the manifest of the annotation file
+    is_valid = xlib.check_annotation_manifest(args.annotation_file)
+    if is_valid:
+        xlib.Message.print('info', f'The annotation file {os.path.basename(args.annotation_file)} has a valid manifest and it is sorted by the merge key.')
+    else:
+        xlib.Message.print('info', f'The annotation file {os.path.basename(args.annotation_file)} has not a valid manifest or it is not sorted by the merge key.')
+
+    # return the check result
+    return is_valid
+
+#-------------------------------------------------------------------------------
+
+def build_parser():
+    '''
+    Build the parser with the available arguments.
+    '''
+
+    # create the parser and add arguments
+    description = 'Description: This program checks if an annotation file has a valid manifest declaring that its records are sorted by the merge key.'
+    text = f'{xlib.get_long_project_name()} v{xlib.get_project_version()} - {os.path.basename(__file__)}\n\n{description}\n'
+    usage = f'\r{text.ljust(len("usage:"))}\nUsage: {os.path.basename(__file__)} arguments'
+    parser = argparse.ArgumentParser(usage=usage)
+    parser._optionals.title = 'Arguments'
+    parser.add_argument('--annotation', dest='annotation_file', help='Path of annotation file in CSV format (mandatory).')
+    parser.add_argument('--verbose', dest='verbose', help=f'Additional job status info during the run: {xlib.get_verbose_code_list_text()}; default: {xlib.Const.DEFAULT_VERBOSE}.')
+    parser.add_argument('--trace', dest='trace', help=f'Additional info useful to the developer team: {xlib.get_trace_code_list_text()}; default: {xlib.Const.DEFAULT_TRACE}.')
+
+    # return the paser
+    return parser
+
+#-------------------------------------------------------------------------------
+
+def check_args(args):
+    '''
+    Check the input arguments.
+    '''
+
+    # initialize the control variable
+    OK = True
+
+    # check "annotation_file"
+    if args.annotation_file is None:
+        xlib.Message.print('error', '*** The annotation file is not indicated in the input arguments.')
+        OK = False
+    elif not os.path.isfile(args.annotation_file):
+        xlib.Message.print('error', f'*** The file {args.annotation_file} does not exist.')
+        OK = False
+
+    # check "verbose"
+    if args.verbose is None:
+        args.verbose = xlib.Const.DEFAULT_VERBOSE
+    elif not xlib.check_code(args.verbose, xlib.get_verbose_code_list(), case_sensitive=False):
+        xlib.Message.print('error', f'*** verbose has to be {xlib.get_verbose_code_list_text()}.')
+        OK = False
+    if args.verbose.upper() == 'Y':
+        xlib.Message.set_verbose_status(True)
+
+    # check "trace"
+    if args.trace is None:
+        args.trace = xlib.Const.DEFAULT_TRACE
+    elif not xlib.check_code(args.trace, xlib.get_trace_code_list(), case_sensitive=False):
+        xlib.Message.print('error', f'*** trace has to be {xlib.get_trace_code_list_text()}.')
+        OK = False
+    if args.trace.upper() == 'Y':
+        xlib.Message.set_trace_status(True)
+
+    # if there are errors, exit with exception
+    if not OK:
+        raise xlib.ProgramException('P001')
+
+#-------------------------------------------------------------------------------
+
+if __name__ == '__main__':
+
+    is_valid = main(sys.argv[1:])
+    sys.exit(0 if is_valid else 1)
+
+#-------------------------------------------------------------------------------
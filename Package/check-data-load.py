@@ -46,7 +46,7 @@ def main(argv):
     check_args(args)
 
     # connect to the TOA database
-    conn = xsqlite.connect_database(args.toa_database)
+    conn = xsqlite.connect_database(args.toa_database, args.db_profile)
 
     # initialize the control variable
     OK = True
@@ -90,6 +90,20 @@ def main(argv):
         if xsqlite.check_go_ontology(conn) == 0 or xsqlite.check_go_cross_references(conn) == 0:
             OK = False
 
+    # report the recommended indexes not found of the tables of the group
+    if args.table_group in ['gymno_01', 'dicots_04', 'monocots_04']:
+        table_name_list = ['plaza_go', 'plaza_interpro', 'plaza_mapman']
+    elif args.table_group == 'gene':
+        table_name_list = ['ncbi_gene2go', 'ncbi_gene2refseq']
+    elif args.table_group == 'interpro':
+        table_name_list = ['interpro_interpro2go']
+    elif args.table_group == 'go':
+        table_name_list = ['go_cross_references']
+    else:
+        table_name_list = []
+    for index_name in xsqlite.get_missing_recommended_index_list(conn, table_name_list):
+        xlib.Message.print('info', f'*** WARNING: The recommended index {index_name} is not found; it can be created with rebuild-database.py --upgrade-indexes=Y.')
+
     # close connection to TOA database
     conn.close()
 
@@ -115,6 +129,7 @@ def build_parser():
     parser._optionals.title = 'Arguments'
     parser.add_argument('--db', dest='toa_database', help='Path of the TOA database (mandatory).')
     parser.add_argument('--group', dest='table_group', help=f'Table group (mandatory): {xlib.get_table_group_code_list_text()}.')
+    parser.add_argument('--db-profile', dest='db_profile', help=f'Profile of the connection to the TOA database: {xlib.get_db_profile_code_list_text()}; default: {xlib.Const.DEFAULT_DB_PROFILE}.')
     parser.add_argument('--verbose', dest='verbose', help=f'Additional job status info during the run: {xlib.get_verbose_code_list_text()}; default: {xlib.Const.DEFAULT_VERBOSE}.')
     parser.add_argument('--trace', dest='trace', help=f'Additional info useful to the developer team: {xlib.get_trace_code_list_text()}; default: {xlib.Const.DEFAULT_TRACE}.')
 
@@ -146,6 +161,15 @@ def check_args(args):
     else:
         args.table_group = args.table_group.lower()
 
+    # check "db_profile"
+    if args.db_profile is None:
+        args.db_profile = xlib.Const.DEFAULT_DB_PROFILE
+    elif not xlib.check_code(args.db_profile, xlib.get_db_profile_code_list(), case_sensitive=False):
+        xlib.Message.print('error', f'*** db-profile has to be {xlib.get_db_profile_code_list_text()}.')
+        OK = False
+    else:
+        args.db_profile = args.db_profile.upper()
+
     # check "verbose"
     if args.verbose is None:
         args.verbose = xlib.Const.DEFAULT_VERBOSE
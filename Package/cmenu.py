@@ -706,6 +706,8 @@ def build_menu_toa_pipelines():
         print()
         print(f'    3. Annotation merger of {xlib.get_toa_name()} pipelines')
         print()
+        print( '    4. Run metrics')
+        print()
         print( '    X. Return to menu Main')
         print()
 
@@ -719,6 +721,8 @@ def build_menu_toa_pipelines():
             build_menu_toa_aminoacid_pipeline()
         elif option == '3':
             build_menu_toa_annotation_merger()
+        elif option == '4':
+            ctoa.form_view_pipeline_metrics()
         elif option == 'X':
             break
 
@@ -743,6 +747,7 @@ def build_menu_toa_nucleotide_pipeline():
         print()
         print( '    3. Run pipeline')
         print( '    4. Restart pipeline')
+        print( '    5. Re-annotate pipeline run')
         print()
         print( '    X. Return to menu Pipelines')
         print()
@@ -759,6 +764,8 @@ def build_menu_toa_nucleotide_pipeline():
             ctoa.form_run_pipeline_process(xlib.get_toa_process_pipeline_nucleotide_code())
         elif option == '4':
             ctoa.form_restart_pipeline_process(xlib.get_toa_process_pipeline_nucleotide_code())
+        elif option == '5':
+            ctoa.form_reannotate_pipeline_process(xlib.get_toa_process_pipeline_nucleotide_code())
         elif option == 'X':
             break
 
@@ -783,6 +790,7 @@ def build_menu_toa_aminoacid_pipeline():
         print()
         print( '    3. Run pipeline')
         print( '    4. Restart pipeline')
+        print( '    5. Re-annotate pipeline run')
         print()
         print( '    X. Return to menu Pipelines')
         print()
@@ -799,6 +807,8 @@ def build_menu_toa_aminoacid_pipeline():
             ctoa.form_run_pipeline_process(xlib.get_toa_process_pipeline_aminoacid_code())
         elif option == '4':
             ctoa.form_restart_pipeline_process(xlib.get_toa_process_pipeline_aminoacid_code())
+        elif option == '5':
+            ctoa.form_reannotate_pipeline_process(xlib.get_toa_process_pipeline_aminoacid_code())
         elif option == 'X':
             break
 
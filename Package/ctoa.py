@@ -24,7 +24,6 @@ menu items in console mode.
 
 #-------------------------------------------------------------------------------
 
-import gzip
 import os
 import pathlib
 import subprocess
@@ -485,6 +484,114 @@ def form_restart_pipeline_process(pipeline_type):
 
 #-------------------------------------------------------------------------------
 
+def form_reannotate_pipeline_process(pipeline_type):
+    '''
+    Annotate again a pipeline run with the reference annotation data currently loaded in the TOA database
+    without aligning again its sequences.
+    '''
+
+    # initialize the control variable
+    OK = True
+
+    # set the pipeline name
+    if pipeline_type == xlib.get_toa_process_pipeline_nucleotide_code():
+        name = xlib.get_toa_process_pipeline_nucleotide_name()
+    elif pipeline_type == xlib.get_toa_process_pipeline_aminoacid_code():
+        name = xlib.get_toa_process_pipeline_aminoacid_name()
+
+    # print the header
+    clib.clear_screen()
+    clib.print_headers_with_environment(f'{name} - Re-annotate run')
+
+    # get the pipeline dataset identification
+    app_list = [pipeline_type]
+    pipeline_dataset_id = cinputs.input_result_dataset_id(xlib.get_toa_result_pipeline_dir(), app_list)
+    if pipeline_dataset_id == '':
+        print(f'WARNING: There are not any {pipeline_type} result datasets.')
+        OK = False
+
+    # get the option to annotate again only the sequences with changed reference annotation data
+    if OK:
+        changed_only = cinputs.input_code(text='Annotate only the sequences with changed reference data', code_list=['Y', 'N'], default_code='Y').upper()
+
+    # confirm the process run
+    if OK:
+        print(xlib.get_separator())
+        OK = clib.confirm_action(f'The pipeline run {pipeline_dataset_id} is going to be annotated again.')
+
+    # run the process
+    if OK:
+
+        devstdout = xlib.DevStdOut(xtoa.reannotate_pipeline_process.__name__)
+        OK = xtoa.reannotate_pipeline_process(pipeline_type, pipeline_dataset_id, changed_only, devstdout, function=None)
+
+    # show continuation message 
+    print(xlib.get_separator())
+    input('Press [Intro] to continue ...')
+
+#-------------------------------------------------------------------------------
+
+def form_view_pipeline_metrics():
+    '''
+    View the resources used by the steps of a pipeline run or compare them with the ones of other run.
+    '''
+
+    # initialize the control variable
+    OK = True
+
+    # print the header
+    clib.clear_screen()
+    clib.print_headers_with_environment('Pipelines - Run metrics')
+
+    # get the dictionary of TOA configuration
+    toa_config_dict = xtoa.get_toa_config_dict()
+
+    # get the pipeline dataset identification
+    app_list = [xlib.get_toa_process_pipeline_nucleotide_code(), xlib.get_toa_process_pipeline_aminoacid_code()]
+    pipeline_dataset_id = cinputs.input_result_dataset_id(xlib.get_toa_result_pipeline_dir(), app_list)
+    if pipeline_dataset_id == '':
+        print('WARNING: There are not any annotation pipeline result datasets.')
+        OK = False
+
+    # get the pipeline dataset identification of the compared run
+    if OK:
+        run_dir_list = [f'{toa_config_dict["RESULT_DIR"]}/{xlib.get_toa_result_pipeline_dir()}/{pipeline_dataset_id}']
+        compare = cinputs.input_code(text='Compare with other run', code_list=['Y', 'N'], default_code='N').upper()
+        if compare == 'Y':
+            pipeline_dataset_id2 = cinputs.input_result_dataset_id(xlib.get_toa_result_pipeline_dir(), app_list)
+            run_dir_list.append(f'{toa_config_dict["RESULT_DIR"]}/{xlib.get_toa_result_pipeline_dir()}/{pipeline_dataset_id2}')
+
+    # get the grouping of the steps
+    if OK:
+        pipeline_metrics_group = cinputs.input_code(text='Grouping of the steps', code_list=xlib.get_pipeline_metrics_group_code_list(), default_code='KIND').upper()
+
+    # check the metrics files
+    if OK:
+        for run_dir in run_dir_list:
+            if not os.path.isfile(xlib.get_pipeline_metrics_file(run_dir)):
+                print(f'*** WARNING: The run {os.path.basename(run_dir)} has not any metrics data.')
+                OK = False
+
+    # print the metrics
+    if OK:
+        (header_list, row_list) = xlib.get_pipeline_metrics_table(run_dir_list, pipeline_metrics_group)
+        print(xlib.get_separator())
+        # set line template (the first column is aligned to the left and the rest to the right)
+        width_list = [max([len(row[i]) for row in [header_list] + row_list]) for i in range(len(header_list))]
+        line_template = '   '.join([f'{{{i}:{"<" if i == 0 else ">"}{width_list[i]}}}' for i in range(len(header_list))])
+        # print header
+        print(line_template.format(*header_list))
+        print(line_template.format(*['=' * width for width in width_list]))
+        # print detail lines
+        for row in row_list:
+            print(line_template.format(*row))
+
+    # show continuation message 
+    print(xlib.get_separator())
+    input('Press [Intro] to continue ...')
+
+#-------------------------------------------------------------------------------
+
 def form_view_x_per_y_data(stats_code):
     '''
     View the x per y data.
@@ -538,7 +645,7 @@ def form_view_x_per_y_data(stats_code):
         # open the statistics file
         if stats_file.endswith('.gz'):
             try:
-                stats_file_id = gzip.open(stats_file, mode='rt', encoding='iso-8859-1', newline='\n')
+                stats_file_id = xlib.open_gzip(stats_file, mode='rt', encoding='iso-8859-1', newline='\n')
             except Exception as e:
                 raise xlib.ProgramException('F002', stats_file)
         else:
@@ -660,7 +767,7 @@ def form_view_dataset_data_frecuency():
         # open the statistics file
         if stats_file.endswith('.gz'):
             try:
-                stats_file_id = gzip.open(stats_file, mode='rt', encoding='iso-8859-1', newline='\n')
+                stats_file_id = xlib.open_gzip(stats_file, mode='rt', encoding='iso-8859-1', newline='\n')
             except Exception as e:
                 raise xlib.ProgramException('F002', stats_file)
         else:
@@ -781,7 +888,7 @@ def form_view_phylogenic_data_frecuency(stats_code):
         # open the statistics file
         if stats_file.endswith('.gz'):
             try:
-                stats_file_id = gzip.open(stats_file, mode='rt', encoding='iso-8859-1', newline='\n')
+                stats_file_id = xlib.open_gzip(stats_file, mode='rt', encoding='iso-8859-1', newline='\n')
             except Exception as e:
                 raise xlib.ProgramException('F002', stats_file)
         else:
@@ -908,7 +1015,7 @@ def form_view_ontologic_data_frecuency(stats_code):
         # open the statistics file
         if stats_file.endswith('.gz'):
             try:
-                stats_file_id = gzip.open(stats_file, mode='rt', encoding='iso-8859-1', newline='\n')
+                stats_file_id = xlib.open_gzip(stats_file, mode='rt', encoding='iso-8859-1', newline='\n')
             except Exception as e:
                 raise xlib.ProgramException('F002', stats_file)
         else:
@@ -1023,7 +1130,7 @@ def form_view_go_data_frecuency():
         # open the statistics file
         if stats_file.endswith('.gz'):
             try:
-                stats_file_id = gzip.open(stats_file, mode='rt', encoding='iso-8859-1', newline='\n')
+                stats_file_id = xlib.open_gzip(stats_file, mode='rt', encoding='iso-8859-1', newline='\n')
             except Exception as e:
                 raise xlib.ProgramException('F002', stats_file)
         else:
@@ -24,11 +24,11 @@ This program extracts annotations of an annotation file.
 #-------------------------------------------------------------------------------
 
 import argparse
-import gzip
 import os
 import sys
 
 import xlib
+import xsqlite
 
 #-------------------------------------------------------------------------------
 
@@ -46,7 +46,7 @@ def main(argv):
     check_args(args)
 
     # extract annotations
-    extract_annotations(args.annotation_file, args.type, args.id_file, args.extract_file, args.stats_file)
+    extract_annotations(args.annotation_file, args.type, args.id_file, args.extract_file, args.stats_file, args.results_db)
 
 #-------------------------------------------------------------------------------
 
@@ -66,6 +66,7 @@ def build_parser():
     parser.add_argument('--id', dest='id_file', help='Path of the identification file in plane text (mandatory).')
     parser.add_argument('--extract', dest='extract_file', help='Path of extracted annotation file in CSV format (mandatory).')
     parser.add_argument('--stats', dest='stats_file', help='Path of statistics file in CSV format (mandatory).')
+    parser.add_argument('--results-db', dest='results_db', help='Path of the results database where the annotation file can be saved or NONE (when the annotation file is saved in it, the annotations are read from the database); default: NONE.')
     parser.add_argument('--verbose', dest='verbose', help=f'Additional job status info during the run: {xlib.get_verbose_code_list_text()}; default: {xlib.Const.DEFAULT_VERBOSE}.')
     parser.add_argument('--trace', dest='trace', help=f'Additional info useful to the developer team: {xlib.get_trace_code_list_text()}; default: {xlib.Const.DEFAULT_TRACE}.')
 
@@ -118,6 +119,12 @@ def check_args(args):
         xlib.Message.print('error', '*** The statistics file is not indicated in the input arguments.')
         OK = False
 
+    # check "results_db"
+    if args.results_db is None:
+        args.results_db = 'NONE'
+    elif args.results_db.upper() == 'NONE':
+        args.results_db = args.results_db.upper()
+
     # check "verbose"
     if args.verbose is None:
         args.verbose = xlib.Const.DEFAULT_VERBOSE
@@ -142,29 +149,33 @@ def check_args(args):
 
 #-------------------------------------------------------------------------------
 
-def extract_annotations(annotation_file, type, id_file, extract_file, stats_file):
+def extract_annotations(annotation_file, type, id_file, extract_file, stats_file, results_db):
     '''
     '''
 
     # get the identification data
     (id_list, id_dict) = get_id_data(id_file)
 
-    # open the annotation file
-    if annotation_file.endswith('.gz'):
-        try:
-            annotation_file_id = gzip.open(annotation_file, mode='rt', encoding='iso-8859-1')
-        except Exception as e:
-            raise xlib.ProgramException('F002', annotation_file)
-    else:
-        try:
-            annotation_file_id = open(annotation_file, mode='r', encoding='iso-8859-1')
-        except Exception as e:
-            raise xlib.ProgramException('F001', annotation_file)
+    # connect to the results database when the annotation file is saved in it
+    results_conn = xlib.connect_results_db(results_db, annotation_file)
+
+    # open the annotation file when it is not saved in the results database
+    if results_conn is None:
+        if annotation_file.endswith('.gz'):
+            try:
+                annotation_file_id = xlib.open_gzip(annotation_file, mode='rt', encoding='iso-8859-1')
+            except Exception as e:
+                raise xlib.ProgramException('F002', annotation_file)
+        else:
+            try:
+                annotation_file_id = open(annotation_file, mode='r', encoding='iso-8859-1')
+            except Exception as e:
+                raise xlib.ProgramException('F001', annotation_file)
 
     # open the extracted identification file
     if extract_file.endswith('.gz'):
         try:
-            extract_file_id = gzip.open(extract_file, mode='wt', encoding='iso-8859-1', newline='\n')
+            extract_file_id = xlib.open_gzip(extract_file, mode='wt', encoding='iso-8859-1', newline='\n')
         except Exception as e:
             raise xlib.ProgramException('F004', extract_file)
     else:
@@ -181,42 +192,64 @@ def extract_annotations(annotation_file, type, id_file, extract_file, stats_file
     xlib.write_annotation_header(extract_file_id, type)
     written_record_counter += 1
 
-    # read the first record of the annotation file (header)
-    read_record_counter += 1
-    (record, key, data_dict) = xlib.read_annotation_record(annotation_file, annotation_file_id, type, read_record_counter)
-    xlib.Message.print('trace', f'key: {key} - record: {record}')
+    # when the annotation file is saved in the results database, select only the annotations of the identifications
+    # (the rows are saved with the columns of the merged annotation files)
+    if results_conn is not None:
 
-    # while there are records
-    while record != '':
+        # initialize the annotation reader and the extracted annotation writer
+        annotation_reader = xlib.ResultsAnnotationReader(results_conn, annotation_file, xsqlite.get_annotations_rows_by_id(results_conn, xlib.get_results_annotation_file(annotation_file), id_list, get_extract_id))
+        extract_writer = xlib.AnnotationWriter(extract_file_id, 'MERGER', is_merged=True)
 
-        # get the identification of the current record
-        id = key
-
-        # this sentence block is only used in a particular case
-        if key.startswith('CUFF'):
-            first_dot_position = key.find('.')
-            second_dot_position = key.find('.', first_dot_position + 1)
-            id = key[:second_dot_position]
-        elif key.startswith('scaffold'):
-            id = key[:key.find(' ')]
-
-        # if the key is in the identification list
-        if id in id_list:
+        # write the selected annotations
+        for (record, key, data_dict) in annotation_reader:
+            xlib.Message.print('trace', f'key: {key} - record: {record}')
 
             # add 1 to the annotation counter of the identification
-            id_dict[id] += 1
+            id_dict[get_extract_id(key)] += 1
 
             # write in the extracted identification file
-            xlib.write_merged_annotation_record(extract_file_id, type, data_dict)
+            extract_writer.write(data_dict)
             written_record_counter += 1
+            xlib.Message.print('verbose', f'\rWritten annotations: {written_record_counter}')
 
-        xlib.Message.print('verbose', f'\rRead annotations: {read_record_counter} - Written annotations: {written_record_counter}')
+        # set the read record counter as when the annotation file is read (header, annotations and end of file)
+        read_record_counter = xsqlite.get_annotation_files_dict(results_conn, xlib.get_results_annotation_file(annotation_file))['record_number'] + 2
+
+    # otherwise, read every annotation of the annotation file
+    else:
 
-        # read the next record of the annotation file
+        # initialize the annotation reader and the extracted annotation writer
+        annotation_reader = xlib.AnnotationReader(annotation_file, annotation_file_id, type)
+        extract_writer = xlib.AnnotationWriter(extract_file_id, type, is_merged=True)
+
+        # read the first record of the annotation file (header)
         read_record_counter += 1
-        (record, key, data_dict) = xlib.read_annotation_record(annotation_file, annotation_file_id, type, read_record_counter)
+        (record, key, data_dict) = annotation_reader.read()
         xlib.Message.print('trace', f'key: {key} - record: {record}')
 
+        # while there are records
+        while record != '':
+
+            # get the identification of the current record
+            id = get_extract_id(key)
+
+            # if the key is in the identification list
+            if id in id_list:
+
+                # add 1 to the annotation counter of the identification
+                id_dict[id] += 1
+
+                # write in the extracted identification file
+                extract_writer.write(data_dict)
+                written_record_counter += 1
+
+            xlib.Message.print('verbose', f'\rRead annotations: {read_record_counter} - Written annotations: {written_record_counter}')
+
+            # read the next record of the annotation file
+            read_record_counter += 1
+            (record, key, data_dict) = annotation_reader.read()
+            xlib.Message.print('trace', f'key: {key} - record: {record}')
+
     xlib.Message.print('verbose', '\n')
 
     # print summary
@@ -224,7 +257,10 @@ def extract_annotations(annotation_file, type, id_file, extract_file, stats_file
     xlib.Message.print('info', f'{written_record_counter} annotations written in the extracted identification file.')
 
     # close files
-    annotation_file_id.close()
+    if results_conn is not None:
+        results_conn.close()
+    else:
+        annotation_file_id.close()
     extract_file_id.close()
 
     # write stats
@@ -232,6 +268,27 @@ def extract_annotations(annotation_file, type, id_file, extract_file, stats_file
 
 #-------------------------------------------------------------------------------
 
+def get_extract_id(key):
+    '''
+    Get the identification of an annotation key.
+    '''
+
+    # get the identification of the key
+    id = key
+
+    # this sentence block is only used in a particular case
+    if key.startswith('CUFF'):
+        first_dot_position = key.find('.')
+        second_dot_position = key.find('.', first_dot_position + 1)
+        id = key[:second_dot_position]
+    elif key.startswith('scaffold'):
+        id = key[:key.find(' ')]
+
+    # return the identification
+    return id
+
+#-------------------------------------------------------------------------------
+
 def get_id_data(id_file):
     '''
     '''
@@ -246,7 +303,7 @@ def get_id_data(id_file):
     # open the identification file
     if id_file.endswith('.gz'):
         try:
-            id_file_id = gzip.open(id_file, mode='rt', encoding='iso-8859-1')
+            id_file_id = xlib.open_gzip(id_file, mode='rt', encoding='iso-8859-1')
         except Exception as e:
             raise xlib.ProgramException('F002', id_file)
     else:
@@ -293,7 +350,7 @@ def write_stats(stats_file, id_list, id_dict):
     # open the statistics file
     if stats_file.endswith('.gz'):
         try:
-            stats_file_id = gzip.open(stats_file, mode='wt', encoding='iso-8859-1', newline='\n')
+            stats_file_id = xlib.open_gzip(stats_file, mode='wt', encoding='iso-8859-1', newline='\n')
         except Exception as e:
             raise xlib.ProgramException('F004', stats_file)
     else:
@@ -24,11 +24,11 @@ This program gets a file with Gene Ontology terms corresponding to each sequence
 #-------------------------------------------------------------------------------
 
 import argparse
-import gzip
 import os
 import sys
 
 import xlib
+import xsqlite
 
 #-------------------------------------------------------------------------------
 
@@ -46,7 +46,7 @@ def main(argv):
     check_args(args)
 
     # get Gene Ontology terms per sequence
-    get_go_terms(args.annotation_file, args.type, args.score_file, args.go_file)
+    get_go_terms(args.annotation_file, args.type, args.score_file, args.go_file, args.results_db)
 
 #-------------------------------------------------------------------------------
 
@@ -65,6 +65,7 @@ def build_parser():
     parser.add_argument('--type', dest='type', help=f'Type of the annotation file (mandatory): {xlib.get_type2_code_list_text()}.')
     parser.add_argument('--score', dest='score_file', help='Path of file with sequence scores in CSV format (mandatory).')
     parser.add_argument('--go', dest='go_file', help='Path of file with GO terms per sequence in CSV format (mandatory).')
+    parser.add_argument('--results-db', dest='results_db', help='Path of the results database where the annotation file can be saved or NONE (when the annotation file is saved in it, the annotations are read from the database); default: NONE.')
     parser.add_argument('--verbose', dest='verbose', help=f'Additional job status info during the run: {xlib.get_verbose_code_list_text()}; default: {xlib.Const.DEFAULT_VERBOSE}.')
     parser.add_argument('--trace', dest='trace', help=f'Additional info useful to the developer team: {xlib.get_trace_code_list_text()}; default: {xlib.Const.DEFAULT_TRACE}.')
 
@@ -112,6 +113,12 @@ def check_args(args):
         xlib.Message.print('error', '*** The file with GO terms per sequence is not indicated in the input arguments.')
         OK = False
 
+    # check "results_db"
+    if args.results_db is None:
+        args.results_db = 'NONE'
+    elif args.results_db.upper() == 'NONE':
+        args.results_db = args.results_db.upper()
+
     # check "verbose"
     if args.verbose is None:
         args.verbose = xlib.Const.DEFAULT_VERBOSE
@@ -135,7 +142,7 @@ def check_args(args):
 
 #-------------------------------------------------------------------------------
 
-def get_go_terms(annotation_file, type, score_file, go_file):
+def get_go_terms(annotation_file, type, score_file, go_file, results_db):
     '''
     '''
 
@@ -145,29 +152,35 @@ def get_go_terms(annotation_file, type, score_file, go_file):
     # get the score dictionary
     score_dict = get_score_dict(score_file)
 
-    # open the annotation file
-    if annotation_file.endswith('.gz'):
-        try:
-            annotation_file_id = gzip.open(annotation_file, mode='rt', encoding='iso-8859-1')
-        except Exception as e:
-            raise xlib.ProgramException('F002', annotation_file)
-    else:
-        try:
-            annotation_file_id = open(annotation_file, mode='r', encoding='iso-8859-1')
-        except Exception as e:
-            raise xlib.ProgramException('F001', annotation_file)
+    # connect to the results database when the annotation file is saved in it
+    results_conn = xlib.connect_results_db(results_db, annotation_file)
 
     # initialize record counters
     read_record_counter = 0
     written_record_counter = 0
 
-    # read the header and first data records of the annotation file
-    (record, key, data_dict) = xlib.read_annotation_record(annotation_file, annotation_file_id, type, read_record_counter)
-    (record, key, data_dict) = xlib.read_annotation_record(annotation_file, annotation_file_id, type, read_record_counter)
-    read_record_counter += 2
+    # when the annotation file is saved in the results database, initialize the reader of its rows with GO identifications
+    if results_conn is not None:
+        annotation_reader = xlib.ResultsAnnotationReader(results_conn, annotation_file, xsqlite.get_annotations_rows(results_conn, xlib.get_results_annotation_file(annotation_file), is_go_annotated=True))
 
-    # while there are records
-    while record != '':
+    # otherwise, open the annotation file, initialize the annotation reader and read the header record
+    else:
+        if annotation_file.endswith('.gz'):
+            try:
+                annotation_file_id = xlib.open_gzip(annotation_file, mode='rt', encoding='iso-8859-1')
+            except Exception as e:
+                raise xlib.ProgramException('F002', annotation_file)
+        else:
+            try:
+                annotation_file_id = open(annotation_file, mode='r', encoding='iso-8859-1')
+            except Exception as e:
+                raise xlib.ProgramException('F001', annotation_file)
+        annotation_reader = xlib.AnnotationReader(annotation_file, annotation_file_id, type)
+        annotation_reader.read()
+        read_record_counter += 1
+
+    # for each data record of the annotation file
+    for (record, key, data_dict) in annotation_reader:
 
         # extract the GO identifications and add them into the GO identifications list of the sequence.
         # go_id format: "go_id1|||go_id2|||...|||go_idn"
@@ -188,20 +201,22 @@ def get_go_terms(annotation_file, type, score_file, go_file):
                 go_id_list.append(go_id)
             seq_id_dict[key] = go_id_list
 
-        # read the next record of the annotation file
-        (record, key, data_dict) = xlib.read_annotation_record(annotation_file, annotation_file_id, type, read_record_counter)
+        # add 1 to the read record counter
         read_record_counter += 1
         xlib.Message.print('verbose', f'\rRead annotations: {read_record_counter}')
 
     xlib.Message.print('verbose', '\n')
 
-    # close file
-    annotation_file_id.close()
+    # close the annotation file or the connection to the results database
+    if results_conn is not None:
+        results_conn.close()
+    else:
+        annotation_file_id.close()
 
     # open the Gene Ontology term file
     if go_file.endswith('.gz'):
         try:
-            go_file_id = gzip.open(go_file, mode='wt', encoding='iso-8859-1', newline='\n')
+            go_file_id = xlib.open_gzip(go_file, mode='wt', encoding='iso-8859-1', newline='\n')
         except Exception as e:
             raise xlib.ProgramException('F004', go_file)
     else:
@@ -241,7 +256,7 @@ def get_score_dict(score_file):
     # open the score file
     if score_file.endswith('.gz'):
         try:
-            score_file_id = gzip.open(score_file, mode='rt', encoding='iso-8859-1')
+            score_file_id = xlib.open_gzip(score_file, mode='rt', encoding='iso-8859-1')
         except Exception as e:
             raise xlib.ProgramException('F002', score_file)
     else:
@@ -266,6 +266,7 @@ class Main():
         self.menu_toa_nucleotide_pipeline.add_separator()
         self.menu_toa_nucleotide_pipeline.add_command(label='Run pipeline', command=self.run_nucleotide_pipeline_process)
         self.menu_toa_nucleotide_pipeline.add_command(label='Restart pipeline', command=self.restart_nucleotide_pipeline_process)
+        self.menu_toa_nucleotide_pipeline.add_command(label='Re-annotate pipeline run', command=self.reannotate_nucleotide_pipeline_process)
 
         # create "menu_toa_aminoacid_pipeline" and add its menu items
         self.menu_toa_aminoacid_pipeline = tkinter.Menu(self.menu_bar, tearoff=0)
@@ -274,6 +275,7 @@ class Main():
         self.menu_toa_aminoacid_pipeline.add_separator()
         self.menu_toa_aminoacid_pipeline.add_command(label='Run pipeline', command=self.run_aminoacid_pipeline_process)
         self.menu_toa_aminoacid_pipeline.add_command(label='Restart pipeline', command=self.restart_aminoacid_pipeline_process)
+        self.menu_toa_aminoacid_pipeline.add_command(label='Re-annotate pipeline run', command=self.reannotate_aminoacid_pipeline_process)
 
         # create "menu_toa_annotation_merger" and add its menu items
         self.menu_toa_annotation_merger = tkinter.Menu(self.menu_bar, tearoff=0)
@@ -288,6 +290,8 @@ class Main():
         self.menu_toa_pipelines.add_cascade(label=f'{xlib.get_toa_name()} {xlib.get_toa_process_pipeline_aminoacid_name()}', menu=self.menu_toa_aminoacid_pipeline)
         self.menu_toa_pipelines.add_separator()
         self.menu_toa_pipelines.add_cascade(label=f'Annotation merger of {xlib.get_toa_name()} pipelines', menu=self.menu_toa_annotation_merger)
+        self.menu_toa_pipelines.add_separator()
+        self.menu_toa_pipelines.add_command(label='Run metrics', command=self.view_pipeline_metrics)
 
         # link "menu_toa_pipelines" to "menu_bar"
         self.menu_bar.add_cascade(label='Annotation pipelines', menu=self.menu_toa_pipelines)
@@ -1418,6 +1422,27 @@ class Main():
 
     #---------------
 
+    def reannotate_nucleotide_pipeline_process(self):
+        '''
+        Annotate again a nucleotide pipeline run without aligning again its sequences.
+        '''
+
+        # close the current form
+        self.close_current_form()
+
+        # create and register "form_reannotate_nucleotide_pipeline_process" in "container" with the grid geometry manager
+        form_reannotate_nucleotide_pipeline_process = gtoa.FormReannotatePipelineProcess(self, pipeline_type=xlib.get_toa_process_pipeline_nucleotide_code())
+        form_reannotate_nucleotide_pipeline_process.grid(row=0, column=0, sticky='nsew')
+
+        # set "form_reannotate_nucleotide_pipeline_process" as current form and add it in the forms dictionary
+        self.current_form = 'form_reannotate_nucleotide_pipeline_process'
+        self.forms_dict[self.current_form] = form_reannotate_nucleotide_pipeline_process
+
+        # raise "form_reannotate_nucleotide_pipeline_process" to front
+        form_reannotate_nucleotide_pipeline_process.tkraise()
+
+    #---------------
+
     def recreate_aminoacid_pipeline_config_file(self):
         '''
         Recreate the amino acid pipeline config file with the default options. It is necessary
@@ -1513,6 +1538,27 @@ class Main():
 
     #---------------
 
+    def reannotate_aminoacid_pipeline_process(self):
+        '''
+        Annotate again a amino acid pipeline run without aligning again its sequences.
+        '''
+
+        # close the current form
+        self.close_current_form()
+
+        # create and register "form_reannotate_aminoacid_pipeline_process" in "container" with the grid geometry manager
+        form_reannotate_aminoacid_pipeline_process = gtoa.FormReannotatePipelineProcess(self, pipeline_type=xlib.get_toa_process_pipeline_aminoacid_code())
+        form_reannotate_aminoacid_pipeline_process.grid(row=0, column=0, sticky='nsew')
+
+        # set "form_reannotate_aminoacid_pipeline_process" as current form and add it in the forms dictionary
+        self.current_form = 'form_reannotate_aminoacid_pipeline_process'
+        self.forms_dict[self.current_form] = form_reannotate_aminoacid_pipeline_process
+
+        # raise "form_reannotate_aminoacid_pipeline_process" to front
+        form_reannotate_aminoacid_pipeline_process.tkraise()
+
+    #---------------
+
     def recreate_annotation_merger_config_file(self):
         '''
         Recreate the pipeline merger config file with the default options. It is necessary
@@ -1587,6 +1633,26 @@ class Main():
 
     #---------------
 
+    def view_pipeline_metrics(self):
+        '''
+        View the resources used by the steps of annotation pipeline runs.
+        '''
+
+        # close the current form
+        self.close_current_form()
+
+        # create and register "form_view_pipeline_metrics" in "container" with the grid geometry manager
+        form_view_pipeline_metrics = gtoa.FormViewPipelineMetrics(self)
+        form_view_pipeline_metrics.grid(row=0, column=0, sticky='nsew')
+
+        # set "form_view_pipeline_metrics" as current form and add it in the forms dictionary
+        self.current_form = 'form_view_pipeline_metrics'
+        self.forms_dict[self.current_form] = form_view_pipeline_metrics
+
+        # raise "form_view_pipeline_metrics" to front
+        form_view_pipeline_metrics.tkraise()
+    #---------------
+
     def view_hit_per_hsp_data(self):
         '''
         View the # HITs per # HSPs data of an annotation pipeline.
@@ -24,7 +24,6 @@ menu items in gui mode.
 
 #-------------------------------------------------------------------------------
 
-import gzip
 import matplotlib
 import os
 import pandas
@@ -1889,6 +1888,485 @@ class FormRestartPipelineProcess(tkinter.Frame):
 
 #-------------------------------------------------------------------------------
 
+class FormReannotatePipelineProcess(tkinter.Frame):
+
+    #---------------
+
+    def __init__(self, main, pipeline_type):
+        '''
+        Execute actions correspending to the creation of a "FormReannotatePipelineProcess" instance.
+        '''
+
+        # save initial parameters in instance variables
+        self.main = main
+        self.root = main.root
+        self.container = main.container
+        self.pipeline_type = pipeline_type
+
+        # call the init method of the parent class
+        tkinter.Frame.__init__(self, self.container)
+
+        # set cursor to show busy status
+        self.root.config(cursor='watch')
+        self.root.update()
+
+        # set the name
+        if self.pipeline_type == xlib.get_toa_process_pipeline_nucleotide_code():
+            self.name = xlib.get_toa_process_pipeline_nucleotide_name()
+        elif self.pipeline_type == xlib.get_toa_process_pipeline_aminoacid_code():
+            self.name = xlib.get_toa_process_pipeline_aminoacid_name()
+
+        # assign the text of the "head"
+        self.head = f'{self.name} - Re-annotate run'
+
+        # create the wrappers to track changes in the inputs
+        self.wrapper_process_type = tkinter.StringVar()
+        self.wrapper_process_type.trace('w', self.check_inputs)
+        self.wrapper_pipeline_dataset = tkinter.StringVar()
+        self.wrapper_pipeline_dataset.trace('w', self.check_inputs)
+        self.wrapper_changed_only = tkinter.StringVar()
+        self.wrapper_changed_only.trace('w', self.check_inputs)
+
+        # build the graphical user interface
+        self.build_gui()
+
+        # load initial data in inputs
+        self.initialize_inputs()
+
+        # set cursor to show normal status
+        self.root.config(cursor='')
+        self.root.update()
+
+    #---------------
+
+    def build_gui(self):
+        '''
+        Build the graphical user interface of "FormReannotatePipelineProcess".
+        '''
+
+        # assign the text to the label of the current process name
+        self.main.label_process['text'] = self.head
+
+        # create "label_process_type" and register it with the grid geometry manager
+        self.label_process_type = tkinter.Label(self, text='Process type')
+        self.label_process_type.grid(row=0, column=0, padx=(15,5), pady=(75,5), sticky='e')
+
+        # create "combobox_process_type" and register it with the grid geometry manager
+        self.combobox_process_type = tkinter.ttk.Combobox(self, width=30, height=4, state='readonly', textvariable=self.wrapper_process_type)
+        self.combobox_process_type.grid(row=0, column=1, padx=(5,5), pady=(75,5), sticky='w')
+
+        # create "label_pipeline_dataset" and register it with the grid geometry manager
+        self.label_pipeline_dataset = tkinter.Label(self, text='Pipeline dataset')
+        self.label_pipeline_dataset.grid(row=1, column=0, padx=(15,5), pady=(45,5), sticky='e')
+
+        # create "combobox_pipeline_dataset" and register it with the grid geometry manager
+        self.combobox_pipeline_dataset = tkinter.ttk.Combobox(self, width=45, height=4, state='readonly', textvariable=self.wrapper_pipeline_dataset)
+        self.combobox_pipeline_dataset.grid(row=1, column=1, padx=(5,5), pady=(45,5), sticky='w')
+
+        # create "label_changed_only" and register it with the grid geometry manager
+        self.label_changed_only = tkinter.Label(self, text='Only sequences with changed reference data')
+        self.label_changed_only.grid(row=2, column=0, padx=(15,5), pady=(45,5), sticky='e')
+
+        # create "combobox_changed_only" and register it with the grid geometry manager
+        self.combobox_changed_only = tkinter.ttk.Combobox(self, width=5, height=4, state='readonly', textvariable=self.wrapper_changed_only)
+        self.combobox_changed_only.grid(row=2, column=1, padx=(5,5), pady=(45,5), sticky='w')
+
+        # create "label_fit" and register it with the grid geometry manager
+        self.label_fit = tkinter.Label(self, text=' '*40)
+        self.label_fit.grid(row=3, column=2, padx=(0,0), pady=(45,5), sticky='e')
+
+        # create "button_execute" and register it with the grid geometry manager
+        self.button_execute = tkinter.ttk.Button(self, text='Execute', command=self.execute, state='disabled')
+        self.button_execute.grid(row=3, column=3, padx=(5,5), pady=(45,5), sticky='e')
+
+        # create "button_close" and register it with the grid geometry manager
+        self.button_close = tkinter.ttk.Button(self, text='Close', command=self.close)
+        self.button_close.grid(row=3, column=4, padx=(5,5), pady=(45,5), sticky='w')
+
+        # link a handler to events
+        self.combobox_process_type.bind('<<ComboboxSelected>>', self.combobox_process_type_selected_item)
+        self.combobox_pipeline_dataset.bind('<<ComboboxSelected>>', self.combobox_pipeline_dataset_selected_item)
+        self.root.bind('<Return>', self.execute)
+
+    #---------------
+
+    def initialize_inputs(self):
+        '''
+        Load initial data in inputs.
+        '''
+
+        # load initial data in inputs
+        self.combobox_process_type['values'] = []
+        self.wrapper_process_type.set('')
+        self.combobox_pipeline_dataset['values'] = []
+        self.wrapper_pipeline_dataset.set('')
+        self.combobox_changed_only['values'] = ['Y', 'N']
+        self.wrapper_changed_only.set('Y')
+
+        # populate data in comboboxes
+        self.populate_combobox_process_type()
+
+    #---------------
+
+    def populate_combobox_process_type(self):
+        '''
+        Populate data in "combobox_process_type".
+        '''
+
+        # clear the value selected in the combobox
+        self.wrapper_process_type.set('')
+
+        # set the process type list
+        process_type_list = [xlib.get_toa_result_pipeline_dir()]
+
+        # load the process type list in the combobox
+        self.combobox_process_type['values'] = sorted(process_type_list)
+
+    #---------------
+
+    def populate_combobox_pipeline_dataset(self):
+        '''
+        Populate data in "combobox_pipeline_dataset".
+        '''
+
+        # clear the value selected in the combobox
+        self.wrapper_pipeline_dataset.set('')
+
+        # get the dictionary of TOA configuration.
+        toa_config_dict = xtoa.get_toa_config_dict()
+
+        # initialize the pipeline dataset name list
+        pipeline_dataset_name_list = []
+
+        # get the result dataset identifications of the process type
+        pipeline_dir = f'{toa_config_dict["RESULT_DIR"]}/{xlib.get_toa_result_pipeline_dir()}'
+        subdir_list = [subdir for subdir in os.listdir(pipeline_dir) if os.path.isdir(os.path.join(pipeline_dir, subdir))]
+        for subdir in subdir_list:
+            if subdir.startswith(self.pipeline_type):
+                if subdir.startswith(xlib.get_toa_process_pipeline_nucleotide_code()) or subdir.startswith(xlib.get_toa_process_pipeline_aminoacid_code()):
+                    pipeline_dataset_name_list.append(subdir)
+
+        # load the pipeline dataset names in the combobox
+        self.combobox_pipeline_dataset['values'] = sorted(pipeline_dataset_name_list)
+
+    #---------------
+
+    def combobox_process_type_selected_item(self, event=None):
+        '''
+        Process the event when an item of "combobox_process_type" has been selected.
+        '''
+
+        # set cursor to show busy status
+        self.root.config(cursor='watch')
+        self.root.update()
+
+        # load data in "combobox_pipeline_dataset"
+        self.populate_combobox_pipeline_dataset()
+
+        # set cursor to show normal status
+        self.root.config(cursor='')
+        self.root.update()
+
+    #---------------
+
+    def combobox_pipeline_dataset_selected_item(self, event=None):
+        '''
+        Process the event when an item of "combobox_pipeline_dataset" has been selected.
+        '''
+
+        pass
+
+    #---------------
+
+    def check_inputs(self, *args):
+        '''
+        Check the content of each input of "FormReannotatePipelineProcess" and do the actions linked to its value.
+        '''
+
+        # initialize the control variable
+        OK = True
+
+        # check if "button_execute" has to be enabled or disabled
+        if self.wrapper_process_type.get() != ''  and self.wrapper_pipeline_dataset.get() != '' and self.wrapper_changed_only.get() != '':
+            self.button_execute['state'] = 'enable'
+        else:
+            self.button_execute['state'] = 'disabled'
+
+        # return the control variable
+        return OK
+
+    #---------------
+
+    def execute(self, event=None):
+        '''
+        Annotate again the pipeline run.
+        '''
+
+        # if "button_execute" is disabled, exit function
+        if str(self.button_execute['state']) == 'disabled':
+            return
+
+        # check inputs
+        OK = self.check_inputs()
+        if not OK:
+            message = 'Some input values are not OK.'
+            tkinter.messagebox.showerror(f'{xlib.get_short_project_name()} - {self.head}', message)
+
+        # confirm the process run
+        if OK:
+            message = f'The pipeline run {self.wrapper_pipeline_dataset.get()} is going to be annotated again.\n\nAre you sure to continue?'
+            OK = tkinter.messagebox.askyesno(f'{xlib.get_short_project_name()} - {self.head}', message)
+
+        # execute the process
+        if OK:
+
+            dialog_log = gdialogs.DialogLog(self, self.head, xtoa.reannotate_pipeline_process.__name__)
+            threading.Thread(target=self.wait_window, args=(dialog_log,)).start()
+            threading.Thread(target=xtoa.reannotate_pipeline_process, args=(self.pipeline_type, self.wrapper_pipeline_dataset.get(), self.wrapper_changed_only.get(), dialog_log, lambda: dialog_log.enable_button_close())).start()
+
+        # close the form
+        if OK:
+            self.close()
+
+    #---------------
+
+    def close(self):
+        '''
+        Close "FormReannotatePipelineProcess".
+        '''
+
+        # clear the label of the current process name
+        self.main.label_process['text'] = ''
+
+        # close the current form
+        self.main.close_current_form()
+
+    #---------------
+
+#-------------------------------------------------------------------------------
+
+class FormViewPipelineMetrics(tkinter.Frame):
+
+    #---------------
+
+    def __init__(self, main):
+        '''
+        Execute actions correspending to the creation of a "FormViewPipelineMetrics" instance.
+        '''
+
+        # save initial parameters in instance variables
+        self.main = main
+        self.root = main.root
+        self.container = main.container
+
+        # call the init method of the parent class
+        tkinter.Frame.__init__(self, self.container)
+
+        # set cursor to show busy status
+        self.root.config(cursor='watch')
+        self.root.update()
+
+        # assign the text of the "name"
+        self.name = 'Run metrics'
+
+        # assign the text of the "head"
+        self.head = f'Pipelines - {self.name}'
+
+        # create the wrappers to track changes in the inputs
+        self.wrapper_pipeline_dataset = tkinter.StringVar()
+        self.wrapper_pipeline_dataset.trace('w', self.check_inputs)
+        self.wrapper_pipeline_dataset2 = tkinter.StringVar()
+        self.wrapper_pipeline_dataset2.trace('w', self.check_inputs)
+        self.wrapper_pipeline_metrics_group = tkinter.StringVar()
+        self.wrapper_pipeline_metrics_group.trace('w', self.check_inputs)
+
+        # build the graphical user interface
+        self.build_gui()
+
+        # load initial data in inputs
+        self.initialize_inputs()
+
+        # set cursor to show normal status
+        self.root.config(cursor='')
+        self.root.update()
+
+    #---------------
+
+    def build_gui(self):
+        '''
+        Build the graphical user interface of "FormViewPipelineMetrics".
+        '''
+
+        # assign the text to the label of the current process name
+        self.main.label_process['text'] = self.head
+
+        # create "label_pipeline_dataset" and register it with the grid geometry manager
+        self.label_pipeline_dataset = tkinter.Label(self, text='Pipeline dataset')
+        self.label_pipeline_dataset.grid(row=0, column=0, padx=(15,5), pady=(75,5), sticky='e')
+
+        # create "combobox_pipeline_dataset" and register it with the grid geometry manager
+        self.combobox_pipeline_dataset = tkinter.ttk.Combobox(self, width=45, height=4, state='readonly', textvariable=self.wrapper_pipeline_dataset)
+        self.combobox_pipeline_dataset.grid(row=0, column=1, padx=(5,5), pady=(75,5), sticky='w')
+
+        # create "label_pipeline_dataset2" and register it with the grid geometry manager
+        self.label_pipeline_dataset2 = tkinter.Label(self, text='Compared pipeline dataset')
+        self.label_pipeline_dataset2.grid(row=1, column=0, padx=(15,5), pady=(45,5), sticky='e')
+
+        # create "combobox_pipeline_dataset2" and register it with the grid geometry manager
+        self.combobox_pipeline_dataset2 = tkinter.ttk.Combobox(self, width=45, height=4, state='readonly', textvariable=self.wrapper_pipeline_dataset2)
+        self.combobox_pipeline_dataset2.grid(row=1, column=1, padx=(5,5), pady=(45,5), sticky='w')
+
+        # create "label_pipeline_metrics_group" and register it with the grid geometry manager
+        self.label_pipeline_metrics_group = tkinter.Label(self, text='Grouping of steps')
+        self.label_pipeline_metrics_group.grid(row=2, column=0, padx=(15,5), pady=(45,5), sticky='e')
+
+        # create "combobox_pipeline_metrics_group" and register it with the grid geometry manager
+        self.combobox_pipeline_metrics_group = tkinter.ttk.Combobox(self, width=15, height=4, state='readonly', textvariable=self.wrapper_pipeline_metrics_group)
+        self.combobox_pipeline_metrics_group.grid(row=2, column=1, padx=(5,5), pady=(45,5), sticky='w')
+
+        # create "label_fit" and register it with the grid geometry manager
+        self.label_fit = tkinter.Label(self, text=' '*40)
+        self.label_fit.grid(row=3, column=2, padx=(0,0), pady=(45,5), sticky='e')
+
+        # create "button_execute" and register it with the grid geometry manager
+        self.button_execute = tkinter.ttk.Button(self, text='Execute', command=self.execute, state='disabled')
+        self.button_execute.grid(row=3, column=3, padx=(5,5), pady=(45,5), sticky='e')
+
+        # create "button_close" and register it with the grid geometry manager
+        self.button_close = tkinter.ttk.Button(self, text='Close', command=self.close)
+        self.button_close.grid(row=3, column=4, padx=(5,5), pady=(45,5), sticky='w')
+
+        # link a handler to events
+        self.root.bind('<Return>', self.execute)
+
+    #---------------
+
+    def initialize_inputs(self):
+        '''
+        Load initial data in inputs.
+        '''
+
+        # load initial data in inputs
+        self.combobox_pipeline_dataset['values'] = []
+        self.wrapper_pipeline_dataset.set('')
+        self.combobox_pipeline_dataset2['values'] = []
+        self.wrapper_pipeline_dataset2.set('')
+        self.combobox_pipeline_metrics_group['values'] = xlib.get_pipeline_metrics_group_code_list()
+        self.wrapper_pipeline_metrics_group.set('KIND')
+
+        # populate data in comboboxes
+        self.populate_combobox_pipeline_dataset()
+
+    #---------------
+
+    def populate_combobox_pipeline_dataset(self):
+        '''
+        Populate data in "combobox_pipeline_dataset" and "combobox_pipeline_dataset2".
+        '''
+
+        # get the dictionary of TOA configuration.
+        toa_config_dict = xtoa.get_toa_config_dict()
+
+        # initialize the pipeline dataset name list
+        pipeline_dataset_name_list = []
+
+        # get the result dataset identifications of the pipelines with metrics data
+        pipeline_dir = f'{toa_config_dict["RESULT_DIR"]}/{xlib.get_toa_result_pipeline_dir()}'
+        subdir_list = [subdir for subdir in os.listdir(pipeline_dir) if os.path.isdir(os.path.join(pipeline_dir, subdir))]
+        for subdir in subdir_list:
+            if subdir.startswith(xlib.get_toa_process_pipeline_nucleotide_code()) or subdir.startswith(xlib.get_toa_process_pipeline_aminoacid_code()):
+                if os.path.isfile(xlib.get_pipeline_metrics_file(os.path.join(pipeline_dir, subdir))):
+                    pipeline_dataset_name_list.append(subdir)
+
+        # load the pipeline dataset names in the comboboxes (the compared pipeline dataset is optional)
+        self.combobox_pipeline_dataset['values'] = sorted(pipeline_dataset_name_list)
+        self.combobox_pipeline_dataset2['values'] = ['NONE'] + sorted(pipeline_dataset_name_list)
+        self.wrapper_pipeline_dataset2.set('NONE')
+
+    #---------------
+
+    def check_inputs(self, *args):
+        '''
+        Check the content of each input of "FormViewPipelineMetrics" and do the actions linked to its value.
+        '''
+
+        # initialize the control variable
+        OK = True
+
+        # check if "button_execute" has to be enabled or disabled
+        if self.wrapper_pipeline_dataset.get() != '' and self.wrapper_pipeline_dataset2.get() != '' and self.wrapper_pipeline_metrics_group.get() != '':
+            self.button_execute['state'] = 'enable'
+        else:
+            self.button_execute['state'] = 'disabled'
+
+        # return the control variable
+        return OK
+
+    #---------------
+
+    def execute(self, event=None):
+        '''
+        Show the resources used by the steps of the pipeline runs.
+        '''
+
+        # if "button_execute" is disabled, exit function
+        if str(self.button_execute['state']) == 'disabled':
+            return
+
+        # check inputs
+        OK = self.check_inputs()
+        if not OK:
+            message = 'Some input values are not OK.'
+            tkinter.messagebox.showerror(f'{xlib.get_short_project_name()} - {self.head}', message)
+
+        # get the run directory list
+        if OK:
+            toa_config_dict = xtoa.get_toa_config_dict()
+            pipeline_dir = f'{toa_config_dict["RESULT_DIR"]}/{xlib.get_toa_result_pipeline_dir()}'
+            run_dir_list = [f'{pipeline_dir}/{self.wrapper_pipeline_dataset.get()}']
+            if self.wrapper_pipeline_dataset2.get() != 'NONE':
+                run_dir_list.append(f'{pipeline_dir}/{self.wrapper_pipeline_dataset2.get()}')
+
+        # get the metrics table
+        if OK:
+            (header_list, row_list) = xlib.get_pipeline_metrics_table(run_dir_list, self.wrapper_pipeline_metrics_group.get())
+
+        # build the data list, the data dictionary and the item dictionary
+        if OK:
+            data_list = [f'column_{i}' for i in range(len(header_list))]
+            data_dict = {}
+            for i in range(len(header_list)):
+                data_dict[f'column_{i}'] = {'text': header_list[i], 'width': 300 if i == 0 else 150, 'alignment': 'left' if i == 0 else 'right'}
+            item_dict = {}
+            for j in range(len(row_list)):
+                item_dict[j] = {f'column_{i}': row_list[j][i] for i in range(len(header_list))}
+
+        # create the dialog Table to show the metrics
+        if OK:
+            dialog_table = gdialogs.DialogTable(self, self.name, 400, 900, data_list, data_dict, item_dict, sorted(item_dict.keys()))
+            self.wait_window(dialog_table)
+
+        # close the form
+        if OK:
+            self.close()
+
+    #---------------
+
+    def close(self):
+        '''
+        Close "FormViewPipelineMetrics".
+        '''
+
+        # clear the label of the current process name
+        self.main.label_process['text'] = ''
+
+        # close the current form
+        self.main.close_current_form()
+
+    #---------------
+
+#-------------------------------------------------------------------------------
+
 class FormViewStats(tkinter.Frame):
 
     #---------------
@@ -2175,7 +2653,7 @@ class FormViewStats(tkinter.Frame):
         # open the statistics file
         if stats_file.endswith('.gz'):
             try:
-                stats_file_id = gzip.open(stats_file, mode='rt', encoding='iso-8859-1', newline='\n')
+                stats_file_id = xlib.open_gzip(stats_file, mode='rt', encoding='iso-8859-1', newline='\n')
             except Exception as e:
                 raise xlib.ProgramException('F002', stats_file)
         else:
@@ -2288,7 +2766,7 @@ class FormViewStats(tkinter.Frame):
         # open the statistics file
         if stats_file.endswith('.gz'):
             try:
-                stats_file_id = gzip.open(stats_file, mode='rt', encoding='iso-8859-1', newline='\n')
+                stats_file_id = xlib.open_gzip(stats_file, mode='rt', encoding='iso-8859-1', newline='\n')
             except Exception as e:
                 raise xlib.ProgramException('F002', stats_file)
         else:
@@ -2384,7 +2862,7 @@ class FormViewStats(tkinter.Frame):
         # open the statistics file
         if stats_file.endswith('.gz'):
             try:
-                stats_file_id = gzip.open(stats_file, mode='rt', encoding='iso-8859-1', newline='\n')
+                stats_file_id = xlib.open_gzip(stats_file, mode='rt', encoding='iso-8859-1', newline='\n')
             except Exception as e:
                 raise xlib.ProgramException('F002', stats_file)
         else:
@@ -2482,7 +2960,7 @@ class FormViewStats(tkinter.Frame):
         # open the statistics file
         if stats_file.endswith('.gz'):
             try:
-                stats_file_id = gzip.open(stats_file, mode='rt', encoding='iso-8859-1', newline='\n')
+                stats_file_id = xlib.open_gzip(stats_file, mode='rt', encoding='iso-8859-1', newline='\n')
             except Exception as e:
                 raise xlib.ProgramException('F002', stats_file)
         else:
@@ -2582,7 +3060,7 @@ class FormViewStats(tkinter.Frame):
         # open the statistics file
         if stats_file.endswith('.gz'):
             try:
-                stats_file_id = gzip.open(stats_file, mode='rt', encoding='iso-8859-1', newline='\n')
+                stats_file_id = xlib.open_gzip(stats_file, mode='rt', encoding='iso-8859-1', newline='\n')
             except Exception as e:
                 raise xlib.ProgramException('F002', stats_file)
         else:
@@ -3215,7 +3693,7 @@ class FormPlotStats(tkinter.Frame):
         # open the statistics file
         if stats_file.endswith('.gz'):
             try:
-                stats_file_id = gzip.open(stats_file, mode='rt', encoding='iso-8859-1', newline='\n')
+                stats_file_id = xlib.open_gzip(stats_file, mode='rt', encoding='iso-8859-1', newline='\n')
             except Exception as e:
                 raise xlib.ProgramException('F002', stats_file)
         else:
@@ -3348,7 +3826,7 @@ class FormPlotStats(tkinter.Frame):
         # open the statistics file
         if stats_file.endswith('.gz'):
             try:
-                stats_file_id = gzip.open(stats_file, mode='rt', encoding='iso-8859-1', newline='\n')
+                stats_file_id = xlib.open_gzip(stats_file, mode='rt', encoding='iso-8859-1', newline='\n')
             except Exception as e:
                 raise xlib.ProgramException('F002', stats_file)
         else:
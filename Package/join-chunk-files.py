@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+#-------------------------------------------------------------------------------
+
+'''
+This software has been developed by:
+
+    GI Sistemas Naturales e Historia Forestal (formerly known as GI Genetica, Fisiologia e Historia Forestal)
+    Dpto. Sistemas y Recursos Naturales
+    ETSI Montes, Forestal y del Medio Natural
+    Universidad Politecnica de Madrid
+    https://github.com/ggfhf/
+
+Licence: GNU General Public Licence Version 3.
+'''
+
+#-------------------------------------------------------------------------------
+
+'''
+This program joins the chunk files (file path + ".chunkN") of a file written in the chunked mode of the pipeline
+processes in the file: the annotation files are merged by the merge key and the rest of files are concatenated
+in the chunk order.
+'''
+
+#-------------------------------------------------------------------------------
+
+import argparse
+import os
+import shutil
+import sys
+
+import xlib
+
+#-------------------------------------------------------------------------------
+
+def main(argv):
+    '''
+    Main line of the program.
+    '''
+
+    # check the operating system
+    xlib.check_os()
+
+    # get and check the arguments
+    parser = build_parser()
+    args = parser.parse_args()
+    check_args(args)
+
+    # get the chunk file list
+    chunk_file_list = [xlib.get_chunk_file(args.file, i + 1) for i in range(args.chunk_number)]
+
+    # join the annotation chunk files
+    if args.chunk_file_format == 'ANNOTATION':
+        join_annotation_files(chunk_file_list, args.file, args.results_db)
+
+    # join the rest of chunk files
+    else:
+        concatenate_files(chunk_file_list, args.file, is_header=(args.chunk_file_format == 'CSV'))
+
+#-------------------------------------------------------------------------------
+
+def build_parser():
+    '''
+    Build the parser with the available arguments.
+    '''
+
+    # create the parser and add arguments
+    description = 'Description: This program joins the chunk files of a file written in the chunked mode of the pipeline processes.'
+    text = f'{xlib.get_long_project_name()} v{xlib.get_project_version()} - {os.path.basename(__file__)}\n\n{description}\n'
+    usage = f'\r{text.ljust(len("usage:"))}\nUsage: {os.path.basename(__file__)} arguments'
+    parser = argparse.ArgumentParser(usage=usage)
+    parser._optionals.title = 'Arguments'
+    parser.add_argument('--file', dest='file', help='Path of the joined file; the chunk files are this path + ".chunkN" (mandatory).')
+    parser.add_argument('--chunks', dest='chunk_number', help='Number of chunk files (mandatory).')
+    parser.add_argument('--format', dest='chunk_file_format', help=f'Format of the chunk files (mandatory): {xlib.get_chunk_file_format_code_list_text()}.')
+    parser.add_argument('--results-db', dest='results_db', help='Path of the results database where the joined annotation file is also saved or NONE; default: NONE.')
+    parser.add_argument('--verbose', dest='verbose', help=f'Additional job status info during the run: {xlib.get_verbose_code_list_text()}; default: {xlib.Const.DEFAULT_VERBOSE}.')
+    parser.add_argument('--trace', dest='trace', help=f'Additional info useful to the developer team: {xlib.get_trace_code_list_text()}; default: {xlib.Const.DEFAULT_TRACE}.')
+
+    # return the paser
+    return parser
+
+#-------------------------------------------------------------------------------
+
+def check_args(args):
+    '''
+    Check the input arguments.
+    '''
+
+    # initialize the control variable
+    OK = True
+
+    # check "file"
+    if args.file is None:
+        xlib.Message.print('error', '*** The joined file is not indicated in the input arguments.')
+        OK = False
+
+    # check "chunk_number"
+    if args.chunk_number is None:
+        xlib.Message.print('error', '*** The number of chunk files is not indicated in the input arguments.')
+        OK = False
+    elif not xlib.check_int(args.chunk_number, minimum=1):
+        xlib.Message.print('error', '*** The number of chunk files has to be an integer number greater than 0.')
+        OK = False
+    else:
+        args.chunk_number = int(args.chunk_number)
+        if args.file is not None:
+            for i in range(args.chunk_number):
+                if not os.path.isfile(xlib.get_chunk_file(args.file, i + 1)):
+                    xlib.Message.print('error', f'*** The file {xlib.get_chunk_file(args.file, i + 1)} does not exist.')
+                    OK = False
+
+    # check "chunk_file_format"
+    if args.chunk_file_format is None:
+        xlib.Message.print('error', '*** The format of the chunk files is not indicated in the input arguments.')
+        OK = False
+    elif not xlib.check_code(args.chunk_file_format, xlib.get_chunk_file_format_code_list(), case_sensitive=False):
+        xlib.Message.print('error', f'*** The format of the chunk files has to be {xlib.get_chunk_file_format_code_list_text()}.')
+        OK = False
+    else:
+        args.chunk_file_format = args.chunk_file_format.upper()
+
+    # check "results_db"
+    if args.results_db is None:
+        args.results_db = 'NONE'
+    elif args.results_db.upper() == 'NONE':
+        args.results_db = 'NONE'
+
+    # check "verbose"
+    if args.verbose is None:
+        args.verbose = xlib.Const.DEFAULT_VERBOSE
+    elif not xlib.check_code(args.verbose, xlib.get_verbose_code_list(), case_sensitive=False):
+        xlib.Message.print('error', f'*** verbose has to be {xlib.get_verbose_code_list_text()}.')
+        OK = False
+    if args.verbose.upper() == 'Y':
+        xlib.Message.set_verbose_status(True)
+
+    # check "trace"
+    if args.trace is None:
+        args.trace = xlib.Const.DEFAULT_TRACE
+    elif not xlib.check_code(args.trace, xlib.get_trace_code_list(), case_sensitive=False):
+        xlib.Message.print('error', f'*** trace has to be {xlib.get_trace_code_list_text()}.')
+        OK = False
+    if args.trace.upper() == 'Y':
+        xlib.Message.set_trace_status(True)
+
+    # if there are errors, exit with exception
+    if not OK:
+        raise xlib.ProgramException('P001')
+
+#-------------------------------------------------------------------------------
+
+def join_annotation_files(chunk_file_list, annotation_file, results_db):
+    '''
+    Merge the annotation chunk files (each one sorted by the merge key) in the annotation file, write its manifest
+    and save it in the results database.
+    '''
+
+    # get the type of the annotation file from the manifest of the first annotation chunk file
+    type = xlib.get_annotation_manifest_dict(chunk_file_list[0]).get('type', 'NONE')
+    if type == 'NONE':
+        raise xlib.ProgramException('F005', chunk_file_list[0], 'an annotation file with a valid manifest')
+
+    # merge the annotation chunk files
+    xlib.Message.print('verbose', f'Merging the chunk files of {os.path.basename(annotation_file)} ...\n')
+    (record_number, first_key, last_key) = xlib.merge_sorted_annotation_files(chunk_file_list, annotation_file, is_header=True)
+    xlib.Message.print('verbose', f'The chunk files are merged: {record_number} records.\n')
+
+    # write the manifest of the annotation file
+    xlib.write_annotation_manifest(annotation_file, type, True, True, record_number, first_key, last_key)
+
+    # save the annotation file in the results database
+    if results_db != 'NONE':
+        xlib.save_annotation_file_in_results_db(results_db, annotation_file, type)
+
+#-------------------------------------------------------------------------------
+
+def concatenate_files(chunk_file_list, output_file, is_header):
+    '''
+    Concatenate the chunk files in the output file; when the files have a header record, only the one of the first chunk is written.
+    '''
+
+    xlib.Message.print('verbose', f'Concatenating the chunk files of {os.path.basename(output_file)} ...\n')
+
+    # open the output file
+    if output_file.endswith('.gz'):
+        try:
+            output_file_id = xlib.open_gzip(output_file, mode='wt', encoding='iso-8859-1', newline='\n')
+        except Exception as e:
+            raise xlib.ProgramException('F004', output_file)
+    else:
+        try:
+            output_file_id = open(output_file, mode='w', encoding='iso-8859-1', newline='\n')
+        except Exception as e:
+            raise xlib.ProgramException('F003', output_file)
+
+    # write the records of each chunk file
+    for i in range(len(chunk_file_list)):
+
+        # open the chunk file
+        try:
+            chunk_file_id = open(chunk_file_list[i], mode='r', encoding='iso-8859-1', newline='\n')
+        except Exception as e:
+            raise xlib.ProgramException('F001', chunk_file_list[i])
+
+        # skip the header record of all chunk files except the first one
+        if is_header and i > 0:
+            chunk_file_id.readline()
+
+        # copy the rest of records
+        shutil.copyfileobj(chunk_file_id, output_file_id)
+
+        # close the chunk file
+        chunk_file_id.close()
+
+    # close the output file
+    output_file_id.close()
+
+    xlib.Message.print('verbose', 'The chunk files are concatenated.\n')
+
+#-------------------------------------------------------------------------------
+
+if __name__ == '__main__':
+
+    main(sys.argv[1:])
+    sys.exit(0)
+
+#-------------------------------------------------------------------------------
@@ -24,7 +24,6 @@ This program loads datasets and species data into TOA database.
 #-------------------------------------------------------------------------------
 
 import argparse
-import gzip
 import os
 import re
 import sys
@@ -48,13 +47,13 @@ def main(argv):
     check_args(args)
 
     # connect to the TOA database
-    conn = xsqlite.connect_database(args.toa_database)
+    conn = xsqlite.connect_database(args.toa_database, args.db_profile)
 
     # load table "datasets"
     load_table_datasets(conn, args.dataset_file)
 
     # load table "species"
-    load_table_species(conn, args.species_file)
+    load_table_species(conn, args.species_file, args.taxonomy_thread_number, args.taxonomy_server)
 
     # load table "ec_ids"
     load_table_ec_ids(conn, args.ec_id_file)
@@ -83,6 +82,9 @@ def build_parser():
     parser.add_argument('--species', dest='species_file', help='Path of species file (mandatory).')
     parser.add_argument('--ecids', dest='ec_id_file', help='Path of EC id file (mandatory).')
     parser.add_argument('--keggids', dest='kegg_id_file', help='Path of KEGG id file (mandatory).')
+    parser.add_argument('--taxonomy-threads', dest='taxonomy_thread_number', help=f'Number of concurrent requests to the taxonomy server; default: {xlib.Const.DEFAULT_TAXONOMY_THREADS}.')
+    parser.add_argument('--taxonomy-server', dest='taxonomy_server', help=f'URL of the taxonomy server; default: {xlib.get_taxonomy_server()}.')
+    parser.add_argument('--db-profile', dest='db_profile', help=f'Profile of the connection to the TOA database: {xlib.get_db_profile_code_list_text()}; default: {xlib.Const.DEFAULT_DB_PROFILE}.')
     parser.add_argument('--verbose', dest='verbose', help=f'Additional job status info during the run: {xlib.get_verbose_code_list_text()}; default: {xlib.Const.DEFAULT_VERBOSE}.')
     parser.add_argument('--trace', dest='trace', help=f'Additional info useful to the developer team: {xlib.get_trace_code_list_text()}; default: {xlib.Const.DEFAULT_TRACE}.')
 
@@ -136,6 +138,28 @@ def check_args(args):
         xlib.Message.print('error', f'*** The file {args.kegg_id_file} does not exist.')
         OK = False
 
+    # check "taxonomy_thread_number"
+    if args.taxonomy_thread_number is None:
+        args.taxonomy_thread_number = xlib.Const.DEFAULT_TAXONOMY_THREADS
+    elif not xlib.check_int(args.taxonomy_thread_number, minimum=1):
+        xlib.Message.print('error', '*** taxonomy-threads has to be an integer number greater than or equal to 1.')
+        OK = False
+    else:
+        args.taxonomy_thread_number = int(args.taxonomy_thread_number)
+
+    # check "taxonomy_server"
+    if args.taxonomy_server is None:
+        args.taxonomy_server = xlib.get_taxonomy_server()
+
+    # check "db_profile"
+    if args.db_profile is None:
+        args.db_profile = xlib.Const.DEFAULT_DB_PROFILE
+    elif not xlib.check_code(args.db_profile, xlib.get_db_profile_code_list(), case_sensitive=False):
+        xlib.Message.print('error', f'*** db-profile has to be {xlib.get_db_profile_code_list_text()}.')
+        OK = False
+    else:
+        args.db_profile = args.db_profile.upper()
+
     # check "verbose"
     if args.verbose is None:
         args.verbose = xlib.Const.DEFAULT_VERBOSE
@@ -187,7 +211,7 @@ def load_table_datasets(conn, dataset_file):
     # open the file of datasets
     if dataset_file.endswith('.gz'):
         try:
-            dataset_file_id = gzip.open(dataset_file, mode='rt', encoding='iso-8859-1')
+            dataset_file_id = xlib.open_gzip(dataset_file, mode='rt', encoding='iso-8859-1')
         except Exception as e:
             raise xlib.ProgramException('F002', dataset_file)
     else:
@@ -252,7 +276,7 @@ def load_table_datasets(conn, dataset_file):
 
 #-------------------------------------------------------------------------------
 
-def load_table_species(conn, species_file):
+def load_table_species(conn, species_file, taxonomy_thread_number, taxonomy_server):
     '''
     '''
     
@@ -266,10 +290,13 @@ def load_table_species(conn, species_file):
     xsqlite.create_species(conn)
     xlib.Message.print('verbose', 'The table is created.\n')
 
+    # create table "taxonomy_not_found" (if it does not exist)
+    xsqlite.create_taxonomy_not_found(conn)
+
     # open the file of species data
     if species_file.endswith('.gz'):
         try:
-            species_file_id = gzip.open(species_file, mode='rt', encoding='iso-8859-1')
+            species_file_id = xlib.open_gzip(species_file, mode='rt', encoding='iso-8859-1')
         except Exception as e:
             raise xlib.ProgramException('F002', species_file)
     else:
@@ -285,8 +312,8 @@ def load_table_species(conn, species_file):
     # initialize the record counter
     record_counter = 0
 
-    # initialize the inserted row counter
-    inserted_row_counter = 0
+    # initialize the row data dictionary list
+    row_dict_list = []
 
     # read the first record
     record = species_file_id.readline()
@@ -311,32 +338,58 @@ def load_table_species(conn, species_file):
             except Exception as e:
                 raise xlib.ProgramException('F006', os.path.basename(species_file), record_counter)
 
-            # get the taxonomy dictionary of the species name from taxonomy server
-            taxonomy_dict = xlib.get_taxonomy_dict('name', row_dict['species_name'])
-            if taxonomy_dict == {}:
-                row_dict['family_name'] = xlib.get_na()
-                row_dict['phylum_name'] = xlib.get_na()
-                row_dict['kingdom_name'] = xlib.get_na()
-                row_dict['superkingdom_name'] = xlib.get_na()
-                row_dict['tax_id'] = xlib.get_na()
-            else:
-                row_dict['family_name'] = taxonomy_dict['family']['name']
-                row_dict['phylum_name'] = taxonomy_dict['phylum']['name']
-                row_dict['kingdom_name'] = taxonomy_dict['kingdom']['name']
-                row_dict['superkingdom_name'] = taxonomy_dict['superkingdom']['name']
-                row_dict['tax_id'] = taxonomy_dict['tax_id']
-
-            # insert data into table species
-            xsqlite.insert_species_row(conn, row_dict)
-            inserted_row_counter += 1
+            # add the row data dictionary to the list
+            row_dict_list.append(row_dict)
 
         # print record counter
-        xlib.Message.print('verbose', f'\rProcessed records of species file: {record_counter} - Inserted rows: {inserted_row_counter}')
+        xlib.Message.print('verbose', f'\rProcessed records of species file: {record_counter}')
 
         # read the next record
         record = species_file_id.readline()
 
     xlib.Message.print('verbose', '\n')
+
+    # get the species names not found in recent queries to the taxonomy server
+    not_found_set = xsqlite.get_taxonomy_not_found_set(conn)
+
+    # get the taxonomy dictionaries of the other species names from taxonomy server
+    xlib.Message.print('verbose', f'Querying the taxonomy server with {taxonomy_thread_number} concurrent requests ...\n')
+    species_name_list = [row_dict['species_name'] for row_dict in row_dict_list if row_dict['species_name'] not in not_found_set]
+    taxonomy_dicts = xlib.get_taxonomy_dicts('name', species_name_list, taxonomy_thread_number, taxonomy_server)
+    xlib.Message.print('verbose', f'The taxonomy server is queried - Species names: {len(taxonomy_dicts)} - Species names not found in recent queries: {len(row_dict_list) - len(species_name_list)}.\n')
+
+    # initialize the inserted row counter
+    inserted_row_counter = 0
+
+    # insert the rows of the species
+    for row_dict in row_dict_list:
+
+        # get the taxonomy dictionary of the species name
+        taxonomy_dict = taxonomy_dicts.get(row_dict['species_name'], {})
+        if taxonomy_dict == {}:
+            row_dict['family_name'] = xlib.get_na()
+            row_dict['phylum_name'] = xlib.get_na()
+            row_dict['kingdom_name'] = xlib.get_na()
+            row_dict['superkingdom_name'] = xlib.get_na()
+            row_dict['tax_id'] = xlib.get_na()
+        else:
+            row_dict['family_name'] = taxonomy_dict['family']['name']
+            row_dict['phylum_name'] = taxonomy_dict['phylum']['name']
+            row_dict['kingdom_name'] = taxonomy_dict['kingdom']['name']
+            row_dict['superkingdom_name'] = taxonomy_dict['superkingdom']['name']
+            row_dict['tax_id'] = taxonomy_dict['tax_id']
+
+        # insert data into table species
+        xsqlite.insert_species_row(conn, row_dict)
+        inserted_row_counter += 1
+
+        # print inserted row counter
+        xlib.Message.print('verbose', f'\rInserted rows: {inserted_row_counter}')
+
+    xlib.Message.print('verbose', '\n')
+
+    # insert the species names not found into table "taxonomy_not_found"
+    xsqlite.insert_taxonomy_not_found_rows(conn, [species_name for (species_name, taxonomy_dict) in taxonomy_dicts.items() if taxonomy_dict == {}])
     
     # create the index on the table "species"
     xlib.Message.print('verbose', 'Creating the index on the table "species" ...\n')
@@ -370,7 +423,7 @@ def load_table_ec_ids(conn, ec_id_file):
     # open the EC id file
     if ec_id_file.endswith('.gz'):
         try:
-            ec_id_file_id = gzip.open(ec_id_file, mode='rt', encoding='iso-8859-1')
+            ec_id_file_id = xlib.open_gzip(ec_id_file, mode='rt', encoding='iso-8859-1')
         except Exception as e:
             raise xlib.ProgramException('F002', ec_id_file)
     else:
@@ -499,7 +552,7 @@ def load_table_kegg_ids(conn, kegg_id_file):
     # open the file of KEGG ids
     if kegg_id_file.endswith('.gz'):
         try:
-            kegg_id_file_id = gzip.open(kegg_id_file, mode='rt', encoding='iso-8859-1')
+            kegg_id_file_id = xlib.open_gzip(kegg_id_file, mode='rt', encoding='iso-8859-1')
         except Exception as e:
             raise xlib.ProgramException('F002', kegg_id_file)
     else:
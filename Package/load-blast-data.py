@@ -24,9 +24,11 @@ This program loads BLAST alignment data into TOA database.
 
 import argparse
 import os
+import re
 import sys
 import xml.etree.ElementTree
 
+import xfasta
 import xlib
 import xsqlite
 
@@ -46,15 +48,22 @@ def main(argv):
     check_args(args)
 
     # connect to the TOA database
-    conn = xsqlite.connect_database(args.toa_database)
+    conn = xsqlite.connect_database(args.toa_database, args.db_profile)
 
     # check the dataset identification
     if not xsqlite.is_dataset_id_found(conn, args.dataset_id):
         raise xlib.ProgramException('L001', args.dataset_id)
 
+    # get the query sequence identifications whose previous rows are deleted (None: all rows of the dataset)
+    query_def_list = None if args.seq_file == 'NONE' else sorted(xfasta.get_seq_id_set(args.seq_file))
+
     # load table "blast" where the BLAST file format is 5 (BLAST XML)
     if args.blast_file_format == '5':
-        load_table_blast_5(conn, args.dataset_id, args.blast_file)
+        load_table_blast_5(conn, args.dataset_id, args.blast_file, args.index_mode, query_def_list)
+
+    # load table "blast" where the BLAST file format is 6 (tabular) or 7 (tabular with comment lines)
+    elif args.blast_file_format in ['6', '7']:
+        load_table_blast_6(conn, args.dataset_id, args.aligner_tool, args.blast_file, args.index_mode, query_def_list)
 
     # close connection to TOA database
     conn.close()
@@ -76,6 +85,10 @@ def build_parser():
     parser.add_argument('--dataset', dest='dataset_id', help='Dataset identification (mandatory).')
     parser.add_argument('--format', dest='blast_file_format', help=f'Format of the BLAST file (mandatory): {xlib.get_blast_file_format_code_list_text()}.')
     parser.add_argument('--blast', dest='blast_file', help='Path of the blastx/blastn file (mandatory).')
+    parser.add_argument('--aligner', dest='aligner_tool', help=f'Aligner tool that generated the BLAST file: {xlib.get_alignment_tool_code_list_text()} (mandatory when the format is 6 or 7).')
+    parser.add_argument('--seqs', dest='seq_file', help='Path of the FASTA file with the query sequences of the BLAST file when only their previous rows have to be deleted (load of a sequence chunk) or NONE to delete all previous rows of the dataset; default: NONE.')
+    parser.add_argument('--index-mode', dest='index_mode', help=f'Maintenance of the table indexes during the load: {xlib.get_index_mode_code_list_text()}; default: {xlib.Const.DEFAULT_INDEX_MODE}.')
+    parser.add_argument('--db-profile', dest='db_profile', help=f'Profile of the connection to the TOA database: {xlib.get_db_profile_code_list_text()}; default: {xlib.Const.DEFAULT_DB_PROFILE}.')
     parser.add_argument('--verbose', dest='verbose', help=f'Additional job status info during the run: {xlib.get_verbose_code_list_text()}; default: {xlib.Const.DEFAULT_VERBOSE}.')
     parser.add_argument('--trace', dest='trace', help=f'Additional info useful to the developer team: {xlib.get_trace_code_list_text()}; default: {xlib.Const.DEFAULT_TRACE}.')
 
@@ -112,6 +125,17 @@ def check_args(args):
         xlib.Message.print('error', f'*** The BLAST file format has to be {xlib.get_blast_file_format_code_list_text()}.')
         OK = False
 
+    # check "aligner_tool"
+    if args.aligner_tool is None:
+        if args.blast_file_format in ['6', '7']:
+            xlib.Message.print('error', '*** The aligner tool is not indicated in the input arguments.')
+            OK = False
+    elif not xlib.check_code(args.aligner_tool, xlib.get_alignment_tool_code_list(), case_sensitive=False):
+        xlib.Message.print('error', f'*** The aligner tool has to be {xlib.get_alignment_tool_code_list_text()}.')
+        OK = False
+    else:
+        args.aligner_tool = args.aligner_tool.upper()
+
     # check "blast_file"
     if args.blast_file is None:
         xlib.Message.print('error', '*** The BLAST file is not indicated in the input arguments.')
@@ -120,6 +144,33 @@ def check_args(args):
         xlib.Message.print('error', f'*** The file {args.blast_file} does not exist.')
         OK = False
 
+    # check "seq_file"
+    if args.seq_file is None:
+        args.seq_file = 'NONE'
+    elif args.seq_file.upper() == 'NONE':
+        args.seq_file = 'NONE'
+    elif not os.path.isfile(args.seq_file):
+        xlib.Message.print('error', f'*** The file {args.seq_file} does not exist.')
+        OK = False
+
+    # check "index_mode"
+    if args.index_mode is None:
+        args.index_mode = xlib.Const.DEFAULT_INDEX_MODE
+    elif not xlib.check_code(args.index_mode, xlib.get_index_mode_code_list(), case_sensitive=False):
+        xlib.Message.print('error', f'*** index-mode has to be {xlib.get_index_mode_code_list_text()}.')
+        OK = False
+    else:
+        args.index_mode = args.index_mode.upper()
+
+    # check "db_profile"
+    if args.db_profile is None:
+        args.db_profile = xlib.Const.DEFAULT_DB_PROFILE
+    elif not xlib.check_code(args.db_profile, xlib.get_db_profile_code_list(), case_sensitive=False):
+        xlib.Message.print('error', f'*** db-profile has to be {xlib.get_db_profile_code_list_text()}.')
+        OK = False
+    else:
+        args.db_profile = args.db_profile.upper()
+
     # check "verbose"
     if args.verbose is None:
         args.verbose = xlib.Const.DEFAULT_VERBOSE
@@ -144,17 +195,25 @@ def check_args(args):
 
 #-------------------------------------------------------------------------------
 
-def load_table_blast_5(conn, dataset_id, blast_file):
+def load_table_blast_5(conn, dataset_id, blast_file, index_mode, query_def_list):
     '''
     '''
 
+    # open the BLAST file
+    if blast_file.endswith('.gz'):
+        try:
+            blast_file_id = xlib.open_gzip(blast_file, mode='rb')
+        except Exception as e:
+            raise xlib.ProgramException('F002', blast_file)
+    else:
+        try:
+            blast_file_id = open(blast_file, mode='rb')
+        except Exception as e:
+            raise xlib.ProgramException('F001', blast_file)
+
     # check if BLAST file is not empty
-    try:
-        blast_file_id = open(blast_file, mode='r', encoding='iso-8859-1')
-    except Exception as e:
-        raise xlib.ProgramException('F001', blast_file)
-    record = blast_file_id.readline()
-    if record == '':
+    if blast_file_id.peek(1)[:1] == b'':
+        blast_file_id.close()
         return
 
     # initialize the iteration counter
@@ -168,27 +227,55 @@ def load_table_blast_5(conn, dataset_id, blast_file):
     xsqlite.create_blast(conn)
     xlib.Message.print('verbose', 'The table is created.\n')
      
-    # create the index on the table "blast"
-    xlib.Message.print('verbose', 'Creating the index on the table "blast" (if it does not exist) ...\n')
-    xsqlite.create_blast_index(conn)
-    xlib.Message.print('verbose', 'The index is created.\n')
-    
-    # delete files from table "blast" corresponding to the repository and dataset identification
+    # initialize the phase timer
+    phase_timer = xlib.PhaseTimer()
+
+    # create the index on the table "blast" (in the deferred index mode, it is created after inserting rows)
+    if index_mode == 'IMMEDIATE':
+        phase_timer.start('index creation')
+        xlib.Message.print('verbose', 'Creating the index on the table "blast" (if it does not exist) ...\n')
+        xsqlite.create_blast_index(conn)
+        xlib.Message.print('verbose', 'The index is created.\n')
+
+    # delete files from table "blast" corresponding to the repository and dataset identification (the index is used when it exists)
+    # (only the rows of the query sequences when there is a query sequence list)
+    phase_timer.start('deletion')
     xlib.Message.print('verbose', 'Deleting previous rows from the table "blast" ...\n')
-    xsqlite.delete_blast_rows(conn, dataset_id)
+    if query_def_list is None:
+        xsqlite.delete_blast_rows(conn, dataset_id)
+    else:
+        xsqlite.delete_blast_query_rows(conn, dataset_id, query_def_list)
     xlib.Message.print('verbose', 'Rows are deleted.\n')
 
-    # build the complee item tree from BLAST XML file
-    tree = xml.etree.ElementTree.parse(blast_file)
-    root = tree.getroot()
-    
-    # walk the tree and insert data into table "blast" for each iteration-hit-hsp
-    for item_blastoutput_iterations in root.iter(tag= 'BlastOutput_iterations'):
-        xlib.Message.print('verbose', f'-> tag: {item_blastoutput_iterations.tag} - attrib: {item_blastoutput_iterations.attrib} - text: {item_blastoutput_iterations.text}\n')
+    # drop the indexes of the table "blast" in the deferred index mode
+    if index_mode == 'DEFERRED':
+        phase_timer.start('index drop')
+        xlib.Message.print('verbose', 'Dropping the indexes of the table "blast" ...\n')
+        index_sentence_list = xsqlite.drop_table_indexes(conn, 'blast')
+        xlib.Message.print('verbose', 'The indexes are dropped.\n')
+
+    # start the measure of the insertion
+    phase_timer.start('insertion')
 
-        # get items "Iteration"
-        for item_iteration in item_blastoutput_iterations.iter(tag= 'Iteration'):
-            xlib.Message.print('verbose', f'---> tag: {item_iteration.tag} - attrib: {item_iteration.attrib} - text: {item_iteration.text}\n')
+    # initialize the batch inserter of the table "blast"
+    batch_inserter = xsqlite.BatchInserter(conn, 'blast')
+
+    # initialize the item "BlastOutput_iterations" (parent of the items "Iteration")
+    item_blastoutput_iterations = None
+
+    # parse the BLAST XML file as a stream and insert data into table "blast" for each iteration-hit-hsp when an item "Iteration" is complete
+    try:
+        for (event, item) in xml.etree.ElementTree.iterparse(blast_file_id, events=('start', 'end')):
+
+            # keep the item "BlastOutput_iterations" in order to release its processed items "Iteration"
+            if event == 'start':
+                if item.tag == 'BlastOutput_iterations':
+                    item_blastoutput_iterations = item
+                continue
+
+            # skip items until an item "Iteration" is complete
+            if item.tag != 'Iteration':
+                continue
 
             # initialize the row data dictionary
             row_dict = {}
@@ -197,27 +284,19 @@ def load_table_blast_5(conn, dataset_id, blast_file):
             # add 1 to iteration counter
             iteration_counter += 1
 
-            # initialize iteration data
-            iteration_iter_num = 0
-            iteration_query_def = ''
-
-            # get data of item "Iteration_iter-num"
-            for item_iteration_iter_num in item_iteration.iter(tag='Iteration_iter-num'):
-                xlib.Message.print('verbose', f'-----> tag: {item_iteration_iter_num.tag} - attrib: {item_iteration_iter_num.attrib} - text: {item_iteration_iter_num.text}\n')
-                row_dict['iteration_iter_num'] = int(item_iteration_iter_num.text)
-
-            # get data of item "Iteration_query-def"
-            for item_iteration_query_def in item_iteration.iter(tag='Iteration_query-def'):
-                xlib.Message.print('verbose', f'-----> tag: {item_iteration_query_def.tag} - attrib: {item_iteration_query_def.attrib} - text: {item_iteration_query_def.text}\n')
-                row_dict['iteration_query_def'] = item_iteration_query_def.text
-
-            # get items "Iteration_hits"
-            for item_iteration_hits in item_iteration.iter(tag='Iteration_hits'):
-                xlib.Message.print('verbose', f'-----> tag: {item_iteration_hits.tag} - attrib: {item_iteration_hits.attrib} - text: {item_iteration_hits.text}\n')
-
-                # get items "Hit"
+            # get data of items "Iteration_iter-num" and "Iteration_query-def" and the items "Iteration_hits"
+            item_iteration_hits_list = []
+            for item_iteration_child in item:
+                if item_iteration_child.tag == 'Iteration_iter-num':
+                    row_dict['iteration_iter_num'] = int(item_iteration_child.text)
+                elif item_iteration_child.tag == 'Iteration_query-def':
+                    row_dict['iteration_query_def'] = item_iteration_child.text
+                elif item_iteration_child.tag == 'Iteration_hits':
+                    item_iteration_hits_list.append(item_iteration_child)
+
+            # get items "Hit"
+            for item_iteration_hits in item_iteration_hits_list:
                 for item_hit in item_iteration_hits.iter(tag='Hit'):
-                    xlib.Message.print('verbose', f'-------> tag: {item_hit.tag} - attrib: {item_hit.attrib} - text: {item_hit.text}')
 
                     # initialize hit data
                     row_dict['hit_num'] = 0
@@ -225,36 +304,26 @@ def load_table_blast_5(conn, dataset_id, blast_file):
                     row_dict['hit_def'] = xlib.get_na()
                     row_dict['hit_accession'] = xlib.get_na()
 
-                    # get data of item "Hit_num"
-                    for item_hit_num in item_hit.iter(tag='Hit_num'):
-                        xlib.Message.print('verbose', f'---------> tag: {item_hit_num.tag} - attrib: {item_hit_num.attrib} - text: {item_hit_num.text}\n')
-                        row_dict['hit_num'] = int(item_hit_num.text)
-
-                    # get data of item "Hit_id"
-                    for item_hit_id in item_hit.iter(tag='Hit_id'):
-                        xlib.Message.print('verbose', f'---------> tag: {item_hit_id.tag} - attrib: {item_hit_id.attrib} - text: {item_hit_id.text}\n')
-                        row_dict['hit_id'] = item_hit_id.text
-
-                    # get data of item "Hit_def"
-                    for item_hit_def in item_hit.iter(tag='Hit_def'):
-                        xlib.Message.print('verbose', f'---------> tag: {item_hit_def.tag} - attrib: {item_hit_def.attrib} - text: {item_hit_def.text}\n')
-                        try:
-                            row_dict['hit_def'] = item_hit_def.text.replace("'", '|').replace(';', ',')
-                        except:
-                            row_dict['hit_def'] = item_hit_def.text
-
-                    # get data of item "Hit_accession"
-                    for item_hit_accession in item_hit.iter(tag='Hit_accession'):
-                        xlib.Message.print('verbose', f'---------> tag: {item_hit_accession.tag} - attrib: {item_hit_accession.attrib} - text: {item_hit_accession.text}\n')
-                        row_dict['hit_accession'] = item_hit_accession.text
-                        
-                    # get items "Hit_hsps"
-                    for item_hit_hsps in item_hit.iter(tag='Hit_hsps'):
-                        xlib.Message.print('verbose', f'---------> tag: {item_hit_hsps.tag} - attrib: {item_hit_hsps.attrib} - text: {item_hit_hsps.text}\n')
-                        
-                        # get items "Hsp"
-                        for item_hsp in item_hit.iter(tag='Hsp'):
-                            xlib.Message.print('verbose', f'-----------> tag: {item_hsp.tag} - attrib: {item_hsp.attrib} - text: {item_hsp.text}\n')
+                    # get data of items "Hit_num", "Hit_id", "Hit_def" and "Hit_accession" and the items "Hit_hsps"
+                    item_hit_hsps_list = []
+                    for item_hit_child in item_hit:
+                        if item_hit_child.tag == 'Hit_num':
+                            row_dict['hit_num'] = int(item_hit_child.text)
+                        elif item_hit_child.tag == 'Hit_id':
+                            row_dict['hit_id'] = item_hit_child.text
+                        elif item_hit_child.tag == 'Hit_def':
+                            try:
+                                row_dict['hit_def'] = item_hit_child.text.replace(';', ',')
+                            except:
+                                row_dict['hit_def'] = xlib.get_na()
+                        elif item_hit_child.tag == 'Hit_accession':
+                            row_dict['hit_accession'] = item_hit_child.text
+                        elif item_hit_child.tag == 'Hit_hsps':
+                            item_hit_hsps_list.append(item_hit_child)
+
+                    # get items "Hsp"
+                    for item_hit_hsps in item_hit_hsps_list:
+                        for item_hsp in item_hit_hsps.iter(tag='Hsp'):
 
                             # initialize hsp data
                             row_dict['hsp_num'] = 0
@@ -265,55 +334,247 @@ def load_table_blast_5(conn, dataset_id, blast_file):
                             row_dict['hsp_align_len'] = 0
                             row_dict['hsp_qseq'] = ''
 
-                            # get data of item "Hsp_num"
-                            for item_hsp_num in item_hsp.iter(tag='Hsp_num'):
-                                xlib.Message.print('verbose', f'-------------> tag: {item_hsp_num.tag} - attrib: {item_hsp_num.attrib} - text: {item_hsp_num.text}\n')
-                                row_dict['hsp_num'] = int(item_hsp_num.text)
-
-                            # get data of item "Hsp_evalue"
-                            for item_hsp_evalue in item_hsp.iter(tag='Hsp_evalue'):
-                                xlib.Message.print('verbose', f'-------------> tag: {item_hsp_evalue.tag} - attrib: {item_hsp_evalue.attrib} - text: {item_hsp_evalue.text}\n')
-                                row_dict['hsp_evalue'] = float(item_hsp_evalue.text)
-
-                            # get data of item "Hsp_identity"
-                            for item_hsp_identity in item_hsp.iter(tag='Hsp_identity'):
-                                xlib.Message.print('verbose', f'-------------> tag: {item_hsp_identity.tag} - attrib: {item_hsp_identity.attrib} - text: {item_hsp_identity.text}\n')
-                                row_dict['hsp_identity'] = int(item_hsp_identity.text)
-
-                            # get data of item "Hsp_positive"
-                            for item_hsp_positive in item_hsp.iter(tag='Hsp_positive'):
-                                xlib.Message.print('verbose', f'-------------> tag: {item_hsp_positive.tag} - attrib: {item_hsp_positive.attrib} - text: {item_hsp_positive.text}\n')
-                                row_dict['hsp_positive'] = int(item_hsp_positive.text)
-
-                            # get data of item "Hsp_gaps"
-                            for item_hsp_gaps in item_hsp.iter(tag='Hsp_gaps'):
-                                xlib.Message.print('verbose', f'-------------> tag: {item_hsp_gaps.tag} - attrib: {item_hsp_gaps.attrib} - text: {item_hsp_gaps.text}\n')
-                                row_dict['hsp_gaps'] = int(item_hsp_gaps.text)
-
-                            # get data of item "Hsp_align-len"
-                            for item_hsp_align_len in item_hsp.iter(tag='Hsp_align-len'):
-                                xlib.Message.print('verbose', f'-------------> tag: {item_hsp_align_len.tag} - attrib: {item_hsp_align_len.attrib} - text: {item_hsp_align_len.text}\n')
-                                row_dict['hsp_align_len'] = int(item_hsp_align_len.text)
-
-                            # get data of item "Hsp_qseq"
-                            for item_hsp_qseq in item_hsp.iter(tag='Hsp_qseq'):
-                                xlib.Message.print('verbose', f'-------------> tag: {item_hsp_qseq.tag} - attrib: {item_hsp_qseq.attrib} - text: {item_hsp_qseq.text}\n')
-                                row_dict['hsp_qseq'] = item_hsp_qseq.text
+                            # get data of items "Hsp_num", "Hsp_evalue", "Hsp_identity", "Hsp_positive", "Hsp_gaps", "Hsp_align-len" and "Hsp_qseq"
+                            for item_hsp_child in item_hsp:
+                                if item_hsp_child.tag == 'Hsp_num':
+                                    row_dict['hsp_num'] = int(item_hsp_child.text)
+                                elif item_hsp_child.tag == 'Hsp_evalue':
+                                    row_dict['hsp_evalue'] = float(item_hsp_child.text)
+                                elif item_hsp_child.tag == 'Hsp_identity':
+                                    row_dict['hsp_identity'] = int(item_hsp_child.text)
+                                elif item_hsp_child.tag == 'Hsp_positive':
+                                    row_dict['hsp_positive'] = int(item_hsp_child.text)
+                                elif item_hsp_child.tag == 'Hsp_gaps':
+                                    row_dict['hsp_gaps'] = int(item_hsp_child.text)
+                                elif item_hsp_child.tag == 'Hsp_align-len':
+                                    row_dict['hsp_align_len'] = int(item_hsp_child.text)
+                                elif item_hsp_child.tag == 'Hsp_qseq':
+                                    row_dict['hsp_qseq'] = item_hsp_child.text
 
                             # insert data into table "blast"
-                            xsqlite.insert_blast_row(conn, row_dict)
+                            batch_inserter.add_row(row_dict)
                             inserted_row_counter += 1
 
+            # release the memory of the processed item "Iteration"
+            item.clear()
+            if item_blastoutput_iterations is not None:
+                item_blastoutput_iterations.remove(item)
+
             # print iteration counter
             xlib.Message.print('verbose', f'\rIterations: {iteration_counter} - Inserted rows: {inserted_row_counter}')
 
+    except xml.etree.ElementTree.ParseError as e:
+        raise xlib.ProgramException('F005', blast_file, 'BLAST XML')
+
+    xlib.Message.print('verbose', '\n')
+
+    # insert the rows remaining in the batch
+    batch_inserter.flush()
+
+    # create the indexes of the table "blast" in the deferred index mode
+    if index_mode == 'DEFERRED':
+        phase_timer.start('index creation')
+        xlib.Message.print('verbose', 'Creating the indexes of the table "blast" ...\n')
+        xsqlite.create_table_indexes(conn, index_sentence_list)
+        xsqlite.create_blast_index(conn)
+        xlib.Message.print('verbose', 'The indexes are created.\n')
+
+    # save changes into TOA database
+    phase_timer.start('commit')
+    xlib.Message.print('verbose', 'Saving changes into TOA database ...\n')
+    conn.commit()
+    xlib.Message.print('verbose', 'Changes are saved.\n')
+
+    # print the elapsed time of each phase
+    phase_timer.print_summary('the load of the table "blast"')
+
+    # close BLAST file
+    blast_file_id.close()
+
+#-------------------------------------------------------------------------------
+
+def load_table_blast_6(conn, dataset_id, aligner_tool, blast_file, index_mode, query_def_list):
+    '''
+    Load the table "blast" from a BLAST tabular file (format 6 or 7) whose columns are the ones of get_blast_tabular_column_list().
+    '''
+
+    # get the column number of the BLAST tabular file
+    column_number = len(xlib.get_blast_tabular_column_list())
+
+    # open the BLAST file
+    if blast_file.endswith('.gz'):
+        try:
+            blast_file_id = xlib.open_gzip(blast_file, mode='rt', encoding='iso-8859-1')
+        except Exception as e:
+            raise xlib.ProgramException('F002', blast_file)
+    else:
+        try:
+            blast_file_id = open(blast_file, mode='r', encoding='iso-8859-1')
+        except Exception as e:
+            raise xlib.ProgramException('F001', blast_file)
+
+    # initialize the record counter
+    record_counter = 0
+ 
+    # initialize the inserted row counter
+    inserted_row_counter = 0
+   
+    # create table "blast"
+    xlib.Message.print('verbose', 'Creating the table "blast" (if it does not exist) ...\n')
+    xsqlite.create_blast(conn)
+    xlib.Message.print('verbose', 'The table is created.\n')
+     
+    # initialize the phase timer
+    phase_timer = xlib.PhaseTimer()
+
+    # create the index on the table "blast" (in the deferred index mode, it is created after inserting rows)
+    if index_mode == 'IMMEDIATE':
+        phase_timer.start('index creation')
+        xlib.Message.print('verbose', 'Creating the index on the table "blast" (if it does not exist) ...\n')
+        xsqlite.create_blast_index(conn)
+        xlib.Message.print('verbose', 'The index is created.\n')
+
+    # delete files from table "blast" corresponding to the repository and dataset identification (the index is used when it exists)
+    # (only the rows of the query sequences when there is a query sequence list)
+    phase_timer.start('deletion')
+    xlib.Message.print('verbose', 'Deleting previous rows from the table "blast" ...\n')
+    if query_def_list is None:
+        xsqlite.delete_blast_rows(conn, dataset_id)
+    else:
+        xsqlite.delete_blast_query_rows(conn, dataset_id, query_def_list)
+    xlib.Message.print('verbose', 'Rows are deleted.\n')
+
+    # drop the indexes of the table "blast" in the deferred index mode
+    if index_mode == 'DEFERRED':
+        phase_timer.start('index drop')
+        xlib.Message.print('verbose', 'Dropping the indexes of the table "blast" ...\n')
+        index_sentence_list = xsqlite.drop_table_indexes(conn, 'blast')
+        xlib.Message.print('verbose', 'The indexes are dropped.\n')
+
+    # start the measure of the insertion
+    phase_timer.start('insertion')
+
+    # initialize the batch inserter of the table "blast"
+    batch_inserter = xsqlite.BatchInserter(conn, 'blast')
+
+    # initialize the query and subject data used to number iterations, hits and HSPs as BLAST XML does
+    iteration_query_def = None
+    iteration_iter_num = 0
+    hit_num_dict = {}
+    hsp_num_dict = {}
+
+    # read the first record
+    record = blast_file_id.readline()
+
+    # while there are records
+    while record != '':
+
+        # add 1 to record counter
+        record_counter += 1
+
+        # process data records (comment lines of format 7 and blank lines are skipped)
+        if not record.startswith('#') and record.strip() != '':
+
+            # extract data
+            # record format: qseqid sseqid stitle evalue nident positive gaps length qseq
+            data_list = record.rstrip('\n').split('\t')
+            if len(data_list) != column_number:
+                raise xlib.ProgramException('F005', blast_file, f'BLAST tabular ({xlib.get_blast_tabular_column_list_text()})')
+            (qseqid, sseqid, stitle, evalue, nident, positive, gaps, length, qseq) = data_list
+
+            # when the query changes, set the new iteration and initialize its hit and HSP numbers
+            if qseqid != iteration_query_def:
+                iteration_query_def = qseqid
+                iteration_iter_num += 1
+                hit_num_dict = {}
+                hsp_num_dict = {}
+
+            # get the hit number of the subject and the HSP number of the subject in the current iteration
+            hit_num = hit_num_dict.setdefault(sseqid, len(hit_num_dict) + 1)
+            hsp_num = hsp_num_dict.get(sseqid, 0) + 1
+            hsp_num_dict[sseqid] = hsp_num
+
+            # get the hit data in the same way as they are in a BLAST XML file of the aligner:
+            # BLAST+ "stitle" is the complete definition and the accession is the last field of "sseqid" without version
+            # DIAMOND "stitle" starts with "sseqid", which is also the accession
+            if aligner_tool == xlib.get_diamond_name():
+                hit_def = stitle[len(sseqid):].strip() if stitle.startswith(sseqid) else stitle.strip()
+                hit_accession = sseqid
+            else:
+                hit_def = stitle.strip()
+                hit_accession_list = [x for x in sseqid.split('|') if x != '']
+                hit_accession = get_accession_without_version(hit_accession_list[-1] if hit_accession_list != [] else sseqid)
+
+            # set the row data dictionary
+            row_dict = {}
+            row_dict['dataset_id'] = dataset_id
+            row_dict['iteration_iter_num'] = iteration_iter_num
+            row_dict['iteration_query_def'] = qseqid
+            row_dict['hit_num'] = hit_num
+            row_dict['hit_id'] = sseqid
+            row_dict['hit_def'] = hit_def.replace(';', ',') if hit_def != '' else xlib.get_na()
+            row_dict['hit_accession'] = hit_accession
+            row_dict['hsp_num'] = hsp_num
+            try:
+                row_dict['hsp_evalue'] = float(evalue)
+                row_dict['hsp_identity'] = int(nident)
+                row_dict['hsp_positive'] = int(positive)
+                row_dict['hsp_gaps'] = int(gaps)
+                row_dict['hsp_align_len'] = int(length)
+            except Exception as e:
+                raise xlib.ProgramException('F005', blast_file, f'BLAST tabular ({xlib.get_blast_tabular_column_list_text()})')
+            row_dict['hsp_qseq'] = qseq
+
+            # insert data into table "blast"
+            batch_inserter.add_row(row_dict)
+            inserted_row_counter += 1
+
+            # print record counter
+            xlib.Message.print('verbose', f'\rRecords: {record_counter} - Inserted rows: {inserted_row_counter}')
+
+        # read the next record
+        record = blast_file_id.readline()
+
     xlib.Message.print('verbose', '\n')
 
+    # insert the rows remaining in the batch
+    batch_inserter.flush()
+
+    # create the indexes of the table "blast" in the deferred index mode
+    if index_mode == 'DEFERRED':
+        phase_timer.start('index creation')
+        xlib.Message.print('verbose', 'Creating the indexes of the table "blast" ...\n')
+        xsqlite.create_table_indexes(conn, index_sentence_list)
+        xsqlite.create_blast_index(conn)
+        xlib.Message.print('verbose', 'The indexes are created.\n')
+
     # save changes into TOA database
+    phase_timer.start('commit')
     xlib.Message.print('verbose', 'Saving changes into TOA database ...\n')
     conn.commit()
     xlib.Message.print('verbose', 'Changes are saved.\n')
 
+    # print the elapsed time of each phase
+    phase_timer.print_summary('the load of the table "blast"')
+
+    # close BLAST file
+    blast_file_id.close()
+
+#-------------------------------------------------------------------------------
+
+def get_accession_without_version(accession):
+    '''
+    Get a NCBI accession without its version (e.g. XP_123456.1 -> XP_123456) as BLAST+ writes it
+    in the item "Hit_accession" of XML files; other identifications are returned unchanged.
+    '''
+
+    # remove the version when the identification has the format of a NCBI accession
+    if re.match(r'^[A-Z]+_?[0-9]+\.[0-9]+$', accession):
+        accession = accession[:accession.rfind('.')]
+
+    # return the accession
+    return accession
+
 #-------------------------------------------------------------------------------
 
 if __name__ == '__main__':
@@ -24,7 +24,6 @@ This program loads genomic features into TOA database from a species from a GFF
 #-------------------------------------------------------------------------------
 
 import argparse
-import gzip
 import os
 import sys
 
@@ -47,7 +46,7 @@ def main(argv):
     check_args(args)
 
     # connect to the TOA database
-    conn = xsqlite.connect_database(args.toa_database)
+    conn = xsqlite.connect_database(args.toa_database, args.db_profile)
 
     # get the taxonomy dictionary of the species name from taxonomy server
     taxonomy_dict = xlib.get_taxonomy_dict('name', args.species_name)
@@ -56,7 +55,7 @@ def main(argv):
 
 
     # load genomic features depending of format of the genomic feature file
-    load_genomic_features(conn, args.species_name, args.gff_file, args.gff_format)
+    load_genomic_features(conn, args.species_name, args.gff_file, args.gff_format, args.index_mode)
 
     # close connection to TOA database
     conn.close()
@@ -78,6 +77,8 @@ def build_parser():
     parser.add_argument('--species', dest='species_name', help='The scientific name of the species using underscore as separator, e.g. Quercus_suber (mandatory).')
     parser.add_argument('--gff', dest='gff_file', help='Path of the GFF file (mandatory).')
     parser.add_argument('--format', dest='gff_format', help='The format of the GFF file: GFF3; default: GFF3.')
+    parser.add_argument('--index-mode', dest='index_mode', help=f'Maintenance of the table indexes during the load: {xlib.get_index_mode_code_list_text()}; default: {xlib.Const.DEFAULT_INDEX_MODE}.')
+    parser.add_argument('--db-profile', dest='db_profile', help=f'Profile of the connection to the TOA database: {xlib.get_db_profile_code_list_text()}; default: {xlib.Const.DEFAULT_DB_PROFILE}.')
     parser.add_argument('--verbose', dest='verbose', help=f'Additional job status info during the run: {xlib.get_verbose_code_list_text()}; default: {xlib.Const.DEFAULT_VERBOSE}.')
     parser.add_argument('--trace', dest='trace', help=f'Additional info useful to the developer team: {xlib.get_trace_code_list_text()}; default: {xlib.Const.DEFAULT_TRACE}.')
 
@@ -121,6 +122,24 @@ def check_args(args):
     else:
         args.gff_format = args.gff_format.upper()
 
+    # check "index_mode"
+    if args.index_mode is None:
+        args.index_mode = xlib.Const.DEFAULT_INDEX_MODE
+    elif not xlib.check_code(args.index_mode, xlib.get_index_mode_code_list(), case_sensitive=False):
+        xlib.Message.print('error', f'*** index-mode has to be {xlib.get_index_mode_code_list_text()}.')
+        OK = False
+    else:
+        args.index_mode = args.index_mode.upper()
+
+    # check "db_profile"
+    if args.db_profile is None:
+        args.db_profile = xlib.Const.DEFAULT_DB_PROFILE
+    elif not xlib.check_code(args.db_profile, xlib.get_db_profile_code_list(), case_sensitive=False):
+        xlib.Message.print('error', f'*** db-profile has to be {xlib.get_db_profile_code_list_text()}.')
+        OK = False
+    else:
+        args.db_profile = args.db_profile.upper()
+
     # check "verbose"
     if args.verbose is None:
         args.verbose = xlib.Const.DEFAULT_VERBOSE
@@ -145,7 +164,7 @@ def check_args(args):
 
 #-------------------------------------------------------------------------------
 
-def load_genomic_features(conn, species_name, gff_file, gff_format):
+def load_genomic_features(conn, species_name, gff_file, gff_format, index_mode):
     '''
     '''
 
@@ -154,20 +173,39 @@ def load_genomic_features(conn, species_name, gff_file, gff_format):
     xsqlite.create_genomic_features(conn)
     xlib.Message.print('verbose', 'The table is created.\n')
      
-    # create index "genomic_features_index" with columns "dataset_id" and "gene_id"  (if not exists)
-    xlib.Message.print('verbose', 'Creating the index on the table "genomic_features" (if it does not exist) ...\n')
-    xsqlite.create_genomic_features_index(conn)
-    xlib.Message.print('verbose', 'The index is created.\n')
-    
-    # delete files from table "genomic_features" corresponding to the dataset and species identifications
+    # initialize the phase timer
+    phase_timer = xlib.PhaseTimer()
+
+    # create the index on the table "genomic_features" (in the deferred index mode, it is created after inserting rows)
+    if index_mode == 'IMMEDIATE':
+        phase_timer.start('index creation')
+        xlib.Message.print('verbose', 'Creating the index on the table "genomic_features" (if it does not exist) ...\n')
+        xsqlite.create_genomic_features_index(conn)
+        xlib.Message.print('verbose', 'The index is created.\n')
+
+    # delete files from table "genomic_features" corresponding to the dataset and species identifications (the index is used when it exists)
+    phase_timer.start('deletion')
     xlib.Message.print('verbose', 'Deleting previous rows from the table "genomic_features" ...\n')
     xsqlite.delete_genomic_features_rows(conn, species_name)
     xlib.Message.print('verbose', 'Rows are deleted.\n')
 
+    # drop the indexes of the table "genomic_features" in the deferred index mode
+    if index_mode == 'DEFERRED':
+        phase_timer.start('index drop')
+        xlib.Message.print('verbose', 'Dropping the indexes of the table "genomic_features" ...\n')
+        index_sentence_list = xsqlite.drop_table_indexes(conn, 'genomic_features')
+        xlib.Message.print('verbose', 'The indexes are dropped.\n')
+
+    # start the measure of the insertion
+    phase_timer.start('insertion')
+
+    # initialize the batch inserter of the table "genomic_features"
+    batch_inserter = xsqlite.BatchInserter(conn, 'genomic_features')
+
     # open the GFF file
     if gff_file.endswith('.gz'):
         try:
-            gff_file_id = gzip.open(gff_file, mode='rt', encoding='iso-8859-1')
+            gff_file_id = xlib.open_gzip(gff_file, mode='rt', encoding='iso-8859-1')
         except Exception as e:
             raise xlib.ProgramException('F002', gff_file)
     else:
@@ -308,11 +346,11 @@ def load_genomic_features(conn, species_name, gff_file, gff_format):
                     pos_2 = attributes.find(';', pos_1 + len(literal) + 1)
                     row_dict['product'] = attributes[pos_1 + len(literal):pos_2]
 
-                # change quotation marks, semicolons and %2C in "product"
-                row_dict['product'] = row_dict['product'].replace("'", '|').replace(';', ',').replace('%2C', ',')
+                # change semicolons and %2C in "product"
+                row_dict['product'] = row_dict['product'].replace(';', ',').replace('%2C', ',')
 
                 # insert data into table "genomic_features"
-                xsqlite.insert_genomic_features_row(conn, row_dict)
+                batch_inserter.add_row(row_dict)
                 inserted_row_counter += 1
 
         # print record counter
@@ -323,11 +361,26 @@ def load_genomic_features(conn, species_name, gff_file, gff_format):
 
     xlib.Message.print('verbose', '\n')
 
+    # insert the rows remaining in the batch
+    batch_inserter.flush()
+
+    # create the indexes of the table "genomic_features" in the deferred index mode
+    if index_mode == 'DEFERRED':
+        phase_timer.start('index creation')
+        xlib.Message.print('verbose', 'Creating the indexes of the table "genomic_features" ...\n')
+        xsqlite.create_table_indexes(conn, index_sentence_list)
+        xsqlite.create_genomic_features_index(conn)
+        xlib.Message.print('verbose', 'The indexes are created.\n')
+
     # save changes into TOA database
+    phase_timer.start('commit')
     xlib.Message.print('verbose', 'Saving changes into TOA database ...\n')
     conn.commit()
     xlib.Message.print('verbose', 'Changes are saved.\n')
 
+    # print the elapsed time of each phase
+    phase_timer.print_summary('the load of the table "genomic_features"')
+
     # close GFF file
     gff_file_id.close()
 
@@ -25,7 +25,6 @@ into TOA database.
 #-------------------------------------------------------------------------------
 
 import argparse
-import gzip
 import os
 import sys
 
@@ -48,7 +47,7 @@ def main(argv):
     check_args(args)
 
     # connect to the TOA database
-    conn = xsqlite.connect_database(args.toa_database)
+    conn = xsqlite.connect_database(args.toa_database, args.db_profile)
 
     # load table "go_ontology"
     load_table_go_ontology(conn, args.ontology_file)
@@ -56,6 +55,9 @@ def main(argv):
     # load table "go_cross_references"
     load_table_go_cross_references(conn, args.ec2go_file, args.kegg2go_file, args.metacyc2go_file, args.interpro2go_file)
 
+    # save the change of the Gene Ontology data (all sequences are annotated again by the re-annotation of pipeline runs)
+    xsqlite.save_reference_group_change(conn, 'go')
+
     # close connection to TOA database
     conn.close()
 
@@ -78,6 +80,7 @@ def build_parser():
     parser.add_argument('--kegg2go', dest='kegg2go_file', help='Path of the gene2go file (mandatory).')
     parser.add_argument('--metacyc2go', dest='metacyc2go_file', help='Path of the metacyc2go file (mandatory).')
     parser.add_argument('--interpro2go', dest='interpro2go_file', help='Path of the interpro2go file (mandatory).')
+    parser.add_argument('--db-profile', dest='db_profile', help=f'Profile of the connection to the TOA database: {xlib.get_db_profile_code_list_text()}; default: {xlib.Const.DEFAULT_DB_PROFILE}.')
     parser.add_argument('--verbose', dest='verbose', help=f'Additional job status info during the run: {xlib.get_verbose_code_list_text()}; default: {xlib.Const.DEFAULT_VERBOSE}.')
     parser.add_argument('--trace', dest='trace', help=f'Additional info useful to the developer team: {xlib.get_trace_code_list_text()}; default: {xlib.Const.DEFAULT_TRACE}.')
 
@@ -139,6 +142,15 @@ def check_args(args):
         xlib.Message.print('error', f'*** The file {args.interpro2go_file} does not exist.')
         OK = False
 
+    # check "db_profile"
+    if args.db_profile is None:
+        args.db_profile = xlib.Const.DEFAULT_DB_PROFILE
+    elif not xlib.check_code(args.db_profile, xlib.get_db_profile_code_list(), case_sensitive=False):
+        xlib.Message.print('error', f'*** db-profile has to be {xlib.get_db_profile_code_list_text()}.')
+        OK = False
+    else:
+        args.db_profile = args.db_profile.upper()
+
     # check "verbose"
     if args.verbose is None:
         args.verbose = xlib.Const.DEFAULT_VERBOSE
@@ -177,6 +189,9 @@ def load_table_go_ontology(conn, ontology_file):
     xsqlite.create_go_ontology(conn)
     xlib.Message.print('verbose', 'The table is created.\n')
 
+    # initialize the batch inserter of the table "go_ontology"
+    batch_inserter = xsqlite.BatchInserter(conn, 'go_ontology')
+
     # initialize the row data dictionary and the external database name and description
     row_dict = {}
     row_dict['external_db'] = 'ec'
@@ -185,7 +200,7 @@ def load_table_go_ontology(conn, ontology_file):
     # open the ontology file
     if ontology_file.endswith('.gz'):
         try:
-            ontology_file_id = gzip.open(ontology_file, mode='rt', encoding='iso-8859-1')
+            ontology_file_id = xlib.open_gzip(ontology_file, mode='rt', encoding='iso-8859-1')
         except Exception as e:
             raise xlib.ProgramException('F002', ontology_file)
     else:
@@ -251,15 +266,15 @@ def load_table_go_ontology(conn, ontology_file):
                 if record.startswith('name:'):
                     row_dict['go_name'] = record[len('name:'):].strip()
 
-                    # change quotation marks and semicolons in "go_name"
-                    row_dict['go_name'] = row_dict['go_name'].replace("'", '|').replace(';', ',')
+                    # change semicolons in "go_name"
+                    row_dict['go_name'] = row_dict['go_name'].replace(';', ',')
 
                 # get the namespace
                 if record.startswith('namespace:'):
                     row_dict['namespace'] = record[len('namespace:'):].strip()
 
-                    # change quotation marks and semicolons in "namespace"
-                    row_dict['namespace'] = row_dict['namespace'].replace("'", '|').replace(';', ',').replace('_', ' ')
+                    # change semicolons in "namespace"
+                    row_dict['namespace'] = row_dict['namespace'].replace(';', ',').replace('_', ' ')
 
                 # get the alternative identificationnamespace
                 if record.startswith('alt_id:'):
@@ -276,11 +291,11 @@ def load_table_go_ontology(conn, ontology_file):
                     break
 
             # insert data into table "go_ontology"
-            xsqlite.insert_go_ontology_row(conn, row_dict)
+            batch_inserter.add_row(row_dict)
             inserted_row_counter += 1
             for alt_id in alt_id_list:
                 row_dict['go_id'] = alt_id
-                xsqlite.insert_go_ontology_row(conn, row_dict)
+                batch_inserter.add_row(row_dict)
                 inserted_row_counter += 1
 
             # print record counter
@@ -295,6 +310,9 @@ def load_table_go_ontology(conn, ontology_file):
     # close ontology file
     ontology_file_id.close()
 
+    # insert the rows remaining in the batch
+    batch_inserter.flush()
+
     # create the index on the table "go_ontology"
     xlib.Message.print('verbose', 'Creating the index on the table "go_ontology" ...\n')
     xsqlite.create_go_ontology_index(conn)
@@ -321,6 +339,9 @@ def load_table_go_cross_references(conn, ec2go_file, kegg2go_file, metacyc2go_fi
     xsqlite.create_go_cross_references(conn)
     xlib.Message.print('verbose', 'The table is created.\n')
 
+    # initialize the batch inserter of the table "go_cross_references"
+    batch_inserter = xsqlite.BatchInserter(conn, 'go_cross_references')
+
     # initialize the row data dictionary and the external database name and description
     row_dict = {}
     row_dict['external_db'] = 'ec'
@@ -329,7 +350,7 @@ def load_table_go_cross_references(conn, ec2go_file, kegg2go_file, metacyc2go_fi
     # open the ec2go file
     if ec2go_file.endswith('.gz'):
         try:
-            ec2go_file_id = gzip.open(ec2go_file, mode='rt', encoding='iso-8859-1')
+            ec2go_file_id = xlib.open_gzip(ec2go_file, mode='rt', encoding='iso-8859-1')
         except Exception as e:
             raise xlib.ProgramException('F002', ec2go_file)
     else:
@@ -374,11 +395,11 @@ def load_table_go_cross_references(conn, ec2go_file, kegg2go_file, metacyc2go_fi
             row_dict['go_term'] = row_dict['go_term'].replace('GO:', '')
             row_dict['external_id'] = row_dict['external_id'].replace('EC:', '')
 
-            # change quotation marks and semicolons in "go_term"
-            row_dict['go_term'] = row_dict['go_term'].replace("'", '|').replace(';', ',')
+            # change semicolons in "go_term"
+            row_dict['go_term'] = row_dict['go_term'].replace(';', ',')
 
             # insert data into table "go_cross_references"
-            xsqlite.insert_go_cross_references_row(conn, row_dict)
+            batch_inserter.add_row(row_dict)
             inserted_row_counter += 1
 
             # print record counter
@@ -400,7 +421,7 @@ def load_table_go_cross_references(conn, ec2go_file, kegg2go_file, metacyc2go_fi
     # open the kegg2go file
     if kegg2go_file.endswith('.gz'):
         try:
-            kegg2go_file_id = gzip.open(kegg2go_file, mode='rt', encoding='iso-8859-1')
+            kegg2go_file_id = xlib.open_gzip(kegg2go_file, mode='rt', encoding='iso-8859-1')
         except Exception as e:
             raise xlib.ProgramException('F002', kegg2go_file)
     else:
@@ -442,11 +463,11 @@ def load_table_go_cross_references(conn, ec2go_file, kegg2go_file, metacyc2go_fi
             row_dict['go_term'] = row_dict['go_term'].replace('GO:', '')
             row_dict['external_id'] = row_dict['external_id'].replace('KEGG:', '')
 
-            # change quotation marks and semicolons in "go_term"
-            row_dict['go_term'] = row_dict['go_term'].replace("'", '|').replace(';', ',')
+            # change semicolons in "go_term"
+            row_dict['go_term'] = row_dict['go_term'].replace(';', ',')
 
             # insert data into table "go_cross_references"
-            xsqlite.insert_go_cross_references_row(conn, row_dict)
+            batch_inserter.add_row(row_dict)
             inserted_row_counter += 1
 
             # print record counter
@@ -468,7 +489,7 @@ def load_table_go_cross_references(conn, ec2go_file, kegg2go_file, metacyc2go_fi
     # open the metacyc2go file
     if metacyc2go_file.endswith('.gz'):
         try:
-            metacyc2go_file_id = gzip.open(metacyc2go_file, mode='rt', encoding='iso-8859-1')
+            metacyc2go_file_id = xlib.open_gzip(metacyc2go_file, mode='rt', encoding='iso-8859-1')
         except Exception as e:
             raise xlib.ProgramException('F002', metacyc2go_file)
     else:
@@ -510,11 +531,11 @@ def load_table_go_cross_references(conn, ec2go_file, kegg2go_file, metacyc2go_fi
             row_dict['go_term'] = row_dict['go_term'].replace('GO:', '')
             row_dict['external_id'] = row_dict['external_id'].replace('MetaCyc:', '')
 
-            # change quotation marks and semicolons in "go_term"
-            row_dict['go_term'] = row_dict['go_term'].replace("'", '|').replace(';', ',')
+            # change semicolons in "go_term"
+            row_dict['go_term'] = row_dict['go_term'].replace(';', ',')
 
             # insert data into table "go_cross_references"
-            xsqlite.insert_go_cross_references_row(conn, row_dict)
+            batch_inserter.add_row(row_dict)
             inserted_row_counter += 1
 
             # print record counter
@@ -535,7 +556,7 @@ def load_table_go_cross_references(conn, ec2go_file, kegg2go_file, metacyc2go_fi
     # open the interpro file
     if interpro2go_file.endswith('.gz'):
         try:
-            interpro2go_file_id = gzip.open(interpro2go_file, mode='rt', encoding='iso-8859-1')
+            interpro2go_file_id = xlib.open_gzip(interpro2go_file, mode='rt', encoding='iso-8859-1')
         except Exception as e:
             raise xlib.ProgramException('F002', interpro2go_file)
     else:
@@ -579,12 +600,12 @@ def load_table_go_cross_references(conn, ec2go_file, kegg2go_file, metacyc2go_fi
             row_dict['go_term'] = row_dict['go_term'].replace('GO:', '')
             row_dict['external_id'] = row_dict['external_id'].replace('InterPro:', '')
 
-            # change quotation marks and semicolons in "go_term" and "external_desc"
-            row_dict['go_term'] = row_dict['go_term'].replace("'", '|').replace(';', ',')
-            row_dict['external_desc'] = row_dict['external_desc'].replace("'", '|').replace(';', ',')
+            # change semicolons in "go_term" and "external_desc"
+            row_dict['go_term'] = row_dict['go_term'].replace(';', ',')
+            row_dict['external_desc'] = row_dict['external_desc'].replace(';', ',')
 
             # insert data into table "go_cross_references"
-            xsqlite.insert_go_cross_references_row(conn, row_dict)
+            batch_inserter.add_row(row_dict)
             inserted_row_counter += 1
 
             # print record counter
@@ -598,6 +619,9 @@ def load_table_go_cross_references(conn, ec2go_file, kegg2go_file, metacyc2go_fi
     # close interpro2go file
     interpro2go_file_id.close()
 
+    # insert the rows remaining in the batch
+    batch_inserter.flush()
+
     # create the index on the table "go_cross_references"
     xlib.Message.print('verbose', 'Creating the index on the table "go_cross_references" ...\n')
     xsqlite.create_go_cross_references_index(conn)
@@ -24,7 +24,6 @@ This program loads InterPro data into TOA database.
 #-------------------------------------------------------------------------------
 
 import argparse
-import gzip
 import os
 import re
 import sys
@@ -48,11 +47,14 @@ def main(argv):
     check_args(args)
 
     # connect to the TOA database
-    conn = xsqlite.connect_database(args.toa_database)
+    conn = xsqlite.connect_database(args.toa_database, args.db_profile)
 
     # load table of mappings of InterPro entries to Gene Ontology terms
     load_table_interpro_interpro2go(conn, args.interpro2go_file)
 
+    # save the change of the InterPro data (all sequences are annotated again by the re-annotation of pipeline runs)
+    xsqlite.save_reference_group_change(conn, 'interpro')
+
     # close connection to TOA database
     conn.close()
 
@@ -71,6 +73,7 @@ def build_parser():
     parser._optionals.title = 'Arguments'
     parser.add_argument('--db', dest='toa_database', help='Path of the TOA database (mandatory).')
     parser.add_argument('--interpro2go', dest='interpro2go_file', help='Path of the interpro2go file (mandatory).')
+    parser.add_argument('--db-profile', dest='db_profile', help=f'Profile of the connection to the TOA database: {xlib.get_db_profile_code_list_text()}; default: {xlib.Const.DEFAULT_DB_PROFILE}.')
     parser.add_argument('--verbose', dest='verbose', help=f'Additional job status info during the run: {xlib.get_verbose_code_list_text()}; default: {xlib.Const.DEFAULT_VERBOSE}.')
     parser.add_argument('--trace', dest='trace', help=f'Additional info useful to the developer team: {xlib.get_trace_code_list_text()}; default: {xlib.Const.DEFAULT_TRACE}.')
 
@@ -100,6 +103,15 @@ def check_args(args):
         xlib.Message.print('error', f'*** The file {args.interpro2go_file} does not exist.')
         OK = False
 
+    # check "db_profile"
+    if args.db_profile is None:
+        args.db_profile = xlib.Const.DEFAULT_DB_PROFILE
+    elif not xlib.check_code(args.db_profile, xlib.get_db_profile_code_list(), case_sensitive=False):
+        xlib.Message.print('error', f'*** db-profile has to be {xlib.get_db_profile_code_list_text()}.')
+        OK = False
+    else:
+        args.db_profile = args.db_profile.upper()
+
     # check "verbose"
     if args.verbose is None:
         args.verbose = xlib.Const.DEFAULT_VERBOSE
@@ -138,10 +150,13 @@ def load_table_interpro_interpro2go(conn, interpro2go_file):
     xsqlite.create_interpro_interpro2go(conn)
     xlib.Message.print('verbose', 'The table is created.\n')
 
+    # initialize the batch inserter of the table "interpro_interpro2go"
+    batch_inserter = xsqlite.BatchInserter(conn, 'interpro_interpro2go')
+
     # open the file of interpro2go
     if interpro2go_file.endswith('.gz'):
         try:
-            interpro2go_file_id = gzip.open(interpro2go_file, mode='rt', encoding='iso-8859-1')
+            interpro2go_file_id = xlib.open_gzip(interpro2go_file, mode='rt', encoding='iso-8859-1')
         except Exception as e:
             raise xlib.ProgramException('F002', interpro2go_file)
     else:
@@ -188,14 +203,14 @@ def load_table_interpro_interpro2go(conn, interpro2go_file):
             # remove database name from text
             row_dict['go_id'] = row_dict['go_id'].replace('GO:', '')
 
-            # change quotation marks and semicolons in "interpro_desc"
-            row_dict['interpro_desc'] = row_dict['interpro_desc'].replace("'", '|').replace(';', ',')
+            # change semicolons in "interpro_desc"
+            row_dict['interpro_desc'] = row_dict['interpro_desc'].replace(';', ',')
 
-            # change quotation marks and semicolon in "go_desc"
-            row_dict['go_desc'] = row_dict['go_desc'].replace("'", '|').replace(';', ',')
+            # change semicolon in "go_desc"
+            row_dict['go_desc'] = row_dict['go_desc'].replace(';', ',')
 
             # insert data into table "interpro_interpro2go"
-            xsqlite.insert_interpro_interpro2go_row(conn, row_dict)
+            batch_inserter.add_row(row_dict)
             inserted_row_counter += 1
 
         # print record counter
@@ -206,6 +221,9 @@ def load_table_interpro_interpro2go(conn, interpro2go_file):
 
     xlib.Message.print('verbose', '\n')
     
+    # insert the rows remaining in the batch
+    batch_inserter.flush()
+
     # create the index 1 on the table "interpro_interpro2go"
     xlib.Message.print('verbose', 'Creating the index 1 on the table "interpro_interpro2go" ...\n')
     xsqlite.create_interpro_interpro2go_index_1(conn)
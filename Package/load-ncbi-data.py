@@ -25,7 +25,6 @@ into TOA database.
 #-------------------------------------------------------------------------------
 
 import argparse
-import gzip
 import os
 import sys
 
@@ -48,7 +47,7 @@ def main(argv):
     check_args(args)
 
     # connect to the TOA database
-    conn = xsqlite.connect_database(args.toa_database)
+    conn = xsqlite.connect_database(args.toa_database, args.db_profile)
    
     # check the dataset identification
     if args.dataset_id != 'gene':
@@ -80,6 +79,7 @@ def build_parser():
     parser.add_argument('--dataset', dest='dataset_id', help='Type: NCBI dataset identification (mandatory).')
     parser.add_argument('--gene2refseq', dest='gene2refseq_file', help='Path of the gene2refseq file (mandatory).')
     parser.add_argument('--gene2go', dest='gene2go_file', help='Path of the gene2go file (mandatory).')
+    parser.add_argument('--db-profile', dest='db_profile', help=f'Profile of the connection to the TOA database: {xlib.get_db_profile_code_list_text()}; default: {xlib.Const.DEFAULT_DB_PROFILE}.')
     parser.add_argument('--verbose', dest='verbose', help=f'Additional job status info during the run: {xlib.get_verbose_code_list_text()}; default: {xlib.Const.DEFAULT_VERBOSE}.')
     parser.add_argument('--trace', dest='trace', help=f'Additional info useful to the developer team: {xlib.get_trace_code_list_text()}; default: {xlib.Const.DEFAULT_TRACE}.')
 
@@ -124,6 +124,15 @@ def check_args(args):
         xlib.Message.print('error', f'*** The file {args.gene2go_file} does not exist.')
         OK = False
 
+    # check "db_profile"
+    if args.db_profile is None:
+        args.db_profile = xlib.Const.DEFAULT_DB_PROFILE
+    elif not xlib.check_code(args.db_profile, xlib.get_db_profile_code_list(), case_sensitive=False):
+        xlib.Message.print('error', f'*** db-profile has to be {xlib.get_db_profile_code_list_text()}.')
+        OK = False
+    else:
+        args.db_profile = args.db_profile.upper()
+
     # check "verbose"
     if args.verbose is None:
         args.verbose = xlib.Const.DEFAULT_VERBOSE
@@ -171,10 +180,13 @@ def load_table_ncbi_gene2refseq_file(conn, dataset_id, gene2refseq_file):
     xsqlite.create_ncbi_gene2refseq(conn)
     xlib.Message.print('verbose', 'The table is created.\n')
 
+    # initialize the batch inserter of the table "ncbi_gene2refseq"
+    batch_inserter = xsqlite.BatchInserter(conn, 'ncbi_gene2refseq')
+
     # open the gene2refseq file
     if gene2refseq_file.endswith('.gz'):
         try:
-            gene2refseq_file_id = gzip.open(gene2refseq_file, mode='rt', encoding='iso-8859-1')
+            gene2refseq_file_id = xlib.open_gzip(gene2refseq_file, mode='rt', encoding='iso-8859-1')
         except Exception as e:
             raise xlib.ProgramException('F002', gene2refseq_file)
     else:
@@ -226,11 +238,8 @@ def load_table_ncbi_gene2refseq_file(conn, dataset_id, gene2refseq_file):
             except Exception as e:
                 raise xlib.ProgramException('D001', 'GeneID', os.path.basename(gene2refseq_file), record_counter)
 
-            # change quotation marks in "gene_symbol"
-            row_dict['gene_symbol'] = row_dict['gene_symbol'].replace("'", '|')
-
             # insert data into table "ncbi_gene2refseq"
-            xsqlite.insert_ncbi_gene2refseq_row(conn, row_dict)
+            batch_inserter.add_row(row_dict)
             inserted_row_counter += 1
 
             # print counters
@@ -241,6 +250,9 @@ def load_table_ncbi_gene2refseq_file(conn, dataset_id, gene2refseq_file):
 
     xlib.Message.print('verbose', '\n')
 
+    # insert the rows remaining in the batch
+    batch_inserter.flush()
+
     # create the index on the table "ncbi_gene2refseq"
     xlib.Message.print('verbose', 'Creating index on the table "ncbi_gene2refseq" ...\n')
     xsqlite.create_ncbi_gene2refseq_index(conn)
@@ -270,6 +282,9 @@ def load_table_ncbi_gene2go(conn, dataset_id, gene2go_file):
     xsqlite.create_ncbi_gene2go(conn)
     xlib.Message.print('verbose', 'The table is created.\n')
 
+    # initialize the batch inserter of the table "ncbi_gene2go"
+    batch_inserter = xsqlite.BatchInserter(conn, 'ncbi_gene2go')
+
     # initialize the record counter
     record_counter = 0
 
@@ -282,7 +297,7 @@ def load_table_ncbi_gene2go(conn, dataset_id, gene2go_file):
     # open the gene2go file
     if gene2go_file.endswith('.gz'):
         try:
-            gene2go_file_id = gzip.open(gene2go_file, mode='rt', encoding='iso-8859-1')
+            gene2go_file_id = xlib.open_gzip(gene2go_file, mode='rt', encoding='iso-8859-1')
         except Exception as e:
             raise xlib.ProgramException('F002', gene2go_file)
     else:
@@ -336,11 +351,11 @@ def load_table_ncbi_gene2go(conn, dataset_id, gene2go_file):
             # remove database name from text
             row_dict['go_id'] = row_dict['go_id'].replace('GO:', '')
 
-            # change quotation marks and semicolons in "go_term"
-            row_dict['go_term'] = row_dict['go_term'].replace("'", '|').replace(';', ',')
+            # change semicolons in "go_term"
+            row_dict['go_term'] = row_dict['go_term'].replace(';', ',')
 
             # insert data into table "ncbi_gene2go"
-            xsqlite.insert_ncbi_gene2go_row(conn, row_dict)
+            batch_inserter.add_row(row_dict)
             inserted_row_counter += 1
 
             # print counters
@@ -351,6 +366,9 @@ def load_table_ncbi_gene2go(conn, dataset_id, gene2go_file):
 
     xlib.Message.print('verbose', '\n')
 
+    # insert the rows remaining in the batch
+    batch_inserter.flush()
+
     # create the index on the table "ncbi_gene2go"
     xlib.Message.print('verbose', 'Creating the index on the table "ncbi_gene2go" ...\n')
     xsqlite.create_ncbi_gene2go_index(conn)
@@ -25,7 +25,6 @@ PLAZA into TOA database.
 #-------------------------------------------------------------------------------
 
 import argparse
-import gzip
 import os
 import sys
 
@@ -48,7 +47,7 @@ def main(argv):
     check_args(args)
 
     # connect to the TOA database
-    conn = xsqlite.connect_database(args.toa_database)
+    conn = xsqlite.connect_database(args.toa_database, args.db_profile)
 
     # get the PLAZA dataset identification list
     plaza_dataset_id_list = xsqlite.get_plaza_dataset_id_list(conn)
@@ -65,16 +64,21 @@ def main(argv):
         raise xlib.ProgramException('L003', args.species_id)
 
     # load table "plaza_gene_description"
-    load_table_plaza_gene_description(conn, args.dataset_id, args.species_id, args.gene_desc_dir, plaza_species_id_list)
+    load_table_plaza_gene_description(conn, args.dataset_id, args.species_id, args.gene_desc_dir, plaza_species_id_list, args.index_mode)
 
     # load table "plaza_interpro"
-    load_table_plaza_interpro(conn, args.dataset_id, args.species_id, args.interpro_file, plaza_species_id_list)
+    load_table_plaza_interpro(conn, args.dataset_id, args.species_id, args.interpro_file, plaza_species_id_list, args.index_mode)
 
     # load table "plaza_go"
-    load_table_plaza_go(conn, args.dataset_id, args.species_id, args.go_file, plaza_species_id_list)
+    load_table_plaza_go(conn, args.dataset_id, args.species_id, args.go_file, plaza_species_id_list, args.index_mode)
 
     # load table "plaza_mapman"
-    load_table_plaza_mapman(conn, args.dataset_id, args.species_id, args.mapman_file, plaza_species_id_list)
+    load_table_plaza_mapman(conn, args.dataset_id, args.species_id, args.mapman_file, plaza_species_id_list, args.index_mode)
+
+    # save the genes of the dataset whose annotation data changed (they are re-annotated by the re-annotation of pipeline runs)
+    xlib.Message.print('verbose', 'Saving the genes with changed annotation data ...\n')
+    changed_gene_number = xsqlite.save_plaza_reference_changes(conn, args.dataset_id)
+    xlib.Message.print('info', f'Genes with changed annotation data: {changed_gene_number}.')
 
     # close connection to TOA database
     conn.close()
@@ -99,6 +103,8 @@ def build_parser():
     parser.add_argument('--interpro', dest='interpro_file', help='Path of the InterPro file (mandatory).')
     parser.add_argument('--go', dest='go_file', help='Path of the Gene Ontology file (mandatory).')
     parser.add_argument('--mapman', dest='mapman_file', help='Path of the Mapman file (mandatory).')
+    parser.add_argument('--index-mode', dest='index_mode', help=f'Maintenance of the table indexes during the load: {xlib.get_index_mode_code_list_text()}; default: {xlib.Const.DEFAULT_INDEX_MODE}.')
+    parser.add_argument('--db-profile', dest='db_profile', help=f'Profile of the connection to the TOA database: {xlib.get_db_profile_code_list_text()}; default: {xlib.Const.DEFAULT_DB_PROFILE}.')
     parser.add_argument('--verbose', dest='verbose', help=f'Additional job status info during the run: {xlib.get_verbose_code_list_text()}; default: {xlib.Const.DEFAULT_VERBOSE}.')
     parser.add_argument('--trace', dest='trace', help=f'Additional info useful to the developer team: {xlib.get_trace_code_list_text()}; default: {xlib.Const.DEFAULT_TRACE}.')
 
@@ -166,6 +172,24 @@ def check_args(args):
         xlib.Message.print('error', f'*** The file {args.mapman_file} does not exist.')
         OK = False
 
+    # check "index_mode"
+    if args.index_mode is None:
+        args.index_mode = xlib.Const.DEFAULT_INDEX_MODE
+    elif not xlib.check_code(args.index_mode, xlib.get_index_mode_code_list(), case_sensitive=False):
+        xlib.Message.print('error', f'*** index-mode has to be {xlib.get_index_mode_code_list_text()}.')
+        OK = False
+    else:
+        args.index_mode = args.index_mode.upper()
+
+    # check "db_profile"
+    if args.db_profile is None:
+        args.db_profile = xlib.Const.DEFAULT_DB_PROFILE
+    elif not xlib.check_code(args.db_profile, xlib.get_db_profile_code_list(), case_sensitive=False):
+        xlib.Message.print('error', f'*** db-profile has to be {xlib.get_db_profile_code_list_text()}.')
+        OK = False
+    else:
+        args.db_profile = args.db_profile.upper()
+
     # check "verbose"
     if args.verbose is None:
         args.verbose = xlib.Const.DEFAULT_VERBOSE
@@ -190,7 +214,7 @@ def check_args(args):
 
 #-------------------------------------------------------------------------------
 
-def load_table_plaza_gene_description(conn, dataset_id, species_id, gene_desc_dir, plaza_species_id_list):
+def load_table_plaza_gene_description(conn, dataset_id, species_id, gene_desc_dir, plaza_species_id_list, index_mode):
     '''
     '''
 
@@ -199,16 +223,35 @@ def load_table_plaza_gene_description(conn, dataset_id, species_id, gene_desc_di
     xsqlite.create_plaza_gene_description(conn)
     xlib.Message.print('verbose', 'The table is created.\n')
      
-    # create index "plaza_gene_description_index" with columns "dataset_id" and "gene_id"  (if not exists)
-    xlib.Message.print('verbose', 'Creating the index on the table "plaza_gene_description" (if it does not exist) ...\n')
-    xsqlite.create_plaza_gene_description_index(conn)
-    xlib.Message.print('verbose', 'The index is created.\n')
-    
-    # delete files from table "plaza_gene_description" corresponding to the dataset and species identifications
+    # initialize the phase timer
+    phase_timer = xlib.PhaseTimer()
+
+    # create the index on the table "plaza_gene_description" (in the deferred index mode, it is created after inserting rows)
+    if index_mode == 'IMMEDIATE':
+        phase_timer.start('index creation')
+        xlib.Message.print('verbose', 'Creating the index on the table "plaza_gene_description" (if it does not exist) ...\n')
+        xsqlite.create_plaza_gene_description_index(conn)
+        xlib.Message.print('verbose', 'The index is created.\n')
+
+    # delete files from table "plaza_gene_description" corresponding to the dataset and species identifications (the index is used when it exists)
+    phase_timer.start('deletion')
     xlib.Message.print('verbose', 'Deleting previous rows from the table "plaza_gene_description" ...\n')
     xsqlite.delete_plaza_gene_description_rows(conn, dataset_id, species_id)
     xlib.Message.print('verbose', 'Rows are deleted.\n')
 
+    # drop the indexes of the table "plaza_gene_description" in the deferred index mode
+    if index_mode == 'DEFERRED':
+        phase_timer.start('index drop')
+        xlib.Message.print('verbose', 'Dropping the indexes of the table "plaza_gene_description" ...\n')
+        index_sentence_list = xsqlite.drop_table_indexes(conn, 'plaza_gene_description')
+        xlib.Message.print('verbose', 'The indexes are dropped.\n')
+
+    # start the measure of the insertion
+    phase_timer.start('insertion')
+
+    # initialize the batch inserter of the table "plaza_gene_description"
+    batch_inserter = xsqlite.BatchInserter(conn, 'plaza_gene_description')
+
     # get the gene description file list
     if species_id != 'all':
         gene_desc_file_list = ['gene_description.{}.csv.gz'.format(species_id)]
@@ -236,7 +279,7 @@ def load_table_plaza_gene_description(conn, dataset_id, species_id, gene_desc_di
         # open the gene description file
         if gene_desc_file.endswith('.gz'):
             try:
-                gene_desc_file_id = gzip.open(gene_desc_file, mode='rt', encoding='iso-8859-1')
+                gene_desc_file_id = xlib.open_gzip(gene_desc_file, mode='rt', encoding='iso-8859-1')
             except Exception as e:
                 raise xlib.ProgramException('F002', gene_desc_file)
         else:
@@ -310,11 +353,11 @@ def load_table_plaza_gene_description(conn, dataset_id, species_id, gene_desc_di
                 # if PLAZA species identification has value not null (for non-comment records)
                 if not record.startswith('#'):
 
-                    # change quotation marks and semicolons in "desc"
-                    row_dict['desc'] = row_dict['desc'].replace("'", '|').replace(';', ',')
+                    # change semicolons in "desc"
+                    row_dict['desc'] = row_dict['desc'].replace(';', ',')
 
                     # insert data into table "plaza_gene_description"
-                    xsqlite.insert_plaza_gene_description_row(conn, row_dict)
+                    batch_inserter.add_row(row_dict)
                     inserted_row_counter += 1
 
                 # print record counter
@@ -328,14 +371,29 @@ def load_table_plaza_gene_description(conn, dataset_id, species_id, gene_desc_di
         # close gene description file
         gene_desc_file_id.close()
 
+    # insert the rows remaining in the batch
+    batch_inserter.flush()
+
+    # create the indexes of the table "plaza_gene_description" in the deferred index mode
+    if index_mode == 'DEFERRED':
+        phase_timer.start('index creation')
+        xlib.Message.print('verbose', 'Creating the indexes of the table "plaza_gene_description" ...\n')
+        xsqlite.create_table_indexes(conn, index_sentence_list)
+        xsqlite.create_plaza_gene_description_index(conn)
+        xlib.Message.print('verbose', 'The indexes are created.\n')
+
     # save changes into TOA database
+    phase_timer.start('commit')
     xlib.Message.print('verbose', 'Saving changes into TOA database ...\n')
     conn.commit()
     xlib.Message.print('verbose', 'Changes are saved.\n')
 
+    # print the elapsed time of each phase
+    phase_timer.print_summary('the load of the table "plaza_gene_description"')
+
 #-------------------------------------------------------------------------------
 
-def load_table_plaza_interpro(conn, dataset_id, species_id, interpro_file, plaza_species_id_list):
+def load_table_plaza_interpro(conn, dataset_id, species_id, interpro_file, plaza_species_id_list, index_mode):
     '''
     '''
 
@@ -344,20 +402,39 @@ def load_table_plaza_interpro(conn, dataset_id, species_id, interpro_file, plaza
     xsqlite.create_plaza_interpro(conn)
     xlib.Message.print('verbose', 'The table is created.\n')
      
-    # create index "plaza_interpro_index" with columns "dataset_id" and "gene_id"  (if not exists)
-    xlib.Message.print('verbose', 'Creating the index on the table "plaza_interpro" (if it does not exist) ...\n')
-    xsqlite.create_plaza_interpro_index(conn)
-    xlib.Message.print('verbose', 'The index is created.\n')
-    
-    # delete files from table "plaza_interpro" corresponding to the dataset and species identifications
+    # initialize the phase timer
+    phase_timer = xlib.PhaseTimer()
+
+    # create the index on the table "plaza_interpro" (in the deferred index mode, it is created after inserting rows)
+    if index_mode == 'IMMEDIATE':
+        phase_timer.start('index creation')
+        xlib.Message.print('verbose', 'Creating the index on the table "plaza_interpro" (if it does not exist) ...\n')
+        xsqlite.create_plaza_interpro_index(conn)
+        xlib.Message.print('verbose', 'The index is created.\n')
+
+    # delete files from table "plaza_interpro" corresponding to the dataset and species identifications (the index is used when it exists)
+    phase_timer.start('deletion')
     xlib.Message.print('verbose', 'Deleting previous rows from the table "plaza_interpro" ...\n')
     xsqlite.delete_plaza_interpro_rows(conn, dataset_id, species_id)
     xlib.Message.print('verbose', 'Rows are deleted.\n')
 
+    # drop the indexes of the table "plaza_interpro" in the deferred index mode
+    if index_mode == 'DEFERRED':
+        phase_timer.start('index drop')
+        xlib.Message.print('verbose', 'Dropping the indexes of the table "plaza_interpro" ...\n')
+        index_sentence_list = xsqlite.drop_table_indexes(conn, 'plaza_interpro')
+        xlib.Message.print('verbose', 'The indexes are dropped.\n')
+
+    # start the measure of the insertion
+    phase_timer.start('insertion')
+
+    # initialize the batch inserter of the table "plaza_interpro"
+    batch_inserter = xsqlite.BatchInserter(conn, 'plaza_interpro')
+
     # open the InterPro file
     if interpro_file.endswith('.gz'):
         try:
-            interpro_file_id = gzip.open(interpro_file, mode='rt', encoding='iso-8859-1')
+            interpro_file_id = xlib.open_gzip(interpro_file, mode='rt', encoding='iso-8859-1')
         except Exception as e:
             raise xlib.ProgramException('F002', interpro_file)
     else:
@@ -475,11 +552,11 @@ def load_table_plaza_interpro(conn, dataset_id, species_id, interpro_file, plaza
                     row_dict['source'] = xlib.get_na()
                     row_dict['domain_id'] = xlib.get_na()
 
-                # change quotation marks and semicolons in "desc"
-                row_dict['desc'] = row_dict['desc'].replace("'", '|').replace(';', ',')
+                # change semicolons in "desc"
+                row_dict['desc'] = row_dict['desc'].replace(';', ',')
 
                 # insert data into table "plaza_interpro"
-                xsqlite.insert_plaza_interpro_row(conn, row_dict)
+                batch_inserter.add_row(row_dict)
                 inserted_row_counter += 1
 
             # print record counter
@@ -490,17 +567,32 @@ def load_table_plaza_interpro(conn, dataset_id, species_id, interpro_file, plaza
 
     xlib.Message.print('verbose', '\n')
 
+    # insert the rows remaining in the batch
+    batch_inserter.flush()
+
+    # create the indexes of the table "plaza_interpro" in the deferred index mode
+    if index_mode == 'DEFERRED':
+        phase_timer.start('index creation')
+        xlib.Message.print('verbose', 'Creating the indexes of the table "plaza_interpro" ...\n')
+        xsqlite.create_table_indexes(conn, index_sentence_list)
+        xsqlite.create_plaza_interpro_index(conn)
+        xlib.Message.print('verbose', 'The indexes are created.\n')
+
     # save changes into TOA database
+    phase_timer.start('commit')
     xlib.Message.print('verbose', 'Saving changes into TOA database ...\n')
     conn.commit()
     xlib.Message.print('verbose', 'Changes are saved.\n')
 
+    # print the elapsed time of each phase
+    phase_timer.print_summary('the load of the table "plaza_interpro"')
+
     # close InterPro file
     interpro_file_id.close()
 
 #-------------------------------------------------------------------------------
 
-def load_table_plaza_go(conn, dataset_id, species_id, go_file, plaza_species_id_list):
+def load_table_plaza_go(conn, dataset_id, species_id, go_file, plaza_species_id_list, index_mode):
     '''
     '''
     
@@ -509,20 +601,39 @@ def load_table_plaza_go(conn, dataset_id, species_id, go_file, plaza_species_id_
     xsqlite.create_plaza_go(conn)
     xlib.Message.print('verbose', 'The table is created.\n')
     
-    # create the index on table "plaza_go"
-    xlib.Message.print('verbose', 'Creating the index on the table "plaza_go" (if it does not exist) ...\n')
-    xsqlite.create_plaza_go_index(conn)
-    xlib.Message.print('verbose', 'The index is created.\n')
-   
-    # delete files from table "plaza_go" corresponding to the dataset and species identifications
+    # initialize the phase timer
+    phase_timer = xlib.PhaseTimer()
+
+    # create the index on the table "plaza_go" (in the deferred index mode, it is created after inserting rows)
+    if index_mode == 'IMMEDIATE':
+        phase_timer.start('index creation')
+        xlib.Message.print('verbose', 'Creating the index on the table "plaza_go" (if it does not exist) ...\n')
+        xsqlite.create_plaza_go_index(conn)
+        xlib.Message.print('verbose', 'The index is created.\n')
+
+    # delete files from table "plaza_go" corresponding to the dataset and species identifications (the index is used when it exists)
+    phase_timer.start('deletion')
     xlib.Message.print('verbose', 'Deleting previous rows from the table "plaza_go" ...\n')
     xsqlite.delete_plaza_go_rows(conn, dataset_id, species_id)
     xlib.Message.print('verbose', 'Rows are deleted.\n')
 
+    # drop the indexes of the table "plaza_go" in the deferred index mode
+    if index_mode == 'DEFERRED':
+        phase_timer.start('index drop')
+        xlib.Message.print('verbose', 'Dropping the indexes of the table "plaza_go" ...\n')
+        index_sentence_list = xsqlite.drop_table_indexes(conn, 'plaza_go')
+        xlib.Message.print('verbose', 'The indexes are dropped.\n')
+
+    # start the measure of the insertion
+    phase_timer.start('insertion')
+
+    # initialize the batch inserter of the table "plaza_go"
+    batch_inserter = xsqlite.BatchInserter(conn, 'plaza_go')
+
     # open the Gene Ontology file
     if go_file.endswith('.gz'):
         try:
-            go_file_id = gzip.open(go_file, mode='rt', encoding='iso-8859-1')
+            go_file_id = xlib.open_gzip(go_file, mode='rt', encoding='iso-8859-1')
         except Exception as e:
             raise xlib.ProgramException('F002', go_file)
     else:
@@ -608,11 +719,11 @@ def load_table_plaza_go(conn, dataset_id, species_id, go_file, plaza_species_id_
                 # remove database name from text
                 row_dict['go_id'] = row_dict['go_id'].replace('GO:', '')
 
-                # change quotation marks and semicolos in "desc"
-                row_dict['desc'] = row_dict['desc'].replace("'", '|').replace(';', ',')
+                # change semicolos in "desc"
+                row_dict['desc'] = row_dict['desc'].replace(';', ',')
 
                 # insert data into table "plaza_go"
-                xsqlite.insert_plaza_go_row(conn, row_dict)
+                batch_inserter.add_row(row_dict)
                 inserted_row_counter += 1
 
             # print record counter
@@ -623,17 +734,32 @@ def load_table_plaza_go(conn, dataset_id, species_id, go_file, plaza_species_id_
 
     xlib.Message.print('verbose', '\n')
 
+    # insert the rows remaining in the batch
+    batch_inserter.flush()
+
+    # create the indexes of the table "plaza_go" in the deferred index mode
+    if index_mode == 'DEFERRED':
+        phase_timer.start('index creation')
+        xlib.Message.print('verbose', 'Creating the indexes of the table "plaza_go" ...\n')
+        xsqlite.create_table_indexes(conn, index_sentence_list)
+        xsqlite.create_plaza_go_index(conn)
+        xlib.Message.print('verbose', 'The indexes are created.\n')
+
     # save changes into TOA database
+    phase_timer.start('commit')
     xlib.Message.print('verbose', 'Saving changes into TOA database ...\n')
     conn.commit()
     xlib.Message.print('verbose', 'Changes are saved.\n')
 
+    # print the elapsed time of each phase
+    phase_timer.print_summary('the load of the table "plaza_go"')
+
     # close Gene Ontology file
     go_file_id.close()
 
 #-------------------------------------------------------------------------------
 
-def load_table_plaza_mapman(conn, dataset_id, species_id, mapman_file, plaza_species_id_list):
+def load_table_plaza_mapman(conn, dataset_id, species_id, mapman_file, plaza_species_id_list, index_mode):
     '''
     '''
     
@@ -642,20 +768,39 @@ def load_table_plaza_mapman(conn, dataset_id, species_id, mapman_file, plaza_spe
     xsqlite.create_plaza_mapman(conn)
     xlib.Message.print('verbose', 'The table is created.\n')
     
-    # create the index on table "plaza_mapman"
-    xlib.Message.print('verbose', 'Creating the index on the table "plaza_mapman" (if it does not exist) ...\n')
-    xsqlite.create_plaza_mapman_index(conn)
-    xlib.Message.print('verbose', 'The index is created.\n')
-   
-    # delete files from table "plaza_mapman" corresponding to the dataset and species identifications
+    # initialize the phase timer
+    phase_timer = xlib.PhaseTimer()
+
+    # create the index on the table "plaza_mapman" (in the deferred index mode, it is created after inserting rows)
+    if index_mode == 'IMMEDIATE':
+        phase_timer.start('index creation')
+        xlib.Message.print('verbose', 'Creating the index on the table "plaza_mapman" (if it does not exist) ...\n')
+        xsqlite.create_plaza_mapman_index(conn)
+        xlib.Message.print('verbose', 'The index is created.\n')
+
+    # delete files from table "plaza_mapman" corresponding to the dataset and species identifications (the index is used when it exists)
+    phase_timer.start('deletion')
     xlib.Message.print('verbose', 'Deleting previous rows from the table "plaza_mapman" ...\n')
     xsqlite.delete_plaza_mapman_rows(conn, dataset_id, species_id)
     xlib.Message.print('verbose', 'Rows are deleted.\n')
 
+    # drop the indexes of the table "plaza_mapman" in the deferred index mode
+    if index_mode == 'DEFERRED':
+        phase_timer.start('index drop')
+        xlib.Message.print('verbose', 'Dropping the indexes of the table "plaza_mapman" ...\n')
+        index_sentence_list = xsqlite.drop_table_indexes(conn, 'plaza_mapman')
+        xlib.Message.print('verbose', 'The indexes are dropped.\n')
+
+    # start the measure of the insertion
+    phase_timer.start('insertion')
+
+    # initialize the batch inserter of the table "plaza_mapman"
+    batch_inserter = xsqlite.BatchInserter(conn, 'plaza_mapman')
+
     # open the Gene Ontology file
     if mapman_file.endswith('.gz'):
         try:
-            mapman_file_id = gzip.open(mapman_file, mode='rt', encoding='iso-8859-1')
+            mapman_file_id = xlib.open_gzip(mapman_file, mode='rt', encoding='iso-8859-1')
         except Exception as e:
             raise xlib.ProgramException('F002', mapman_file)
     else:
@@ -721,11 +866,11 @@ def load_table_plaza_mapman(conn, dataset_id, species_id, mapman_file, plaza_spe
                     print('plaza_species_id: {}'.format(row_dict['plaza_species_id']))
                     raise xlib.ProgramException('L002', 'species', os.path.basename(mapman_file), record_counter)
 
-                # change quotation marks and semicolos in "desc"
-                row_dict['desc'] = row_dict['desc'].replace("'", '|').replace(';', ',')
+                # change semicolos in "desc"
+                row_dict['desc'] = row_dict['desc'].replace(';', ',')
 
                 # insert data into table "plaza_mapman"
-                xsqlite.insert_plaza_mapman_row(conn, row_dict)
+                batch_inserter.add_row(row_dict)
                 inserted_row_counter += 1
 
             # print record counter
@@ -736,11 +881,26 @@ def load_table_plaza_mapman(conn, dataset_id, species_id, mapman_file, plaza_spe
 
     xlib.Message.print('verbose', '\n')
 
+    # insert the rows remaining in the batch
+    batch_inserter.flush()
+
+    # create the indexes of the table "plaza_mapman" in the deferred index mode
+    if index_mode == 'DEFERRED':
+        phase_timer.start('index creation')
+        xlib.Message.print('verbose', 'Creating the indexes of the table "plaza_mapman" ...\n')
+        xsqlite.create_table_indexes(conn, index_sentence_list)
+        xsqlite.create_plaza_mapman_index(conn)
+        xlib.Message.print('verbose', 'The indexes are created.\n')
+
     # save changes into TOA database
+    phase_timer.start('commit')
     xlib.Message.print('verbose', 'Saving changes into TOA database ...\n')
     conn.commit()
     xlib.Message.print('verbose', 'Changes are saved.\n')
 
+    # print the elapsed time of each phase
+    phase_timer.print_summary('the load of the table "plaza_mapman"')
+
     # close Gene Ontology file
     mapman_file_id.close()
 
@@ -0,0 +1,332 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+#-------------------------------------------------------------------------------
+
+'''
+This software has been developed by:
+
+    GI Sistemas Naturales e Historia Forestal (formerly known as GI Genetica, Fisiologia e Historia Forestal)
+    Dpto. Sistemas y Recursos Naturales
+    ETSI Montes, Forestal y del Medio Natural
+    Universidad Politecnica de Madrid
+    https://github.com/ggfhf/
+
+Licence: GNU General Public Licence Version 3.
+'''
+
+#-------------------------------------------------------------------------------
+
+'''
+This program loads the taxonomy lineages of the NCBI Taxonomy database dump
+(files names.dmp and nodes.dmp) into TOA database.
+'''
+
+#-------------------------------------------------------------------------------
+
+import argparse
+import os
+import sys
+
+import xlib
+import xsqlite
+
+#-------------------------------------------------------------------------------
+
+def main(argv):
+    '''
+    Main line of the program.
+    '''
+
+    # check the operating system
+    xlib.check_os()
+
+    # get and check the arguments
+    parser = build_parser()
+    args = parser.parse_args()
+    check_args(args)
+
+    # connect to the TOA database
+    conn = xsqlite.connect_database(args.toa_database, args.db_profile)
+
+    # load table "taxonomy_lineages"
+    load_table_taxonomy_lineages(conn, args.names_file, args.nodes_file)
+
+    # close connection to TOA database
+    conn.close()
+
+#-------------------------------------------------------------------------------
+
+def build_parser():
+    '''
+    Build the parser with the available arguments.
+    '''
+
+    # create the parser and add arguments
+    description = 'Description: This program loads the taxonomy lineages of the NCBI Taxonomy database dump into TOA database.'
+    text = f'{xlib.get_long_project_name()} v{xlib.get_project_version()} - {os.path.basename(__file__)}\n\n{description}\n'
+    usage = f'\r{text.ljust(len("usage:"))}\nUsage: {os.path.basename(__file__)} arguments'
+    parser = argparse.ArgumentParser(usage=usage)
+    parser._optionals.title = 'Arguments'
+    parser.add_argument('--db', dest='toa_database', help='Path of the TOA database (mandatory).')
+    parser.add_argument('--names', dest='names_file', help='Path of the names.dmp file (mandatory).')
+    parser.add_argument('--nodes', dest='nodes_file', help='Path of the nodes.dmp file (mandatory).')
+    parser.add_argument('--db-profile', dest='db_profile', help=f'Profile of the connection to the TOA database: {xlib.get_db_profile_code_list_text()}; default: {xlib.Const.DEFAULT_DB_PROFILE}.')
+    parser.add_argument('--verbose', dest='verbose', help=f'Additional job status info during the run: {xlib.get_verbose_code_list_text()}; default: {xlib.Const.DEFAULT_VERBOSE}.')
+    parser.add_argument('--trace', dest='trace', help=f'Additional info useful to the developer team: {xlib.get_trace_code_list_text()}; default: {xlib.Const.DEFAULT_TRACE}.')
+
+    # return the paser
+    return parser
+
+#-------------------------------------------------------------------------------
+
+def check_args(args):
+    '''
+    Check the input arguments.
+    '''
+
+    # initialize the control variable
+    OK = True
+
+    # check "toa_database"
+    if args.toa_database is None:
+        xlib.Message.print('error', '*** The TOA database is not indicated in the input arguments.')
+        OK = False
+
+    # check "names_file"
+    if args.names_file is None:
+        xlib.Message.print('error', '*** The names.dmp file is not indicated in the input arguments.')
+        OK = False
+    elif not os.path.isfile(args.names_file):
+        xlib.Message.print('error', f'*** The file {args.names_file} does not exist.')
+        OK = False
+
+    # check "nodes_file"
+    if args.nodes_file is None:
+        xlib.Message.print('error', '*** The nodes.dmp file is not indicated in the input arguments.')
+        OK = False
+    elif not os.path.isfile(args.nodes_file):
+        xlib.Message.print('error', f'*** The file {args.nodes_file} does not exist.')
+        OK = False
+
+    # check "db_profile"
+    if args.db_profile is None:
+        args.db_profile = xlib.Const.DEFAULT_DB_PROFILE
+    elif not xlib.check_code(args.db_profile, xlib.get_db_profile_code_list(), case_sensitive=False):
+        xlib.Message.print('error', f'*** db-profile has to be {xlib.get_db_profile_code_list_text()}.')
+        OK = False
+    else:
+        args.db_profile = args.db_profile.upper()
+
+    # check "verbose"
+    if args.verbose is None:
+        args.verbose = xlib.Const.DEFAULT_VERBOSE
+    elif not xlib.check_code(args.verbose, xlib.get_verbose_code_list(), case_sensitive=False):
+        xlib.Message.print('error', f'*** verbose has to be {xlib.get_verbose_code_list_text()}.')
+        OK = False
+    if args.verbose.upper() == 'Y':
+        xlib.Message.set_verbose_status(True)
+
+    # check "trace"
+    if args.trace is None:
+        args.trace = xlib.Const.DEFAULT_TRACE
+    elif not xlib.check_code(args.trace, xlib.get_trace_code_list(), case_sensitive=False):
+        xlib.Message.print('error', f'*** trace has to be {xlib.get_trace_code_list_text()}.')
+        OK = False
+    if args.trace.upper() == 'Y':
+        xlib.Message.set_trace_status(True)
+
+    # if there are errors, exit with exception
+    if not OK:
+        raise xlib.ProgramException('P001')
+
+#-------------------------------------------------------------------------------
+
+def load_table_taxonomy_lineages(conn, names_file, nodes_file):
+    '''
+    Load the table "taxonomy_lineages" with the family, phylum, kingdom and superkingdom of each scientific name.
+    '''
+
+    # get the parent and rank dictionaries of the taxonomy nodes
+    (parent_dict, rank_dict) = get_node_dicts(nodes_file)
+
+    # get the scientific names of the taxonomy nodes with a rank of the lineage
+    rank_name_dict = {}
+    for (tax_id, name) in read_scientific_names(names_file):
+        if tax_id in rank_dict:
+            rank_name_dict[tax_id] = name
+
+    # drop table "taxonomy_lineages" (if it exists)
+    xlib.Message.print('verbose', 'Droping the table "taxonomy_lineages" ...\n')
+    xsqlite.drop_taxonomy_lineages(conn)
+    xlib.Message.print('verbose', 'The table is droped.\n')
+
+    # create table "taxonomy_lineages"
+    xlib.Message.print('verbose', 'Creating the table "taxonomy_lineages" ...\n')
+    xsqlite.create_taxonomy_lineages(conn)
+    xlib.Message.print('verbose', 'The table is created.\n')
+
+    # initialize the batch inserter of the table "taxonomy_lineages"
+    batch_inserter = xsqlite.BatchInserter(conn, 'taxonomy_lineages')
+
+    # initialize the lineage dictionary of the ancestors already walked
+    lineage_dict = {}
+
+    # initialize the inserted row counter
+    inserted_row_counter = 0
+
+    # insert the lineage of each scientific name
+    for (tax_id, name) in read_scientific_names(names_file):
+
+        # get the lineage
+        lineage = get_lineage(tax_id, parent_dict, rank_dict, rank_name_dict, lineage_dict)
+
+        # insert data into table "taxonomy_lineages"
+        batch_inserter.add_row((tax_id, name, lineage[0], lineage[1], lineage[2], lineage[3]))
+        inserted_row_counter += 1
+
+        # print counters
+        if inserted_row_counter % 100000 == 0:
+            xlib.Message.print('verbose', f'\rInserted rows: {inserted_row_counter}')
+
+    xlib.Message.print('verbose', f'\rInserted rows: {inserted_row_counter}\n')
+
+    # insert the rows remaining in the batch
+    batch_inserter.flush()
+
+    # create the index on the table "taxonomy_lineages"
+    xlib.Message.print('verbose', 'Creating the index on the table "taxonomy_lineages" ...\n')
+    xsqlite.create_taxonomy_lineages_index(conn)
+    xlib.Message.print('verbose', 'The index is created.\n')
+
+    # save changes into TOA database
+    xlib.Message.print('verbose', 'Saving changes into TOA database ...\n')
+    conn.commit()
+    xlib.Message.print('verbose', 'Changes are saved.\n')
+
+#-------------------------------------------------------------------------------
+
+def get_node_dicts(nodes_file):
+    '''
+    Get the parent dictionary of every taxonomy node and the rank dictionary of the nodes
+    whose rank is part of the lineage (family, phylum, kingdom and superkingdom or domain).
+    '''
+
+    # initialize the dictionaries
+    parent_dict = {}
+    rank_dict = {}
+
+    # set the position of each rank in the lineage
+    rank_position_dict = {'family': 0, 'phylum': 1, 'kingdom': 2, 'superkingdom': 3, 'domain': 3}
+
+    # open the nodes file
+    nodes_file_id = open_dmp_file(nodes_file)
+
+    # initialize the record counter
+    record_counter = 0
+
+    # read every record
+    # record format: tax_id\t|\tparent tax_id\t|\trank\t|\t...
+    for record in nodes_file_id:
+        record_counter += 1
+        data_list = record.split('\t|\t')
+        try:
+            tax_id = int(data_list[0])
+            parent_dict[tax_id] = int(data_list[1])
+            rank = data_list[2].strip()
+        except Exception as e:
+            raise xlib.ProgramException('F006', os.path.basename(nodes_file), record_counter)
+        if rank in rank_position_dict:
+            rank_dict[tax_id] = rank_position_dict[rank]
+
+    # close the nodes file
+    nodes_file_id.close()
+
+    # return the dictionaries
+    return parent_dict, rank_dict
+
+#-------------------------------------------------------------------------------
+
+def read_scientific_names(names_file):
+    '''
+    Iterate over the taxonomy identifications and scientific names of the names file.
+    '''
+
+    # open the names file
+    names_file_id = open_dmp_file(names_file)
+
+    # initialize the record counter
+    record_counter = 0
+
+    # read every record
+    # record format: tax_id\t|\tname_txt\t|\tunique name\t|\tname class\t|
+    for record in names_file_id:
+        record_counter += 1
+        data_list = record.split('\t|\t')
+        try:
+            if data_list[3].rstrip('\t|\n') == 'scientific name':
+                yield int(data_list[0]), data_list[1].strip()
+        except Exception as e:
+            raise xlib.ProgramException('F006', os.path.basename(names_file), record_counter)
+
+    # close the names file
+    names_file_id.close()
+
+#-------------------------------------------------------------------------------
+
+def open_dmp_file(dmp_file):
+    '''
+    Open a file of the NCBI Taxonomy database dump (it can be compressed with gzip).
+    '''
+
+    if dmp_file.endswith('.gz'):
+        try:
+            dmp_file_id = xlib.open_gzip(dmp_file, mode='rt', encoding='iso-8859-1')
+        except Exception as e:
+            raise xlib.ProgramException('F002', dmp_file)
+    else:
+        try:
+            dmp_file_id = open(dmp_file, mode='r', encoding='iso-8859-1')
+        except Exception as e:
+            raise xlib.ProgramException('F001', dmp_file)
+
+    return dmp_file_id
+
+#-------------------------------------------------------------------------------
+
+def get_lineage(tax_id, parent_dict, rank_dict, rank_name_dict, lineage_dict):
+    '''
+    Get the lineage (family, phylum, kingdom and superkingdom names) of a taxonomy identification
+    walking its ancestors (the lineages of the ancestors are kept in a dictionary to be reused).
+    '''
+
+    # walk the ancestors until the root or an ancestor whose lineage is already known
+    path = []
+    current_tax_id = tax_id
+    while current_tax_id not in lineage_dict:
+        path.append(current_tax_id)
+        parent_tax_id = parent_dict.get(current_tax_id, current_tax_id)
+        if parent_tax_id == current_tax_id:
+            break
+        current_tax_id = parent_tax_id
+    lineage = lineage_dict.get(current_tax_id, (xlib.get_na(),) * 4)
+
+    # build the lineage of each node of the path from the top
+    for (i, path_tax_id) in enumerate(reversed(path)):
+        if path_tax_id in rank_dict:
+            position = rank_dict[path_tax_id]
+            lineage = lineage[:position] + (rank_name_dict.get(path_tax_id, xlib.get_na()),) + lineage[position + 1:]
+        if i < len(path) - 1:
+            lineage_dict[path_tax_id] = lineage
+
+    # return the lineage
+    return lineage
+
+#-------------------------------------------------------------------------------
+
+if __name__ == '__main__':
+
+    main(sys.argv[1:])
+    sys.exit(0)
+
+#-------------------------------------------------------------------------------
@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+#-------------------------------------------------------------------------------
+
+'''
+This software has been developed by:
+
+    GI Sistemas Naturales e Historia Forestal (formerly known as GI Genetica, Fisiologia e Historia Forestal)
+    Dpto. Sistemas y Recursos Naturales
+    ETSI Montes, Forestal y del Medio Natural
+    Universidad Politecnica de Madrid
+    https://github.com/ggfhf/
+
+Licence: GNU General Public Licence Version 3.
+'''
+
+#-------------------------------------------------------------------------------
+
+'''
+This program looks up the query sequences of an alignment in the alignment cache (keyed by the hash of each sequence,
+the build of the target database and the aligner parameters) and writes the sequences not found (cache misses) in
+a FASTA file, which is the only one submitted to the aligner.
+'''
+
+#-------------------------------------------------------------------------------
+
+import argparse
+import os
+import sys
+
+import xfasta
+import xlib
+import xsqlite
+
+#-------------------------------------------------------------------------------
+
+def main(argv):
+    '''
+    Main line of the program.
+    '''
+
+    # check the operating system
+    xlib.check_os()
+
+    # get and check the arguments
+    parser = build_parser()
+    args = parser.parse_args()
+    check_args(args)
+
+    # connect to the alignment cache database and create the table (if it does not exist)
+    conn = xsqlite.connect_database(args.alignment_cache_db, 'BULK-LOAD')
+    xsqlite.create_alignment_cache(conn)
+
+    # write the cache misses
+    write_cache_misses(conn, args.seq_file, args.database, args.parameters, args.miss_file)
+
+    # close connection to the alignment cache database
+    conn.close()
+
+#-------------------------------------------------------------------------------
+
+def build_parser():
+    '''
+    Build the parser with the available arguments.
+    '''
+
+    # create the parser and add arguments
+    description = 'Description: This program looks up the query sequences of an alignment in the alignment cache and writes the cache misses.'
+    text = f'{xlib.get_long_project_name()} v{xlib.get_project_version()} - {os.path.basename(__file__)}\n\n{description}\n'
+    usage = f'\r{text.ljust(len("usage:"))}\nUsage: {os.path.basename(__file__)} arguments'
+    parser = argparse.ArgumentParser(usage=usage)
+    parser._optionals.title = 'Arguments'
+    parser.add_argument('--cache', dest='alignment_cache_db', help='Path of the alignment cache database (mandatory).')
+    parser.add_argument('--seqs', dest='seq_file', help='Path of the FASTA file with the query sequences (mandatory).')
+    parser.add_argument('--database', dest='database', help='Path of the target database of the aligner (BLAST+ database path + name or DIAMOND database file) (mandatory).')
+    parser.add_argument('--parameters', dest='parameters', help='Aligner program and parameters (mandatory).')
+    parser.add_argument('--misses', dest='miss_file', help='Path of the FASTA file where the sequences not found in the cache are written (mandatory).')
+    parser.add_argument('--verbose', dest='verbose', help=f'Additional job status info during the run: {xlib.get_verbose_code_list_text()}; default: {xlib.Const.DEFAULT_VERBOSE}.')
+    parser.add_argument('--trace', dest='trace', help=f'Additional info useful to the developer team: {xlib.get_trace_code_list_text()}; default: {xlib.Const.DEFAULT_TRACE}.')
+
+
+    # return the paser
+    return parser
+
+#-------------------------------------------------------------------------------
+
+def check_args(args):
+    '''
+    Check the input arguments.
+    '''
+
+    # initialize the control variable
+    OK = True
+
+    # check "alignment_cache_db"
+    if args.alignment_cache_db is None:
+        xlib.Message.print('error', '*** The alignment cache database is not indicated in the input arguments.')
+        OK = False
+
+    # check "seq_file"
+    if args.seq_file is None:
+        xlib.Message.print('error', '*** The FASTA file with the query sequences is not indicated in the input arguments.')
+        OK = False
+    elif not os.path.isfile(args.seq_file):
+        xlib.Message.print('error', f'*** The file {args.seq_file} does not exist.')
+        OK = False
+
+    # check "database"
+    if args.database is None:
+        xlib.Message.print('error', '*** The target database of the aligner is not indicated in the input arguments.')
+        OK = False
+    elif not os.path.isdir(os.path.dirname(os.path.abspath(args.database))):
+        xlib.Message.print('error', f'*** The directory {os.path.dirname(os.path.abspath(args.database))} does not exist.')
+        OK = False
+
+    # check "parameters"
+    if args.parameters is None:
+        xlib.Message.print('error', '*** The aligner program and parameters are not indicated in the input arguments.')
+        OK = False
+
+    # check "miss_file"
+    if args.miss_file is None:
+        xlib.Message.print('error', '*** The FASTA file of the cache misses is not indicated in the input arguments.')
+        OK = False
+
+    # check "verbose"
+    if args.verbose is None:
+        args.verbose = xlib.Const.DEFAULT_VERBOSE
+    elif not xlib.check_code(args.verbose, xlib.get_verbose_code_list(), case_sensitive=False):
+        xlib.Message.print('error', f'*** verbose has to be {xlib.get_verbose_code_list_text()}.')
+        OK = False
+    if args.verbose.upper() == 'Y':
+        xlib.Message.set_verbose_status(True)
+
+    # check "trace"
+    if args.trace is None:
+        args.trace = xlib.Const.DEFAULT_TRACE
+    elif not xlib.check_code(args.trace, xlib.get_trace_code_list(), case_sensitive=False):
+        xlib.Message.print('error', f'*** trace has to be {xlib.get_trace_code_list_text()}.')
+        OK = False
+    if args.trace.upper() == 'Y':
+        xlib.Message.set_trace_status(True)
+
+    # if there are errors, exit with exception
+    if not OK:
+        raise xlib.ProgramException('P001')
+
+#-------------------------------------------------------------------------------
+
+def write_cache_misses(conn, seq_file, database, parameters, miss_file):
+    '''
+    Write the query sequences not found in the alignment cache in the FASTA file of the cache misses.
+    '''
+
+    # get the alignment key
+    alignment_key = xlib.get_alignment_cache_key(database, parameters)
+    xlib.Message.print('trace', f'alignment_key: {alignment_key}')
+
+    # open the FASTA file of the cache misses
+    try:
+        miss_file_id = open(miss_file, mode='w', encoding='iso-8859-1', newline='\n')
+    except Exception as e:
+        raise xlib.ProgramException('F003', miss_file)
+
+    # initialize the counters
+    hit_counter = 0
+    miss_counter = 0
+
+    # initialize the batch of sequences
+    batch_list = []
+
+    # look up the sequences of the query file in batches
+    xlib.Message.print('verbose', f'Looking up the sequences of {os.path.basename(seq_file)} in the alignment cache ...\n')
+    seq_iterator = xfasta.read_fasta_file(seq_file)
+    while True:
+
+        # read the next sequence and add it to the batch
+        seq_data = next(seq_iterator, None)
+        if seq_data is not None:
+            batch_list.append(seq_data)
+            if len(batch_list) < xlib.Const.DEFAULT_BATCH_SIZE:
+                continue
+
+        # look up the sequences of the batch and write the cache misses
+        alignment_cache_dict = xsqlite.get_alignment_cache_dict(conn, alignment_key, [xlib.get_seq_hash(seq) for (seq_id, seq, record_text) in batch_list])
+        for (seq_id, seq, record_text) in batch_list:
+            if xlib.get_seq_hash(seq) in alignment_cache_dict:
+                hit_counter += 1
+            else:
+                miss_counter += 1
+                miss_file_id.write(record_text if record_text.endswith('\n') else f'{record_text}\n')
+        batch_list = []
+
+        # exit the loop when there are not more sequences
+        if seq_data is None:
+            break
+
+    # close the FASTA file of the cache misses
+    miss_file_id.close()
+
+    # print summary
+    xlib.Message.print('info', f'Alignment cache - Hits: {hit_counter} - Misses: {miss_counter}.')
+
+#-------------------------------------------------------------------------------
+
+if __name__ == '__main__':
+
+    main(sys.argv[1:])
+    sys.exit(0)
+
+#-------------------------------------------------------------------------------
@@ -18,13 +18,13 @@ Licence: GNU General Public Licence Version 3.
 #-------------------------------------------------------------------------------
 
 '''
-This program merges two annotation files.
+This program merges two annotation files or a list of annotation files.
 '''
 
 #-------------------------------------------------------------------------------
 
 import argparse
-import gzip
+import heapq
 import os
 import sys
 
@@ -51,10 +51,17 @@ def main(argv):
     # merge annotation files with operation "1BEST" (all annotations of the first file and annotations if the second file if their seq id is not in the first)
     elif args.merger_operation ==  '1BEST':
         merge_files_operation_1best(args.annotation_file_1, args.type_1, args.annotation_file_2, args.type_2, args.merger_file, args.header)
+    # merge annotation files with operation "ALL" (annotations included in any file of the list)
+    elif args.merger_operation ==  'ALL':
+        merge_files_operation_all(args.annotation_file_list, args.type_list, args.merger_file, args.header)
     # save a annotation file with record format "PLAZA", "REFSEQ", "NT" or "NR" in record format "MERGER"
     elif args.merger_operation ==  'SAVE1':
         save_annotation_file_merger_format(args.annotation_file_1, args.type_1, args.merger_file, args.header)
 
+    # save the merged annotation file in the results database
+    if args.results_db != 'NONE':
+        xlib.save_annotation_file_in_results_db(args.results_db, args.merger_file, 'MERGER', is_header=(args.header == 'Y'))
+
 #-------------------------------------------------------------------------------
 
 def build_parser():
@@ -63,17 +70,20 @@ def build_parser():
     '''
 
     # create the parser and add arguments
-    description = 'This program merges two annotation files.'
+    description = 'This program merges two annotation files or a list of annotation files.'
     text = f'{xlib.get_long_project_name()} v{xlib.get_project_version()} - {os.path.basename(__file__)}\n\n{description}\n'
     usage = f'\r{text.ljust(len("usage:"))}\nUsage: {os.path.basename(__file__)} arguments'
     parser = argparse.ArgumentParser(usage=usage)
     parser._optionals.title = 'Arguments'
-    parser.add_argument('--file1', dest='annotation_file_1', help='Path of the first annotation file in CSV format (mandatory).')
-    parser.add_argument('--type1', dest='type_1', help=f'Type of the first annotation file (mandatory): {xlib.get_type_code_list_text()}.')
-    parser.add_argument('--file2', dest='annotation_file_2', help='Path of the second annotation file in CSV format or NONE if operation is "SAVE1" (mandatory).')
-    parser.add_argument('--type2', dest='type_2', help=f'Type of the second annotation file (mandatory): {xlib.get_type_code_list_text()} or NONE if operation is "SAVE1".')
+    parser.add_argument('--file1', dest='annotation_file_1', help='Path of the first annotation file in CSV format (mandatory if operation is not "ALL").')
+    parser.add_argument('--type1', dest='type_1', help=f'Type of the first annotation file (mandatory if operation is not "ALL"): {xlib.get_type_code_list_text()}.')
+    parser.add_argument('--file2', dest='annotation_file_2', help='Path of the second annotation file in CSV format or NONE if operation is "SAVE1" (mandatory if operation is not "ALL").')
+    parser.add_argument('--type2', dest='type_2', help=f'Type of the second annotation file (mandatory if operation is not "ALL"): {xlib.get_type_code_list_text()} or NONE if operation is "SAVE1".')
+    parser.add_argument('--list', dest='annotation_file_list', help='List of annotation file paths in CSV format with the following format: file1,file2,...,filen (mandatory if operation is "ALL").')
+    parser.add_argument('--types', dest='type_list', help=f'List of types of the annotation files of the list with the following format: type1,type2,...,typen (mandatory if operation is "ALL"); each type has to be {xlib.get_type_code_list_text()}.')
     parser.add_argument('--mfile', dest='merger_file', help='Path of the merged non-annotated transcrip file (mandatory).')
-    parser.add_argument('--operation', dest='merger_operation', help=f'Merger operation (mandatory): {xlib.get_annotation_merger_operation_code_list_text()}.')
+    parser.add_argument('--operation', dest='merger_operation', help=f'Merger operation (mandatory): {xlib.get_annotation_merger_operation_code_list_text()}, ALL (annotations included in any file of the list) or SAVE1 (save the first file in merged format).')
+    parser.add_argument('--results-db', dest='results_db', help='Path of the results database where the merged annotation file is also saved or NONE; default: NONE.')
     parser.add_argument('--header', dest='header', help=f'Insertion of a header record: {xlib.get_header_code_list_text()}; default: {xlib.Const.DEFAULT_HEADER}.')
     parser.add_argument('--verbose', dest='verbose', help=f'Additional job status info during the run: {xlib.get_verbose_code_list_text()}; default: {xlib.Const.DEFAULT_VERBOSE}.')
     parser.add_argument('--trace', dest='trace', help=f'Additional info useful to the developer team: {xlib.get_trace_code_list_text()}; default: {xlib.Const.DEFAULT_TRACE}.')
@@ -91,18 +101,29 @@ def check_args(args):
     # initialize the control variable
     OK = True
 
+    # set if the operation merges a list of annotation files
+    is_list_operation = args.merger_operation is not None and args.merger_operation.upper() == 'ALL'
+
     # check "annotation_file_1"
-    if args.annotation_file_1 is None:
+    if args.annotation_file_1 is None and is_list_operation:
+        args.annotation_file_1 = 'NONE'
+    elif args.annotation_file_1 is None:
         xlib.Message.print('error', '*** The first annotation file is not indicated in the input arguments.')
         OK = False
+    elif args.annotation_file_1.upper() == 'NONE' and is_list_operation:
+        args.annotation_file_1 = args.annotation_file_1.upper()
     elif not os.path.isfile(args.annotation_file_1):
         xlib.Message.print('error', f'*** The file {args.annotation_file_1} does not exist.')
         OK = False
 
     # check "type_1"
-    if args.type_1 is None:
+    if args.type_1 is None and is_list_operation:
+        args.type_1 = 'NONE'
+    elif args.type_1 is None:
         xlib.Message.print('error', '*** The type of first annotation file is not indicated in the input arguments.')
         OK = False
+    elif args.type_1.upper() == 'NONE' and is_list_operation:
+        args.type_1 = args.type_1.upper()
     elif not xlib.check_code(args.type_1, xlib.get_type_code_list(), case_sensitive=False):
         xlib.Message.print('error', f'*** The type of annotation file has to be {xlib.get_type_code_list_text()}.')
         OK = False
@@ -110,7 +131,9 @@ def check_args(args):
         args.type_1 = args.type_1.upper()
 
     # check "annotation_file_2"
-    if args.annotation_file_2 is None:
+    if args.annotation_file_2 is None and is_list_operation:
+        args.annotation_file_2 = 'NONE'
+    elif args.annotation_file_2 is None:
         xlib.Message.print('error', '*** The second annotation file is not indicated in the input arguments.')
         OK = False
     elif args.annotation_file_2.upper() == 'NONE':
@@ -120,7 +143,9 @@ def check_args(args):
         OK = False
 
     # check "type_2"
-    if args.type_2 is None:
+    if args.type_2 is None and is_list_operation:
+        args.type_2 = 'NONE'
+    elif args.type_2 is None:
         xlib.Message.print('error', '*** The format of second annotation file is not indicated in the input arguments.')
         OK = False
     elif args.type_2.upper() == 'NONE' and args.annotation_file_2 != 'NONE':
@@ -134,6 +159,35 @@ def check_args(args):
     else:
         args.type_2 = args.type_2.upper()
 
+    # check "annotation_file_list"
+    if args.annotation_file_list is None and is_list_operation:
+        xlib.Message.print('error', '*** The list of annotation files is not indicated in the input arguments.')
+        OK = False
+    elif args.annotation_file_list is not None:
+        args.annotation_file_list = xlib.split_literal_to_string_list(args.annotation_file_list)
+        for annotation_file in args.annotation_file_list:
+            if not os.path.isfile(annotation_file):
+                xlib.Message.print('error', f'*** The file {annotation_file} does not exist.')
+                OK = False
+
+    # check "type_list"
+    if args.type_list is None and is_list_operation:
+        xlib.Message.print('error', '*** The list of types of the annotation files is not indicated in the input arguments.')
+        OK = False
+    elif args.type_list is not None:
+        args.type_list = xlib.split_literal_to_string_list(args.type_list)
+        for i in range(len(args.type_list)):
+            if not xlib.check_code(args.type_list[i], xlib.get_type_code_list(), case_sensitive=False):
+                xlib.Message.print('error', f'*** The type of annotation file has to be {xlib.get_type_code_list_text()}.')
+                OK = False
+            else:
+                args.type_list[i] = args.type_list[i].upper()
+
+    # check the relationship between "annotation_file_list" and "type_list"
+    if isinstance(args.annotation_file_list, list) and isinstance(args.type_list, list) and len(args.annotation_file_list) != len(args.type_list):
+        xlib.Message.print('error', '*** The list of annotation files and the list of types have to have the same number of items.')
+        OK = False
+
     # check "merger_file"
     if args.merger_file is None:
         xlib.Message.print('error', '*** The merged file is not indicated in the input arguments.')
@@ -146,12 +200,21 @@ def check_args(args):
     elif args.merger_operation.upper() == 'SAVE1' and args.annotation_file_2 != 'NONE':
         xlib.Message.print('error', '*** The merger operation SAVE1 is only valid when the second annotation file is NONE.')
         OK = False
-    elif args.merger_operation.upper() != 'SAVE1' and not xlib.check_code(args.merger_operation, xlib.get_annotation_merger_operation_code_list(), case_sensitive=False) :
+    elif args.merger_operation.upper() == 'ALL' and args.annotation_file_2 != 'NONE':
+        xlib.Message.print('error', '*** The merger operation ALL is only valid with a list of annotation files.')
+        OK = False
+    elif args.merger_operation.upper() not in ['SAVE1', 'ALL'] and not xlib.check_code(args.merger_operation, xlib.get_annotation_merger_operation_code_list(), case_sensitive=False) :
         xlib.Message.print('error', f'*** The merger operation has to be {xlib.get_annotation_merger_operation_code_list_text()}.')
         OK = False
     else:
         args.merger_operation = args.merger_operation.upper()
 
+    # check "results_db"
+    if args.results_db is None:
+        args.results_db = 'NONE'
+    elif args.results_db.upper() == 'NONE':
+        args.results_db = args.results_db.upper()
+
     # check "header"
     if args.header is None:
         args.header = xlib.Const.DEFAULT_HEADER
@@ -193,7 +256,7 @@ def merge_files_operation_1and2(annotation_file_1, type_1, annotation_file_2, ty
     # open the first annotation file
     if annotation_file_1.endswith('.gz'):
         try:
-            annotation_file_1_id = gzip.open(annotation_file_1, mode='rt', encoding='iso-8859-1')
+            annotation_file_1_id = xlib.open_gzip(annotation_file_1, mode='rt', encoding='iso-8859-1')
         except Exception as e:
             raise xlib.ProgramException('F002', annotation_file_1)
     else:
@@ -205,7 +268,7 @@ def merge_files_operation_1and2(annotation_file_1, type_1, annotation_file_2, ty
     # open the second annotation file
     if annotation_file_2.endswith('.gz'):
         try:
-            annotation_file_2_id = gzip.open(annotation_file_2, mode='rt', encoding='iso-8859-1')
+            annotation_file_2_id = xlib.open_gzip(annotation_file_2, mode='rt', encoding='iso-8859-1')
         except Exception as e:
             raise xlib.ProgramException('F002', annotation_file_2)
     else:
@@ -217,7 +280,7 @@ def merge_files_operation_1and2(annotation_file_1, type_1, annotation_file_2, ty
     # open the merged annotation file
     if merger_file.endswith('.gz'):
         try:
-            merger_file_id = gzip.open(merger_file, mode='wt', encoding='iso-8859-1', newline='\n')
+            merger_file_id = xlib.open_gzip(merger_file, mode='wt', encoding='iso-8859-1', newline='\n')
         except Exception as e:
             raise xlib.ProgramException('F004', merger_file)
     else:
@@ -226,6 +289,15 @@ def merge_files_operation_1and2(annotation_file_1, type_1, annotation_file_2, ty
         except Exception as e:
             raise xlib.ProgramException('F003', merger_file)
 
+    # initialize the output buffer of the merged annotation file
+    merger_buffer = xlib.AnnotationOutputBuffer(merger_file_id)
+
+    # initialize the annotation readers and the merged annotation writers
+    annotation_reader_1 = xlib.AnnotationReader(annotation_file_1, annotation_file_1_id, type_1)
+    annotation_reader_2 = xlib.AnnotationReader(annotation_file_2, annotation_file_2_id, type_2)
+    merger_writer_1 = xlib.AnnotationWriter(merger_buffer, type_1, is_merged=True)
+    merger_writer_2 = xlib.AnnotationWriter(merger_buffer, type_2, is_merged=True)
+
     # initialize record counters
     read_record_counter_1 = 0
     read_record_counter_2 = 0
@@ -233,15 +305,15 @@ def merge_files_operation_1and2(annotation_file_1, type_1, annotation_file_2, ty
 
     # print header record in merged file if necessary
     if header == 'Y':
-        xlib.write_annotation_header(merger_file_id, 'MERGER')
+        xlib.write_annotation_header(merger_buffer, 'MERGER')
         written_record_counter += 1
 
     # read the first record of the first annotation file
-    (record_1, key_1, data_dict_1) = xlib.read_annotation_record(annotation_file_1, annotation_file_1_id, type_1, read_record_counter_1)
+    (record_1, key_1, data_dict_1) = annotation_reader_1.read()
     xlib.Message.print('trace', f'key_1: {key_1} - record_1: {record_1}')
 
     # read the first record of the second annotation file
-    (record_2, key_2, data_dict_2) = xlib.read_annotation_record(annotation_file_2, annotation_file_2_id, type_2, read_record_counter_2)
+    (record_2, key_2, data_dict_2) = annotation_reader_2.read()
     xlib.Message.print('trace', f'key_2: {key_2} - record_2: {record_2}')
 
     # while there are records in any annotation file
@@ -254,12 +326,12 @@ def merge_files_operation_1and2(annotation_file_1, type_1, annotation_file_2, ty
             read_record_counter_1 += 1
 
             # write in the merged annotation file
-            xlib.write_merged_annotation_record(merger_file_id, type_1, data_dict_1)
+            merger_writer_1.write(data_dict_1)
             written_record_counter += 1
             xlib.Message.print('verbose', f'\rWritten annotations: {written_record_counter}')
 
             # read the next record of the first annotation file
-            (record_1, key_1, data_dict_1) = xlib.read_annotation_record(annotation_file_1, annotation_file_1_id, type_1, read_record_counter_1)
+            (record_1, key_1, data_dict_1) = annotation_reader_1.read()
             xlib.Message.print('trace', f'key_1: {key_1} - record_1: {record_1}')
 
         # while there are records in both annotation files and key of the first annotation file is equal to the key of the second annotation file
@@ -269,21 +341,21 @@ def merge_files_operation_1and2(annotation_file_1, type_1, annotation_file_2, ty
             read_record_counter_1 += 1
 
             # write the first file record in the merged annotation file
-            xlib.write_merged_annotation_record(merger_file_id, type_1, data_dict_1)
+            merger_writer_1.write(data_dict_1)
             written_record_counter += 1
             xlib.Message.print('verbose', f'\rWritten annotations: {written_record_counter}')
 
             # read the next record of the first annotation file
-            (record_1, key_1, data_dict_1) = xlib.read_annotation_record(annotation_file_1, annotation_file_1_id, type_1, read_record_counter_1)
+            (record_1, key_1, data_dict_1) = annotation_reader_1.read()
             xlib.Message.print('trace', f'key_1: {key_1} - record_1: {record_1}')
 
             # write the second file record in the merged annotation file
-            xlib.write_merged_annotation_record(merger_file_id, type_2, data_dict_2)
+            merger_writer_2.write(data_dict_2)
             written_record_counter += 1
             xlib.Message.print('verbose', f'\rWritten annotations: {written_record_counter}')
 
             # read the next record of the second annotation file
-            (record_2, key_2, data_dict_2) = xlib.read_annotation_record(annotation_file_2, annotation_file_2_id, type_2, read_record_counter_2)
+            (record_2, key_2, data_dict_2) = annotation_reader_2.read()
             xlib.Message.print('trace', f'key_2: {key_2} - record_2: {record_2}')
 
         # while there are records in the second annotation file and key of the first annotation file is greater than the key of the second annotation file
@@ -293,12 +365,12 @@ def merge_files_operation_1and2(annotation_file_1, type_1, annotation_file_2, ty
             read_record_counter_2 += 1
 
             # write in the merged annotation file
-            xlib.write_merged_annotation_record(merger_file_id, type_2, data_dict_2)
+            merger_writer_2.write(data_dict_2)
             written_record_counter += 1
             xlib.Message.print('verbose', f'\rWritten annotations: {written_record_counter}')
 
             # read the next record of the second annotation file
-            (record_2, key_2, data_dict_2) = xlib.read_annotation_record(annotation_file_2, annotation_file_2_id, type_2, read_record_counter_2)
+            (record_2, key_2, data_dict_2) = annotation_reader_2.read()
             xlib.Message.print('trace', f'key_2: {key_2} - record_2: {record_2}')
 
     # print summary
@@ -310,7 +382,7 @@ def merge_files_operation_1and2(annotation_file_1, type_1, annotation_file_2, ty
     # close files
     annotation_file_1_id.close()
     annotation_file_2_id.close()
-    merger_file_id.close()
+    merger_buffer.close()
 
 #-------------------------------------------------------------------------------
 
@@ -323,7 +395,7 @@ def merge_files_operation_1best(annotation_file_1, type_1, annotation_file_2, ty
     # open the first annotation file
     if annotation_file_1.endswith('.gz'):
         try:
-            annotation_file_1_id = gzip.open(annotation_file_1, mode='rt', encoding='iso-8859-1')
+            annotation_file_1_id = xlib.open_gzip(annotation_file_1, mode='rt', encoding='iso-8859-1')
         except Exception as e:
             raise xlib.ProgramException('F002', annotation_file_1)
     else:
@@ -335,7 +407,7 @@ def merge_files_operation_1best(annotation_file_1, type_1, annotation_file_2, ty
     # open the second annotation file
     if annotation_file_2.endswith('.gz'):
         try:
-            annotation_file_2_id = gzip.open(annotation_file_2, mode='rt', encoding='iso-8859-1')
+            annotation_file_2_id = xlib.open_gzip(annotation_file_2, mode='rt', encoding='iso-8859-1')
         except Exception as e:
             raise xlib.ProgramException('F002', annotation_file_2)
     else:
@@ -347,7 +419,7 @@ def merge_files_operation_1best(annotation_file_1, type_1, annotation_file_2, ty
     # open the merged annotation file
     if merger_file.endswith('.gz'):
         try:
-            merger_file_id = gzip.open(merger_file, mode='wt', encoding='iso-8859-1', newline='\n')
+            merger_file_id = xlib.open_gzip(merger_file, mode='wt', encoding='iso-8859-1', newline='\n')
         except Exception as e:
             raise xlib.ProgramException('F004', merger_file)
     else:
@@ -356,6 +428,15 @@ def merge_files_operation_1best(annotation_file_1, type_1, annotation_file_2, ty
         except Exception as e:
             raise xlib.ProgramException('F003', merger_file)
 
+    # initialize the output buffer of the merged annotation file
+    merger_buffer = xlib.AnnotationOutputBuffer(merger_file_id)
+
+    # initialize the annotation readers and the merged annotation writers
+    annotation_reader_1 = xlib.AnnotationReader(annotation_file_1, annotation_file_1_id, type_1)
+    annotation_reader_2 = xlib.AnnotationReader(annotation_file_2, annotation_file_2_id, type_2)
+    merger_writer_1 = xlib.AnnotationWriter(merger_buffer, type_1, is_merged=True)
+    merger_writer_2 = xlib.AnnotationWriter(merger_buffer, type_2, is_merged=True)
+
     # initialize record counters
     read_record_counter_1 = 0
     read_record_counter_2 = 0
@@ -363,15 +444,15 @@ def merge_files_operation_1best(annotation_file_1, type_1, annotation_file_2, ty
 
     # print header record in merged file if necessary
     if header == 'Y':
-        xlib.write_annotation_header(merger_file_id, 'MERGER')
+        xlib.write_annotation_header(merger_buffer, 'MERGER')
         written_record_counter += 1
 
     # read the first record of the first annotation file
-    (record_1, key_1, data_dict_1) = xlib.read_annotation_record(annotation_file_1, annotation_file_1_id, type_1, read_record_counter_1)
+    (record_1, key_1, data_dict_1) = annotation_reader_1.read()
     xlib.Message.print('trace', f'key_1: {key_1} - record_1: {record_1}')
 
     # read the first record of the second annotation file
-    (record_2, key_2, data_dict_2) = xlib.read_annotation_record(annotation_file_2, annotation_file_2_id, type_2, read_record_counter_2)
+    (record_2, key_2, data_dict_2) = annotation_reader_2.read()
     xlib.Message.print('trace', f'key_2: {key_2} - record_2: {record_2}')
 
     # while there are records in any annotation file
@@ -385,12 +466,12 @@ def merge_files_operation_1best(annotation_file_1, type_1, annotation_file_2, ty
             read_record_counter_1 += 1
 
             # write in the merged annotation file
-            xlib.write_merged_annotation_record(merger_file_id, type_1, data_dict_1)
+            merger_writer_1.write(data_dict_1)
             written_record_counter += 1
             xlib.Message.print('verbose', f'\rWritten annotations: {written_record_counter}')
 
             # read the next record of the first annotation file
-            (record_1, key_1, data_dict_1) = xlib.read_annotation_record(annotation_file_1, annotation_file_1_id, type_1, read_record_counter_1)
+            (record_1, key_1, data_dict_1) = annotation_reader_1.read()
             xlib.Message.print('trace', f'key_1: {key_1} - record_1: {record_1}')
 
         # while there are records in the first annotation file and key of the first annotation file is equal to the key of the second annotation file
@@ -400,17 +481,17 @@ def merge_files_operation_1best(annotation_file_1, type_1, annotation_file_2, ty
             read_record_counter_1 += 1
 
             # write in the merged annotation file
-            xlib.write_merged_annotation_record(merger_file_id, type_1, data_dict_1)
+            merger_writer_1.write(data_dict_1)
             written_record_counter += 1
             xlib.Message.print('verbose', f'\rWritten annotations: {written_record_counter}')
 
             # read next records of the second annotation file while their key is equal to the key of the first annotation file
             while record_2 != '' and data_dict_1['nt_seq_id'] == data_dict_2['nt_seq_id']:
-                (record_2, key_2, data_dict_2) = xlib.read_annotation_record(annotation_file_2, annotation_file_2_id, type_2, read_record_counter_2)
+                (record_2, key_2, data_dict_2) = annotation_reader_2.read()
                 xlib.Message.print('trace', f'key_2: {key_2} - record_2: {record_2}')
 
             # read the next record of the first annotation file
-            (record_1, key_1, data_dict_1) = xlib.read_annotation_record(annotation_file_1, annotation_file_1_id, type_1, read_record_counter_1)
+            (record_1, key_1, data_dict_1) = annotation_reader_1.read()
             xlib.Message.print('trace', f'key_1: {key_1} - record_1: {record_1}')
 
         # while there are records in the second annotation file and key of the first annotation file is greater than the key of the second annotation file
@@ -420,12 +501,12 @@ def merge_files_operation_1best(annotation_file_1, type_1, annotation_file_2, ty
             read_record_counter_2 += 1
 
             # write in the merged annotation file
-            xlib.write_merged_annotation_record(merger_file_id, type_2, data_dict_2)
+            merger_writer_2.write(data_dict_2)
             written_record_counter += 1
             xlib.Message.print('verbose', f'\rWritten annotations: {written_record_counter}')
 
             # read the next record of the second annotation file
-            (record_2, key_2, data_dict_2) = xlib.read_annotation_record(annotation_file_2, annotation_file_2_id, type_2, read_record_counter_2)
+            (record_2, key_2, data_dict_2) = annotation_reader_2.read()
             xlib.Message.print('trace', f'key_2: {key_2} - record_2: {record_2}')
 
     # print summary
@@ -437,7 +518,115 @@ def merge_files_operation_1best(annotation_file_1, type_1, annotation_file_2, ty
     # close files
     annotation_file_1_id.close()
     annotation_file_2_id.close()
-    merger_file_id.close()
+    merger_buffer.close()
+
+#-------------------------------------------------------------------------------
+
+def merge_files_operation_all(annotation_file_list, type_list, merger_file, header):
+    '''
+    Merge annotation files with operation "ALL" (annotations included in any file of the list)
+    with a k-way merge: the next record of each file is kept in a heap ordered by key and file position.
+    '''
+
+    # initialize the lists of annotation file identifications, readers and merged annotation writers
+    annotation_file_id_list = []
+    annotation_reader_list = []
+    merger_writer_list = []
+
+    # open the merged annotation file
+    if merger_file.endswith('.gz'):
+        try:
+            merger_file_id = xlib.open_gzip(merger_file, mode='wt', encoding='iso-8859-1', newline='\n')
+        except Exception as e:
+            raise xlib.ProgramException('F004', merger_file)
+    else:
+        try:
+            merger_file_id = open(merger_file, mode='w', encoding='iso-8859-1', newline='\n')
+        except Exception as e:
+            raise xlib.ProgramException('F003', merger_file)
+
+    # initialize the output buffer of the merged annotation file
+    merger_buffer = xlib.AnnotationOutputBuffer(merger_file_id)
+
+    # open each annotation file (skipping the header record when its manifest declares it)
+    for i in range(len(annotation_file_list)):
+        if annotation_file_list[i].endswith('.gz'):
+            try:
+                annotation_file_id = xlib.open_gzip(annotation_file_list[i], mode='rt', encoding='iso-8859-1')
+            except Exception as e:
+                raise xlib.ProgramException('F002', annotation_file_list[i])
+        else:
+            try:
+                annotation_file_id = open(annotation_file_list[i], mode='r', encoding='iso-8859-1')
+            except Exception as e:
+                raise xlib.ProgramException('F001', annotation_file_list[i])
+        if xlib.get_annotation_manifest_dict(annotation_file_list[i]).get('header', 'N') == 'Y':
+            annotation_file_id.readline()
+        annotation_file_id_list.append(annotation_file_id)
+        annotation_reader_list.append(xlib.AnnotationReader(annotation_file_list[i], annotation_file_id, type_list[i]))
+        merger_writer_list.append(xlib.AnnotationWriter(merger_buffer, type_list[i], is_merged=True))
+
+    # initialize record counters
+    read_record_counter_list = [0] * len(annotation_file_list)
+    written_record_counter = 0
+
+    # initialize the first and last keys of the merged annotation file
+    first_key = None
+    last_key = None
+
+    # print header record in merged file if necessary
+    if header == 'Y':
+        xlib.write_annotation_header(merger_buffer, 'MERGER')
+        written_record_counter += 1
+
+    # read the first record of each annotation file and build the heap
+    # (the file position breaks ties, so the annotations with the same key are written in the order of the list)
+    heap = []
+    for i in range(len(annotation_reader_list)):
+        (record, key, data_dict) = annotation_reader_list[i].read()
+        xlib.Message.print('trace', f'file: {i + 1} - key: {key} - record: {record}')
+        if record != '':
+            heap.append((key, i, data_dict))
+    heapq.heapify(heap)
+
+    # while there are records in any annotation file
+    while heap != []:
+
+        # get the record with the least key
+        (key, i, data_dict) = heap[0]
+
+        # add 1 to record counter
+        read_record_counter_list[i] += 1
+
+        # write in the merged annotation file
+        merger_writer_list[i].write(data_dict)
+        written_record_counter += 1
+        if first_key is None:
+            first_key = key
+        last_key = key
+        xlib.Message.print('verbose', f'\rWritten annotations: {written_record_counter}')
+
+        # read the next record of the annotation file and replace the written record in the heap
+        (record, key, data_dict) = annotation_reader_list[i].read()
+        xlib.Message.print('trace', f'file: {i + 1} - key: {key} - record: {record}')
+        if record != '':
+            heapq.heapreplace(heap, (key, i, data_dict))
+        else:
+            heapq.heappop(heap)
+
+    # print summary
+    xlib.Message.print('verbose', '\n')
+    for i in range(len(annotation_file_list)):
+        xlib.Message.print('info', f'{read_record_counter_list[i]} records read from the annotation file {os.path.basename(annotation_file_list[i])}.')
+    xlib.Message.print('info', f'{written_record_counter} records written in the merged annotation file.')
+
+    # close files
+    for annotation_file_id in annotation_file_id_list:
+        annotation_file_id.close()
+    merger_buffer.close()
+
+    # write the manifest of the merged annotation file (its records are sorted by the merge key)
+    xlib.write_annotation_manifest(merger_file, 'MERGER', True, header == 'Y', written_record_counter - (1 if header == 'Y' else 0), first_key, last_key)
 
 #-------------------------------------------------------------------------------
 
@@ -449,7 +638,7 @@ def save_annotation_file_merger_format(annotation_file_1, type_1, merger_file, h
     # open the annotation file
     if annotation_file_1.endswith('.gz'):
         try:
-            annotation_file_1_id = gzip.open(annotation_file_1, mode='rt', encoding='iso-8859-1')
+            annotation_file_1_id = xlib.open_gzip(annotation_file_1, mode='rt', encoding='iso-8859-1')
         except Exception as e:
             raise xlib.ProgramException('F002', annotation_file_1)
     else:
@@ -461,7 +650,7 @@ def save_annotation_file_merger_format(annotation_file_1, type_1, merger_file, h
     # open the merger file
     if merger_file.endswith('.gz'):
         try:
-            merger_file_id = gzip.open(merger_file, mode='wt', encoding='iso-8859-1', newline='\n')
+            merger_file_id = xlib.open_gzip(merger_file, mode='wt', encoding='iso-8859-1', newline='\n')
         except Exception as e:
             raise xlib.ProgramException('F004', merger_file)
     else:
@@ -470,17 +659,24 @@ def save_annotation_file_merger_format(annotation_file_1, type_1, merger_file, h
         except Exception as e:
             raise xlib.ProgramException('F003', merger_file)
 
+    # initialize the output buffer of the merged annotation file
+    merger_buffer = xlib.AnnotationOutputBuffer(merger_file_id)
+
+    # initialize the annotation reader and the merged annotation writer
+    annotation_reader_1 = xlib.AnnotationReader(annotation_file_1, annotation_file_1_id, type_1)
+    merger_writer_1 = xlib.AnnotationWriter(merger_buffer, type_1, is_merged=True)
+
     # initialize record counters
     read_record_counter_1 = 0
     written_record_counter = 0
           
     # print header record in merged file if necessary
     if header == 'Y':
-        xlib.write_annotation_header(merger_file_id, 'MERGER')
+        xlib.write_annotation_header(merger_buffer, 'MERGER')
         written_record_counter += 1
 
     # read the first record of the annotation file
-    (record_1, key_1, data_dict_1) = xlib.read_annotation_record(annotation_file_1, annotation_file_1_id, type_1, read_record_counter_1)
+    (record_1, key_1, data_dict_1) = annotation_reader_1.read()
     xlib.Message.print('trace', f'key_1: {key_1} - record_1: {record_1}')
 
     # while there are records in annotation file
@@ -490,12 +686,12 @@ def save_annotation_file_merger_format(annotation_file_1, type_1, merger_file, h
             read_record_counter_1 += 1
 
             # write in the merged annotation file
-            xlib.write_merged_annotation_record(merger_file_id, type_1, data_dict_1)
+            merger_writer_1.write(data_dict_1)
             written_record_counter += 1
             xlib.Message.print('verbose', f'\rWritten annotations: {written_record_counter}')
 
             # read the next record of the annotation file
-            (record_1, key_1, data_dict_1) = xlib.read_annotation_record(annotation_file_1, annotation_file_1_id, type_1, read_record_counter_1)
+            (record_1, key_1, data_dict_1) = annotation_reader_1.read()
             xlib.Message.print('trace', f'key_1: {key_1} - record_1: {record_1}')
 
     # print summary
@@ -505,7 +701,7 @@ def save_annotation_file_merger_format(annotation_file_1, type_1, merger_file, h
 
     # close files
     annotation_file_1_id.close()
-    merger_file_id.close()
+    merger_buffer.close()
 
 #-------------------------------------------------------------------------------
 
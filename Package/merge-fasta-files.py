@@ -24,11 +24,11 @@ This program merges two FASTA files.
 #-------------------------------------------------------------------------------
 
 import argparse
-import gzip
 import os
 import re
 import sys
 
+import xfasta
 import xlib
 
 #-------------------------------------------------------------------------------
@@ -162,67 +162,13 @@ def check_args(args):
 
 def get_file_2_id_dict(fasta_file_2):
     '''
+    Get the dictionary with the sequence identifications of the second FASTA file (they are got from the FASTA index,
+    which is built when it is necessary).
     '''
 
-    # initialize the dictionary with sequence identifications of the second file
-    file_2_id_dict = {}
-
-    # set the pattern of the header records (>sequence_info)
-    pattern = r'^>(.*)$'
-
-    # open the second FASTA file
-    if fasta_file_2.endswith('.gz'):
-        try:
-            fasta_file_2_id = gzip.open(fasta_file_2, mode='rt', encoding='iso-8859-1')
-        except Exception as e:
-            raise xlib.ProgramException('F002', fasta_file_2)
-    else:
-        try:
-            fasta_file_2_id = open(fasta_file_2, mode='r', encoding='iso-8859-1')
-        except Exception as e:
-            raise xlib.ProgramException('F001', fasta_file_2)
-
-    # initialize the sequence counter
-    seq_counter = 0
-
-    # read the first record
-    record = fasta_file_2_id.readline()
-
-    # while there are records
-    while record != '':
-
-        # process the header record 
-        if record.startswith('>'):
-
-            # extract the data 
-            mo = re.search(pattern, record)
-            sequence_id = mo.group(1).strip()
-
-            # add sequence identification to the dictionary
-            file_2_id_dict[sequence_id] = True
-
-            # read the next record
-            record = fasta_file_2_id.readline()
-
-        else:
-
-            # control the FASTA format
-            raise xlib.ProgramException('F005', fasta_file_2, 'FASTA')
-
-        # while there are records and they are sequence
-        while record != '' and not record.startswith('>'):
-
-            # read the next record
-            record = fasta_file_2_id.readline()
-
-        # add 1 to sequence counter and print it
-        seq_counter += 1
-        xlib.Message.print('verbose', f'\r{seq_counter} sequences processed of the second FASTA file')
-
-    xlib.Message.print('verbose', '\n')
-
-    # close file
-    fasta_file_2_id.close()
+    # get the dictionary with sequence identifications of the second file
+    file_2_id_dict = dict.fromkeys(xfasta.get_seq_id_set(fasta_file_2), True)
+    xlib.Message.print('verbose', f'{len(file_2_id_dict)} sequences in the second FASTA file\n')
 
     # return the dictionary with sequence identifications of the second file
     return file_2_id_dict
@@ -244,7 +190,7 @@ def merge_files_operation_1and2(fasta_file_1, file_2_id_dict, merged_file, toa_t
     # open the first FASTA file
     if fasta_file_1.endswith('.gz'):
         try:
-            fasta_file_1_id = gzip.open(fasta_file_1, mode='rt', encoding='iso-8859-1')
+            fasta_file_1_id = xlib.open_gzip(fasta_file_1, mode='rt', encoding='iso-8859-1')
         except Exception as e:
             raise xlib.ProgramException('F002', fasta_file_1)
     else:
@@ -256,7 +202,7 @@ def merge_files_operation_1and2(fasta_file_1, file_2_id_dict, merged_file, toa_t
     # open the merged file
     if merged_file.endswith('.gz'):
         try:
-            merged_file_id = gzip.open(merged_file, mode='wt', encoding='iso-8859-1', newline='\n')
+            merged_file_id = xlib.open_gzip(merged_file, mode='wt', encoding='iso-8859-1', newline='\n')
         except Exception as e:
             raise xlib.ProgramException('F004', merged_file)
     else:
@@ -345,7 +291,7 @@ def merge_files_operation_1less2(fasta_file_1, file_2_id_dict, merged_file, toa_
     # open the first FASTA file
     if fasta_file_1.endswith('.gz'):
         try:
-            fasta_file_1_id = gzip.open(fasta_file_1, mode='rt', encoding='iso-8859-1')
+            fasta_file_1_id = xlib.open_gzip(fasta_file_1, mode='rt', encoding='iso-8859-1')
         except Exception as e:
             raise xlib.ProgramException('F002', fasta_file_1)
     else:
@@ -357,7 +303,7 @@ def merge_files_operation_1less2(fasta_file_1, file_2_id_dict, merged_file, toa_
     # open the merged file
     if merged_file.endswith('.gz'):
         try:
-            merged_file_id = gzip.open(merged_file, mode='wt', encoding='iso-8859-1', newline='\n')
+            merged_file_id = xlib.open_gzip(merged_file, mode='wt', encoding='iso-8859-1', newline='\n')
         except Exception as e:
             raise xlib.ProgramException('F004', merged_file)
     else:
@@ -24,7 +24,6 @@ This program merges several XML files.
 #-------------------------------------------------------------------------------
 
 import argparse
-import gzip
 import os
 import sys
 
@@ -167,7 +166,7 @@ def merge_files(xml_file_list, toa_transcriptome_relationship_dict, toa_transdec
     # open the merged XML file
     if merged_file.endswith('.gz'):
         try:
-            merged_file_id = gzip.open(merged_file, mode='wt', encoding='iso-8859-1', newline='\n')
+            merged_file_id = xlib.open_gzip(merged_file, mode='wt', encoding='iso-8859-1', newline='\n')
         except Exception as e:
             raise xlib.ProgramException('F004', merged_file)
     else:
@@ -185,7 +184,7 @@ def merge_files(xml_file_list, toa_transcriptome_relationship_dict, toa_transdec
         # open the XML file
         if xml_file_list[i].endswith('.gz'):
             try:
-                xml_file_id = gzip.open(xml_file_list[i], mode='rt', encoding='iso-8859-1')
+                xml_file_id = xlib.open_gzip(xml_file_list[i], mode='rt', encoding='iso-8859-1')
             except Exception as e:
                 raise xlib.ProgramException('F002', xml_file_list[i])
         else:
@@ -46,7 +46,7 @@ def main(argv):
     check_args(args)
 
     # connect to the TOA database
-    conn = xsqlite.connect_database(args.toa_database)
+    conn = xsqlite.connect_database(args.toa_database, args.db_profile)
 
     # rebuild the TOA database file
     xlib.Message.print('verbose', 'Rebuilding TOA database ...\n')
@@ -56,6 +56,12 @@ def main(argv):
     else:
         xlib.Message.print('error', '*** WARNING: The database file can not be rebuilt.')
 
+    # create the recommended indexes and analyze the TOA database
+    if args.upgrade_indexes == 'Y':
+        xlib.Message.print('verbose', 'Upgrading the indexes of TOA database ...\n')
+        xsqlite.create_recommended_indexes(conn)
+        xlib.Message.print('verbose', 'The indexes are upgraded.\n')
+
     # close connection to TOA database
     conn.close()
 
@@ -73,6 +79,8 @@ def build_parser():
     parser = argparse.ArgumentParser(usage=usage)
     parser._optionals.title = 'Arguments'
     parser.add_argument('--db', dest='toa_database', help='Path of the TOA database (mandatory).')
+    parser.add_argument('--upgrade-indexes', dest='upgrade_indexes', help=f'Create the recommended indexes for the annotation and analyze the database: {xlib.get_upgrade_indexes_code_list_text()}; default: {xlib.Const.DEFAULT_UPGRADE_INDEXES}.')
+    parser.add_argument('--db-profile', dest='db_profile', help=f'Profile of the connection to the TOA database: {xlib.get_db_profile_code_list_text()}; default: {xlib.Const.DEFAULT_DB_PROFILE}.')
     parser.add_argument('--verbose', dest='verbose', help=f'Additional job status info during the run: {xlib.get_verbose_code_list_text()}; default: {xlib.Const.DEFAULT_VERBOSE}.')
     parser.add_argument('--trace', dest='trace', help=f'Additional info useful to the developer team: {xlib.get_trace_code_list_text()}; default: {xlib.Const.DEFAULT_TRACE}.')
 
@@ -94,6 +102,24 @@ def check_args(args):
         xlib.Message.print('error', '*** The TOA database is not indicated in the input arguments.')
         OK = False
 
+    # check "upgrade_indexes"
+    if args.upgrade_indexes is None:
+        args.upgrade_indexes = xlib.Const.DEFAULT_UPGRADE_INDEXES
+    elif not xlib.check_code(args.upgrade_indexes, xlib.get_upgrade_indexes_code_list(), case_sensitive=False):
+        xlib.Message.print('error', f'*** upgrade-indexes has to be {xlib.get_upgrade_indexes_code_list_text()}.')
+        OK = False
+    else:
+        args.upgrade_indexes = args.upgrade_indexes.upper()
+
+    # check "db_profile"
+    if args.db_profile is None:
+        args.db_profile = xlib.Const.DEFAULT_DB_PROFILE
+    elif not xlib.check_code(args.db_profile, xlib.get_db_profile_code_list(), case_sensitive=False):
+        xlib.Message.print('error', f'*** db-profile has to be {xlib.get_db_profile_code_list_text()}.')
+        OK = False
+    else:
+        args.db_profile = args.db_profile.upper()
+
     # check "verbose"
     if args.verbose is None:
         args.verbose = xlib.Const.DEFAULT_VERBOSE
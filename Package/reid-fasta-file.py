@@ -24,7 +24,6 @@ This program re-identifies sequences of a FASTA file.
 #-------------------------------------------------------------------------------
 
 import argparse
-import gzip
 import os
 import re
 import sys
@@ -145,7 +144,7 @@ def reidentify_seq_ids(input_fasta_file, sequence_type, output_fasta_file, relat
     # open the input FASTA file
     if input_fasta_file.endswith('.gz'):
         try:
-            input_fasta_file_id = gzip.open(input_fasta_file, mode='rt', encoding='iso-8859-1')
+            input_fasta_file_id = xlib.open_gzip(input_fasta_file, mode='rt', encoding='iso-8859-1')
         except Exception as e:
             raise xlib.ProgramException('F002', input_fasta_file)
     else:
@@ -157,7 +156,7 @@ def reidentify_seq_ids(input_fasta_file, sequence_type, output_fasta_file, relat
     # open the output FASTA file
     if output_fasta_file.endswith('.gz'):
         try:
-            output_fasta_file_id = gzip.open(output_fasta_file, mode='wt', encoding='iso-8859-1', newline='\n')
+            output_fasta_file_id = xlib.open_gzip(output_fasta_file, mode='wt', encoding='iso-8859-1', newline='\n')
         except Exception as e:
             raise xlib.ProgramException('F004', output_fasta_file)
     else:
@@ -225,7 +224,7 @@ def reidentify_seq_ids(input_fasta_file, sequence_type, output_fasta_file, relat
     # open the relationship file
     if relationship_file.endswith('.gz'):
         try:
-            relationship_file_id = gzip.open(relationship_file, mode='wt', encoding='iso-8859-1', newline='\n')
+            relationship_file_id = xlib.open_gzip(relationship_file, mode='wt', encoding='iso-8859-1', newline='\n')
         except Exception as e:
             raise xlib.ProgramException('F004', relationship_file)
     else:
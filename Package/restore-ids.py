@@ -18,13 +18,12 @@ Licence: GNU General Public Licence Version 3.
 #-------------------------------------------------------------------------------
 
 '''
-This program restores transcript sequence identifications in a FASTA or XML file.
+This program restores transcript sequence identifications in a FASTA, TSV (BLAST tabular) or XML file.
 '''
 
 #-------------------------------------------------------------------------------
 
 import argparse
-import gzip
 import os
 import re
 import sys
@@ -58,6 +57,9 @@ def main(argv):
     # restore transcript sequence identifications in a FASTA file
     if args.file_format == 'FASTA':
         restore_ids_fasta(args.input_file, toa_transcriptome_relationship_dict, toa_transdecoder_relationship_dict, args.output_file)
+    # restore transcript sequence identifications in a TSV file
+    elif args.file_format == 'TSV':
+        restore_ids_tsv(args.input_file, toa_transcriptome_relationship_dict, toa_transdecoder_relationship_dict, args.output_file)
     # restore transcript sequence identifications in a XML file
     elif args.file_format == 'XML':
         restore_ids_xml(args.input_file, toa_transcriptome_relationship_dict, toa_transdecoder_relationship_dict, args.output_file)
@@ -70,7 +72,7 @@ def build_parser():
     '''
 
     # create the parser and add arguments
-    description = 'Description: This program restores original sequence identifications in FASTA or XML file.'
+    description = 'Description: This program restores original sequence identifications in FASTA, TSV (BLAST tabular) or XML file.'
     text = f'{xlib.get_long_project_name()} v{xlib.get_project_version()} - {os.path.basename(__file__)}\n\n{description}\n'
     usage = f'\r{text.ljust(len("usage:"))}\nUsage: {os.path.basename(__file__)} arguments'
     parser = argparse.ArgumentParser(usage=usage)
@@ -175,7 +177,7 @@ def restore_ids_fasta(input_file, toa_transcriptome_relationship_dict, toa_trans
     # open the input FASTA file
     if input_file.endswith('.gz'):
         try:
-            input_file_id = gzip.open(input_file, mode='rt', encoding='iso-8859-1')
+            input_file_id = xlib.open_gzip(input_file, mode='rt', encoding='iso-8859-1')
         except Exception as e:
             raise xlib.ProgramException('F002', input_file)
     else:
@@ -187,7 +189,7 @@ def restore_ids_fasta(input_file, toa_transcriptome_relationship_dict, toa_trans
     # open the output FASTA file
     if output_file.endswith('.gz'):
         try:
-            output_file_id = gzip.open(output_file, mode='wt', encoding='iso-8859-1', newline='\n')
+            output_file_id = xlib.open_gzip(output_file, mode='wt', encoding='iso-8859-1', newline='\n')
         except Exception as e:
             raise xlib.ProgramException('F004', output_file)
     else:
@@ -248,6 +250,79 @@ def restore_ids_fasta(input_file, toa_transcriptome_relationship_dict, toa_trans
 
 #-------------------------------------------------------------------------------
 
+def restore_ids_tsv(input_file, toa_transcriptome_relationship_dict, toa_transdecoder_relationship_dict, output_file):
+    '''
+    Restore transcript sequence identifications in a TSV file (BLAST tabular format 6 or 7)
+    '''
+
+    # open the input TSV file
+    if input_file.endswith('.gz'):
+        try:
+            input_file_id = xlib.open_gzip(input_file, mode='rt', encoding='iso-8859-1')
+        except Exception as e:
+            raise xlib.ProgramException('F002', input_file)
+    else:
+        try:
+            input_file_id = open(input_file, mode='r', encoding='iso-8859-1')
+        except Exception as e:
+            raise xlib.ProgramException('F001', input_file)
+
+    # open the output TSV file
+    if output_file.endswith('.gz'):
+        try:
+            output_file_id = xlib.open_gzip(output_file, mode='wt', encoding='iso-8859-1', newline='\n')
+        except Exception as e:
+            raise xlib.ProgramException('F004', output_file)
+    else:
+        try:
+            output_file_id = open(output_file, mode='w', encoding='iso-8859-1', newline='\n')
+        except Exception as e:
+            raise xlib.ProgramException('F003', output_file)
+
+    # initialize input record counter
+    input_record_counter = 0
+
+    # read the first record
+    record = input_file_id.readline()
+
+    # while there are records
+    while record != '':
+
+        # add 1 to the input record counter
+        input_record_counter += 1
+
+        # when the record is a data record (the comment records of format 7 are written unchanged)
+        if not record.startswith('#') and record.strip() != '':
+
+            # get the sequence identification (first column)
+            (seq_id, separator, rest) = record.partition('\t')
+
+            # get the transcript sequence identification
+            (transcript_seq_id, nt_seq_id, aa_seq_id) = xlib.get_seq_ids(seq_id, toa_transcriptome_relationship_dict, toa_transdecoder_relationship_dict)
+
+            # set the record with the transcript sequence identification
+            record = f'{transcript_seq_id}{separator}{rest}'
+
+        # write the record in the output TSV file
+        output_file_id.write(record)
+
+        # print the input record counter
+        xlib.Message.print('verbose', f'\rProcessed records: {input_record_counter}')
+
+        # read the next record
+        record = input_file_id.readline()
+
+    xlib.Message.print('verbose', '\n')
+
+    # close files
+    input_file_id.close()
+    output_file_id.close()
+
+    # print OK message 
+    xlib.Message.print('verbose', f'The file {os.path.basename(output_file)} is created\n.')
+
+#-------------------------------------------------------------------------------
+
 def restore_ids_xml(input_file, toa_transcriptome_relationship_dict, toa_transdecoder_relationship_dict, output_file):
     '''
     Restore transcript sequence identifications in a XML file
@@ -256,7 +331,7 @@ def restore_ids_xml(input_file, toa_transcriptome_relationship_dict, toa_transde
     # open the input XML file
     if input_file.endswith('.gz'):
         try:
-            input_file_id = gzip.open(input_file, mode='rt', encoding='iso-8859-1')
+            input_file_id = xlib.open_gzip(input_file, mode='rt', encoding='iso-8859-1')
         except Exception as e:
             raise xlib.ProgramException('F002', input_file)
     else:
@@ -268,7 +343,7 @@ def restore_ids_xml(input_file, toa_transcriptome_relationship_dict, toa_transde
     # open the output XML file
     if output_file.endswith('.gz'):
         try:
-            output_file_id = gzip.open(output_file, mode='wt', encoding='iso-8859-1', newline='\n')
+            output_file_id = xlib.open_gzip(output_file, mode='wt', encoding='iso-8859-1', newline='\n')
         except Exception as e:
             raise xlib.ProgramException('F004', output_file)
     else:
@@ -0,0 +1,340 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+#-------------------------------------------------------------------------------
+
+'''
+This software has been developed by:
+
+    GI Sistemas Naturales e Historia Forestal (formerly known as GI Genetica, Fisiologia e Historia Forestal)
+    Dpto. Sistemas y Recursos Naturales
+    ETSI Montes, Forestal y del Medio Natural
+    Universidad Politecnica de Madrid
+    https://github.com/ggfhf/
+
+Licence: GNU General Public Licence Version 3.
+'''
+
+#-------------------------------------------------------------------------------
+
+'''
+This program runs the steps of a pipeline script declared in a step file. Each step declares its inputs, outputs
+and thread number; a step depends on the previous steps that write its inputs or outputs or read its outputs, and
+the steps whose dependencies are ended run concurrently while their threads fit in the thread budget. The steps
+with an OK status file in the status directory were previously run and they are not run again. The output of each
+step is written in the standard output as it arrives, with the step name as prefix, and in a log file of the status
+directory, which is kept when the step fails. The resources used by each run step (wall and CPU time, maximum resident set size and block I/O) are appended to the metrics file
+of the run directory.
+'''
+
+#-------------------------------------------------------------------------------
+
+import argparse
+import datetime
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+
+import xlib
+
+#-------------------------------------------------------------------------------
+
+def main(argv):
+    '''
+    Main line of the program.
+    '''
+
+    # check the operating system
+    xlib.check_os()
+
+    # get and check the arguments
+    parser = build_parser()
+    args = parser.parse_args()
+    check_args(args)
+
+    # run the pipeline steps
+    run_pipeline_steps(args.script, args.step_file, args.run_dir, args.threads)
+
+#-------------------------------------------------------------------------------
+
+def build_parser():
+    '''
+    Build the parser with the available arguments.
+    '''
+
+    # create the parser and add arguments
+    description = 'Description: This program runs the steps of a pipeline script declared in a step file running concurrently the independent steps.'
+    text = f'{xlib.get_long_project_name()} v{xlib.get_project_version()} - {os.path.basename(__file__)}\n\n{description}\n'
+    usage = f'\r{text.ljust(len("usage:"))}\nUsage: {os.path.basename(__file__)} arguments'
+    parser = argparse.ArgumentParser(usage=usage)
+    parser._optionals.title = 'Arguments'
+    parser.add_argument('--script', dest='script', help='Path of the pipeline script: it runs the step whose name is passed as argument (mandatory).')
+    parser.add_argument('--steps', dest='step_file', help='Path of the step file with the inputs, outputs and thread number of each step (mandatory).')
+    parser.add_argument('--rundir', dest='run_dir', help='Path of the run directory whose status directory has the OK status files of the steps (mandatory).')
+    parser.add_argument('--threads', dest='threads', help=f'Thread budget of the steps running concurrently; default: {xlib.Const.DEFAULT_THREADS}.')
+    parser.add_argument('--verbose', dest='verbose', help=f'Additional job status info during the run: {xlib.get_verbose_code_list_text()}; default: {xlib.Const.DEFAULT_VERBOSE}.')
+    parser.add_argument('--trace', dest='trace', help=f'Additional info useful to the developer team: {xlib.get_trace_code_list_text()}; default: {xlib.Const.DEFAULT_TRACE}.')
+
+    # return the paser
+    return parser
+
+#-------------------------------------------------------------------------------
+
+def check_args(args):
+    '''
+    Check the input arguments.
+    '''
+
+    # initialize the control variable
+    OK = True
+
+    # check "script"
+    if args.script is None:
+        xlib.Message.print('error', '*** The pipeline script is not indicated in the input arguments.')
+        OK = False
+    elif not os.path.isfile(args.script):
+        xlib.Message.print('error', f'*** The file {args.script} does not exist.')
+        OK = False
+
+    # check "step_file"
+    if args.step_file is None:
+        xlib.Message.print('error', '*** The step file is not indicated in the input arguments.')
+        OK = False
+    elif not os.path.isfile(args.step_file):
+        xlib.Message.print('error', f'*** The file {args.step_file} does not exist.')
+        OK = False
+
+    # check "run_dir"
+    if args.run_dir is None:
+        xlib.Message.print('error', '*** The run directory is not indicated in the input arguments.')
+        OK = False
+    elif not os.path.isdir(xlib.get_status_dir(args.run_dir)):
+        xlib.Message.print('error', f'*** The directory {xlib.get_status_dir(args.run_dir)} does not exist.')
+        OK = False
+
+    # check "threads"
+    if args.threads is None:
+        args.threads = xlib.Const.DEFAULT_THREADS
+    elif not xlib.check_int(args.threads, minimum=1):
+        xlib.Message.print('error', '*** The thread budget has to be an integer number greater than 0.')
+        OK = False
+    else:
+        args.threads = int(args.threads)
+
+    # check "verbose"
+    if args.verbose is None:
+        args.verbose = xlib.Const.DEFAULT_VERBOSE
+    elif not xlib.check_code(args.verbose, xlib.get_verbose_code_list(), case_sensitive=False):
+        xlib.Message.print('error', f'*** verbose has to be {xlib.get_verbose_code_list_text()}.')
+        OK = False
+    if args.verbose.upper() == 'Y':
+        xlib.Message.set_verbose_status(True)
+
+    # check "trace"
+    if args.trace is None:
+        args.trace = xlib.Const.DEFAULT_TRACE
+    elif not xlib.check_code(args.trace, xlib.get_trace_code_list(), case_sensitive=False):
+        xlib.Message.print('error', f'*** trace has to be {xlib.get_trace_code_list_text()}.')
+        OK = False
+    if args.trace.upper() == 'Y':
+        xlib.Message.set_trace_status(True)
+
+    # if there are errors, exit with exception
+    if not OK:
+        raise xlib.ProgramException('P001')
+
+#-------------------------------------------------------------------------------
+
+def run_pipeline_steps(script, step_file, run_dir, threads):
+    '''
+    Run the steps of a pipeline script: the ready steps run concurrently within the thread budget.
+    '''
+
+    # get the step list and the dependency dictionary
+    step_list = xlib.get_pipeline_step_list(step_file)
+    dependency_dict = xlib.get_pipeline_step_dependency_dict(step_list)
+    step_dict_dict = {step_dict['name']: step_dict for step_dict in step_list}
+
+    # initialize the set of ended steps and the list of pending steps
+    ended_step_set = set()
+    pending_step_list = []
+
+    # skip the steps that were previously run
+    for step_dict in step_list:
+        if os.path.isfile(xlib.get_step_status_ok(run_dir, step_dict['name'])):
+            xlib.Message.print('info', f'{xlib.get_separator()}')
+            xlib.Message.print('info', f'Step {step_dict["name"]}: this step was previously run.')
+            ended_step_set.add(step_dict['name'])
+        else:
+            pending_step_list.append(step_dict)
+
+    # initialize the dictionary of running steps, the free threads and the failed step data
+    running_step_dict = {}
+    free_threads = threads
+    failed_step = None
+    failed_rc = 0
+
+    # while there are pending or running steps
+    while pending_step_list != [] or running_step_dict != {}:
+
+        # start the pending steps whose dependencies are ended and whose threads fit in the free threads
+        # (no step is started after a step fails)
+        if failed_step is None:
+            for step_dict in pending_step_list.copy():
+                step_threads = min(step_dict['threads'], threads)
+                if dependency_dict[step_dict['name']].issubset(ended_step_set) and step_threads <= free_threads:
+                    running_step_dict[step_dict['name']] = start_step(script, run_dir, step_dict['name'], step_threads)
+                    pending_step_list.remove(step_dict)
+                    free_threads -= step_threads
+
+        # exit the loop when there are not running steps (the pending steps depend on a failed step)
+        if running_step_dict == {}:
+            break
+
+        # wait for the end of a running step (the resource usage includes the processes run by the step)
+        (pid, status, rusage) = os.wait4(-1, 0)
+        step = [step for step in running_step_dict if running_step_dict[step][0].pid == pid][0]
+        (process, output_thread, log_file, step_threads, start_time) = running_step_dict[step]
+        process.returncode = rc = os.waitstatus_to_exitcode(status)
+        end_time = time.time()
+
+        # write the step log and metrics
+        write_step_log(step, output_thread, log_file, rc, end_time - start_time)
+        write_step_metrics(run_dir, step_dict_dict[step], step_threads, rc, start_time, end_time, rusage)
+
+        # release the threads of the step
+        del running_step_dict[step]
+        free_threads += step_threads
+
+        # save the step as ended or failed
+        if rc == 0:
+            ended_step_set.add(step)
+        elif failed_step is None:
+            failed_step = step
+            failed_rc = rc
+
+    # if a step failed, exit with exception
+    if failed_step is not None:
+        raise xlib.ProgramException('S003', failed_step, failed_rc)
+
+    # print summary
+    xlib.Message.print('info', f'{xlib.get_separator()}')
+    xlib.Message.print('info', f'{len(ended_step_set)} steps are ended OK.')
+
+#-------------------------------------------------------------------------------
+
+def start_step(script, run_dir, step, step_threads):
+    '''
+    Start a step running the pipeline script with the step name as argument; its output is written in the standard
+    output and in a log file by a thread while the step runs.
+    '''
+
+    # get the log file of the step
+    log_file = f'{xlib.get_status_dir(run_dir)}/{step}.log'
+
+    # start the step
+    with output_lock:
+        xlib.Message.print('info', f'{xlib.get_separator()}')
+        xlib.Message.print('info', f'Step {step}: started at {datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")} with {step_threads} thread(s).')
+    try:
+        log_file_id = open(log_file, mode='w', encoding='iso-8859-1', newline='\n')
+    except Exception as e:
+        raise xlib.ProgramException('F003', log_file)
+    process = subprocess.Popen([script, step], stdout=subprocess.PIPE, stderr=subprocess.STDOUT, encoding='iso-8859-1', errors='replace')
+
+    # start the thread that writes the output of the step
+    output_thread = threading.Thread(target=write_step_output, args=(step, process.stdout, log_file_id), daemon=True)
+    output_thread.start()
+
+    # return the step data
+    return (process, output_thread, log_file, step_threads, time.time())
+
+#-------------------------------------------------------------------------------
+
+# lock of the standard output shared by the threads that write the output of the steps
+output_lock = threading.Lock()
+
+#-------------------------------------------------------------------------------
+
+def write_step_output(step, output_id, log_file_id):
+    '''
+    Write each record of the output of a running step, as it arrives, in the standard output (with the step name
+    as prefix) and in the log file of the step.
+    '''
+
+    # write every record until the step closes its output
+    for record in output_id:
+        log_file_id.write(record)
+        log_file_id.flush()
+        with output_lock:
+            sys.stdout.write(f'[{step}] {record}')
+            sys.stdout.flush()
+
+    # close the output and the log file
+    output_id.close()
+    log_file_id.close()
+
+#-------------------------------------------------------------------------------
+
+def write_step_log(step, output_thread, log_file, rc, duration):
+    '''
+    Wait for the end of the output of an ended step and write its end in the standard output (the log file is
+    removed when the step ends OK).
+    '''
+
+    # wait for the last records of the output of the step
+    output_thread.join()
+
+    # write the end of the step
+    with output_lock:
+        xlib.Message.print('info', f'{xlib.get_separator()}')
+        xlib.Message.print('info', f'Step {step}: ended with return code {rc} after {round(duration)} s.')
+
+    # remove the log file when the step ends OK
+    if rc == 0:
+        os.remove(log_file)
+    else:
+        xlib.Message.print('info', f'The output of the step is kept in {log_file}.')
+
+#-------------------------------------------------------------------------------
+
+def write_step_metrics(run_dir, step_dict, step_threads, rc, start_time, end_time, rusage):
+    '''
+    Append the resources used by an ended step to the metrics file of the run directory.
+    '''
+
+    # build the metrics record (the block I/O is counted in blocks of 512 bytes)
+    data_dict = {
+        'run': os.path.basename(os.path.normpath(run_dir)),
+        'step': step_dict['name'],
+        'dataset': step_dict['dataset'],
+        'threads': step_threads,
+        'start': datetime.datetime.fromtimestamp(start_time).strftime('%Y-%m-%d %H:%M:%S'),
+        'rc': rc,
+        'wall_time': round(end_time - start_time, 3),
+        'user_time': round(rusage.ru_utime, 3),
+        'system_time': round(rusage.ru_stime, 3),
+        'max_rss': rusage.ru_maxrss,
+        'read_kb': rusage.ru_inblock // 2,
+        'written_kb': rusage.ru_oublock // 2
+        }
+
+    # append the record to the metrics file
+    metrics_file = xlib.get_pipeline_metrics_file(run_dir)
+    try:
+        with open(metrics_file, mode='a', encoding='iso-8859-1', newline='\n') as metrics_file_id:
+            metrics_file_id.write(f'{json.dumps(data_dict)}\n')
+    except Exception as e:
+        raise xlib.ProgramException('F003', metrics_file)
+
+#-------------------------------------------------------------------------------
+
+if __name__ == '__main__':
+
+    main(sys.argv[1:])
+    sys.exit(0)
+
+#-------------------------------------------------------------------------------
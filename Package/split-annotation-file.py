@@ -24,7 +24,6 @@ This program splits a annotation file in several files with a certain record num
 #-------------------------------------------------------------------------------
 
 import argparse
-import gzip
 import os
 import sys
 
@@ -148,7 +147,7 @@ def split_files(annotation_file, type, record_number_per_file, header):
     # open the first annotation file
     if annotation_file.endswith('.gz'):
         try:
-            annotation_file_id = gzip.open(annotation_file, mode='rt', encoding='iso-8859-1')
+            annotation_file_id = xlib.open_gzip(annotation_file, mode='rt', encoding='iso-8859-1')
         except Exception as e:
             raise xlib.ProgramException('F002', annotation_file)
     else:
@@ -164,13 +163,16 @@ def split_files(annotation_file, type, record_number_per_file, header):
     input_record_counter = 0
     output_record_counter = 99999999
 
+    # initialize the annotation reader
+    annotation_reader = xlib.AnnotationReader(annotation_file, annotation_file_id, type)
+
     # read the header record
     if header == 'Y':
-        annotation_file_id.readline()
+        annotation_reader.read()
 
     # read the first/second (when header record exists) record of the annotation file
     input_record_counter += 1
-    (record, key, data_dict) = xlib.read_annotation_record(annotation_file, annotation_file_id, type, input_record_counter)
+    (record, key, data_dict) = annotation_reader.read()
 
     # while there are records in the annotation file
     while record != '':
@@ -196,7 +198,7 @@ def split_files(annotation_file, type, record_number_per_file, header):
             # open the output file
             if output_file.endswith('.gz'):
                 try:
-                    output_file_id = gzip.open(output_file, mode='wt', encoding='iso-8859-1', newline='\n')
+                    output_file_id = xlib.open_gzip(output_file, mode='wt', encoding='iso-8859-1', newline='\n')
                 except Exception as e:
                     raise xlib.ProgramException('F004', output_file)
             else:
@@ -208,6 +210,9 @@ def split_files(annotation_file, type, record_number_per_file, header):
             # print header record in the output_file
             xlib.write_annotation_header(output_file_id, type)
 
+            # initialize the writer of the output file
+            output_writer = xlib.AnnotationWriter(output_file_id, type)
+
             # initialize the output annotation counter
             output_record_counter = 0
 
@@ -219,12 +224,12 @@ def split_files(annotation_file, type, record_number_per_file, header):
 
             # write in the output file
             output_record_counter += 1
-            xlib.write_annotation_record(output_file_id, type, data_dict)
+            output_writer.write(data_dict)
             xlib.Message.print('verbose', f'\rRead annotations: {input_record_counter} - Written annotations in the file {os.path.basename(output_file)}: {output_record_counter}.')
 
             # read the next record of the first annotation file
             input_record_counter += 1
-            (record, key, data_dict) = xlib.read_annotation_record(annotation_file, annotation_file_id, type, input_record_counter)
+            (record, key, data_dict) = annotation_reader.read()
 
     # print summary
     xlib.Message.print('verbose', '\n')
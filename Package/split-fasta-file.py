@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+#-------------------------------------------------------------------------------
+
+'''
+This software has been developed by:
+
+    GI Sistemas Naturales e Historia Forestal (formerly known as GI Genetica, Fisiologia e Historia Forestal)
+    Dpto. Sistemas y Recursos Naturales
+    ETSI Montes, Forestal y del Medio Natural
+    Universidad Politecnica de Madrid
+    https://github.com/ggfhf/
+
+Licence: GNU General Public Licence Version 3.
+'''
+
+#-------------------------------------------------------------------------------
+
+'''
+This program splits a FASTA file in a certain number of contiguous chunk files with a similar sequence number
+(FASTA file path + ".chunkN") used in the chunked mode of the pipeline processes.
+'''
+
+#-------------------------------------------------------------------------------
+
+import argparse
+import os
+import sys
+
+import xfasta
+import xlib
+
+#-------------------------------------------------------------------------------
+
+def main(argv):
+    '''
+    Main line of the program.
+    '''
+
+    # check the operating system
+    xlib.check_os()
+
+    # get and check the arguments
+    parser = build_parser()
+    args = parser.parse_args()
+    check_args(args)
+
+    # split the FASTA file
+    split_file(args.fasta_file, args.chunk_number)
+
+#-------------------------------------------------------------------------------
+
+def build_parser():
+    '''
+    Build the parser with the available arguments.
+    '''
+
+    # create the parser and add arguments
+    description = 'Description: This program splits a FASTA file in a certain number of contiguous chunk files with a similar sequence number.'
+    text = f'{xlib.get_long_project_name()} v{xlib.get_project_version()} - {os.path.basename(__file__)}\n\n{description}\n'
+    usage = f'\r{text.ljust(len("usage:"))}\nUsage: {os.path.basename(__file__)} arguments'
+    parser = argparse.ArgumentParser(usage=usage)
+    parser._optionals.title = 'Arguments'
+    parser.add_argument('--fasta', dest='fasta_file', help='Path of the FASTA file (mandatory).')
+    parser.add_argument('--chunks', dest='chunk_number', help='Number of chunk files (mandatory).')
+    parser.add_argument('--verbose', dest='verbose', help=f'Additional job status info during the run: {xlib.get_verbose_code_list_text()}; default: {xlib.Const.DEFAULT_VERBOSE}.')
+    parser.add_argument('--trace', dest='trace', help=f'Additional info useful to the developer team: {xlib.get_trace_code_list_text()}; default: {xlib.Const.DEFAULT_TRACE}.')
+
+    # return the paser
+    return parser
+
+#-------------------------------------------------------------------------------
+
+def check_args(args):
+    '''
+    Check the input arguments.
+    '''
+
+    # initialize the control variable
+    OK = True
+
+    # check "fasta_file"
+    if args.fasta_file is None:
+        xlib.Message.print('error', '*** The FASTA file is not indicated in the input arguments.')
+        OK = False
+    elif not os.path.isfile(args.fasta_file):
+        xlib.Message.print('error', f'*** The file {args.fasta_file} does not exist.')
+        OK = False
+
+    # check "chunk_number"
+    if args.chunk_number is None:
+        xlib.Message.print('error', '*** The number of chunk files is not indicated in the input arguments.')
+        OK = False
+    elif not xlib.check_int(args.chunk_number, minimum=1):
+        xlib.Message.print('error', '*** The number of chunk files has to be an integer number greater than 0.')
+        OK = False
+    else:
+        args.chunk_number = int(args.chunk_number)
+
+    # check "verbose"
+    if args.verbose is None:
+        args.verbose = xlib.Const.DEFAULT_VERBOSE
+    elif not xlib.check_code(args.verbose, xlib.get_verbose_code_list(), case_sensitive=False):
+        xlib.Message.print('error', f'*** verbose has to be {xlib.get_verbose_code_list_text()}.')
+        OK = False
+    if args.verbose.upper() == 'Y':
+        xlib.Message.set_verbose_status(True)
+
+    # check "trace"
+    if args.trace is None:
+        args.trace = xlib.Const.DEFAULT_TRACE
+    elif not xlib.check_code(args.trace, xlib.get_trace_code_list(), case_sensitive=False):
+        xlib.Message.print('error', f'*** trace has to be {xlib.get_trace_code_list_text()}.')
+        OK = False
+    if args.trace.upper() == 'Y':
+        xlib.Message.set_trace_status(True)
+
+    # if there are errors, exit with exception
+    if not OK:
+        raise xlib.ProgramException('P001')
+
+#-------------------------------------------------------------------------------
+
+def split_file(fasta_file, chunk_number):
+    '''
+    Split a FASTA file in chunk files.
+    '''
+
+    # split the FASTA file
+    xlib.Message.print('verbose', f'Splitting the file {os.path.basename(fasta_file)} in {chunk_number} chunks ...\n')
+    chunk_seq_number_list = xfasta.split_fasta_file(fasta_file, chunk_number)
+
+    # print summary
+    for i in range(chunk_number):
+        xlib.Message.print('info', f'{os.path.basename(xlib.get_chunk_file(fasta_file, i + 1))}: {chunk_seq_number_list[i]} sequences.')
+
+#-------------------------------------------------------------------------------
+
+if __name__ == '__main__':
+
+    main(sys.argv[1:])
+    sys.exit(0)
+
+#-------------------------------------------------------------------------------
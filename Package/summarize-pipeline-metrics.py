@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+#-------------------------------------------------------------------------------
+
+'''
+This software has been developed by:
+
+    GI Sistemas Naturales e Historia Forestal (formerly known as GI Genetica, Fisiologia e Historia Forestal)
+    Dpto. Sistemas y Recursos Naturales
+    ETSI Montes, Forestal y del Medio Natural
+    Universidad Politecnica de Madrid
+    https://github.com/ggfhf/
+
+Licence: GNU General Public Licence Version 3.
+'''
+
+#-------------------------------------------------------------------------------
+
+'''
+This program summarizes the resources used by the steps of one or more runs of pipeline processes (wall and CPU time,
+maximum resident set size and block I/O recorded in the metrics file of each run directory) to see where the
+run time goes and to compare runs.
+'''
+
+#-------------------------------------------------------------------------------
+
+import argparse
+import os
+import sys
+
+import xlib
+
+#-------------------------------------------------------------------------------
+
+def main(argv):
+    '''
+    Main line of the program.
+    '''
+
+    # check the operating system
+    xlib.check_os()
+
+    # get and check the arguments
+    parser = build_parser()
+    args = parser.parse_args()
+    check_args(args)
+
+    # summarize the pipeline metrics
+    summarize_metrics(args.run_dir_list, args.pipeline_metrics_group)
+
+#-------------------------------------------------------------------------------
+
+def build_parser():
+    '''
+    Build the parser with the available arguments.
+    '''
+
+    # create the parser and add arguments
+    description = 'Description: This program summarizes the resources used by the steps of one or more runs of pipeline processes.'
+    text = f'{xlib.get_long_project_name()} v{xlib.get_project_version()} - {os.path.basename(__file__)}\n\n{description}\n'
+    usage = f'\r{text.ljust(len("usage:"))}\nUsage: {os.path.basename(__file__)} arguments'
+    parser = argparse.ArgumentParser(usage=usage)
+    parser._optionals.title = 'Arguments'
+    parser.add_argument('--rundirs', dest='run_dir_list', help='Paths of the run directories separated by commas; with several runs, they are compared (mandatory).')
+    parser.add_argument('--group', dest='pipeline_metrics_group', help=f'Grouping of the steps: {xlib.get_pipeline_metrics_group_code_list_text()}; default: KIND.')
+    parser.add_argument('--verbose', dest='verbose', help=f'Additional job status info during the run: {xlib.get_verbose_code_list_text()}; default: {xlib.Const.DEFAULT_VERBOSE}.')
+    parser.add_argument('--trace', dest='trace', help=f'Additional info useful to the developer team: {xlib.get_trace_code_list_text()}; default: {xlib.Const.DEFAULT_TRACE}.')
+
+    # return the paser
+    return parser
+
+#-------------------------------------------------------------------------------
+
+def check_args(args):
+    '''
+    Check the input arguments.
+    '''
+
+    # initialize the control variable
+    OK = True
+
+    # check "run_dir_list"
+    if args.run_dir_list is None:
+        xlib.Message.print('error', '*** The run directories are not indicated in the input arguments.')
+        OK = False
+    else:
+        args.run_dir_list = [run_dir.strip() for run_dir in args.run_dir_list.split(',') if run_dir.strip() != '']
+        for run_dir in args.run_dir_list:
+            if not os.path.isfile(xlib.get_pipeline_metrics_file(run_dir)):
+                xlib.Message.print('error', f'*** The file {xlib.get_pipeline_metrics_file(run_dir)} does not exist.')
+                OK = False
+
+    # check "pipeline_metrics_group"
+    if args.pipeline_metrics_group is None:
+        args.pipeline_metrics_group = 'KIND'
+    elif not xlib.check_code(args.pipeline_metrics_group, xlib.get_pipeline_metrics_group_code_list(), case_sensitive=False):
+        xlib.Message.print('error', f'*** The grouping of the steps has to be {xlib.get_pipeline_metrics_group_code_list_text()}.')
+        OK = False
+    else:
+        args.pipeline_metrics_group = args.pipeline_metrics_group.upper()
+
+    # check "verbose"
+    if args.verbose is None:
+        args.verbose = xlib.Const.DEFAULT_VERBOSE
+    elif not xlib.check_code(args.verbose, xlib.get_verbose_code_list(), case_sensitive=False):
+        xlib.Message.print('error', f'*** verbose has to be {xlib.get_verbose_code_list_text()}.')
+        OK = False
+    if args.verbose.upper() == 'Y':
+        xlib.Message.set_verbose_status(True)
+
+    # check "trace"
+    if args.trace is None:
+        args.trace = xlib.Const.DEFAULT_TRACE
+    elif not xlib.check_code(args.trace, xlib.get_trace_code_list(), case_sensitive=False):
+        xlib.Message.print('error', f'*** trace has to be {xlib.get_trace_code_list_text()}.')
+        OK = False
+    if args.trace.upper() == 'Y':
+        xlib.Message.set_trace_status(True)
+
+    # if there are errors, exit with exception
+    if not OK:
+        raise xlib.ProgramException('P001')
+
+#-------------------------------------------------------------------------------
+
+def summarize_metrics(run_dir_list, pipeline_metrics_group):
+    '''
+    Print the table of the resources used by the steps of the runs.
+    '''
+
+    # get the table
+    (header_list, row_list) = xlib.get_pipeline_metrics_table(run_dir_list, pipeline_metrics_group)
+
+    # set the column widths (the first column is aligned to the left and the rest to the right)
+    width_list = [max([len(row[i]) for row in [header_list] + row_list]) for i in range(len(header_list))]
+    line_template = '   '.join([f'{{{i}:{"<" if i == 0 else ">"}{width_list[i]}}}' for i in range(len(header_list))])
+
+    # print the table
+    xlib.Message.print('info', line_template.format(*header_list))
+    xlib.Message.print('info', line_template.format(*['=' * width for width in width_list]))
+    for row in row_list:
+        xlib.Message.print('info', line_template.format(*row))
+
+#-------------------------------------------------------------------------------
+
+if __name__ == '__main__':
+
+    main(sys.argv[1:])
+    sys.exit(0)
+
+#-------------------------------------------------------------------------------
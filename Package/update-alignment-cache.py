@@ -0,0 +1,417 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+#-------------------------------------------------------------------------------
+
+'''
+This software has been developed by:
+
+    GI Sistemas Naturales e Historia Forestal (formerly known as GI Genetica, Fisiologia e Historia Forestal)
+    Dpto. Sistemas y Recursos Naturales
+    ETSI Montes, Forestal y del Medio Natural
+    Universidad Politecnica de Madrid
+    https://github.com/ggfhf/
+
+Licence: GNU General Public Licence Version 3.
+'''
+
+#-------------------------------------------------------------------------------
+
+'''
+This program updates the alignment cache with the alignments of the sequences not found in the cache (the output
+of the aligner run with the cache misses) and writes the alignment file of all query sequences, in the order of
+the FASTA file, with the cached alignments and the new ones.
+'''
+
+#-------------------------------------------------------------------------------
+
+import argparse
+import os
+import sys
+import xml.sax.saxutils
+
+import xfasta
+import xlib
+import xsqlite
+
+#-------------------------------------------------------------------------------
+
+def main(argv):
+    '''
+    Main line of the program.
+    '''
+
+    # check the operating system
+    xlib.check_os()
+
+    # get and check the arguments
+    parser = build_parser()
+    args = parser.parse_args()
+    check_args(args)
+
+    # get the alignment key
+    alignment_key = xlib.get_alignment_cache_key(args.database, args.parameters)
+    xlib.Message.print('trace', f'alignment_key: {alignment_key}')
+
+    # connect to the alignment cache database and create the table (if it does not exist)
+    conn = xsqlite.connect_database(args.alignment_cache_db, 'BULK-LOAD')
+    xsqlite.create_alignment_cache(conn)
+
+    # save the alignments of the cache misses in the cache
+    if args.alignment_format == '5':
+        header_record_list = save_xml_alignments(conn, alignment_key, args.miss_file, args.miss_alignment_file)
+    else:
+        save_tabular_alignments(conn, alignment_key, args.miss_file, args.miss_alignment_file)
+        header_record_list = []
+
+    # write the alignment file of all query sequences
+    write_alignment_file(conn, alignment_key, args.seq_file, args.alignment_format, header_record_list, args.alignment_file)
+
+    # close connection to the alignment cache database
+    conn.close()
+
+#-------------------------------------------------------------------------------
+
+def build_parser():
+    '''
+    Build the parser with the available arguments.
+    '''
+
+    # create the parser and add arguments
+    description = 'Description: This program updates the alignment cache with the alignments of the cache misses and writes the alignment file of all query sequences.'
+    text = f'{xlib.get_long_project_name()} v{xlib.get_project_version()} - {os.path.basename(__file__)}\n\n{description}\n'
+    usage = f'\r{text.ljust(len("usage:"))}\nUsage: {os.path.basename(__file__)} arguments'
+    parser = argparse.ArgumentParser(usage=usage)
+    parser._optionals.title = 'Arguments'
+    parser.add_argument('--cache', dest='alignment_cache_db', help='Path of the alignment cache database (mandatory).')
+    parser.add_argument('--seqs', dest='seq_file', help='Path of the FASTA file with the query sequences (mandatory).')
+    parser.add_argument('--database', dest='database', help='Path of the target database of the aligner (BLAST+ database path + name or DIAMOND database file) (mandatory).')
+    parser.add_argument('--parameters', dest='parameters', help='Aligner program and parameters (mandatory).')
+    parser.add_argument('--misses', dest='miss_file', help='Path of the FASTA file with the sequences not found in the cache (mandatory).')
+    parser.add_argument('--malignment', dest='miss_alignment_file', help='Path of the alignment file of the cache misses written by the aligner (mandatory).')
+    parser.add_argument('--format', dest='alignment_format', help=f'Format of the alignment files (mandatory): {xlib.get_alignment_format_code_list_text()}.')
+    parser.add_argument('--alignment', dest='alignment_file', help='Path of the alignment file of all query sequences (mandatory).')
+    parser.add_argument('--verbose', dest='verbose', help=f'Additional job status info during the run: {xlib.get_verbose_code_list_text()}; default: {xlib.Const.DEFAULT_VERBOSE}.')
+    parser.add_argument('--trace', dest='trace', help=f'Additional info useful to the developer team: {xlib.get_trace_code_list_text()}; default: {xlib.Const.DEFAULT_TRACE}.')
+
+
+    # return the paser
+    return parser
+
+#-------------------------------------------------------------------------------
+
+def check_args(args):
+    '''
+    Check the input arguments.
+    '''
+
+    # initialize the control variable
+    OK = True
+
+    # check "alignment_cache_db"
+    if args.alignment_cache_db is None:
+        xlib.Message.print('error', '*** The alignment cache database is not indicated in the input arguments.')
+        OK = False
+
+    # check "seq_file"
+    if args.seq_file is None:
+        xlib.Message.print('error', '*** The FASTA file with the query sequences is not indicated in the input arguments.')
+        OK = False
+    elif not os.path.isfile(args.seq_file):
+        xlib.Message.print('error', f'*** The file {args.seq_file} does not exist.')
+        OK = False
+
+    # check "database"
+    if args.database is None:
+        xlib.Message.print('error', '*** The target database of the aligner is not indicated in the input arguments.')
+        OK = False
+    elif not os.path.isdir(os.path.dirname(os.path.abspath(args.database))):
+        xlib.Message.print('error', f'*** The directory {os.path.dirname(os.path.abspath(args.database))} does not exist.')
+        OK = False
+
+    # check "parameters"
+    if args.parameters is None:
+        xlib.Message.print('error', '*** The aligner program and parameters are not indicated in the input arguments.')
+        OK = False
+
+    # check "miss_file"
+    if args.miss_file is None:
+        xlib.Message.print('error', '*** The FASTA file of the cache misses is not indicated in the input arguments.')
+        OK = False
+    elif not os.path.isfile(args.miss_file):
+        xlib.Message.print('error', f'*** The file {args.miss_file} does not exist.')
+        OK = False
+
+    # check "miss_alignment_file"
+    if args.miss_alignment_file is None:
+        xlib.Message.print('error', '*** The alignment file of the cache misses is not indicated in the input arguments.')
+        OK = False
+    elif not os.path.isfile(args.miss_alignment_file):
+        xlib.Message.print('error', f'*** The file {args.miss_alignment_file} does not exist.')
+        OK = False
+
+    # check "alignment_format"
+    if args.alignment_format is None:
+        xlib.Message.print('error', '*** The format of the alignment files is not indicated in the input arguments.')
+        OK = False
+    elif not xlib.check_code(args.alignment_format, xlib.get_alignment_format_code_list(), case_sensitive=False):
+        xlib.Message.print('error', f'*** The format of the alignment files has to be {xlib.get_alignment_format_code_list_text()}.')
+        OK = False
+
+    # check "alignment_file"
+    if args.alignment_file is None:
+        xlib.Message.print('error', '*** The alignment file of all query sequences is not indicated in the input arguments.')
+        OK = False
+
+    # check "verbose"
+    if args.verbose is None:
+        args.verbose = xlib.Const.DEFAULT_VERBOSE
+    elif not xlib.check_code(args.verbose, xlib.get_verbose_code_list(), case_sensitive=False):
+        xlib.Message.print('error', f'*** verbose has to be {xlib.get_verbose_code_list_text()}.')
+        OK = False
+    if args.verbose.upper() == 'Y':
+        xlib.Message.set_verbose_status(True)
+
+    # check "trace"
+    if args.trace is None:
+        args.trace = xlib.Const.DEFAULT_TRACE
+    elif not xlib.check_code(args.trace, xlib.get_trace_code_list(), case_sensitive=False):
+        xlib.Message.print('error', f'*** trace has to be {xlib.get_trace_code_list_text()}.')
+        OK = False
+    if args.trace.upper() == 'Y':
+        xlib.Message.set_trace_status(True)
+
+    # if there are errors, exit with exception
+    if not OK:
+        raise xlib.ProgramException('P001')
+
+#-------------------------------------------------------------------------------
+
+def get_miss_seq_hash_dict(miss_file):
+    '''
+    Get a dictionary with the hash of each sequence of the FASTA file of the cache misses.
+    '''
+
+    # initialize the hash dictionary
+    seq_hash_dict = {}
+
+    # add the hash of each sequence
+    for (seq_id, seq, record_text) in xfasta.read_fasta_file(miss_file):
+        seq_hash_dict[seq_id] = xlib.get_seq_hash(seq)
+
+    # return the hash dictionary
+    return seq_hash_dict
+
+#-------------------------------------------------------------------------------
+
+def save_xml_alignments(conn, alignment_key, miss_file, miss_alignment_file):
+    '''
+    Save in the alignment cache the items "Iteration" of the BLAST XML file of the cache misses (without the items
+    with the iteration number and the query identification and definition, which are written again when the
+    alignment file is built) and return the header records of the file. The sequences without item "Iteration"
+    are saved with an empty result.
+    '''
+
+    # get the hash of each sequence of the cache misses
+    seq_hash_dict = get_miss_seq_hash_dict(miss_file)
+
+    # initialize the header record list, the iteration record list and the query sequence identification
+    header_record_list = []
+    iteration_record_list = None
+    seq_id = None
+
+    # initialize the row list and the set of saved sequences
+    row_list = []
+    saved_seq_id_set = set()
+
+    # open the BLAST XML file of the cache misses
+    try:
+        miss_alignment_file_id = open(miss_alignment_file, mode='r', encoding='iso-8859-1')
+    except Exception as e:
+        raise xlib.ProgramException('F001', miss_alignment_file)
+
+    # initialize the record counter
+    record_counter = 0
+
+    # read every record
+    for record in miss_alignment_file_id:
+
+        # add 1 to the record counter
+        record_counter += 1
+
+        # the item "Iteration" begins
+        if record.strip() == '<Iteration>':
+            iteration_record_list = [record]
+            seq_id = None
+
+        # the item "Iteration" ends
+        elif record.strip() == '</Iteration>':
+            iteration_record_list.append(record)
+            if seq_id is None or seq_id not in seq_hash_dict:
+                raise xlib.ProgramException('F006', os.path.basename(miss_alignment_file), record_counter)
+            row_list.append((alignment_key, seq_hash_dict[seq_id], ''.join(iteration_record_list)))
+            saved_seq_id_set.add(seq_id)
+            iteration_record_list = None
+            if len(row_list) >= xlib.Const.DEFAULT_BATCH_SIZE:
+                xsqlite.insert_alignment_cache_rows(conn, row_list)
+                row_list = []
+
+        # the record is in an item "Iteration"
+        elif iteration_record_list is not None:
+            if record.strip().startswith('<Iteration_query-def>'):
+                seq_id = xml.sax.saxutils.unescape(record[record.find('>') + 1:record.find('</')], {'&quot;': '"', '&apos;': "'"})
+            elif not record.strip().startswith('<Iteration_iter-num>') and not record.strip().startswith('<Iteration_query-ID>'):
+                iteration_record_list.append(record)
+
+        # the record is in the header (before the first item "Iteration")
+        elif seq_id is None and not record.strip().startswith('</BlastOutput'):
+            header_record_list.append(record)
+
+    # close the BLAST XML file of the cache misses
+    miss_alignment_file_id.close()
+
+    # save the sequences without alignments with an empty result
+    for (seq_id, seq_hash) in seq_hash_dict.items():
+        if seq_id not in saved_seq_id_set:
+            row_list.append((alignment_key, seq_hash, ''))
+    xsqlite.insert_alignment_cache_rows(conn, row_list)
+
+    # return the header record list
+    return header_record_list
+
+#-------------------------------------------------------------------------------
+
+def save_tabular_alignments(conn, alignment_key, miss_file, miss_alignment_file):
+    '''
+    Save in the alignment cache the records of the BLAST tabular file of the cache misses (without the column
+    of the query sequence identification, which is written again when the alignment file is built). The sequences
+    without records are saved with an empty result.
+    '''
+
+    # get the hash of each sequence of the cache misses (the aligner writes the first word of the definition line
+    # as query sequence identification in the tabular format)
+    seq_hash_dict = {seq_id.split()[0]: seq_hash for (seq_id, seq_hash) in get_miss_seq_hash_dict(miss_file).items()}
+
+    # initialize the result dictionary (the records of a sequence are consecutive, but they are grouped anyway)
+    result_dict = {}
+
+    # initialize the row list
+    row_list = []
+
+    # open the BLAST tabular file of the cache misses
+    try:
+        miss_alignment_file_id = open(miss_alignment_file, mode='r', encoding='iso-8859-1')
+    except Exception as e:
+        raise xlib.ProgramException('F001', miss_alignment_file)
+
+    # initialize the record counter
+    record_counter = 0
+
+    # read every record and group the records of each sequence
+    for record in miss_alignment_file_id:
+        record_counter += 1
+        if record.strip() == '' or record.startswith('#'):
+            continue
+        (seq_id, separator, rest) = record.partition('\t')
+        if seq_id not in seq_hash_dict:
+            raise xlib.ProgramException('F006', os.path.basename(miss_alignment_file), record_counter)
+        result_dict[seq_id] = result_dict.get(seq_id, '') + (rest if rest.endswith('\n') else f'{rest}\n')
+
+    # close the BLAST tabular file of the cache misses
+    miss_alignment_file_id.close()
+
+    # save the records of each sequence (the sequences without records are saved with an empty result)
+    for (seq_id, seq_hash) in seq_hash_dict.items():
+        row_list.append((alignment_key, seq_hash, result_dict.get(seq_id, '')))
+        if len(row_list) >= xlib.Const.DEFAULT_BATCH_SIZE:
+            xsqlite.insert_alignment_cache_rows(conn, row_list)
+            row_list = []
+    xsqlite.insert_alignment_cache_rows(conn, row_list)
+
+#-------------------------------------------------------------------------------
+
+def write_alignment_file(conn, alignment_key, seq_file, alignment_format, header_record_list, alignment_file):
+    '''
+    Write the alignment file of all query sequences, in the order of the FASTA file, with the results saved
+    in the alignment cache.
+    '''
+
+    # open the alignment file
+    try:
+        alignment_file_id = open(alignment_file, mode='w', encoding='iso-8859-1', newline='\n')
+    except Exception as e:
+        raise xlib.ProgramException('F003', alignment_file)
+
+    # write the header records of a BLAST XML file (the ones of the BLAST XML file of the cache misses
+    # or the minimal ones when the aligner did not write any record)
+    if alignment_format == '5':
+        if header_record_list == []:
+            header_record_list = ['<?xml version="1.0"?>\n', '<BlastOutput>\n', '  <BlastOutput_iterations>\n']
+        for record in header_record_list:
+            alignment_file_id.write(record)
+
+    # initialize the counters
+    iteration_counter = 0
+    hit_counter = 0
+    seq_counter = 0
+
+    # initialize the batch of sequences
+    batch_list = []
+
+    # write the results of the sequences of the query file in batches
+    seq_iterator = xfasta.read_fasta_file(seq_file)
+    while True:
+
+        # read the next sequence and add it to the batch
+        seq_data = next(seq_iterator, None)
+        if seq_data is not None:
+            batch_list.append((seq_data[0], xlib.get_seq_hash(seq_data[1])))
+            if len(batch_list) < xlib.Const.DEFAULT_BATCH_SIZE:
+                continue
+
+        # get the results of the sequences of the batch and write them
+        alignment_cache_dict = xsqlite.get_alignment_cache_dict(conn, alignment_key, [seq_hash for (seq_id, seq_hash) in batch_list])
+        for (seq_id, seq_hash) in batch_list:
+            seq_counter += 1
+            result = alignment_cache_dict.get(seq_hash)
+            if result is None:
+                raise xlib.ProgramException('B002', f'The alignment of the sequence {seq_id} is not found in the alignment cache.')
+            if result == '':
+                continue
+            hit_counter += 1
+            if alignment_format == '5':
+                iteration_counter += 1
+                (first_record, separator, rest) = result.partition('\n')
+                alignment_file_id.write(f'{first_record}\n')
+                alignment_file_id.write(f'  <Iteration_iter-num>{iteration_counter}</Iteration_iter-num>\n')
+                alignment_file_id.write(f'  <Iteration_query-ID>Query_{iteration_counter}</Iteration_query-ID>\n')
+                alignment_file_id.write(f'  <Iteration_query-def>{xml.sax.saxutils.escape(seq_id)}</Iteration_query-def>\n')
+                alignment_file_id.write(rest)
+            else:
+                for record in result.splitlines(keepends=True):
+                    alignment_file_id.write(f'{seq_id.split()[0]}\t{record}')
+        batch_list = []
+
+        # exit the loop when there are not more sequences
+        if seq_data is None:
+            break
+
+    # write the trailer records of a BLAST XML file
+    if alignment_format == '5':
+        alignment_file_id.write('  </BlastOutput_iterations>\n')
+        alignment_file_id.write('</BlastOutput>\n')
+
+    # close the alignment file
+    alignment_file_id.close()
+
+    # print summary
+    xlib.Message.print('info', f'The alignment file {os.path.basename(alignment_file)} is written: {seq_counter} sequences, {hit_counter} with alignment results.')
+
+#-------------------------------------------------------------------------------
+
+if __name__ == '__main__':
+
+    main(sys.argv[1:])
+    sys.exit(0)
+
+#-------------------------------------------------------------------------------
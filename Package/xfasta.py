@@ -0,0 +1,416 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+#-------------------------------------------------------------------------------
+
+'''
+This software has been developed by:
+
+    GI Sistemas Naturales e Historia Forestal (formerly known as GI Genetica, Fisiologia e Historia Forestal)
+    Dpto. Sistemas y Recursos Naturales
+    ETSI Montes, Forestal y del Medio Natural
+    Universidad Politecnica de Madrid
+    https://github.com/ggfhf/
+
+Licence: GNU General Public Licence Version 3.
+'''
+
+#-------------------------------------------------------------------------------
+
+'''
+This source contains functions and classes to read, index and split FASTA files used in both console mode and gui mode.
+'''
+
+#-------------------------------------------------------------------------------
+
+import gzip
+import os
+import sys
+
+import xlib
+
+#-------------------------------------------------------------------------------
+
+def get_fasta_index_file(fasta_file):
+    '''
+    Get the path of the index file of a FASTA file.
+    '''
+
+    return f'{fasta_file}.tfai'
+
+#-------------------------------------------------------------------------------
+
+def get_seq_number(fasta_file):
+    '''
+    Get the sequence number of a FASTA file using its index.
+    '''
+
+    return FastaIndex(fasta_file).get_seq_number()
+
+#-------------------------------------------------------------------------------
+
+def get_seq_id_set(fasta_file):
+    '''
+    Get the set of sequence identifications of a FASTA file using its index.
+    '''
+
+    return FastaIndex(fasta_file).get_seq_id_set()
+
+#-------------------------------------------------------------------------------
+
+def read_fasta_file(fasta_file):
+    '''
+    Read a FASTA file yielding the identification, the sequence and the records (header and sequence records)
+    of each sequence.
+    '''
+
+    # open the FASTA file
+    if fasta_file.endswith('.gz'):
+        try:
+            fasta_file_id = xlib.open_gzip(fasta_file, mode='rt', encoding='iso-8859-1')
+        except Exception as e:
+            raise xlib.ProgramException('F002', fasta_file)
+    else:
+        try:
+            fasta_file_id = open(fasta_file, mode='r', encoding='iso-8859-1')
+        except Exception as e:
+            raise xlib.ProgramException('F001', fasta_file)
+
+    # initialize the data of the current sequence
+    seq_id = None
+    record_list = []
+
+    # read every record
+    for record in fasta_file_id:
+
+        # process the header record
+        if record.startswith('>'):
+            if seq_id is not None:
+                yield (seq_id, ''.join([x.strip() for x in record_list[1:]]), ''.join(record_list))
+            seq_id = record[1:].strip()
+            record_list = [record]
+
+        # control the FASTA format
+        elif seq_id is None:
+            if record.strip() != '':
+                fasta_file_id.close()
+                raise xlib.ProgramException('F005', fasta_file, 'FASTA')
+
+        # process a sequence record
+        else:
+            record_list.append(record)
+
+    # yield the last sequence
+    if seq_id is not None:
+        yield (seq_id, ''.join([x.strip() for x in record_list[1:]]), ''.join(record_list))
+
+    # close the FASTA file
+    fasta_file_id.close()
+
+#-------------------------------------------------------------------------------
+
+def split_fasta_file(fasta_file, chunk_number):
+    '''
+    Split a FASTA file in contiguous chunk files with a similar sequence number (there are always chunk_number
+    files, some of them can be empty when the sequence number is lower) and return the sequence number of each chunk.
+    '''
+
+    # get the sequence number of each chunk
+    seq_number = get_seq_number(fasta_file)
+    chunk_seq_number_list = [seq_number // chunk_number + (1 if i < seq_number % chunk_number else 0) for i in range(chunk_number)]
+
+    # open the FASTA file
+    if fasta_file.endswith('.gz'):
+        try:
+            fasta_file_id = xlib.open_gzip(fasta_file, mode='rt', encoding='iso-8859-1')
+        except Exception as e:
+            raise xlib.ProgramException('F002', fasta_file)
+    else:
+        try:
+            fasta_file_id = open(fasta_file, mode='r', encoding='iso-8859-1')
+        except Exception as e:
+            raise xlib.ProgramException('F001', fasta_file)
+
+    # read the first record
+    record = fasta_file_id.readline()
+
+    # write the sequences of each chunk
+    for i in range(chunk_number):
+
+        # open the chunk file
+        chunk_file = xlib.get_chunk_file(fasta_file, i + 1)
+        try:
+            chunk_file_id = open(chunk_file, mode='w', encoding='iso-8859-1', newline='\n')
+        except Exception as e:
+            raise xlib.ProgramException('F003', chunk_file)
+
+        # copy the header and sequence records of the sequences of the chunk
+        chunk_seq_counter = 0
+        while record != '' and (chunk_seq_counter < chunk_seq_number_list[i] or not record.startswith('>')):
+            if record.startswith('>'):
+                chunk_seq_counter += 1
+            chunk_file_id.write(record)
+            record = fasta_file_id.readline()
+
+        # close the chunk file
+        chunk_file_id.close()
+
+    # close the FASTA file
+    fasta_file_id.close()
+
+    # return the sequence number of each chunk
+    return chunk_seq_number_list
+
+#-------------------------------------------------------------------------------
+
+class FastaIndex():
+    '''
+    This class manages the index of a FASTA file (it can be compressed with gzip). The index is kept in a
+    sidecar file (FASTA file path + ".tfai") that is reused while the size and modification time of the FASTA
+    file do not change, and rebuilt otherwise.
+
+    Index file format:
+        #file_size<TAB>file_mtime_ns<TAB>seq_number
+        seq_id<TAB>seq_length<TAB>offset<TAB>record_size
+
+    where seq_id is the header record without ">", seq_length is the base number, offset is the byte position
+    of the header record in the uncompressed data and record_size is the byte number of the header and sequence records.
+    '''
+
+    #---------------
+
+    def __init__(self, fasta_file):
+        '''
+        Initialize the index of a FASTA file building it when there is not a valid index file.
+        '''
+
+        # save initial parameters in instance variables
+        self.fasta_file = fasta_file
+        self.index_file = get_fasta_index_file(fasta_file)
+
+        # initialize the sequence number and the index dictionary (it is loaded when it is necessary)
+        self.seq_number = None
+        self.index_dict = None
+
+        # get the status of the FASTA file
+        try:
+            file_stat = os.stat(fasta_file)
+        except Exception as e:
+            raise xlib.ProgramException('F001', fasta_file)
+        self.file_size = file_stat.st_size
+        self.file_mtime_ns = file_stat.st_mtime_ns
+
+        # read the sequence number of the index file when it is valid or build the index
+        self.seq_number = self.read_index_header()
+        if self.seq_number is None:
+            self.build()
+
+    #---------------
+
+    def read_index_header(self):
+        '''
+        Read the header record of the index file and return the sequence number when the index
+        corresponds to the current FASTA file; otherwise, return None.
+        '''
+
+        # initialize the sequence number
+        seq_number = None
+
+        # read the header record
+        try:
+            with open(self.index_file, mode='r', encoding='iso-8859-1') as index_file_id:
+                data_list = index_file_id.readline().lstrip('#').rstrip('\n').split('\t')
+            if int(data_list[0]) == self.file_size and int(data_list[1]) == self.file_mtime_ns:
+                seq_number = int(data_list[2])
+        except Exception as e:
+            seq_number = None
+
+        # return the sequence number
+        return seq_number
+
+    #---------------
+
+    def build(self):
+        '''
+        Build the index reading the FASTA file and write the index file.
+        '''
+
+        xlib.Message.print('verbose', f'Indexing the FASTA file {os.path.basename(self.fasta_file)} ...\n')
+
+        # open the FASTA file in binary mode to get the byte offsets
+        if self.fasta_file.endswith('.gz'):
+            try:
+                fasta_file_id = xlib.open_gzip(self.fasta_file, mode='rb')
+            except Exception as e:
+                raise xlib.ProgramException('F002', self.fasta_file)
+        else:
+            try:
+                fasta_file_id = open(self.fasta_file, mode='rb')
+            except Exception as e:
+                raise xlib.ProgramException('F001', self.fasta_file)
+
+        # initialize the index dictionary and the data of the current sequence
+        self.index_dict = {}
+        seq_id = None
+        seq_length = 0
+        seq_offset = 0
+
+        # read every record
+        offset = 0
+        for record in fasta_file_id:
+
+            # process the header record
+            if record.startswith(b'>'):
+                if seq_id is not None:
+                    self.index_dict[seq_id] = (seq_length, seq_offset, offset - seq_offset)
+                seq_id = record[1:].decode('iso-8859-1').strip()
+                seq_length = 0
+                seq_offset = offset
+
+            # control the FASTA format
+            elif seq_id is None:
+                fasta_file_id.close()
+                raise xlib.ProgramException('F005', self.fasta_file, 'FASTA')
+
+            # process a sequence record
+            else:
+                seq_length += len(record.strip())
+
+            offset += len(record)
+
+        # add the last sequence
+        if seq_id is not None:
+            self.index_dict[seq_id] = (seq_length, seq_offset, offset - seq_offset)
+
+        # close the FASTA file
+        fasta_file_id.close()
+
+        # set the sequence number
+        self.seq_number = len(self.index_dict)
+
+        # write the index file (when it can not be written, the index is only kept in memory)
+        index_file_tmp = f'{self.index_file}.tmp'
+        try:
+            with open(index_file_tmp, mode='w', encoding='iso-8859-1', newline='\n') as index_file_id:
+                index_file_id.write(f'#{self.file_size}\t{self.file_mtime_ns}\t{self.seq_number}\n')
+                for (seq_id, (seq_length, seq_offset, record_size)) in self.index_dict.items():
+                    index_file_id.write(f'{seq_id}\t{seq_length}\t{seq_offset}\t{record_size}\n')
+            os.replace(index_file_tmp, self.index_file)
+        except Exception as e:
+            xlib.Message.print('trace', f'The index file {self.index_file} can not be written: {e}')
+
+        xlib.Message.print('verbose', f'The FASTA file is indexed: {self.seq_number} sequences.\n')
+
+    #---------------
+
+    def load(self):
+        '''
+        Load the index dictionary from the index file.
+        '''
+
+        # initialize the index dictionary
+        self.index_dict = {}
+
+        # read the index records (the sequence identification can contain tabs)
+        try:
+            with open(self.index_file, mode='r', encoding='iso-8859-1') as index_file_id:
+                index_file_id.readline()
+                for record in index_file_id:
+                    (seq_id, seq_length, seq_offset, record_size) = record.rstrip('\n').rsplit('\t', 3)
+                    self.index_dict[seq_id] = (int(seq_length), int(seq_offset), int(record_size))
+        except Exception as e:
+            raise xlib.ProgramException('F006', os.path.basename(self.index_file), len(self.index_dict) + 2)
+
+    #---------------
+
+    def get_index_dict(self):
+        '''
+        Get the index dictionary (sequence identification -> (sequence length, offset, record size)).
+        '''
+
+        if self.index_dict is None:
+            self.load()
+        return self.index_dict
+
+    #---------------
+
+    def get_seq_number(self):
+        '''
+        Get the sequence number.
+        '''
+
+        return self.seq_number
+
+    #---------------
+
+    def get_seq_id_set(self):
+        '''
+        Get the set of sequence identifications.
+        '''
+
+        return set(self.get_index_dict().keys())
+
+    #---------------
+
+    def get_seq_length(self, seq_id):
+        '''
+        Get the length of a sequence (None when the sequence identification is not in the index).
+        '''
+
+        data = self.get_index_dict().get(seq_id)
+        return None if data is None else data[0]
+
+    #---------------
+
+    def get_record(self, seq_id):
+        '''
+        Get the header and sequence records of a sequence as text (None when the sequence identification is not in the index).
+        A compressed file is decompressed from the beginning to the offset of the sequence.
+        '''
+
+        # get the index data of the sequence
+        data = self.get_index_dict().get(seq_id)
+        if data is None:
+            return None
+        (seq_length, seq_offset, record_size) = data
+
+        # read the records
+        if self.fasta_file.endswith('.gz'):
+            try:
+                with gzip.open(self.fasta_file, mode='rb') as fasta_file_id:
+                    fasta_file_id.seek(seq_offset)
+                    record = fasta_file_id.read(record_size)
+            except Exception as e:
+                raise xlib.ProgramException('F002', self.fasta_file)
+        else:
+            try:
+                with open(self.fasta_file, mode='rb') as fasta_file_id:
+                    fasta_file_id.seek(seq_offset)
+                    record = fasta_file_id.read(record_size)
+            except Exception as e:
+                raise xlib.ProgramException('F001', self.fasta_file)
+
+        # return the records as text
+        return record.decode('iso-8859-1')
+
+    #---------------
+
+    def get_seq(self, seq_id):
+        '''
+        Get the sequence (without header and EOLs) of a sequence identification (None when it is not in the index).
+        '''
+
+        record = self.get_record(seq_id)
+        if record is None:
+            return None
+        return ''.join([seq_record.strip() for seq_record in record.splitlines()[1:]])
+
+    #---------------
+
+#-------------------------------------------------------------------------------
+
+if __name__ == '__main__':
+    print('This source contains functions and classes to index and split FASTA files used in both console mode and gui mode.')
+    sys.exit(0)
+
+#-------------------------------------------------------------------------------
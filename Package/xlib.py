@@ -24,13 +24,25 @@ software package used in both console mode and gui mode.
 
 #-------------------------------------------------------------------------------
 
+import atexit
+import concurrent.futures
 import configparser
 import datetime
+import hashlib
+import heapq
+import io
+import json
 import os
+import queue
 import re
 import requests
+import shutil
 import subprocess
 import sys
+import tempfile
+import threading
+import time
+import weakref
 
 import gzip
 import xsqlite
@@ -259,6 +271,269 @@ def get_status_wrong(current_run_dir):
 
 #-------------------------------------------------------------------------------
 
+def get_step_status_ok(current_run_dir, step):
+    '''
+    Get the OK status file of a pipeline step.
+    '''
+
+    # set the OK status file of the step
+    step_ok_status = f'{current_run_dir}/status/{step}.ok'
+
+    # return the OK status file of the step
+    return step_ok_status
+
+#-------------------------------------------------------------------------------
+
+def get_pipeline_step_file(current_run_dir):
+    '''
+    Get the step file of a pipeline process.
+    '''
+
+    # set the step file
+    step_file = f'{current_run_dir}/pipeline-steps.ini'
+
+    # return the step file
+    return step_file
+
+#-------------------------------------------------------------------------------
+
+def get_pipeline_step_list(step_file):
+    '''
+    Get the step list of a pipeline process from its step file.
+    '''
+
+    # initialize the step list
+    step_list = []
+
+    # get the step data (the sections are got in the file order)
+    for (step, option_dict) in get_option_dict(step_file).items():
+        step_list.append({
+            'name': step,
+            'input_list': [x.strip() for x in option_dict.get('inputs', '').split(',') if x.strip() != ''],
+            'output_list': [x.strip() for x in option_dict.get('outputs', '').split(',') if x.strip() != ''],
+            'threads': int(option_dict.get('threads', '1')),
+            'dataset': option_dict.get('dataset', 'NONE')
+            })
+
+    # return the step list
+    return step_list
+
+#-------------------------------------------------------------------------------
+
+def get_pipeline_step_dependency_dict(step_list):
+    '''
+    Get the dependency dictionary of the steps of a pipeline process: a step depends on the previous steps
+    that write its inputs or outputs or that read its outputs.
+    '''
+
+    # initialize the dependency dictionary
+    dependency_dict = {}
+
+    # get the previous steps with a conflict of each step
+    for i in range(len(step_list)):
+        input_set = set(step_list[i]['input_list'])
+        output_set = set(step_list[i]['output_list'])
+        dependency_dict[step_list[i]['name']] = set()
+        for j in range(i):
+            if not output_set.union(input_set).isdisjoint(step_list[j]['output_list']) or not output_set.isdisjoint(step_list[j]['input_list']):
+                dependency_dict[step_list[i]['name']].add(step_list[j]['name'])
+
+    # return the dependency dictionary
+    return dependency_dict
+
+#-------------------------------------------------------------------------------
+
+def get_chunk_file(file, chunk):
+    '''
+    Get the path of the file of a chunk (1, 2, ...) of a file in the chunked mode of a pipeline process
+    (the pipeline scripts use the same convention: "$FILE.chunkN").
+    '''
+
+    # set the chunk file
+    chunk_file = f'{file}.chunk{chunk}'
+
+    # return the chunk file
+    return chunk_file
+
+#-------------------------------------------------------------------------------
+
+def get_alignment_cache_db(toa_db):
+    '''
+    Get the path of the alignment cache database (it is in the directory of the TOA database).
+    '''
+
+    # set the alignment cache database
+    alignment_cache_db = f'{os.path.dirname(toa_db)}/alignment-cache.db'
+
+    # return the alignment cache database
+    return alignment_cache_db
+
+#-------------------------------------------------------------------------------
+
+def get_alignment_cache_key(database, parameters):
+    '''
+    Get the key of the alignments in the alignment cache: a hash of the aligner parameters and the build
+    of the target database (name, size and modification time of the files whose path starts with the database path).
+    '''
+
+    # initialize the hash with the aligner parameters (the spaces are normalized)
+    key_hash = hashlib.sha256(' '.join(parameters.split()).encode('iso-8859-1'))
+
+    # add the build of the target database
+    database_dir = os.path.dirname(database) if os.path.dirname(database) != '' else '.'
+    database_name = os.path.basename(database)
+    for file in sorted(os.listdir(database_dir)):
+        if file.startswith(database_name) and os.path.isfile(os.path.join(database_dir, file)):
+            stat = os.stat(os.path.join(database_dir, file))
+            key_hash.update(f'\t{file}\t{stat.st_size}\t{stat.st_mtime_ns}'.encode('iso-8859-1'))
+
+    # return the alignment key
+    return key_hash.hexdigest()
+
+#-------------------------------------------------------------------------------
+
+def get_seq_hash(seq):
+    '''
+    Get the hash of a sequence used as key in the alignment cache (the sequence is converted to upper case).
+    '''
+
+    return hashlib.sha256(seq.upper().encode('iso-8859-1')).hexdigest()
+
+#-------------------------------------------------------------------------------
+
+def get_pipeline_metrics_file(current_run_dir):
+    '''
+    Get the metrics file of a pipeline process (a JSON record by line with the resources used by each run step).
+    '''
+
+    # set the metrics file
+    metrics_file = f'{current_run_dir}/pipeline-metrics.jsonl'
+
+    # return the metrics file
+    return metrics_file
+
+#-------------------------------------------------------------------------------
+
+def get_pipeline_step_kind(step, dataset):
+    '''
+    Get the kind of a pipeline step: its name without the dataset identification and the chunk number.
+    '''
+
+    # remove the dataset identification and the chunk number of the step name
+    kind = step.replace(f'_{dataset}', '', 1) if dataset != 'NONE' else step
+    kind = re.sub(r'_chunk\d+$', '', kind)
+
+    # return the step kind
+    return kind
+
+#-------------------------------------------------------------------------------
+
+def get_pipeline_metrics_record_list(current_run_dir):
+    '''
+    Get the metrics records of a pipeline process: when a step was run several times (restarts), only
+    its last record is got.
+    '''
+
+    # initialize the record dictionary
+    record_dict = {}
+
+    # read the records of the metrics file
+    metrics_file = get_pipeline_metrics_file(current_run_dir)
+    try:
+        with open(metrics_file, mode='r', encoding='iso-8859-1') as metrics_file_id:
+            for record in metrics_file_id:
+                if record.strip() != '':
+                    data_dict = json.loads(record)
+                    record_dict.pop(data_dict['step'], None)
+                    record_dict[data_dict['step']] = data_dict
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        raise ProgramException('F001', metrics_file)
+
+    # return the record list
+    return list(record_dict.values())
+
+#-------------------------------------------------------------------------------
+
+def get_pipeline_metrics_table(current_run_dir_list, group):
+    '''
+    Get the header list and the row list of a table with the resources used by the steps of one or more runs
+    of pipeline processes grouped by step, by step kind and dataset or by step kind: with one run, the step number,
+    wall and CPU time, maximum resident set size and block I/O of each group; with several runs, the wall and
+    CPU time and maximum resident set size of each group in each run to compare them. The last row is the total
+    of the steps (the wall time is the sum of the steps, not the elapsed time of concurrent steps).
+    '''
+
+    # initialize the group list and the dictionary of the resources of each run
+    group_list = []
+    run_group_dict = {}
+
+    # add the resources of the steps of each run to their groups
+    for current_run_dir in current_run_dir_list:
+        group_dict = {}
+        for data_dict in get_pipeline_metrics_record_list(current_run_dir):
+            kind = get_pipeline_step_kind(data_dict['step'], data_dict['dataset'])
+            if group == 'STEP':
+                key = data_dict['step']
+            elif group == 'DATASET' and data_dict['dataset'] != 'NONE':
+                key = f'{kind} ({data_dict["dataset"]})'
+            else:
+                key = kind
+            if key not in group_list:
+                group_list.append(key)
+            resource_dict = group_dict.setdefault(key, {'steps': 0, 'wall_time': 0.0, 'cpu_time': 0.0, 'max_rss': 0, 'read_kb': 0, 'written_kb': 0})
+            resource_dict['steps'] += 1
+            resource_dict['wall_time'] += data_dict['wall_time']
+            resource_dict['cpu_time'] += data_dict['user_time'] + data_dict['system_time']
+            resource_dict['max_rss'] = max(resource_dict['max_rss'], data_dict['max_rss'])
+            resource_dict['read_kb'] += data_dict['read_kb']
+            resource_dict['written_kb'] += data_dict['written_kb']
+        run_group_dict[current_run_dir] = group_dict
+
+    # add the total of the resources of the steps of each run
+    for group_dict in run_group_dict.values():
+        group_dict['Total'] = {
+            'steps': sum([resource_dict['steps'] for resource_dict in group_dict.values()]),
+            'wall_time': sum([resource_dict['wall_time'] for resource_dict in group_dict.values()]),
+            'cpu_time': sum([resource_dict['cpu_time'] for resource_dict in group_dict.values()]),
+            'max_rss': max([resource_dict['max_rss'] for resource_dict in group_dict.values()], default=0),
+            'read_kb': sum([resource_dict['read_kb'] for resource_dict in group_dict.values()]),
+            'written_kb': sum([resource_dict['written_kb'] for resource_dict in group_dict.values()])
+            }
+    group_list.append('Total')
+
+    # build the header list and the row list of one run
+    if len(current_run_dir_list) == 1:
+        header_list = ['Group', 'Steps', 'Wall time (s)', 'CPU time (s)', 'Max RSS (Kb)', 'Read (Kb)', 'Written (Kb)']
+        group_dict = run_group_dict[current_run_dir_list[0]]
+        row_list = []
+        for key in group_list:
+            resource_dict = group_dict[key]
+            row_list.append([key, str(resource_dict['steps']), f'{resource_dict["wall_time"]:.1f}', f'{resource_dict["cpu_time"]:.1f}', str(resource_dict['max_rss']), str(resource_dict['read_kb']), str(resource_dict['written_kb'])])
+
+    # build the header list and the row list of several runs
+    else:
+        header_list = ['Group']
+        for current_run_dir in current_run_dir_list:
+            run_id = os.path.basename(current_run_dir)
+            header_list += [f'{run_id} wall time (s)', f'{run_id} CPU time (s)', f'{run_id} max RSS (Kb)']
+        row_list = []
+        for key in group_list:
+            row = [key]
+            for current_run_dir in current_run_dir_list:
+                resource_dict = run_group_dict[current_run_dir].get(key)
+                if resource_dict is None:
+                    row += ['-', '-', '-']
+                else:
+                    row += [f'{resource_dict["wall_time"]:.1f}', f'{resource_dict["cpu_time"]:.1f}', str(resource_dict['max_rss'])]
+            row_list.append(row)
+
+    # return the header list and the row list
+    return (header_list, row_list)
+
+#-------------------------------------------------------------------------------
+
 def get_run_log_file():
     '''
     Get the log file name of a process run.
@@ -1815,7 +2090,7 @@ def get_taxonomy_server():
 
 #-------------------------------------------------------------------------------
 
-def get_taxonomy_dict(type, value):
+def get_taxonomy_dict(type, value, taxonomy_server=None):
     '''
     Get a taxonomy dictionary with the a species data downloaded from the taxonomy server.
     '''
@@ -1824,7 +2099,8 @@ def get_taxonomy_dict(type, value):
     taxonomy_dict = {}
 
     # set the taxonomy server
-    taxonomy_server = get_taxonomy_server()
+    if taxonomy_server is None:
+        taxonomy_server = get_taxonomy_server()
 
     # replace spaces by underscores in value
     value = value.strip().replace(' ', '_')
@@ -1852,6 +2128,28 @@ def get_taxonomy_dict(type, value):
 
 #-------------------------------------------------------------------------------
 
+def get_taxonomy_dicts(type, value_list, thread_number=None, taxonomy_server=None):
+    '''
+    Get a dictionary with the taxonomy dictionary of each value of a list downloaded from the taxonomy server
+    by a pool of threads (the thread number limits the requests in progress at the same time).
+    '''
+
+    # set the thread number
+    if thread_number is None:
+        thread_number = Const.DEFAULT_TAXONOMY_THREADS
+
+    # remove duplicated values keeping their order
+    value_list = list(dict.fromkeys(value_list))
+
+    # inquire the taxonomy data of the values to the server
+    with concurrent.futures.ThreadPoolExecutor(max_workers=thread_number) as executor:
+        taxonomy_dict_list = list(executor.map(lambda value: get_taxonomy_dict(type, value, taxonomy_server), value_list))
+
+    # return the dictionary of taxonomy dictionaries
+    return dict(zip(value_list, taxonomy_dict_list))
+
+#-------------------------------------------------------------------------------
+
 def get_species_data(conn, species_dict, species_name):
     '''
     Get species data from the species dictionary.
@@ -1875,265 +2173,248 @@ def get_species_data(conn, species_dict, species_name):
 
     except Exception as e:
 
-        # get the taxonomy dictionary of the species name from taxonomy server
-        taxonomy_dict = get_taxonomy_dict('name', species_name)
-        if taxonomy_dict == {}:
-            row_dict['family_name'] = get_na()
-            row_dict['phylum_name'] = get_na()
-            row_dict['kingdom_name'] = get_na()
-            row_dict['superkingdom_name'] = get_na()
-            row_dict['tax_id'] = get_na()
+        # get the taxonomy lineage of the species name from the NCBI Taxonomy data loaded into TOA database
+        if xsqlite.check_taxonomy_lineages(conn) == 1:
+            taxonomy_lineage_dict = xsqlite.get_taxonomy_lineage_dict(conn, species_name)
+            row_dict['family_name'] = taxonomy_lineage_dict.get('family_name', get_na())
+            row_dict['phylum_name'] = taxonomy_lineage_dict.get('phylum_name', get_na())
+            row_dict['kingdom_name'] = taxonomy_lineage_dict.get('kingdom_name', get_na())
+            row_dict['superkingdom_name'] = taxonomy_lineage_dict.get('superkingdom_name', get_na())
+            row_dict['tax_id'] = taxonomy_lineage_dict.get('tax_id', get_na())
             row_dict['plaza_species_id'] = get_na()
+
+        # get the taxonomy dictionary of the species name from taxonomy server (except if it was not found in a recent query)
         else:
-            row_dict['family_name'] = taxonomy_dict.get('family', {}).get('name', get_na())
-            row_dict['phylum_name'] = taxonomy_dict.get('phylum', {}).get('name', get_na())
-            row_dict['kingdom_name'] = taxonomy_dict.get('kingdom', {}).get('name', get_na())
-            row_dict['superkingdom_name'] = taxonomy_dict.get('superkingdom', {}).get('name', get_na())
-            row_dict['tax_id'] = taxonomy_dict.get('tax_id', get_na())
-            row_dict['plaza_species_id']  = get_na()
 
-        # insert data into the table "species"
-        if taxonomy_dict != {}:
-            xsqlite.insert_species_row(conn, row_dict)
+            is_not_found = xsqlite.is_taxonomy_not_found(conn, species_name)
+            taxonomy_dict = {} if is_not_found else get_taxonomy_dict('name', species_name)
+            if taxonomy_dict == {}:
+                row_dict['family_name'] = get_na()
+                row_dict['phylum_name'] = get_na()
+                row_dict['kingdom_name'] = get_na()
+                row_dict['superkingdom_name'] = get_na()
+                row_dict['tax_id'] = get_na()
+                row_dict['plaza_species_id'] = get_na()
+            else:
+                row_dict['family_name'] = taxonomy_dict.get('family', {}).get('name', get_na())
+                row_dict['phylum_name'] = taxonomy_dict.get('phylum', {}).get('name', get_na())
+                row_dict['kingdom_name'] = taxonomy_dict.get('kingdom', {}).get('name', get_na())
+                row_dict['superkingdom_name'] = taxonomy_dict.get('superkingdom', {}).get('name', get_na())
+                row_dict['tax_id'] = taxonomy_dict.get('tax_id', get_na())
+                row_dict['plaza_species_id']  = get_na()
+
+            # insert data into the table "species" or the species name into the table "taxonomy_not_found"
+            # and save changes into TOA database (in read-only connections, they are kept pending to be inserted later)
+            if not xsqlite.is_read_only(conn):
+                if taxonomy_dict != {}:
+                    xsqlite.insert_species_row(conn, row_dict)
+                elif not is_not_found:
+                    xsqlite.create_taxonomy_not_found(conn)
+                    xsqlite.insert_taxonomy_not_found_rows(conn, [species_name])
+                conn.commit()
+            elif taxonomy_dict != {}:
+                conn.pending_species_row_list.append(dict(row_dict))
+            elif not is_not_found:
+                conn.pending_taxonomy_not_found_list.append(species_name)
 
         # insert data into species dictionary
         species_dict[species_name] = row_dict
 
-        # save changes into TOA database
-        conn.commit()
-
     # return the species taxonomy data
     return species_dict, row_dict['family_name'], row_dict['phylum_name'], row_dict['kingdom_name'], row_dict['superkingdom_name']
 
 #-------------------------------------------------------------------------------
 
-def read_annotation_record(file_name, file_id, type, record_counter):
+# set of the streams opened by "open_gzip" that are not closed yet (they are closed at exit)
+open_gzip_stream_set = weakref.WeakSet()
+
+#-------------------------------------------------------------------------------
+
+def open_gzip(file_name, mode='rb', compresslevel=None, encoding=None, errors=None, newline=None, threads=None):
     '''
+    Open a file compressed with gzip (modes "r", "rb", "rt", "w", "wb" and "wt") compressing and decompressing
+    out of the consumer thread: with a pigz process using the thread number when pigz is available; otherwise,
+    the writes are compressed by a pool with the thread number of threads and the reads are decompressed by
+    a single read-ahead thread (the thread number only sets the blocks decompressed ahead).
+    The streams not closed by the caller are closed at exit.
     '''
 
-    # initialize the data dictionary
-    data_dict = {}
+    # set the compression level and the thread number
+    if compresslevel is None:
+        compresslevel = Const.GZIP_COMPRESSION_LEVEL
+    if threads is None:
+        threads = max(1, min(Const.GZIP_THREADS, os.cpu_count() or 1))
 
-    # initialize the key
-    key = None
+    # check the mode
+    raw_mode = mode.replace('t', '').replace('b', '')
+    if raw_mode not in ['r', 'w'] or ('t' in mode and 'b' in mode):
+        raise ValueError(f'Invalid mode: {mode}')
 
-    # read next record
-    record = file_id.readline()
+    # open the raw stream of uncompressed data
+    if is_pigz_available():
+        raw_stream = GzipProcessStream(file_name, raw_mode, compresslevel, threads)
+    elif raw_mode == 'r':
+        raw_stream = GzipThreadReader(file_name, threads)
+    else:
+        raw_stream = GzipThreadWriter(file_name, compresslevel, threads)
 
-    # if there is record 
-    if record != '':
+    # buffer the raw stream and get a text stream in text mode or the buffered stream in binary mode
+    # (the raw stream is closed when they can not be created)
+    try:
+        if raw_mode == 'r':
+            buffered_stream = io.BufferedReader(raw_stream, buffer_size=Const.GZIP_BUFFER_SIZE)
+        else:
+            buffered_stream = io.BufferedWriter(raw_stream, buffer_size=Const.GZIP_BUFFER_SIZE)
+        if 't' in mode:
+            stream = io.TextIOWrapper(buffered_stream, encoding=encoding, errors=errors, newline=newline)
+        else:
+            stream = buffered_stream
+    except Exception:
+        raw_stream.close()
+        raise
 
-        # remove EOL
-        record = record.strip('\n')
+    # save the stream in the set of open streams
+    open_gzip_stream_set.add(stream)
 
-        # if type is PLAZA
-        if type.upper() == 'PLAZA':
+    # return the stream
+    return stream
 
-            # extract data 
-            # PLAZA record format: "seq_id";"nt_seq_id";"aa_seq_id";"hit_num";"hsp_num";"iteration_iter_num";"hit_accession";"hsp_evalue";"hsp_identity";"hsp_positive";"hsp_gaps";"hsp_align_len";"hsp_qseq";"species";"family";"phylum";"kingdom";"superkingdom";"desc";"databases";"go_id";"go_desc";"interpro_id";"interpro_desc";"mapman_id";"mapman_desc";"ec_id";"kegg_id";"metacyc_id"
-            data_list = []
-            start = 0
-            for end in [i for i, chr in enumerate(record) if chr == ';']:
-                data_list.append(record[start:end].strip('"'))
-                start = end + 1
-            data_list.append(record[start:].strip('\n').strip('"'))
-            try:
-                seq_id = data_list[0]
-                nt_seq_id = data_list[1]
-                aa_seq_id = data_list[2]
-                hit_num = data_list[3]
-                hsp_num = data_list[4]
-                iteration_iter_num = data_list[5]
-                hit_accession = data_list[6]
-                hsp_evalue = data_list[7]
-                hsp_identity = data_list[8]
-                hsp_positive = data_list[9]
-                hsp_gaps = data_list[10]
-                hsp_align_len = data_list[11]
-                hsp_qseq = data_list[12]
-                species = data_list[13]
-                family = data_list[14]
-                phylum = data_list[15]
-                kingdom = data_list[16]
-                superkingdom = data_list[17]
-                desc = data_list[18]
-                databases = data_list[19]
-                go_id = data_list[20]
-                go_desc = data_list[21]
-                interpro_id = data_list[22]
-                interpro_desc = data_list[23]
-                mapman_id = data_list[24]
-                mapman_desc = data_list[25]
-                ec_id = data_list[26]
-                kegg_id = data_list[27]
-                metacyc_id = data_list[28]
-            except Exception as e:
-                raise ProgramException('F006', os.path.basename(file_name), record_counter)
+#-------------------------------------------------------------------------------
+
+def close_open_gzip_streams():
+    '''
+    Close the streams opened by "open_gzip" that are not closed yet. It is run at exit (also when a ProgramException
+    ends the program), so the decompression threads are stopped before the interpreter shutdown and the pending data
+    of the compressed files are written.
+    '''
+
+    for stream in list(open_gzip_stream_set):
+        try:
+            if not stream.closed:
+                stream.close()
+        except BaseException:
+            pass
+
+atexit.register(close_open_gzip_streams)
+
+#-------------------------------------------------------------------------------
+
+def is_pigz_available():
+    '''
+    Check if pigz is available in the path.
+    '''
+
+    return shutil.which('pigz') is not None
+
+#-------------------------------------------------------------------------------
+
+def get_annotation_column_list(type):
+    '''
+    Get the column list of the annotation records of a type.
+    '''
+
+    # if type is PLAZA
+    if type.upper() == 'PLAZA':
+        column_list = ['seq_id', 'nt_seq_id', 'aa_seq_id', 'hit_num', 'hsp_num', 'iteration_iter_num', 'hit_accession', 'hsp_evalue', 'hsp_identity', 'hsp_positive', 'hsp_gaps', 'hsp_align_len', 'hsp_qseq', 'species', 'family', 'phylum', 'kingdom', 'superkingdom', 'desc', 'databases', 'go_id', 'go_desc', 'interpro_id', 'interpro_desc', 'mapman_id', 'mapman_desc', 'ec_id', 'kegg_id', 'metacyc_id']
+
+    # if type is REFSEQ
+    elif type.upper() == 'REFSEQ':
+        column_list = ['seq_id', 'nt_seq_id', 'aa_seq_id', 'hit_num', 'hsp_num', 'iteration_iter_num', 'hit_id', 'hsp_evalue', 'hsp_identity', 'hsp_positive', 'hsp_gaps', 'hsp_align_len', 'hsp_qseq', 'species', 'family', 'phylum', 'kingdom', 'superkingdom', 'desc', 'databases', 'gene_id', 'status', 'rna_nucleotide_accession', 'protein_accession', 'genomic_nucleotide_accession', 'gene_symbol', 'go_id', 'evidence', 'go_term', 'category', 'interpro_id', 'interpro_desc', 'ec_id', 'kegg_id', 'metacyc_id']
+
+    # if type is NT or NR
+    elif type.upper() in ['NT', 'NR']:
+        column_list = ['seq_id', 'nt_seq_id', 'aa_seq_id', 'hit_num', 'hsp_num', 'iteration_iter_num', 'hit_id', 'hsp_evalue', 'hsp_identity', 'hsp_positive', 'hsp_gaps', 'hsp_align_len', 'hsp_qseq', 'species', 'family', 'phylum', 'kingdom', 'superkingdom', 'desc', 'databases']
+
+    # if type is MERGER
+    elif type.upper() == 'MERGER':
+        column_list = ['seq_id', 'nt_seq_id', 'aa_seq_id', 'hit_num', 'hsp_num', 'hit_id', 'hsp_evalue', 'hsp_identity', 'hsp_positive', 'hsp_gaps', 'hsp_align_len', 'hsp_qseq', 'species', 'family', 'phylum', 'kingdom', 'superkingdom', 'desc', 'databases', 'go_id', 'go_desc', 'interpro_id', 'interpro_desc', 'mapman_id', 'mapman_desc', 'ec_id', 'kegg_id', 'metacyc_id', 'refseq_gene_id', 'refseq_desc', 'refseq_status', 'refseq_rna_nucleotide_accession', 'refseq_protein_accession', 'refseq_genomic_nucleotide_accession', 'refseq_gene_symbol']
+
+    # otherwise
+    else:
+        column_list = []
+
+    # return the column list
+    return column_list
+
+#-------------------------------------------------------------------------------
+
+def get_annotation_key_list(type, is_merged):
+    '''
+    Get the list of data dictionary keys whose values are written in each column of an annotation record
+    of a type (None when the column is written empty).
+    '''
+
+    # initialize the key list
+    key_list = []
 
-            # set the key
-            key = f'{nt_seq_id}-{aa_seq_id}-{hit_num}-{hsp_num}'
+    # if the record is written in the annotation file of the type
+    if not is_merged:
 
-            # get the record data dictionary
-            data_dict = {'seq_id': seq_id, 'nt_seq_id': nt_seq_id, 'aa_seq_id': aa_seq_id, 'hit_num': hit_num, 'hsp_num': hsp_num, 'iteration_iter_num': iteration_iter_num, 'hit_accession': hit_accession, 'hsp_evalue': hsp_evalue, 'hsp_identity': hsp_identity, 'hsp_positive': hsp_positive, 'hsp_gaps': hsp_gaps, 'hsp_align_len': hsp_align_len, 'hsp_qseq': hsp_qseq, 'species': species, 'family': family, 'phylum': phylum, 'kingdom': kingdom, 'superkingdom': superkingdom, 'desc': desc, 'databases': databases, 'go_id': go_id, 'go_desc': go_desc, 'interpro_id': interpro_id, 'interpro_desc': interpro_desc, 'mapman_id': mapman_id, 'mapman_desc': mapman_desc, 'ec_id': ec_id, 'kegg_id': kegg_id, 'metacyc_id': metacyc_id}
+        # if type is PLAZA
+        if type.upper() == 'PLAZA':
+            key_list = ['seq_id', 'nt_seq_id', 'aa_seq_id', 'hit_num', 'hsp_num', 'iteration_iter_num', 'hit_accession', 'hsp_evalue', 'hsp_identity', 'hsp_positive', 'hsp_gaps', 'hsp_align_len', 'hsp_qseq', 'species', 'family', 'phylum', 'kingdom', 'superkingdom', 'desc', 'accum_databases', 'accum_go_id', 'accum_go_desc', 'accum_interpro_id', 'accum_interpro_desc', 'accum_mapman_id', 'accum_mapman_desc', 'accum_ec_id', 'accum_kegg_id', 'accum_metacyc_id']
 
         # if type is REFSEQ
         elif type.upper() == 'REFSEQ':
+            key_list = ['seq_id', 'nt_seq_id', 'aa_seq_id', 'hit_num', 'hsp_num', 'iteration_iter_num', 'hit_id', 'hsp_evalue', 'hsp_identity', 'hsp_positive', 'hsp_gaps', 'hsp_align_len', 'hsp_qseq', 'species', 'family', 'phylum', 'kingdom', 'superkingdom', 'desc', 'accum_databases', 'gene_id', 'status', 'rna_nucleotide_accession', 'protein_accession', 'genomic_nucleotide_accession', 'gene_symbol', 'accum_go_id', 'accum_evidence', 'accum_go_term', 'accum_category', 'accum_interpro_id', 'accum_interpro_desc', 'accum_ec_id', 'accum_kegg_id', 'accum_metacyc_id']
 
-            # extract data 
-            # REFSEQ record format: "seq_id";"nt_seq_id";"aa_seq_id";"hit_num";"hsp_num";"iteration_iter_num";"hit_id";"hsp_evalue";"hsp_identity";"hsp_positive";"hsp_gaps";"hsp_align_len";"hsp_qseq";"species";"family";"phylum";"kingdom";"superkingdom";"desc";"databases";"gene_id";"status";"rna_nucleotide_accession";"protein_accession";"genomic_nucleotide_accession";"gene_symbol";"go_id";"evidence";"go_term";"category";"interpro_id";"interpro_desc";"ec_id";"kegg_id";"metacyc_id"
-            data_list = []
-            start = 0
-            for end in [i for i, chr in enumerate(record) if chr == ';']:
-                data_list.append(record[start:end].strip('"'))
-                start = end + 1
-            data_list.append(record[start:].strip('"').strip('\n'))
-            try:
-                seq_id = data_list[0]
-                nt_seq_id = data_list[1]
-                aa_seq_id = data_list[2]
-                hit_num = data_list[3]
-                hsp_num = data_list[4]
-                iteration_iter_num = data_list[5]
-                hit_id = data_list[6]
-                hsp_evalue = data_list[7]
-                hsp_identity = data_list[8]
-                hsp_positive = data_list[9]
-                hsp_gaps = data_list[10]
-                hsp_align_len = data_list[11]
-                hsp_qseq = data_list[12]
-                species = data_list[13]
-                family = data_list[14]
-                phylum = data_list[15]
-                kingdom = data_list[16]
-                superkingdom = data_list[17]
-                desc = data_list[18]
-                databases = data_list[19]
-                gene_id = data_list[20]
-                status = data_list[21]
-                rna_nucleotide_accession = data_list[22]
-                protein_accession = data_list[23]
-                genomic_nucleotide_accession = data_list[24]
-                gene_symbol = data_list[25]
-                go_id = data_list[26]
-                evidence = data_list[27]
-                go_term = data_list[28]
-                category = data_list[29]
-                interpro_id = data_list[30]
-                interpro_desc = data_list[31]
-                ec_id = data_list[32]
-                kegg_id = data_list[33]
-                metacyc_id = data_list[34]
-            except Exception as e:
-                raise ProgramException('F006', os.path.basename(file_name), record_counter)
+        # if type is NT or NR
+        elif type.upper() in ['NT', 'NR']:
+            key_list = ['seq_id', 'nt_seq_id', 'aa_seq_id', 'hit_num', 'hsp_num', 'iteration_iter_num', 'hit_id', 'hsp_evalue', 'hsp_identity', 'hsp_positive', 'hsp_gaps', 'hsp_align_len', 'hsp_qseq', 'species', 'family', 'phylum', 'kingdom', 'superkingdom', 'desc', 'accum_databases']
 
-            # set the key
-            key = f'{nt_seq_id}-{aa_seq_id}-{hit_num}-{hsp_num}'
-
-            # get the record data dictionary
-            data_dict = {'seq_id': seq_id, 'nt_seq_id': nt_seq_id, 'aa_seq_id': aa_seq_id, 'hit_num': hit_num, 'hsp_num': hsp_num, 'iteration_iter_num': iteration_iter_num, 'hit_id': hit_id,  'hsp_evalue': hsp_evalue,  'hsp_identity': hsp_identity, 'hsp_positive': hsp_positive, 'hsp_gaps': hsp_gaps, 'hsp_align_len': hsp_align_len, 'hsp_qseq': hsp_qseq, 'species': species, 'family': family, 'phylum': phylum, 'kingdom': kingdom, 'superkingdom': superkingdom, 'desc': desc, 'databases': databases, 'gene_id': gene_id, 'status': status, 'rna_nucleotide_accession': rna_nucleotide_accession, 'protein_accession': protein_accession, 'genomic_nucleotide_accession': genomic_nucleotide_accession, 'gene_symbol': gene_symbol, 'go_id': go_id, 'evidence': evidence, 'go_term': go_term, 'category':category, 'interpro_id': interpro_id, 'interpro_desc': interpro_desc, 'ec_id': ec_id, 'kegg_id': kegg_id, 'metacyc_id': metacyc_id}
+        # if type is MERGER
+        elif type.upper() == 'MERGER':
+            key_list = get_annotation_column_list('MERGER')
 
-        # if type is NT o NR
-        if type.upper() in ['NT', 'NR']:
+    # if the record is written in a merged annotation file
+    # merged record format: "seq_id";"nt_seq_id";"aa_seq_id";"hit_num";"hsp_num";"hit_id";"hsp_evalue";"hsp_identity";"hsp_positive";"hsp_gaps";"hsp_align_len";"hsp_qseq";"species";"family";"phylum";"kingdom";"superkingdom";"desc";"databases";"go_id";"go_desc";"interpro_id";"interpro_desc";"mapman_id";"mapman_desc";"ec_id";"kegg_id";"metacyc_id";"refseq_gene_id";"refseq_desc";"refseq_status";"refseq_rna_nucleotide_accession";"refseq_protein_accession";"refseq_genomic_nucleotide_accession";"refseq_gene_symbol"
+    else:
 
-            # extract data 
-            # PLAZA record format: "seq_id";"nt_seq_id";"aa_seq_id";"hit_num";"hsp_num";"iteration_iter_num";"hit_id";"hsp_evalue";"hsp_identity";"hsp_positive";"hsp_gaps";"hsp_align_len";"hsp_qseq";"species";"family";"phylum";"kingdom";"superkingdom";"desc";"databases"
-            data_list = []
-            start = 0
-            for end in [i for i, chr in enumerate(record) if chr == ';']:
-                data_list.append(record[start:end].strip('"'))
-                start = end + 1
-            data_list.append(record[start:].strip('"'))
-            try:
-                seq_id = data_list[0]
-                nt_seq_id = data_list[1]
-                aa_seq_id = data_list[2]
-                hit_num = data_list[3]
-                hsp_num = data_list[4]
-                iteration_iter_num = data_list[5]
-                hit_id = data_list[6]
-                hsp_evalue = data_list[7]
-                hsp_identity = data_list[8]
-                hsp_positive = data_list[9]
-                hsp_gaps = data_list[10]
-                hsp_align_len = data_list[11]
-                hsp_qseq = data_list[12]
-                species = data_list[13]
-                family = data_list[14]
-                phylum = data_list[15]
-                kingdom = data_list[16]
-                superkingdom = data_list[17]
-                desc = data_list[18]
-                databases = data_list[19]
-            except Exception as e:
-                raise ProgramException('F006', os.path.basename(file_name), record_counter)
+        # if type is PLAZA
+        if type.upper() == 'PLAZA':
+            key_list = ['seq_id', 'nt_seq_id', 'aa_seq_id', 'hit_num', 'hsp_num', 'hit_accession', 'hsp_evalue', 'hsp_identity', 'hsp_positive', 'hsp_gaps', 'hsp_align_len', 'hsp_qseq', 'species', 'family', 'phylum', 'kingdom', 'superkingdom', 'desc', 'databases', 'go_id', 'go_desc', 'interpro_id', 'interpro_desc', 'mapman_id', 'mapman_desc', 'ec_id', 'kegg_id', 'metacyc_id'] + [None] * 7
 
-            # set the key
-            key = f'{nt_seq_id}-{aa_seq_id}-{hit_num}-{hsp_num}'
+        # if type is REFSEQ
+        elif type.upper() == 'REFSEQ':
+            key_list = ['seq_id', 'nt_seq_id', 'aa_seq_id', 'hit_num', 'hsp_num', 'hit_id', 'hsp_evalue', 'hsp_identity', 'hsp_positive', 'hsp_gaps', 'hsp_align_len', 'hsp_qseq', 'species', 'family', 'phylum', 'kingdom', 'superkingdom', 'desc', 'databases', 'go_id', 'go_term', 'interpro_id', 'interpro_desc', None, None, 'ec_id', 'kegg_id', 'metacyc_id', 'gene_id', 'desc', 'status', 'rna_nucleotide_accession', 'protein_accession', 'genomic_nucleotide_accession', 'gene_symbol']
 
-            # get the record data dictionary
-            data_dict = {'seq_id': seq_id, 'nt_seq_id': nt_seq_id, 'aa_seq_id': aa_seq_id, 'hit_num': hit_num, 'hsp_num': hsp_num, 'iteration_iter_num': iteration_iter_num, 'hit_id': hit_id, 'hsp_evalue': hsp_evalue, 'hsp_identity': hsp_identity, 'hsp_positive': hsp_positive, 'hsp_gaps': hsp_gaps, 'hsp_align_len': hsp_align_len, 'hsp_qseq': hsp_qseq, 'species': species, 'family': family, 'phylum': phylum, 'kingdom': kingdom, 'superkingdom': superkingdom, 'desc': desc, 'databases': databases}
+        # if type is NT or NR
+        elif type.upper() in ['NT', 'NR']:
+            key_list = ['seq_id', 'nt_seq_id', 'aa_seq_id', 'hit_num', 'hsp_num', 'hit_id', 'hsp_evalue', 'hsp_identity', 'hsp_positive', 'hsp_gaps', 'hsp_align_len', 'hsp_qseq', 'species', 'family', 'phylum', 'kingdom', 'superkingdom', 'desc', 'databases'] + [None] * 16
 
         # if type is MERGER
-        # MERGER record format: "seq_id";"nt_seq_id";"aa_seq_id";"hit_num";"hsp_num";"hit_id";"hsp_evalue";"hsp_identity";"hsp_positive";"hsp_gaps";"hsp_align_len";"hsp_qseq";"species";"family";"phylum";"kingdom";"superkingdom";"desc";"databases";"go_id";"go_desc";"interpro_id";"interpro_desc";"mapman_id";"mapman_desc";"refseq_gene_id";"refseq_desc";"refseq_status";"refseq_protein_accession";"refseq_genomic_nucleotide_accession";"refseq_gene_symbol"
         elif type.upper() == 'MERGER':
+            key_list = get_annotation_column_list('MERGER')
 
-            # extract data 
-            data_list = []
-            start = 0
-            for end in [i for i, chr in enumerate(record) if chr == ';']:
-                data_list.append(record[start:end].strip('"'))
-                start = end + 1
-            data_list.append(record[start:].strip('"').strip('\n'))
-            try:
-                seq_id = data_list[0]
-                nt_seq_id = data_list[1]
-                aa_seq_id = data_list[2]
-                hit_num = data_list[3]
-                hsp_num = data_list[4]
-                hit_id = data_list[5]
-                hsp_evalue = data_list[6]
-                hsp_identity = data_list[7]
-                hsp_positive = data_list[8]
-                hsp_gaps = data_list[9]
-                hsp_align_len = data_list[10]
-                hsp_qseq = data_list[11]
-                species = data_list[12]
-                family = data_list[13]
-                phylum = data_list[14]
-                kingdom = data_list[15]
-                superkingdom = data_list[16]
-                desc = data_list[17]
-                databases = data_list[18]
-                go_id = data_list[19]
-                go_desc = data_list[20]
-                interpro_id = data_list[21]
-                interpro_desc = data_list[22]
-                mapman_id = data_list[23]
-                mapman_desc = data_list[24]
-                ec_id = data_list[25]
-                kegg_id = data_list[26]
-                metacyc_id = data_list[27]
-                refseq_gene_id = data_list[28]
-                refseq_desc = data_list[29]
-                refseq_status = data_list[30]
-                refseq_rna_nucleotide_accession = data_list[31]
-                refseq_protein_accession = data_list[32]
-                refseq_genomic_nucleotide_accession = data_list[33]
-                refseq_gene_symbol = data_list[34]
-            except Exception as e:
-                raise ProgramException('F006', os.path.basename(file_name), record_counter)
+    # return the key list
+    return key_list
 
-            # set the key
-            key = f'{nt_seq_id}-{aa_seq_id}-{hit_num}-{hsp_num}'
-    
-            # get the record data dictionary
-            data_dict = {'seq_id': seq_id, 'nt_seq_id': nt_seq_id, 'aa_seq_id': aa_seq_id, 'hit_num': hit_num, 'hsp_num': hsp_num, 'hit_id': hit_id, 'hsp_evalue': hsp_evalue,  'hsp_identity': hsp_identity, 'hsp_positive': hsp_positive, 'hsp_gaps': hsp_gaps, 'hsp_align_len': hsp_align_len, 'hsp_qseq': hsp_qseq, 'species': species, 'family': family, 'phylum': phylum, 'kingdom': kingdom, 'superkingdom': superkingdom, 'desc': desc, 'databases': databases, 'go_id': go_id, 'go_desc': go_desc, 'interpro_id': interpro_id, 'interpro_desc': interpro_desc, 'mapman_id': mapman_id, 'mapman_desc': mapman_desc, 'ec_id': ec_id, 'kegg_id': kegg_id, 'metacyc_id': metacyc_id, 'refseq_gene_id': refseq_gene_id, 'refseq_desc': refseq_desc, 'refseq_status': refseq_status, 'refseq_rna_nucleotide_accession': refseq_rna_nucleotide_accession, 'refseq_protein_accession': refseq_protein_accession, 'refseq_genomic_nucleotide_accession': refseq_genomic_nucleotide_accession, 'refseq_gene_symbol': refseq_gene_symbol}
+#-------------------------------------------------------------------------------
+
+def read_annotation_record(file_name, file_id, type, record_counter):
+    '''
+    Read the next record of an annotation file (AnnotationReader is faster when the file is read sequentially).
+    '''
+
+    # read next record
+    record = file_id.readline()
+
+    # if there is record 
+    if record != '':
+
+        # remove EOL
+        record = record.strip('\n')
+
+        # decode the record
+        column_dict = {column: i for (i, column) in enumerate(get_annotation_column_list(type))}
+        (key, data_dict) = AnnotationReader.decode(file_name, type, column_dict, record, record_counter)
 
     # if there is not record 
     else:
 
-        # set the key
+        # set the key and data dictionary
         key = bytes.fromhex('7E').decode('utf-8')
+        data_dict = {}
 
     # return the record, key and data dictionary
     return record, key, data_dict
@@ -2144,111 +2425,444 @@ def write_annotation_header(file_id, type):
     '''
     '''
 
-    # if type is PLAZA
-    if type.upper() == 'PLAZA':
-        file_id.write( '"seq_id";"nt_seq_id";"aa_seq_id";"hit_num";"hsp_num";"iteration_iter_num";"hit_accession";"hsp_evalue";"hsp_identity";"hsp_positive";"hsp_gaps";"hsp_align_len";"hsp_qseq";"species";"family";"phylum";"kingdom";"superkingdom";"desc";"databases";"go_id";"go_desc";"interpro_id";"interpro_desc";"mapman_id";"mapman_desc";"ec_id";"kegg_id";"metacyc_id"\n')
+    # write the column names of the type
+    column_list = get_annotation_column_list(type)
+    if column_list != []:
+        file_id.write('"' + '";"'.join(column_list) + '"\n')
 
-    # if type is REFSEQ
-    elif type.upper() == 'REFSEQ':
-        file_id.write( '"seq_id";"nt_seq_id";"aa_seq_id";"hit_num";"hsp_num";"iteration_iter_num";"hit_id";"hsp_evalue";"hsp_identity";"hsp_positive";"hsp_gaps";"hsp_align_len";"hsp_qseq";"species";"family";"phylum";"kingdom";"superkingdom";"desc";"databases";"gene_id";"status";"rna_nucleotide_accession";"protein_accession";"genomic_nucleotide_accession";"gene_symbol";"go_id";"evidence";"go_term";"category";"interpro_id";"interpro_desc";"ec_id";"kegg_id";"metacyc_id"\n')
+#-------------------------------------------------------------------------------
 
-    # if type is NT or NR
-    elif type.upper() in ['NT', 'NR']:
-        file_id.write( '"seq_id";"nt_seq_id";"aa_seq_id";"hit_num";"hsp_num";"iteration_iter_num";"hit_id";"hsp_evalue";"hsp_identity";"hsp_positive";"hsp_gaps";"hsp_align_len";"hsp_qseq";"species";"family";"phylum";"kingdom";"superkingdom";"desc";"databases"\n')
+def write_annotation_record(file_id, type, data_dict):
+    '''
+    Write a data dictionary of an annotation process (the data dictionary is not modified).
+    '''
 
-    # if type is MERGER
-    elif type.upper() == 'MERGER':
-        file_id.write( '"seq_id";"nt_seq_id";"aa_seq_id";"hit_num";"hsp_num";"hit_id";"hsp_evalue";"hsp_identity";"hsp_positive";"hsp_gaps";"hsp_align_len";"hsp_qseq";"species";"family";"phylum";"kingdom";"superkingdom";"desc";"databases";"go_id";"go_desc";"interpro_id";"interpro_desc";"mapman_id";"mapman_desc";"ec_id";"kegg_id";"metacyc_id";"refseq_gene_id";"refseq_desc";"refseq_status";"refseq_rna_nucleotide_accession";"refseq_protein_accession";"refseq_genomic_nucleotide_accession";"refseq_gene_symbol"\n')
+    # write the record
+    file_id.write(AnnotationWriter.encode_record(type, False, data_dict))
 
 #-------------------------------------------------------------------------------
 
-def write_annotation_record(file_id, type, data_dict):
+def write_merged_annotation_record(file_id, type, data_dict):
     '''
     '''
 
-    # convert hit_num to string with format
-    if check_int(data_dict['hit_num']):
-        data_dict['hit_num'] = f'{int(data_dict["hit_num"]):02d}'
+    # write the record in merged format
+    file_id.write(AnnotationWriter.encode_record(type, True, data_dict))
 
-    # convert hsp_num to string with format
-    if check_int(data_dict['hsp_num']):
-        data_dict['hspt_num'] = f'{int(data_dict["hsp_num"]):02d}'
-
-    # if type is PLAZA
-    # format: "seq_id";"nt_seq_id";"aa_seq_id";"hit_num";"hsp_num";"iteration_iter_num";"hit_accession";"hsp_evalue";"hsp_identity";"hsp_positive";"hsp_gaps";"hsp_align_len";"hsp_qseq";"species";"family";"phylum";"kingdom";"superkingdom";"desc";"databases";"go_id";"go_desc";"interpro_id";"interpro_desc";"mapman_id";"mapman_desc";"ec_id";"kegg_id";"metacyc_id"
-    if type.upper() == 'PLAZA':
-        if data_dict['accum_go_id'] != '': data_dict['accum_go_id'] = f'''GO:{data_dict['accum_go_id']}'''
-        file_id.write(f'''"{data_dict['seq_id']}";"{data_dict['nt_seq_id']}";"{data_dict['aa_seq_id']}";"{data_dict['hit_num']}";"{data_dict['hsp_num']}";"{data_dict['iteration_iter_num']}";"{data_dict['hit_accession']}";"{data_dict['hsp_evalue']}";"{data_dict['hsp_identity']}";"{data_dict['hsp_positive']}";"{data_dict['hsp_gaps']}";"{data_dict['hsp_align_len']}";"{data_dict['hsp_qseq']}";"{data_dict['species']}";"{data_dict['family']}";"{data_dict['phylum']}";"{data_dict['kingdom']}";"{data_dict['superkingdom']}";"{data_dict['desc']}";"{data_dict['accum_databases']}";"{data_dict['accum_go_id']}";"{data_dict['accum_go_desc']}";"{data_dict['accum_interpro_id']}";"{data_dict['accum_interpro_desc']}";"{data_dict['accum_mapman_id']}";"{data_dict['accum_mapman_desc']}";"{data_dict['accum_ec_id']}";"{data_dict['accum_kegg_id']}";"{data_dict['accum_metacyc_id']}"\n''')
+#-------------------------------------------------------------------------------
 
-    # if type is REFSEQ
-    # format: "seq_id";"nt_seq_id";"aa_seq_id";"hit_num";"hsp_num";"iteration_iter_num";"hit_id";"hsp_evalue";"hsp_identity";"hsp_positive";"hsp_gaps";"hsp_align_len";"hsp_qseq";"species";"family";"phylum";"kingdom";"superkingdom";"desc";"gene_id";"status";"rna_nucleotide_accession";"protein_accession";"genomic_nucleotide_accession";"gene_symbol";"go_id";"evidence";"go_term";"category";"interpro_id";"interpro_desc";"ec_id";"kegg_id";"metacyc_id"
-    elif type.upper() == 'REFSEQ':
-        if data_dict['accum_go_id'] != '': data_dict['accum_go_id'] = f'''GO:{data_dict['accum_go_id']}'''
-        file_id.write(f'''"{data_dict['seq_id']}";"{data_dict['nt_seq_id']}";"{data_dict['aa_seq_id']}";"{data_dict['hit_num']}";"{data_dict['hsp_num']}";"{data_dict['iteration_iter_num']}";"{data_dict['hit_id']}";"{data_dict['hsp_evalue']}";"{data_dict['hsp_identity']}";"{data_dict['hsp_positive']}";"{data_dict['hsp_gaps']}";"{data_dict['hsp_align_len']}";"{data_dict['hsp_qseq']}";"{data_dict['species']}";"{data_dict['family']}";"{data_dict['phylum']}";"{data_dict['kingdom']}";"{data_dict['superkingdom']}";"{data_dict['desc']}";"{data_dict['accum_databases']}";"{data_dict['gene_id']}";"{data_dict['status']}";"{data_dict['rna_nucleotide_accession']}";"{data_dict['protein_accession']}";"{data_dict['genomic_nucleotide_accession']}";"{data_dict['gene_symbol']}";"{data_dict['accum_go_id']}";"{data_dict['accum_evidence']}";"{data_dict['accum_go_term']}";"{data_dict['accum_category']}";"{data_dict['accum_interpro_id']}";"{data_dict['accum_interpro_desc']}";"{data_dict['accum_ec_id']}";"{data_dict['accum_kegg_id']}";"{data_dict['accum_metacyc_id']}"\n''')
+def get_annotation_key(data_dict):
+    '''
+    Get the merge key of a data dictionary of an annotation process as it is written in the annotation file.
+    '''
 
-    # if type is NT or NR
-    # format: "seq_id";"nt_seq_id";"aa_seq_id";"hit_num";"hsp_num";"iteration_iter_num";"hit_id";"hsp_evalue";"hsp_identity";"hsp_positive";"hsp_gaps";"hsp_align_len";"hsp_qseq";"species";"family";"phylum";"kingdom";"superkingdom";"desc";"databases"
-    elif type.upper() in ['NT', 'NR']:
-        file_id.write(f'''"{data_dict['seq_id']}";"{data_dict['nt_seq_id']}";"{data_dict['aa_seq_id']}";"{data_dict['hit_num']}";"{data_dict['hsp_num']}";"{data_dict['iteration_iter_num']}";"{data_dict['hit_id']}";"{data_dict['hsp_evalue']}";"{data_dict['hsp_identity']}";"{data_dict['hsp_positive']}";"{data_dict['hsp_gaps']}";"{data_dict['hsp_align_len']}";"{data_dict['hsp_qseq']}";"{data_dict['species']}";"{data_dict['family']}";"{data_dict['phylum']}";"{data_dict['kingdom']}";"{data_dict['superkingdom']}";"{data_dict['desc']}";"{data_dict['accum_databases']}"\n''')
+    # get the hit number with the format of the annotation file
+    hit_num = f'{int(data_dict["hit_num"]):02d}' if check_int(data_dict['hit_num']) else data_dict['hit_num']
 
-    # if type is MERGER
-    # format: "seq_id";"nt_seq_id";"aa_seq_id";"hit_num";"hsp_num";"hit_id";"hsp_evalue";"hsp_identity";"hsp_positive";"hsp_gaps";"hsp_align_len";"hsp_qseq";"species";"family";"phylum";"kingdom";"superkingdom";"desc";"databases";"go_id";"go_desc";"interpro_id";"interpro_desc";"mapman_id";"mapman_desc";"ec_id";"kegg_id";"metacyc_id";"refseq_gene_id";"refseq_desc";"refseq_status";"refseq_rna_nucleotide_accession";"refseq_protein_accession";"refseq_genomic_nucleotide_accession";"refseq_gene_symbol"
-    elif type.upper() == 'MERGER':
-        file_id.write(f'''"{data_dict['seq_id']}";"{data_dict['nt_seq_id']}";"{data_dict['aa_seq_id']}";"{data_dict['hit_num']}";"{data_dict['hsp_num']}";"{data_dict['hit_id']}";"{data_dict['hsp_evalue']}";"{data_dict['hsp_identity']}";"{data_dict['hsp_positive']}";"{data_dict['hsp_gaps']}";"{data_dict['hsp_align_len']}";"{data_dict['hsp_qseq']}";"{data_dict['species']}";"{data_dict['family']}";"{data_dict['phylum']}";"{data_dict['kingdom']}";"{data_dict['superkingdom']}";"{data_dict['desc']}";"{data_dict['databases']}";"{data_dict['go_id']}";"{data_dict['go_desc']}";"{data_dict['interpro_id']}";"{data_dict['interpro_desc']}";"{data_dict['mapman_id']}";"{data_dict['mapman_desc']}";"{data_dict['ec_id']}";"{data_dict['kegg_id']}";"{data_dict['metacyc_id']}";"{data_dict['refseq_gene_id']}";"{data_dict['refseq_desc']}";"{data_dict['refseq_status']}";"{data_dict['refseq_rna_nucleotide_accession']}";"{data_dict['refseq_protein_accession']}";"{data_dict['refseq_genomic_nucleotide_accession']}";"{data_dict['refseq_gene_symbol']}"\n''')
+    # return the key
+    return f'{data_dict["nt_seq_id"]}-{data_dict["aa_seq_id"]}-{hit_num}-{data_dict["hsp_num"]}'
 
 #-------------------------------------------------------------------------------
 
-def write_merged_annotation_record(file_id, type, data_dict):
+def get_annotation_record_key(record):
     '''
+    Get the merge key of a record of an annotation file.
     '''
 
-    # convert hit_num to string with format
-    if check_int(data_dict['hit_num']):
-        data_dict['hit_num'] = f'{int(data_dict["hit_num"]):02d}'
+    # split the first columns of the record
+    value_list = record.split(';', 5)
 
-    # convert hsp_num to string with format
-    if check_int(data_dict['hsp_num']):
-        data_dict['hspt_num'] = f'{int(data_dict["hsp_num"]):02d}'
+    # return the key
+    return f'''{value_list[1].strip('"')}-{value_list[2].strip('"')}-{value_list[3].strip('"')}-{value_list[4].strip('"')}'''
 
-    # merged record format: "seq_id";"nt_seq_id";"aa_seq_id";"hit_num";"hsp_num";"hit_id";"hsp_evalue";"hsp_identity";"hsp_positive";"hsp_gaps";"hsp_align_len";"hsp_qseq";"species";"family";"phylum";"kingdom";"superkingdom";"desc";"databases";"go_id";"go_desc";"interpro_id";"interpro_desc";"mapman_id";"mapman_desc";"ec_id";"kegg_id";"metacyc_id";"refseq_gene_id";"refseq_desc";"refseq_status";"refseq_rna_nucleotide_accession";"refseq_protein_accession";"refseq_genomic_nucleotide_accession";"refseq_gene_symbol"
+#-------------------------------------------------------------------------------
 
-    # if type is PLAZA
-    if type.upper() == 'PLAZA':
-        file_id.write(f'''"{data_dict['seq_id']}";"{data_dict['nt_seq_id']}";"{data_dict['aa_seq_id']}";"{data_dict['hit_num']}";"{data_dict['hsp_num']}";"{data_dict['hit_accession']}";"{data_dict['hsp_evalue']}";"{data_dict['hsp_identity']}";"{data_dict['hsp_positive']}";"{data_dict['hsp_gaps']}";"{data_dict['hsp_align_len']}";"{data_dict['hsp_qseq']}";"{data_dict['species']}";"{data_dict['family']}";"{data_dict['phylum']}";"{data_dict['kingdom']}";"{data_dict['superkingdom']}";"{data_dict['desc']}";"{data_dict['databases']}";"{data_dict['go_id']}";"{data_dict['go_desc']}";"{data_dict['interpro_id']}";"{data_dict['interpro_desc']}";"{data_dict['mapman_id']}";"{data_dict['mapman_desc']}";"{data_dict['ec_id']}";"{data_dict['kegg_id']}";"{data_dict['metacyc_id']}";"";"";"";"";"";"";""\n''')
+def get_annotation_manifest_file(annotation_file):
+    '''
+    Get the path of the manifest file of an annotation file.
+    '''
 
-    # if type is REFSEQ
-    elif type.upper() == 'REFSEQ':
-        file_id.write(f'''"{data_dict['seq_id']}";"{data_dict['nt_seq_id']}";"{data_dict['aa_seq_id']}";"{data_dict['hit_num']}";"{data_dict['hsp_num']}";"{data_dict['hit_id']}";"{data_dict['hsp_evalue']}";"{data_dict['hsp_identity']}";"{data_dict['hsp_positive']}";"{data_dict['hsp_gaps']}";"{data_dict['hsp_align_len']}";"{data_dict['hsp_qseq']}";"{data_dict['species']}";"{data_dict['family']}";"{data_dict['phylum']}";"{data_dict['kingdom']}";"{data_dict['superkingdom']}";"{data_dict['desc']}";"{data_dict['databases']}";"{data_dict['go_id']}";"{data_dict['go_term']}";"{data_dict['interpro_id']}";"{data_dict['interpro_desc']}";"";"";"{data_dict['ec_id']}";"{data_dict['kegg_id']}";"{data_dict['metacyc_id']}";"{data_dict['gene_id']}";"{data_dict['desc']}";"{data_dict['status']}";"{data_dict['rna_nucleotide_accession']}";"{data_dict['protein_accession']}";"{data_dict['genomic_nucleotide_accession']}";"{data_dict['gene_symbol']}"\n''')
+    return f'{annotation_file}.manifest'
 
-    # if type is NT or NR
-    elif type.upper() in ['NT', 'NR']:
-        file_id.write(f'''"{data_dict['seq_id']}";"{data_dict['nt_seq_id']}";"{data_dict['aa_seq_id']}";"{data_dict['hit_num']}";"{data_dict['hsp_num']}";"{data_dict['hit_id']}";"{data_dict['hsp_evalue']}";"{data_dict['hsp_identity']}";"{data_dict['hsp_positive']}";"{data_dict['hsp_gaps']}";"{data_dict['hsp_align_len']}";"{data_dict['hsp_qseq']}";"{data_dict['species']}";"{data_dict['family']}";"{data_dict['phylum']}";"{data_dict['kingdom']}";"{data_dict['superkingdom']}";"{data_dict['desc']}";"{data_dict['databases']}";"";"";"";"";"";"";"";"";"";"";"";"";"";"";"";""\n''')
+#-------------------------------------------------------------------------------
 
-    # if type is MERGER
-    elif type.upper() == 'MERGER':
-        file_id.write(f'''"{data_dict['seq_id']}";"{data_dict['nt_seq_id']}";"{data_dict['aa_seq_id']}";"{data_dict['hit_num']}";"{data_dict['hsp_num']}";"{data_dict['hit_id']}";"{data_dict['hsp_evalue']}";"{data_dict['hsp_identity']}";"{data_dict['hsp_positive']}";"{data_dict['hsp_gaps']}";"{data_dict['hsp_align_len']}";"{data_dict['hsp_qseq']}";"{data_dict['species']}";"{data_dict['family']}";"{data_dict['phylum']}";"{data_dict['kingdom']}";"{data_dict['superkingdom']}";"{data_dict['desc']}";"{data_dict['databases']}";"{data_dict['go_id']}";"{data_dict['go_desc']}";"{data_dict['interpro_id']}";"{data_dict['interpro_desc']}";"{data_dict['mapman_id']}";"{data_dict['mapman_desc']}";"{data_dict['ec_id']}";"{data_dict['kegg_id']}";"{data_dict['metacyc_id']}";"{data_dict['refseq_gene_id']}";"{data_dict['refseq_desc']}";"{data_dict['refseq_status']}";"{data_dict['refseq_rna_nucleotide_accession']}";"{data_dict['refseq_protein_accession']}";"{data_dict['refseq_genomic_nucleotide_accession']}";"{data_dict['refseq_gene_symbol']}"\n''')
+def write_annotation_manifest(annotation_file, type, is_sorted, is_header, record_number, first_key, last_key):
+    '''
+    Write the manifest file of an annotation file already closed: it declares whether the records are sorted
+    by the merge key and the size and modification time of the file to detect later changes.
+    '''
+
+    # get the manifest file
+    manifest_file = get_annotation_manifest_file(annotation_file)
+
+    # get the file status
+    file_stat = os.stat(annotation_file)
+
+    # write the manifest file
+    try:
+        with open(manifest_file, mode='w', encoding='iso-8859-1', newline='\n') as manifest_file_id:
+            manifest_file_id.write('[manifest]\n')
+            manifest_file_id.write(f'type = {type.upper()}\n')
+            manifest_file_id.write('sort_key = nt_seq_id, aa_seq_id, hit_num, hsp_num\n')
+            manifest_file_id.write(f'sorted = {"Y" if is_sorted else "N"}\n')
+            manifest_file_id.write(f'header = {"Y" if is_header else "N"}\n')
+            manifest_file_id.write(f'record_number = {record_number}\n')
+            manifest_file_id.write(f'first_key = {"" if first_key is None else first_key}\n')
+            manifest_file_id.write(f'last_key = {"" if last_key is None else last_key}\n')
+            manifest_file_id.write(f'file_size = {file_stat.st_size}\n')
+            manifest_file_id.write(f'file_mtime_ns = {file_stat.st_mtime_ns}\n')
+    except Exception as e:
+        raise ProgramException('F003', manifest_file)
 
 #-------------------------------------------------------------------------------
 
-def get_id_relationship_dict(relationship_file):
+def get_annotation_manifest_dict(annotation_file):
     '''
-    Get the new-old identification relationship dictionary.
+    Get the dictionary of the manifest of an annotation file; it is empty when the manifest does not exist,
+    can not be read or does not correspond to the current annotation file (size or modification time changed).
     '''
 
-    # initialize the new-old identification relationship dictionary
-    id_relationship_dict = {}
+    # initialize the manifest dictionary
+    manifest_dict = {}
 
-    # when the relationship file is not NONE
-    if relationship_file != 'NONE':
+    # get the manifest file
+    manifest_file = get_annotation_manifest_file(annotation_file)
 
-        # open the relationship file
-        if relationship_file.endswith('.gz'):
-            try:
-                relationship_file_id = gzip.open(relationship_file, mode='rt', encoding='iso-8859-1')
-            except Exception as e:
-                raise ProgramException('F002', relationship_file)
-        else:
-            try:
+    # read the manifest file
+    if os.path.isfile(manifest_file) and os.path.isfile(annotation_file):
+        config = configparser.ConfigParser(interpolation=None)
+        try:
+            config.read(manifest_file, encoding='iso-8859-1')
+            manifest_dict = dict(config['manifest'])
+            file_stat = os.stat(annotation_file)
+            if int(manifest_dict['file_size']) != file_stat.st_size or int(manifest_dict['file_mtime_ns']) != file_stat.st_mtime_ns:
+                manifest_dict = {}
+        except Exception as e:
+            manifest_dict = {}
+
+    # return the manifest dictionary
+    return manifest_dict
+
+#-------------------------------------------------------------------------------
+
+def check_annotation_manifest(annotation_file):
+    '''
+    Check if an annotation file has a valid manifest declaring that its records are sorted by the merge key.
+    '''
+
+    return get_annotation_manifest_dict(annotation_file).get('sorted', 'N') == 'Y'
+
+#-------------------------------------------------------------------------------
+
+def merge_sorted_annotation_files(annotation_file_list, output_file, is_header):
+    '''
+    Merge annotation files sorted by the merge key in an output file sorted by the merge key
+    (when the files have a header record, only the one of the first file is written)
+    and return the record number and the first and last keys.
+    '''
+
+    # initialize the list of annotation file identifications
+    annotation_file_id_list = []
+
+    # open each annotation file and read its header record
+    header_record = ''
+    for annotation_file in annotation_file_list:
+        if annotation_file.endswith('.gz'):
+            try:
+                annotation_file_id = open_gzip(annotation_file, mode='rt', encoding='iso-8859-1')
+            except Exception as e:
+                raise ProgramException('F002', annotation_file)
+        else:
+            try:
+                annotation_file_id = open(annotation_file, mode='r', encoding='iso-8859-1')
+            except Exception as e:
+                raise ProgramException('F001', annotation_file)
+        if is_header:
+            record = annotation_file_id.readline()
+            if header_record == '':
+                header_record = record
+        annotation_file_id_list.append(annotation_file_id)
+
+    # open the output file
+    if output_file.endswith('.gz'):
+        try:
+            output_file_id = open_gzip(output_file, mode='wt', encoding='iso-8859-1', newline='\n')
+        except Exception as e:
+            raise ProgramException('F004', output_file)
+    else:
+        try:
+            output_file_id = open(output_file, mode='w', encoding='iso-8859-1', newline='\n')
+        except Exception as e:
+            raise ProgramException('F003', output_file)
+
+    # initialize the output buffer of the output file
+    output_buffer = AnnotationOutputBuffer(output_file_id)
+
+    # write the header record
+    output_buffer.write(header_record)
+
+    # initialize the record number and the first and last keys
+    record_number = 0
+    first_key = None
+    last_key = None
+
+    # write the records with a k-way merge (records with the same key are written in the order of the list)
+    for record in heapq.merge(*annotation_file_id_list, key=get_annotation_record_key):
+        output_buffer.write(record)
+        record_number += 1
+        last_key = get_annotation_record_key(record)
+        if first_key is None:
+            first_key = last_key
+
+    # close files
+    for annotation_file_id in annotation_file_id_list:
+        annotation_file_id.close()
+    output_buffer.close()
+
+    # return the record number and the first and last keys
+    return record_number, first_key, last_key
+
+#-------------------------------------------------------------------------------
+
+def sort_annotation_file(annotation_file, is_header):
+    '''
+    Sort the records of an annotation file by the merge key with an external sort: the file is read in chunks
+    that are sorted in memory and written in temporal files, which are merged in the annotation file.
+    Return the record number and the first and last keys.
+    '''
+
+    # create the temporal directory of the chunk files
+    chunk_dir = tempfile.mkdtemp(prefix='toa-sort-', dir=os.path.dirname(os.path.abspath(annotation_file)))
+
+    # open the annotation file
+    if annotation_file.endswith('.gz'):
+        try:
+            annotation_file_id = open_gzip(annotation_file, mode='rt', encoding='iso-8859-1')
+        except Exception as e:
+            raise ProgramException('F002', annotation_file)
+    else:
+        try:
+            annotation_file_id = open(annotation_file, mode='r', encoding='iso-8859-1')
+        except Exception as e:
+            raise ProgramException('F001', annotation_file)
+
+    # read the header record
+    header_record = annotation_file_id.readline() if is_header else ''
+
+    # write the sorted chunks in the chunk files (each one with the header record)
+    chunk_file_list = []
+    record_list = []
+    record = annotation_file_id.readline()
+    while record != '' or record_list != []:
+        if record != '':
+            record_list.append(record)
+        if record == '' or len(record_list) >= Const.ANNOTATION_SORT_CHUNK_SIZE:
+            chunk_file = f'{chunk_dir}/chunk-{len(chunk_file_list)}.csv'
+            try:
+                with open(chunk_file, mode='w', encoding='iso-8859-1', newline='\n') as chunk_file_id:
+                    chunk_file_id.write(header_record)
+                    record_list.sort(key=get_annotation_record_key)
+                    chunk_file_id.writelines(record_list)
+            except Exception as e:
+                raise ProgramException('F003', chunk_file)
+            chunk_file_list.append(chunk_file)
+            record_list = []
+        if record != '':
+            record = annotation_file_id.readline()
+
+    # close the annotation file
+    annotation_file_id.close()
+
+    # merge the chunk files in the annotation file
+    if chunk_file_list != []:
+        (record_number, first_key, last_key) = merge_sorted_annotation_files(chunk_file_list, annotation_file, is_header)
+    else:
+        (record_number, first_key, last_key) = (0, None, None)
+
+    # delete the temporal directory of the chunk files
+    shutil.rmtree(chunk_dir, ignore_errors=True)
+
+    # return the record number and the first and last keys
+    return record_number, first_key, last_key
+
+#-------------------------------------------------------------------------------
+
+def get_annotation_ontology_id_list(value, ontology):
+    '''
+    Get the list of ontology identifications (GO or InterPro) of an annotation value; the values of the annotation
+    files ("GO:go_id1*go_id2*...") and of the merged annotation files ("go_id1|||go_id2|||...") are accepted.
+    '''
+
+    # initialize the identification list
+    id_list = []
+
+    # split the value and normalize the identifications
+    for id in value.replace('|||', '*').split('*'):
+        id = id.strip()
+        if ontology == 'GO' and id.startswith('GO:'):
+            id = id[3:]
+        if id != '':
+            id = f'GO:{id}' if ontology == 'GO' else id
+            if id not in id_list:
+                id_list.append(id)
+
+    # return the identification list
+    return id_list
+
+#-------------------------------------------------------------------------------
+
+def save_annotation_file_in_results_db(results_db, annotation_file, type, is_header=True):
+    '''
+    Save the records of an annotation file in a results database (the records previously saved of the file
+    with the same path are replaced). The records are saved with the columns of the merged annotation files
+    and the GO and InterPro identifications of each record are also saved to be queried by identification;
+    the size and modification time of the file are saved to detect later changes.
+    '''
+
+    results_annotation_file = get_results_annotation_file(annotation_file)
+    Message.print('verbose', f'Saving the annotation file {os.path.basename(annotation_file)} in the results database ...\n')
+
+    # get the file status
+    try:
+        file_stat = os.stat(annotation_file)
+    except Exception as e:
+        raise ProgramException('F001', annotation_file)
+
+    # connect to the results database
+    conn = xsqlite.connect_database(results_db, 'BULK-LOAD')
+
+    # create the tables (if they do not exist)
+    xsqlite.create_annotation_files(conn)
+    xsqlite.create_annotations(conn)
+    xsqlite.create_annotations_index(conn)
+    xsqlite.create_annotation_ontology_ids(conn)
+
+    # delete the rows previously saved of the annotation file
+    xsqlite.delete_results_annotation_file_rows(conn, results_annotation_file)
+    conn.commit()
+
+    # open the annotation file
+    if annotation_file.endswith('.gz'):
+        try:
+            annotation_file_id = open_gzip(annotation_file, mode='rt', encoding='iso-8859-1')
+        except Exception as e:
+            raise ProgramException('F002', annotation_file)
+    else:
+        try:
+            annotation_file_id = open(annotation_file, mode='r', encoding='iso-8859-1')
+        except Exception as e:
+            raise ProgramException('F001', annotation_file)
+
+    # initialize the annotation reader and skip the header record
+    annotation_reader = AnnotationReader(annotation_file, annotation_file_id, type)
+    if is_header:
+        annotation_reader.read()
+
+    # get the keys of the values saved in each column of the merged annotation files
+    key_list = get_annotation_key_list(type, is_merged=True)
+
+    # initialize the batch inserters
+    annotations_inserter = xsqlite.BatchInserter(conn, 'annotations')
+    go_ids_inserter = xsqlite.BatchInserter(conn, 'annotation_go_ids')
+    interpro_ids_inserter = xsqlite.BatchInserter(conn, 'annotation_interpro_ids')
+
+    # initialize the record counter
+    record_counter = 0
+
+    # insert the data of each record
+    for (record, key, data_record) in annotation_reader:
+        record_counter += 1
+        value_list = ['' if column_key is None else data_record.get(column_key, '') for column_key in key_list]
+        if check_int(value_list[3]):
+            value_list[3] = f'{int(value_list[3]):02d}'
+        annotations_inserter.add_row(tuple([results_annotation_file, record_counter] + value_list))
+        for go_id in get_annotation_ontology_id_list(data_record.get('go_id', ''), 'GO'):
+            go_ids_inserter.add_row((results_annotation_file, record_counter, value_list[0], go_id))
+        for interpro_id in get_annotation_ontology_id_list(data_record.get('interpro_id', ''), 'INTERPRO'):
+            interpro_ids_inserter.add_row((results_annotation_file, record_counter, value_list[0], interpro_id))
+
+    # insert the rows remaining in the batches
+    annotations_inserter.flush()
+    go_ids_inserter.flush()
+    interpro_ids_inserter.flush()
+
+    # close the annotation file
+    annotation_file_id.close()
+
+    # register the annotation file
+    xsqlite.insert_annotation_files_row(conn, {'annotation_file': results_annotation_file, 'type': type.upper(), 'record_number': record_counter, 'file_size': file_stat.st_size, 'file_mtime_ns': file_stat.st_mtime_ns})
+    conn.commit()
+
+    # close connection to the results database
+    conn.close()
+
+    Message.print('verbose', f'The annotation file is saved: {record_counter} records.\n')
+
+#-------------------------------------------------------------------------------
+
+def get_results_annotation_file(annotation_file):
+    '''
+    Get the name of an annotation file in a results database (its absolute path, so that the files
+    with the same name in different directories are saved apart).
+    '''
+
+    return os.path.abspath(annotation_file)
+
+#-------------------------------------------------------------------------------
+
+def connect_results_db(results_db, annotation_file):
+    '''
+    Connect to a results database in read-only mode when the annotation file is saved in it and the file
+    has not changed since then (same size and modification time); otherwise, return None (the annotation
+    file has to be read).
+    '''
+
+    # initialize the connection
+    conn = None
+
+    # connect to the results database and check that the current annotation file is saved in it
+    if results_db != 'NONE' and os.path.isfile(results_db):
+        conn = xsqlite.connect_database(results_db, 'READ-ONLY')
+        data_dict = xsqlite.get_annotation_files_dict(conn, get_results_annotation_file(annotation_file))
+        try:
+            file_stat = os.stat(annotation_file)
+            OK = data_dict != {} and data_dict['file_size'] == file_stat.st_size and data_dict['file_mtime_ns'] == file_stat.st_mtime_ns
+        except Exception as e:
+            OK = False
+        if not OK:
+            conn.close()
+            conn = None
+
+    # print the source of the annotations
+    if conn is None:
+        Message.print('verbose', f'The annotations are read from the annotation file {os.path.basename(annotation_file)}.\n')
+    else:
+        Message.print('verbose', f'The annotations are read from the results database {os.path.basename(results_db)}.\n')
+
+    # return the connection
+    return conn
+
+#-------------------------------------------------------------------------------
+
+def get_id_relationship_dict(relationship_file):
+    '''
+    Get the new-old identification relationship dictionary.
+    '''
+
+    # initialize the new-old identification relationship dictionary
+    id_relationship_dict = {}
+
+    # when the relationship file is not NONE
+    if relationship_file != 'NONE':
+
+        # open the relationship file
+        if relationship_file.endswith('.gz'):
+            try:
+                relationship_file_id = open_gzip(relationship_file, mode='rt', encoding='iso-8859-1')
+            except Exception as e:
+                raise ProgramException('F002', relationship_file)
+        else:
+            try:
                 relationship_file_id = open(relationship_file, mode='r', encoding='iso-8859-1')
             except Exception as e:
                 raise ProgramException('F001', relationship_file)
@@ -2329,6 +2943,24 @@ def get_seq_ids(x_seq_id, toa_transcriptome_relationship_dict, toa_transdecoder_
 
 #-------------------------------------------------------------------------------
 
+def get_alignment_format_code_list():
+    '''
+    Get the code list of "alignment_format".
+    '''
+
+    return ['5', '6']
+
+#-------------------------------------------------------------------------------
+
+def get_alignment_format_code_list_text():
+    '''
+    Get the code list of "alignment_format" as text.
+    '''
+
+    return '5 (BLAST XML) or 6 (tabular)'
+
+#-------------------------------------------------------------------------------
+
 def get_alignment_tool_code_list():
     '''
     Get the code list of "alignment_tool".
@@ -2352,7 +2984,7 @@ def get_blast_file_format_code_list():
     Get the code list of "blast_file_format".
     '''
 
-    return ['5']
+    return ['5', '6', '7']
 
 #-------------------------------------------------------------------------------
     
@@ -2361,7 +2993,25 @@ def get_blast_file_format_code_list_text():
     Get the code list of "blast_file_format" as text.
     '''
 
-    return '5 (BLAST XML)'
+    return '5 (BLAST XML), 6 (tabular) or 7 (tabular with comment lines)'
+
+#-------------------------------------------------------------------------------
+    
+def get_blast_tabular_column_list():
+    '''
+    Get the column list of the BLAST tabular files (formats 6 and 7) loaded into TOA database.
+    '''
+
+    return ['qseqid', 'sseqid', 'stitle', 'evalue', 'nident', 'positive', 'gaps', 'length', 'qseq']
+
+#-------------------------------------------------------------------------------
+    
+def get_blast_tabular_column_list_text():
+    '''
+    Get the column list of the BLAST tabular files (formats 6 and 7) as text.
+    '''
+
+    return ' '.join(get_blast_tabular_column_list())
 
 #-------------------------------------------------------------------------------
     
@@ -2509,12 +3159,120 @@ def get_header_code_list_text():
 
 #-------------------------------------------------------------------------------
     
+def get_db_profile_code_list():
+    '''
+    Get the code list of "db_profile".
+    '''
+
+    return ['DEFAULT', 'BULK-LOAD', 'READ-ONLY']
+
+#-------------------------------------------------------------------------------
+    
+def get_db_profile_code_list_text():
+    '''
+    Get the code list of "db_profile" as text.
+    '''
+
+    return 'DEFAULT (SQLite defaults), BULK-LOAD (journal in memory, no syncs, large cache and memory-mapped I/O) or READ-ONLY (read-only mode and memory-mapped I/O)'
+
+#-------------------------------------------------------------------------------
+    
+def get_index_mode_code_list():
+    '''
+    Get the code list of "index_mode".
+    '''
+
+    return ['IMMEDIATE', 'DEFERRED']
+
+#-------------------------------------------------------------------------------
+    
+def get_index_mode_code_list_text():
+    '''
+    Get the code list of "index_mode" as text.
+    '''
+
+    return 'IMMEDIATE (indexes are maintained during the load) or DEFERRED (indexes are dropped before inserting rows and built at the end)'
+
+#-------------------------------------------------------------------------------
+    
+def get_cache_mode_code_list():
+    '''
+    Get the code list of "cache_mode".
+    '''
+
+    return ['NONE', 'ALL', 'LRU']
+
+#-------------------------------------------------------------------------------
+    
+def get_cache_mode_code_list_text():
+    '''
+    Get the code list of "cache_mode" as text.
+    '''
+
+    return 'NONE (queries per batch), ALL (preload of all genes of the dataset) or LRU (memory of the last used genes)'
+
+#-------------------------------------------------------------------------------
+    
+def get_chunk_file_format_code_list():
+    '''
+    Get the code list of "chunk_file_format".
+    '''
+
+    return ['ANNOTATION', 'CSV', 'FASTA', 'TSV']
+
+#-------------------------------------------------------------------------------
+    
+def get_chunk_file_format_code_list_text():
+    '''
+    Get the code list of "chunk_file_format" as text.
+    '''
+
+    return 'ANNOTATION (annotation files sorted by the merge key), CSV (files with a header record), FASTA or TSV'
+
+#-------------------------------------------------------------------------------
+    
+def get_alignment_cache_code_list():
+    '''
+    Get the code list of "alignment_cache".
+    '''
+
+    return ['Y', 'N']
+
+#-------------------------------------------------------------------------------
+    
+def get_alignment_cache_code_list_text():
+    '''
+    Get the code list of "alignment_cache" as text.
+    '''
+
+    return 'Y (the alignments of sequences previously aligned with the same database build and parameters are reused) or N'
+
+#-------------------------------------------------------------------------------
+    
+def get_pipeline_metrics_group_code_list():
+    '''
+    Get the code list of "pipeline_metrics_group".
+    '''
+
+    return ['DATASET', 'KIND', 'STEP']
+
+#-------------------------------------------------------------------------------
+    
+def get_pipeline_metrics_group_code_list_text():
+    '''
+    Get the code list of "pipeline_metrics_group" as text.
+    '''
+
+    return 'DATASET (step kind and dataset), KIND (step kind, e. g. align_transcripts_proteome) or STEP'
+
+#-------------------------------------------------------------------------------
+    
 def get_restored_file_format_code_list():
     '''
     Get the code list of "restored_file_format".
     '''
 
-    return ['FASTA', 'XML']
+    return ['FASTA', 'TSV', 'XML']
 
 #-------------------------------------------------------------------------------
     
@@ -2545,6 +3303,24 @@ def get_verbose_code_list_text():
 
 #-------------------------------------------------------------------------------
     
+def get_upgrade_indexes_code_list():
+    '''
+    Get the code list of "upgrade_indexes".
+    '''
+
+    return ['Y', 'N']
+
+#-------------------------------------------------------------------------------
+    
+def get_upgrade_indexes_code_list_text():
+    '''
+    Get the code list of "upgrade_indexes" as text.
+    '''
+
+    return 'Y (yes) or N (no)'
+
+#-------------------------------------------------------------------------------
+    
 def get_trace_code_list():
     '''
     Get the code list of "trace".
@@ -2654,10 +3430,30 @@ class Const():
 
     #---------------
 
+    DEFAULT_BATCH_SIZE = 1000
+    DEFAULT_CACHE_MODE = 'NONE'
+    DEFAULT_CACHE_SIZE = 100000
+    DEFAULT_DB_PROFILE = 'DEFAULT'
     DEFAULT_HEADER = 'N'
+    DEFAULT_INDEX_MODE = 'IMMEDIATE'
+    DEFAULT_INSERT_BATCH_SIZE = 10000
     DEFAULT_RNUM = 1000000
+    DEFAULT_TARGET_CLADE = 'Viridiplantae'
+    DEFAULT_TAXONOMY_THREADS = 8
+    DEFAULT_THREADS = 1
     DEFAULT_TRACE = 'N'
+    DEFAULT_UPGRADE_INDEXES = 'N'
     DEFAULT_VERBOSE = 'N'
+    DEFAULT_WORKERS = 1
+
+   #---------------
+
+    DB_PROFILE_CACHE_SIZE = 2097152    # KiB
+    DB_PROFILE_MMAP_SIZE = 68719476736    # bytes (it is limited by SQLITE_MAX_MMAP_SIZE)
+
+   #---------------
+
+    TAXONOMY_NOT_FOUND_EXPIRATION_DAYS = 90
 
    #---------------
 
@@ -2665,6 +3461,20 @@ class Const():
 
    #---------------
 
+    ANNOTATION_READ_BLOCK_SIZE = 1048576    # bytes
+    ANNOTATION_SORT_CHUNK_SIZE = 1000000    # records
+    ANNOTATION_WRITE_BUFFER_SIZE = 4194304    # characters (records buffered before each write in the annotation file)
+
+   #---------------
+
+    GZIP_COMPRESSION_LEVEL = 6
+    GZIP_THREADS = 4    # pigz processes or compression threads (blocks decompressed ahead by the read-ahead thread)
+    GZIP_BLOCK_SIZE = 1048576    # bytes (uncompressed data compressed by each thread)
+    GZIP_BUFFER_SIZE = 4194304    # bytes
+
+
+   #---------------
+
 #-------------------------------------------------------------------------------
  
 class Message():
@@ -2710,6 +3520,911 @@ class Message():
 
 #-------------------------------------------------------------------------------
 
+class PhaseTimer():
+    '''
+    This class measures the elapsed time of the phases of a process.
+    '''
+
+    #---------------
+
+    def __init__(self):
+        '''
+        Initialize the phase data.
+        '''
+
+        self.phase_name = None
+        self.start_time = None
+        self.elapsed_time_dict = {}
+
+    #---------------
+
+    def start(self, phase_name):
+        '''
+        Start the measure of a phase (the current phase is stopped).
+        '''
+
+        self.stop()
+        self.phase_name = phase_name
+        self.start_time = time.perf_counter()
+
+    #---------------
+
+    def stop(self):
+        '''
+        Stop the measure of the current phase.
+        '''
+
+        if self.phase_name is not None:
+            self.elapsed_time_dict[self.phase_name] = self.elapsed_time_dict.get(self.phase_name, 0) + time.perf_counter() - self.start_time
+            self.phase_name = None
+
+    #---------------
+
+    def print_summary(self, process_name):
+        '''
+        Print the elapsed time of each phase.
+        '''
+
+        self.stop()
+        phase_text = ' - '.join([f'{phase_name}: {elapsed_time:.3f} s' for (phase_name, elapsed_time) in self.elapsed_time_dict.items()])
+        Message.print('info', f'Elapsed time of {process_name} - {phase_text}.')
+
+    #---------------
+
+#-------------------------------------------------------------------------------
+
+class AnnotationRecord():
+    '''
+    This class holds the values of an annotation record read from a file; the values are got by column name
+    using the column dictionary shared by all records of the same type.
+    '''
+
+    #---------------
+
+    __slots__ = ('type', 'column_dict', 'value_list')
+
+    #---------------
+
+    def __init__(self, type, column_dict, value_list):
+        '''
+        Initialize the record data.
+        '''
+
+        self.type = type
+        self.column_dict = column_dict
+        self.value_list = value_list
+
+    #---------------
+
+    def __getitem__(self, column):
+        '''
+        Get the value of a column.
+        '''
+
+        return self.value_list[self.column_dict[column]]
+
+    #---------------
+
+    def __contains__(self, column):
+        '''
+        Check if the record has a column.
+        '''
+
+        return column in self.column_dict
+
+    #---------------
+
+    def get(self, column, default=None):
+        '''
+        Get the value of a column or a default value when the record has not the column.
+        '''
+
+        position = self.column_dict.get(column)
+
+        return self.value_list[position] if position is not None else default
+
+    #---------------
+
+    def to_dict(self):
+        '''
+        Get a data dictionary with the record values.
+        '''
+
+        return {column: self.value_list[position] for (column, position) in self.column_dict.items()}
+
+    #---------------
+
+#-------------------------------------------------------------------------------
+
+class AnnotationReader():
+    '''
+    This class reads the records of an annotation file in blocks of lines and decodes them into
+    "AnnotationRecord" instances. It can be used as an iterator of (record, key, data record) tuples
+    or record to record with the method "read".
+    '''
+
+    #---------------
+
+    def __init__(self, file_name, file_id, type, block_size=None):
+        '''
+        Initialize the reader of an annotation file already opened.
+        '''
+
+        # save initial parameters in instance variables
+        self.file_name = file_name
+        self.file_id = file_id
+        self.type = type.upper()
+        self.block_size = Const.ANNOTATION_READ_BLOCK_SIZE if block_size is None else block_size
+
+        # get the column dictionary of the type
+        self.column_dict = {column: i for (i, column) in enumerate(get_annotation_column_list(self.type))}
+
+        # initialize the record counter and the block of lines
+        self.record_counter = 0
+        self.line_list = []
+        self.line_position = 0
+
+    #---------------
+
+    def __iter__(self):
+        '''
+        Get the iterator.
+        '''
+
+        return self
+
+    #---------------
+
+    def __next__(self):
+        '''
+        Get the next tuple (record, key, data record) or stop the iteration at the end of file.
+        '''
+
+        # read the next block of lines when the current one is consumed
+        if self.line_position >= len(self.line_list):
+            self.line_list = self.file_id.readlines(self.block_size)
+            self.line_position = 0
+            if self.line_list == []:
+                raise StopIteration
+
+        # get the next line
+        record = self.line_list[self.line_position].strip('\n')
+        self.line_position += 1
+        self.record_counter += 1
+
+        # decode the record
+        (key, data_record) = AnnotationReader.decode(self.file_name, self.type, self.column_dict, record, self.record_counter)
+
+        # return the record, key and data record
+        return record, key, data_record
+
+    #---------------
+
+    def read(self):
+        '''
+        Read the next record; at the end of file, the record is empty, the key is "~" and the data is an empty dictionary.
+        '''
+
+        try:
+            return self.__next__()
+        except StopIteration:
+            return '', bytes.fromhex('7E').decode('utf-8'), {}
+
+    #---------------
+
+    @staticmethod
+    def decode(file_name, type, column_dict, record, record_counter):
+        '''
+        Decode an annotation record without EOL and get its key and data record.
+        '''
+
+        # split the record and remove the quotes of the values
+        value_list = [value.strip('"') for value in record.split(';')]
+        if len(value_list) < len(column_dict):
+            raise ProgramException('F006', os.path.basename(file_name), record_counter)
+
+        # set the key
+        key = f'{value_list[1]}-{value_list[2]}-{value_list[3]}-{value_list[4]}'
+
+        # return the key and data record
+        return key, AnnotationRecord(type, column_dict, value_list)
+
+    #---------------
+
+#-------------------------------------------------------------------------------
+
+class AnnotationWriter():
+    '''
+    This class writes annotation records (data dictionaries or "AnnotationRecord" instances) using record
+    templates compiled once per type; the file can be an "AnnotationOutputBuffer" instance shared by several
+    writers to write the records in blocks.
+    '''
+
+    #---------------
+
+    template_dict = {}
+
+    #---------------
+
+    def __init__(self, file_id, type, is_merged=False):
+        '''
+        Initialize the writer of an annotation file already opened.
+        '''
+
+        # save initial parameters in instance variables
+        self.file_id = file_id
+        self.type = type.upper()
+        self.is_merged = is_merged
+
+        # initialize the written record counter
+        self.record_counter = 0
+
+    #---------------
+
+    def write(self, data):
+        '''
+        Write a record.
+        '''
+
+        # encode the data and write it
+        self.file_id.write(AnnotationWriter.encode_record(self.type, self.is_merged, data))
+
+        # add 1 to the written record counter
+        self.record_counter += 1
+
+    #---------------
+
+    def write_all(self, data_iterable):
+        '''
+        Write every record of an iterable and return the number of written records.
+        '''
+
+        # initialize the written record counter
+        record_counter = 0
+
+        # write the records
+        for data in data_iterable:
+            self.write(data)
+            record_counter += 1
+
+        # return the written record counter
+        return record_counter
+
+    #---------------
+
+    @staticmethod
+    def get_template(type, is_merged, record_type=None):
+        '''
+        Get the record template of a type: with named fields to format data dictionaries or,
+        when the type of the read records is passed, with positional fields to format their values.
+        '''
+
+        # get the template when it is already compiled
+        template_key = (type.upper(), is_merged, record_type)
+        template = AnnotationWriter.template_dict.get(template_key)
+
+        # compile the template
+        if template is None:
+            if record_type is None:
+                field_list = ['' if key is None else '{' + key + '}' for key in get_annotation_key_list(type, is_merged)]
+            elif is_merged:
+                column_list = get_annotation_column_list(record_type)
+                field_list = ['' if key is None else '{' + str(column_list.index(key)) + '}' for key in get_annotation_key_list(type, is_merged)]
+            else:
+                field_list = ['{' + str(position) + '}' for position in range(len(get_annotation_column_list(record_type)))]
+            template = '"' + '";"'.join(field_list) + '"\n'
+            AnnotationWriter.template_dict[template_key] = template
+
+        # return the template
+        return template
+
+    #---------------
+
+    @staticmethod
+    def encode_record(type, is_merged, data):
+        '''
+        Encode a data dictionary or a data record with the hit number formatted with two digits and,
+        in the annotation files of PLAZA and RefSeq, the prefix added to the GO identifications
+        (the data are not modified).
+        '''
+
+        # when the data is a record, format its values with a positional template
+        if isinstance(data, AnnotationRecord):
+            value_list = data.value_list
+            if check_int(value_list[3]):
+                value_list = value_list[:3] + [f'{int(value_list[3]):02d}'] + value_list[4:]
+            return AnnotationWriter.get_template(type, is_merged, data.type).format(*value_list)
+
+        # when the data is a dictionary, format its values with a named template
+        else:
+            format_dict = {}
+            if check_int(data['hit_num']):
+                format_dict['hit_num'] = f'{int(data["hit_num"]):02d}'
+            if not is_merged and type.upper() in ['PLAZA', 'REFSEQ'] and data['accum_go_id'] != '':
+                format_dict['accum_go_id'] = f'GO:{data["accum_go_id"]}'
+            if format_dict != {}:
+                data = {**data, **format_dict}
+            return AnnotationWriter.get_template(type, is_merged).format_map(data)
+
+    #---------------
+
+#-------------------------------------------------------------------------------
+
+class AnnotationOutputBuffer():
+    '''
+    This class buffers the text written in an annotation file already opened and writes it in blocks:
+    the buffered text is joined and encoded once per flush. After the buffer is created, the file has to be
+    written only through it.
+    '''
+
+    #---------------
+
+    def __init__(self, file_id, buffer_size=None):
+        '''
+        Initialize the buffer of an annotation file already opened.
+        '''
+
+        # set the buffer size
+        if buffer_size is None:
+            buffer_size = Const.ANNOTATION_WRITE_BUFFER_SIZE
+
+        # save initial parameters in instance variables
+        self.file_id = file_id
+        self.buffer_size = buffer_size
+
+        # get the encoding of the text stream and its binary buffer (None when the text has to be written in the file)
+        self.encoding = getattr(file_id, 'encoding', None) or 'iso-8859-1'
+        self.errors = getattr(file_id, 'errors', None) or 'strict'
+        self.binary_file_id = getattr(file_id, 'buffer', None)
+
+        # initialize the text list and its length
+        self.text_list = []
+        self.text_length = 0
+
+        # initialize the written byte counter
+        self.byte_counter = 0
+
+    #---------------
+
+    def write(self, text):
+        '''
+        Add a text to the buffer and write the buffer when it is full.
+        '''
+
+        # add the text
+        self.text_list.append(text)
+        self.text_length += len(text)
+
+        # write the buffer when it is full
+        if self.text_length >= self.buffer_size:
+            self.flush()
+
+    #---------------
+
+    def flush(self):
+        '''
+        Write the buffered text in the file.
+        '''
+
+        # when there is buffered text
+        if self.text_list != []:
+
+            # join the buffered text
+            text = ''.join(self.text_list)
+
+            # encode the text and write it in the binary buffer of the text stream (after the text previously written in the stream)
+            if self.binary_file_id is not None:
+                data = text.encode(self.encoding, self.errors)
+                self.file_id.flush()
+                self.binary_file_id.write(data)
+                self.byte_counter += len(data)
+
+            # otherwise, write the text in the file
+            else:
+                self.file_id.write(text)
+                self.byte_counter += len(text.encode(self.encoding, self.errors))
+
+            # clear the buffer
+            self.text_list = []
+            self.text_length = 0
+
+    #---------------
+
+    def close(self):
+        '''
+        Write the buffered text and close the file.
+        '''
+
+        self.flush()
+        self.file_id.close()
+
+    #---------------
+
+#-------------------------------------------------------------------------------
+
+class ResultsAnnotationReader():
+    '''
+    This class reads the records of an annotation file saved in a results database with the same interface
+    as "AnnotationReader": the records are got in the order of the file, with the columns of the merged
+    annotation files and without the header record.
+    '''
+
+    #---------------
+
+    def __init__(self, conn, annotation_file, rows=None):
+        '''
+        Initialize the reader of the rows of an annotation file (all its rows when they are not passed).
+        '''
+
+        # save initial parameters in instance variables
+        self.annotation_file = get_results_annotation_file(annotation_file)
+        self.rows = xsqlite.get_annotations_rows(conn, self.annotation_file) if rows is None else rows
+        self.type = 'MERGER'
+
+        # get the column dictionary of the merged annotation files
+        self.column_dict = {column: i for (i, column) in enumerate(get_annotation_column_list(self.type))}
+
+        # initialize the record counter
+        self.record_counter = 0
+
+    #---------------
+
+    def __iter__(self):
+        '''
+        Get the iterator.
+        '''
+
+        return self
+
+    #---------------
+
+    def __next__(self):
+        '''
+        Get the next tuple (record, key, data record) or stop the iteration at the end of the rows.
+        '''
+
+        # get the next row
+        row = next(self.rows)
+        self.record_counter += 1
+
+        # build the record, the key and the data record
+        value_list = list(row)
+        record = '"' + '";"'.join(value_list) + '"'
+        key = f'{value_list[1]}-{value_list[2]}-{value_list[3]}-{value_list[4]}'
+
+        # return the record, key and data record
+        return record, key, AnnotationRecord(self.type, self.column_dict, value_list)
+
+    #---------------
+
+    def read(self):
+        '''
+        Read the next record; at the end of the rows, the record is empty, the key is "~" and the data is an empty dictionary.
+        '''
+
+        try:
+            return self.__next__()
+        except StopIteration:
+            return '', bytes.fromhex('7E').decode('utf-8'), {}
+
+    #---------------
+
+#-------------------------------------------------------------------------------
+
+class SortedAnnotationWriter(AnnotationWriter):
+    '''
+    This class writes the data dictionaries of an annotation process sorted by the merge key: the records of
+    each sequence are buffered and sorted when the sequence is completed, and the file is sorted at the end
+    only when the sequences have not been processed in key order.
+    '''
+
+    #---------------
+
+    def __init__(self, file_id, type):
+        '''
+        Initialize the writer of an annotation file already opened.
+        '''
+
+        # initialize the writer
+        super().__init__(file_id, type, is_merged=False)
+
+        # initialize the buffer of data dictionaries of the current sequence
+        self.data_dict_list = []
+
+        # initialize the sort control variables
+        self.is_sorted = True
+        self.first_key = None
+        self.last_key = None
+
+    #---------------
+
+    def add(self, data_dict):
+        '''
+        Add a data dictionary of the current sequence.
+        '''
+
+        self.data_dict_list.append(data_dict)
+
+    #---------------
+
+    def flush(self):
+        '''
+        Write the data dictionaries of the current sequence sorted by the merge key.
+        '''
+
+        # sort the data dictionaries and write them
+        for (key, data_dict) in sorted([(get_annotation_key(data_dict), data_dict) for data_dict in self.data_dict_list], key=lambda x: x[0]):
+            if self.last_key is not None and key < self.last_key:
+                self.is_sorted = False
+            if self.first_key is None:
+                self.first_key = key
+            self.last_key = key
+            self.write(data_dict)
+
+        # clear the buffer
+        self.data_dict_list = []
+
+    #---------------
+
+    def write_manifest(self, annotation_file):
+        '''
+        Sort the annotation file, when it is necessary, and write its manifest (the file has to be closed).
+        '''
+
+        # sort the annotation file when the sequences have not been processed in key order
+        if not self.is_sorted:
+            Message.print('verbose', f'Sorting the annotation file {os.path.basename(annotation_file)} ...\n')
+            (record_number, self.first_key, self.last_key) = sort_annotation_file(annotation_file, is_header=True)
+            self.is_sorted = True
+            Message.print('verbose', 'The file is sorted.\n')
+
+        # write the manifest
+        write_annotation_manifest(annotation_file, self.type, self.is_sorted, True, self.record_counter, self.first_key, self.last_key)
+
+    #---------------
+
+#-------------------------------------------------------------------------------
+
+class GzipProcessStream(io.RawIOBase):
+    '''
+    This class is a raw stream of the uncompressed data of a gzip file compressed or decompressed by a pigz process.
+    '''
+
+    #---------------
+
+    def __init__(self, file_name, mode, compresslevel, threads):
+        '''
+        Open the file and start the pigz process.
+        '''
+
+        # initialize the raw stream
+        super().__init__()
+
+        # save initial parameters in instance variables
+        self.file_name = file_name
+        self.mode = mode
+
+        # open the file and start the pigz process reading from or writing to it
+        if mode == 'r':
+            self.file_id = open(file_name, mode='rb')
+            self.process = subprocess.Popen(['pigz', '--decompress', '--stdout', f'--processes={threads}'], stdin=self.file_id, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+        else:
+            self.file_id = open(file_name, mode='wb')
+            self.process = subprocess.Popen(['pigz', '--stdout', f'-{compresslevel}', f'--processes={threads}'], stdin=subprocess.PIPE, stdout=self.file_id, stderr=subprocess.DEVNULL)
+
+        # initialize the end of file control variable
+        self.is_eof = False
+
+    #---------------
+
+    def readable(self):
+        '''
+        Check if the stream can be read.
+        '''
+
+        return self.mode == 'r'
+
+    #---------------
+
+    def writable(self):
+        '''
+        Check if the stream can be written.
+        '''
+
+        return self.mode == 'w'
+
+    #---------------
+
+    def readinto(self, buffer):
+        '''
+        Read uncompressed data into a buffer and return the number of bytes read.
+        '''
+
+        # read data from the pigz process
+        byte_number = self.process.stdout.readinto(buffer)
+
+        # at the end of file, check that the file has been decompressed without errors
+        if byte_number == 0 and not self.is_eof:
+            self.is_eof = True
+            if self.process.wait() != 0:
+                raise ProgramException('F002', self.file_name)
+
+        # return the number of bytes read
+        return byte_number
+
+    #---------------
+
+    def write(self, buffer):
+        '''
+        Write uncompressed data and return the number of bytes written.
+        '''
+
+        self.process.stdin.write(buffer)
+        return len(buffer)
+
+    #---------------
+
+    def close(self):
+        '''
+        Close the stream waiting for the end of the pigz process.
+        '''
+
+        if not self.closed:
+
+            # close the stream
+            super().close()
+
+            # end the pigz process
+            if self.mode == 'r':
+                self.process.stdout.close()
+                if not self.is_eof:
+                    self.process.kill()
+                return_code = self.process.wait()
+            else:
+                self.process.stdin.close()
+                return_code = self.process.wait()
+
+            # close the file
+            self.file_id.close()
+
+            # check that the file has been compressed without errors
+            if self.mode == 'w' and return_code != 0:
+                raise ProgramException('F004', self.file_name)
+
+    #---------------
+
+#-------------------------------------------------------------------------------
+
+class GzipThreadReader(io.RawIOBase):
+    '''
+    This class is a raw stream of the uncompressed data of a gzip file decompressed by a thread
+    that reads ahead of the consumer blocks of data, so decompression and processing run in parallel.
+    '''
+
+    #---------------
+
+    def __init__(self, file_name, threads):
+        '''
+        Open the file and start the decompression thread.
+        '''
+
+        # initialize the raw stream
+        super().__init__()
+
+        # save initial parameters in instance variables
+        self.file_name = file_name
+
+        # open the file
+        self.file_id = gzip.open(file_name, mode='rb')
+
+        # initialize the queue of decompressed blocks and the current block (there is a single decompression
+        # thread, so the thread number only sets the number of blocks decompressed ahead of the consumer)
+        self.block_queue = queue.Queue(maxsize=threads)
+        self.block = b''
+        self.block_position = 0
+        self.is_eof = False
+
+        # start the decompression thread (it is a daemon thread and it is stopped when the stream is closed;
+        # the streams not closed are closed at exit before the interpreter shutdown)
+        self.stop_event = threading.Event()
+        self.thread = threading.Thread(target=self.decompress, daemon=True)
+        self.thread.start()
+
+    #---------------
+
+    def decompress(self):
+        '''
+        Decompress blocks of data and put them in the queue (an empty block marks the end of file).
+        '''
+
+        try:
+            while not self.stop_event.is_set():
+                block = self.file_id.read(Const.GZIP_BLOCK_SIZE)
+                self.put_block(block)
+                if block == b'':
+                    break
+        except Exception as e:
+            self.put_block(e)
+
+    #---------------
+
+    def put_block(self, block):
+        '''
+        Put a block (or the exception raised decompressing it) in the queue while the stream is not closed.
+        '''
+
+        while not self.stop_event.is_set():
+            try:
+                self.block_queue.put(block, timeout=0.1)
+                break
+            except queue.Full:
+                pass
+
+    #---------------
+
+    def readable(self):
+        '''
+        Check if the stream can be read.
+        '''
+
+        return True
+
+    #---------------
+
+    def readinto(self, buffer):
+        '''
+        Read uncompressed data into a buffer and return the number of bytes read.
+        '''
+
+        # get the next block when the current one is consumed
+        if self.block_position >= len(self.block):
+            if self.is_eof:
+                return 0
+            block = self.block_queue.get()
+            if isinstance(block, Exception):
+                self.close()
+                raise ProgramException('F002', self.file_name)
+            if block == b'':
+                self.is_eof = True
+                return 0
+            self.block = block
+            self.block_position = 0
+
+        # copy data of the current block into the buffer
+        byte_number = min(len(buffer), len(self.block) - self.block_position)
+        buffer[:byte_number] = self.block[self.block_position:self.block_position + byte_number]
+        self.block_position += byte_number
+
+        # return the number of bytes read
+        return byte_number
+
+    #---------------
+
+    def close(self):
+        '''
+        Close the stream stopping the decompression thread.
+        '''
+
+        if not self.closed:
+            super().close()
+            self.stop_event.set()
+            self.thread.join()
+            self.file_id.close()
+
+    #---------------
+
+#-------------------------------------------------------------------------------
+
+class GzipThreadWriter(io.RawIOBase):
+    '''
+    This class is a raw stream that compresses data in a gzip file with a pool of threads: the data is split
+    in blocks that are compressed in parallel as independent gzip members and written in their order.
+    '''
+
+    #---------------
+
+    def __init__(self, file_name, compresslevel, threads):
+        '''
+        Open the file and create the thread pool.
+        '''
+
+        # initialize the raw stream
+        super().__init__()
+
+        # save initial parameters in instance variables
+        self.file_name = file_name
+        self.compresslevel = compresslevel
+        self.threads = threads
+
+        # open the file
+        self.file_id = open(file_name, mode='wb')
+
+        # create the thread pool and initialize the list of blocks being compressed
+        self.executor = concurrent.futures.ThreadPoolExecutor(max_workers=threads)
+        self.future_list = []
+
+        # initialize the buffer of uncompressed data and the written member counter
+        self.buffer = bytearray()
+        self.member_counter = 0
+
+    #---------------
+
+    def writable(self):
+        '''
+        Check if the stream can be written.
+        '''
+
+        return True
+
+    #---------------
+
+    def write(self, buffer):
+        '''
+        Write uncompressed data and return the number of bytes written.
+        '''
+
+        # add the data to the buffer
+        self.buffer += buffer
+
+        # compress the full blocks of the buffer
+        while len(self.buffer) >= Const.GZIP_BLOCK_SIZE:
+            self.submit_block(bytes(self.buffer[:Const.GZIP_BLOCK_SIZE]))
+            del self.buffer[:Const.GZIP_BLOCK_SIZE]
+
+        # return the number of bytes written
+        return len(buffer)
+
+    #---------------
+
+    def submit_block(self, block):
+        '''
+        Submit a block to the thread pool and write the compressed blocks when there are too many blocks pending.
+        '''
+
+        self.future_list.append(self.executor.submit(gzip.compress, block, compresslevel=self.compresslevel))
+        while len(self.future_list) > 2 * self.threads:
+            self.write_member(self.future_list.pop(0).result())
+
+    #---------------
+
+    def write_member(self, member):
+        '''
+        Write a compressed block (a gzip member) in the file.
+        '''
+
+        self.file_id.write(member)
+        self.member_counter += 1
+
+    #---------------
+
+    def close(self):
+        '''
+        Close the stream compressing and writing the pending data.
+        '''
+
+        if not self.closed:
+
+            # close the stream
+            super().close()
+
+            # write the compressed blocks and compress and write the rest of the buffer in this thread, so it is also
+            # written when the stream is closed at exit and the thread pool does not accept blocks
+            # (a file without data has an empty gzip member)
+            try:
+                for future in self.future_list:
+                    self.write_member(future.result())
+                if len(self.buffer) > 0 or self.member_counter == 0:
+                    self.write_member(gzip.compress(bytes(self.buffer), compresslevel=self.compresslevel))
+                    self.buffer = bytearray()
+            finally:
+                self.future_list = []
+                self.executor.shutdown()
+                self.file_id.close()
+
+    #---------------
+
+#-------------------------------------------------------------------------------
+
 class ProgramException(Exception):
     '''
     This class controls various exceptions that can occur in the execution of the application.
@@ -2762,6 +4477,10 @@ class ProgramException(Exception):
             Message.print('error', f'*** ERROR {code_exception}: The program has parameters with invalid values.')
         elif code_exception == 'S001':
             Message.print('error', f'*** ERROR {code_exception}: The {param1} OS is not supported.')
+        elif code_exception == 'S002':
+            Message.print('error', f'*** ERROR {code_exception}: The worker process {param1} ended with return code {param2}.')
+        elif code_exception == 'S003':
+            Message.print('error', f'*** ERROR {code_exception}: The pipeline step {param1} ended with return code {param2}.')
         elif code_exception == 'W001':
             Message.print('error', f'*** ERROR {code_exception}: The server {param1} is not reachable.')
         elif code_exception == 'W002':
@@ -24,28 +24,129 @@ used in both console mode and gui mode.
 
 #-------------------------------------------------------------------------------
 
+import collections
+import hashlib
+import itertools
+import pathlib
 import sqlite3
 import sys
+import time
 
 import xlib
 
 #-------------------------------------------------------------------------------
 
-def connect_database(database_path):
+class Connection(sqlite3.Connection):
     '''
-    Connect to the database.
+    This class is a database connection that keeps the profile used to open it.
     '''
 
+    #---------------
+
+    db_profile = None
+
+    # species taxonomy data got with a read-only connection (pending to be inserted by a writable one)
+    pending_species_row_list = None
+    pending_taxonomy_not_found_list = None
+
+    #---------------
+
+#-------------------------------------------------------------------------------
+
+def connect_database(database_path, db_profile=None, is_immutable=False):
+    '''
+    Connect to the database and set the pragmas of a connection profile (a read-only connection to a database
+    that nobody changes while it is open can be immutable: it is read without locks or change detection).
+    '''
+
+    # set the default profile
+    if db_profile is None:
+        db_profile = xlib.Const.DEFAULT_DB_PROFILE
+
+    # connect to the database
     try:
-        conn = sqlite3.connect(database_path)
+        if db_profile == 'READ-ONLY':
+            conn = sqlite3.connect(f'{pathlib.Path(database_path).resolve().as_uri()}?mode=ro{"&immutable=1" if is_immutable else ""}', uri=True, factory=Connection)
+        else:
+            conn = sqlite3.connect(database_path, factory=Connection)
     except Exception as e:
         raise xlib.ProgramException('B001', database_path)
+    conn.db_profile = db_profile
+    conn.pending_species_row_list = []
+    conn.pending_taxonomy_not_found_list = []
+
+    # set the pragmas of the profile
+    for sentence in get_db_profile_pragma_list(db_profile):
+        try:
+            conn.execute(sentence)
+        except Exception as e:
+            raise xlib.ProgramException('B002', e, sentence, conn)
 
     # return connection
     return conn
 
 #-------------------------------------------------------------------------------
 
+def is_read_only(conn):
+    '''
+    Check if the connection was opened with the read-only profile.
+    '''
+
+    return getattr(conn, 'db_profile', None) == 'READ-ONLY'
+
+#-------------------------------------------------------------------------------
+
+def get_db_profile_pragma_list(db_profile):
+    '''
+    Get the pragma sentences of a connection profile.
+    '''
+
+    # bulk load: the database file is not synced and the rollback journal is kept in memory
+    # (the journal mode is not persistent, so the database file keeps its own mode when the connection
+    # is closed and no -wal/-shm files are left, but a crash of the program during a load can damage it)
+    if db_profile == 'BULK-LOAD':
+        pragma_list = [
+            'PRAGMA journal_mode = MEMORY',
+            'PRAGMA synchronous = OFF',
+            f'PRAGMA cache_size = -{xlib.Const.DB_PROFILE_CACHE_SIZE}',
+            'PRAGMA temp_store = MEMORY',
+            f'PRAGMA mmap_size = {xlib.Const.DB_PROFILE_MMAP_SIZE}',
+            ]
+
+    # read-only: the database is memory-mapped and the read-only mode of the connection and the query-only
+    # guard reject any change (the guard also rejects the changes of the temporary tables, so it is disabled
+    # only while the temporary tables used by the batch queries are loaded)
+    elif db_profile == 'READ-ONLY':
+        pragma_list = [
+            f'PRAGMA mmap_size = {xlib.Const.DB_PROFILE_MMAP_SIZE}',
+            'PRAGMA temp_store = MEMORY',
+            'PRAGMA query_only = ON',
+            ]
+
+    # default: SQLite defaults
+    else:
+        pragma_list = []
+
+    # return the pragma list
+    return pragma_list
+
+#-------------------------------------------------------------------------------
+
+def set_query_only(conn, is_query_only):
+    '''
+    Enable or disable the query-only guard of a connection opened with the read-only profile
+    (the connections of other profiles have not the guard).
+    '''
+
+    if is_read_only(conn):
+        sentence = f'PRAGMA query_only = {"ON" if is_query_only else "OFF"}'
+        try:
+            conn.execute(sentence)
+        except Exception as e:
+            raise xlib.ProgramException('B002', e, sentence, conn)
+
+#-------------------------------------------------------------------------------
+
 def rebuild_database(conn):
     '''
     Rebuild the database file.
@@ -65,6 +166,336 @@ def rebuild_database(conn):
     # return the control variable
     return OK
 
+#-------------------------------------------------------------------------------
+# recommended indexes
+#-------------------------------------------------------------------------------
+
+def get_recommended_index_dict():
+    '''
+    Get the dictionary of the recommended indexes with the table and the columns of each index
+    (they cover the columns selected in the queries of the annotation; the table "blast" has not any one
+    because an index with its long columns "hit_def" and "hsp_qseq" would nearly double the table size,
+    and the index "blast_index" already serves its queries).
+    '''
+
+    return {
+        'plaza_go_covering_index': {'table_name': 'plaza_go', 'column_list': ['dataset_id', 'gene_id', 'plaza_species_id', 'go_id', 'evidence', 'desc']},
+        'plaza_interpro_covering_index': {'table_name': 'plaza_interpro', 'column_list': ['dataset_id', 'gene_id', 'plaza_species_id', 'motif_id', 'desc']},
+        'plaza_mapman_covering_index': {'table_name': 'plaza_mapman', 'column_list': ['dataset_id', 'gene_id', 'plaza_species_id', 'mapman_id', 'desc']},
+        'ncbi_gene2refseq_covering_index': {'table_name': 'ncbi_gene2refseq', 'column_list': ['protein_accession', 'gene_id', 'status', 'rna_nucleotide_accession', 'genomic_nucleotide_accession', 'gene_symbol']},
+        'ncbi_gene2go_covering_index': {'table_name': 'ncbi_gene2go', 'column_list': ['gene_id', 'go_id', 'evidence', 'go_term', 'category']},
+        'interpro_interpro2go_covering_index': {'table_name': 'interpro_interpro2go', 'column_list': ['interpro_id', 'go_id', 'go_desc']},
+        'go_cross_references_covering_index': {'table_name': 'go_cross_references', 'column_list': ['go_id', 'go_term', 'external_db', 'external_id', 'external_desc']},
+        }
+
+#-------------------------------------------------------------------------------
+
+def is_object_found(conn, object_type, object_name):
+    '''
+    Check if an object (table or index) exists in the database.
+    '''
+
+    # check if the object exists
+    sentence = '''
+               SELECT EXISTS
+                   (SELECT 1
+                       FROM sqlite_master
+                       WHERE type = ?
+                         AND name = ?
+                       LIMIT 1);
+               '''
+    try:
+        rows = conn.execute(sentence, (object_type, object_name))
+    except Exception as e:
+        raise xlib.ProgramException('B002', e, sentence, conn)
+
+    # get the control value
+    for row in rows:
+        control = int(row[0])
+        break
+
+    # return the control value
+    return control == 1
+
+#-------------------------------------------------------------------------------
+
+def get_obsolete_index_list():
+    '''
+    Get the list of the indexes recommended in previous versions that have to be dropped.
+    '''
+
+    return ['blast_covering_index']
+
+#-------------------------------------------------------------------------------
+
+def get_missing_recommended_index_list(conn, table_name_list=None):
+    '''
+    Get the list of recommended indexes (of the tables of a list or of all tables) that do not exist
+    in the database when their table exists.
+    '''
+
+    # initialize the missing index list
+    missing_index_list = []
+
+    # check each recommended index
+    for (index_name, index_data) in get_recommended_index_dict().items():
+        if table_name_list is not None and index_data['table_name'] not in table_name_list:
+            continue
+        if is_object_found(conn, 'table', index_data['table_name']) and not is_object_found(conn, 'index', index_name):
+            missing_index_list.append(index_name)
+
+    # return the missing index list
+    return missing_index_list
+
+#-------------------------------------------------------------------------------
+
+def create_recommended_indexes(conn):
+    '''
+    Create the recommended indexes (if they do not exist) of the existing tables, drop the obsolete ones
+    and analyze the database.
+    '''
+
+    # drop the obsolete indexes
+    for index_name in get_obsolete_index_list():
+        if is_object_found(conn, 'index', index_name):
+            xlib.Message.print('verbose', f'Dropping the obsolete index {index_name} ...\n')
+            sentence = f'''
+                        DROP INDEX IF EXISTS {index_name};
+                        '''
+            try:
+                conn.execute(sentence)
+            except Exception as e:
+                raise xlib.ProgramException('B002', e, sentence, conn)
+            xlib.Message.print('verbose', 'The index is dropped.\n')
+
+    # create the recommended indexes of the existing tables
+    for (index_name, index_data) in get_recommended_index_dict().items():
+        if is_object_found(conn, 'table', index_data['table_name']):
+            xlib.Message.print('verbose', f'Creating the index {index_name} on the table "{index_data["table_name"]}" (if it does not exist) ...\n')
+            sentence = f'''
+                        CREATE INDEX IF NOT EXISTS {index_name}
+                            ON {index_data['table_name']} ({', '.join(index_data['column_list'])});
+                        '''
+            try:
+                conn.execute(sentence)
+            except Exception as e:
+                raise xlib.ProgramException('B002', e, sentence, conn)
+            xlib.Message.print('verbose', 'The index is created.\n')
+
+    # gather the statistics used by the query planner
+    xlib.Message.print('verbose', 'Analyzing the database ...\n')
+    sentence = 'ANALYZE'
+    try:
+        conn.execute(sentence)
+    except Exception as e:
+        raise xlib.ProgramException('B002', e, sentence, conn)
+    xlib.Message.print('verbose', 'The database is analyzed.\n')
+
+    # save changes into the database
+    conn.commit()
+
+#-------------------------------------------------------------------------------
+# deferred indexes
+#-------------------------------------------------------------------------------
+
+def drop_table_indexes(conn, table_name):
+    '''
+    Drop the indexes of a table and return the sentences to create them again
+    (the indexes automatically created by SQLite are not dropped).
+    '''
+
+    # initialize the index sentence list
+    index_sentence_list = []
+
+    # get the indexes of the table
+    sentence = '''
+               SELECT name, sql
+                   FROM sqlite_master
+                   WHERE type = 'index'
+                     AND tbl_name = ?
+                     AND sql IS NOT NULL
+                   ORDER BY name;
+               '''
+    try:
+        rows = conn.execute(sentence, (table_name,)).fetchall()
+    except Exception as e:
+        raise xlib.ProgramException('B002', e, sentence, conn)
+
+    # drop each index
+    for row in rows:
+        sentence = f'DROP INDEX IF EXISTS {row[0]}'
+        try:
+            conn.execute(sentence)
+        except Exception as e:
+            raise xlib.ProgramException('B002', e, sentence, conn)
+        index_sentence_list.append(row[1])
+
+    # return the index sentence list
+    return index_sentence_list
+
+#-------------------------------------------------------------------------------
+
+def create_table_indexes(conn, index_sentence_list):
+    '''
+    Create the indexes dropped by drop_table_indexes.
+    '''
+
+    for sentence in index_sentence_list:
+        try:
+            conn.execute(sentence)
+        except Exception as e:
+            raise xlib.ProgramException('B002', e, sentence, conn)
+
+#-------------------------------------------------------------------------------
+# bulk insert
+#-------------------------------------------------------------------------------
+
+def get_column_list(conn, table_name):
+    '''
+    Get the column name list of a table.
+    '''
+
+    # initialize the column list
+    column_list = []
+
+    # select the column data of the table
+    sentence = f'''
+                PRAGMA table_info({table_name});
+                '''
+    try:
+        rows = conn.execute(sentence)
+    except Exception as e:
+        raise xlib.ProgramException('B002', e, sentence, conn)
+
+    # add the column names to the list
+    for row in rows:
+        column_list.append(row[1])
+
+    # return the column list
+    return column_list
+
+#-------------------------------------------------------------------------------
+
+def insert_rows(conn, table_name, column_list, row_list):
+    '''
+    Insert a row list (tuples with the values of the column list) into a table using bound parameters.
+    '''
+
+    sentence = f'''
+                INSERT INTO {table_name}
+                    ({', '.join(column_list)})
+                    VALUES ({', '.join(['?'] * len(column_list))});
+                '''
+    try:
+        conn.executemany(sentence, row_list)
+    except Exception as e:
+        raise xlib.ProgramException('B002', e, sentence, conn)
+
+#-------------------------------------------------------------------------------
+
+class BatchInserter():
+    '''
+    This class inserts rows into a table in batches of bound parameters, each batch inside an explicit transaction.
+    '''
+
+    #---------------
+
+    def __init__(self, conn, table_name, batch_size=None):
+
+        self.conn = conn
+        self.table_name = table_name
+        self.column_list = get_column_list(conn, table_name)
+        self.batch_size = xlib.Const.DEFAULT_INSERT_BATCH_SIZE if batch_size is None else batch_size
+        self.row_list = []
+        self.inserted_row_counter = 0
+
+    #---------------
+
+    def add_row(self, row):
+        '''
+        Add a row (a tuple with the values of the table columns or a dictionary with the column names as keys) to the batch.
+        '''
+
+        # convert the row dictionary to a tuple
+        if isinstance(row, dict):
+            row = tuple([row[column] for column in self.column_list])
+
+        # add the row to the batch and insert the batch when it is full
+        self.row_list.append(row)
+        if len(self.row_list) >= self.batch_size:
+            self.flush()
+
+    #---------------
+
+    def flush(self):
+        '''
+        Insert the rows of the batch and save changes into the database.
+        '''
+
+        if self.row_list != []:
+
+            # begin an explicit transaction (if there is not one in progress)
+            if not self.conn.in_transaction:
+                sentence = 'BEGIN'
+                try:
+                    self.conn.execute(sentence)
+                except Exception as e:
+                    raise xlib.ProgramException('B002', e, sentence, self.conn)
+
+            # insert the rows
+            insert_rows(self.conn, self.table_name, self.column_list, self.row_list)
+            self.inserted_row_counter += len(self.row_list)
+            self.row_list = []
+
+            # save changes into the database
+            self.conn.commit()
+
+    #---------------
+
+#-------------------------------------------------------------------------------
+# temporary table "id_list"
+#-------------------------------------------------------------------------------
+
+def load_id_list(conn, id_list):
+    '''
+    Load an identification list into the temporary table "id_list" (it is used to join batch queries).
+    '''
+
+    # disable the query-only guard while the temporary table is loaded
+    set_query_only(conn, False)
+
+    # create the temporary table "id_list" (if it does not exist)
+    sentence = '''
+               CREATE TEMP TABLE IF NOT EXISTS id_list (
+                   id PRIMARY KEY);
+               '''
+    try:
+        conn.execute(sentence)
+    except Exception as e:
+        raise xlib.ProgramException('B002', e, sentence, conn)
+
+    # delete the identifications of the previous batch
+    sentence = '''
+               DELETE FROM temp.id_list;
+               '''
+    try:
+        conn.execute(sentence)
+    except Exception as e:
+        raise xlib.ProgramException('B002', e, sentence, conn)
+
+    # insert the identifications using bound parameters
+    sentence = '''
+               INSERT OR IGNORE INTO temp.id_list (id)
+                   VALUES (?);
+               '''
+    try:
+        conn.executemany(sentence, [(id,) for id in id_list])
+    except Exception as e:
+        raise xlib.ProgramException('B002', e, sentence, conn)
+
+    # enable again the query-only guard
+    set_query_only(conn, True)
+
 #-------------------------------------------------------------------------------
 # table "blast"
 #-------------------------------------------------------------------------------
@@ -134,13 +565,13 @@ def insert_blast_row(conn, row_dict):
     Insert a row into table "blast"
     '''
 
-    sentence = f'''
-                INSERT INTO blast
-                    (dataset_id, iteration_iter_num, iteration_query_def, hit_num, hit_id, hit_def, hit_accession, hsp_num, hsp_evalue, hsp_identity, hsp_positive, hsp_gaps, hsp_align_len, hsp_qseq)
-                    VALUES ('{row_dict["dataset_id"]}', '{row_dict["iteration_iter_num"]}', '{row_dict["iteration_query_def"]}', '{row_dict["hit_num"]}', '{row_dict["hit_id"]}', '{row_dict["hit_def"]}', '{row_dict["hit_accession"]}', '{row_dict["hsp_num"]}', '{row_dict["hsp_evalue"]}', '{row_dict["hsp_identity"]}', '{row_dict["hsp_positive"]}', '{row_dict["hsp_gaps"]}', '{row_dict["hsp_align_len"]}', '{row_dict["hsp_qseq"]}')
-                '''
+    sentence = '''
+               INSERT INTO blast
+                   (dataset_id, iteration_iter_num, iteration_query_def, hit_num, hit_id, hit_def, hit_accession, hsp_num, hsp_evalue, hsp_identity, hsp_positive, hsp_gaps, hsp_align_len, hsp_qseq)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?);
+               '''
     try:
-        conn.execute(sentence)
+        conn.execute(sentence, (row_dict['dataset_id'], row_dict['iteration_iter_num'], row_dict['iteration_query_def'], row_dict['hit_num'], row_dict['hit_id'], row_dict['hit_def'], row_dict['hit_accession'], row_dict['hsp_num'], row_dict['hsp_evalue'], row_dict['hsp_identity'], row_dict['hsp_positive'], row_dict['hsp_gaps'], row_dict['hsp_align_len'], row_dict['hsp_qseq']))
     except Exception as e:
         raise xlib.ProgramException('B002', e, sentence, conn)
 
@@ -162,6 +593,27 @@ def delete_blast_rows(conn, dataset_id):
 
 #-------------------------------------------------------------------------------
 
+def delete_blast_query_rows(conn, dataset_id, query_def_list):
+    '''
+    Delete rows from table "blast" corresponding to the dataset identification and a list of query sequence identifications
+    '''
+
+    # load the query sequence identifications in the temporary table "id_list"
+    load_id_list(conn, query_def_list)
+
+    # delete the rows
+    sentence = '''
+               DELETE FROM blast
+                   WHERE dataset_id = ?
+                     AND iteration_query_def IN (SELECT id FROM temp.id_list);
+               '''
+    try:
+        conn.execute(sentence, (dataset_id,))
+    except Exception as e:
+        raise xlib.ProgramException('B002', e, sentence, conn)
+
+#-------------------------------------------------------------------------------
+
 def get_blast_dict(conn, dataset_id, x_seq_id):
     '''
     Get a dictionary of data alignments corresponding to rows with a dataset identification and a sequence identification
@@ -194,6 +646,41 @@ def get_blast_dict(conn, dataset_id, x_seq_id):
     # return the blast dictionary
     return blast_dict
 
+#-------------------------------------------------------------------------------
+
+def get_blast_batch_dict(conn, dataset_id, x_seq_id_list):
+    '''
+    Get a dictionary of blast dictionaries corresponding to rows with a dataset identification and a sequence identification list
+    (nt_seq_id in nucleotide pipeline or aa_seq_id in amino acid pipeline) from the table "blast"
+    '''
+
+    # initialize the blast batch dictionary
+    blast_batch_dict = {}
+
+    # load the sequence identification list into the temporary table "id_list"
+    load_id_list(conn, x_seq_id_list)
+
+    # select rows from the table "blast" corresponding to the iteration_query_def list
+    sentence = '''
+               SELECT iteration_query_def, iteration_iter_num, hit_num, hit_id, hit_def, hit_accession, hsp_num, hsp_evalue, hsp_identity, hsp_positive, hsp_gaps, hsp_align_len, hsp_qseq
+                   FROM blast
+                   WHERE dataset_id = ?
+                     AND iteration_query_def IN (SELECT id FROM temp.id_list)
+                   ORDER BY iteration_query_def, rowid;
+               '''
+    try:
+        rows = conn.execute(sentence, (dataset_id,))
+    except Exception as e:
+        raise xlib.ProgramException('B002', e, sentence, conn)
+
+    # add hit-hsp data to the blast dictionary of each sequence identification
+    for row in rows:
+        blast_dict = blast_batch_dict.setdefault(row[0], {})
+        blast_dict[len(blast_dict)] = {'iteration_iter_num':row[1], 'hit_num':row[2], 'hit_id':row[3], 'hit_def':row[4], 'hit_accession':row[5], 'hsp_num':row[6], 'hsp_evalue':float(row[7]), 'hsp_identity':int(row[8]), 'hsp_positive':int(row[9]), 'hsp_gaps':int(row[10]), 'hsp_align_len':int(row[11]), 'hsp_qseq':row[12]}
+
+    # return the blast batch dictionary
+    return blast_batch_dict
+
 #-------------------------------------------------------------------------------
 # table "datasets"
 #-------------------------------------------------------------------------------
@@ -253,13 +740,13 @@ def insert_datasets_row(conn, row_dict):
     Insert a row into table "datasets"
     '''
 
-    sentence = f'''
-                INSERT INTO datasets
-                    (dataset_id, dataset_name, repository_id, ftp_adress)
-                    VALUES ('{row_dict["dataset_id"]}', '{row_dict["dataset_name"]}', '{row_dict["repository_id"]}', '{row_dict["ftp_adress"]}');
-                '''
+    sentence = '''
+               INSERT INTO datasets
+                   (dataset_id, dataset_name, repository_id, ftp_adress)
+                   VALUES (?, ?, ?, ?);
+               '''
     try:
-        conn.execute(sentence)
+        conn.execute(sentence, (row_dict['dataset_id'], row_dict['dataset_name'], row_dict['repository_id'], row_dict['ftp_adress']))
     except Exception as e:
         raise xlib.ProgramException('B002', e, sentence, conn)
 
@@ -453,13 +940,13 @@ def insert_ec_ids_row(conn, row_dict):
     Insert a row into table "ec_ids"
     '''
 
-    sentence = f'''
-                INSERT INTO ec_ids
-                    (ec_id, desc)
-                    VALUES ('{row_dict["ec_id"]}', '{row_dict["desc"]}');
-                '''
+    sentence = '''
+               INSERT INTO ec_ids
+                   (ec_id, desc)
+                   VALUES (?, ?);
+               '''
     try:
-        conn.execute(sentence)
+        conn.execute(sentence, (row_dict['ec_id'], row_dict['desc']))
     except Exception as e:
         raise xlib.ProgramException('B002', e, sentence, conn)
 
@@ -590,13 +1077,13 @@ def insert_genomic_features_row(conn, row_dict):
     Insert a row into table "genomic_features".
     '''
 
-    sentence = f'''
-                INSERT INTO genomic_features
-                    (species_name, seq_id, start, end, type, gene_id, genbank_id, gene, protein_id, transcript_id, product)
-                    VALUES ('{row_dict["species_name"]}', '{row_dict["seq_id"]}', {row_dict["start"]}, {row_dict["end"]}, '{row_dict["type"]}', '{row_dict["gene_id"]}', '{row_dict["genbank_id"]}', '{row_dict["gene"]}', '{row_dict["protein_id"]}', '{row_dict["transcript_id"]}', '{row_dict["product"]}');
-                '''
+    sentence = '''
+               INSERT INTO genomic_features
+                   (species_name, seq_id, start, end, type, gene_id, genbank_id, gene, protein_id, transcript_id, product)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?);
+               '''
     try:
-        conn.execute(sentence)
+        conn.execute(sentence, (row_dict['species_name'], row_dict['seq_id'], row_dict['start'], row_dict['end'], row_dict['type'], row_dict['gene_id'], row_dict['genbank_id'], row_dict['gene'], row_dict['protein_id'], row_dict['transcript_id'], row_dict['product']))
     except Exception as e:
         raise xlib.ProgramException('B002', e, sentence, conn)
 
@@ -759,13 +1246,13 @@ def insert_go_ontology_row(conn, row_dict):
     Insert a row into table "go_ontology".
     '''
 
-    sentence = f'''
-                INSERT INTO go_ontology
-                    (go_id, go_name, namespace)
-                    VALUES ('{row_dict["go_id"]}', '{row_dict["go_name"]}', '{row_dict["namespace"]}');
-                '''
+    sentence = '''
+               INSERT INTO go_ontology
+                   (go_id, go_name, namespace)
+                   VALUES (?, ?, ?);
+               '''
     try:
-        conn.execute(sentence)
+        conn.execute(sentence, (row_dict['go_id'], row_dict['go_name'], row_dict['namespace']))
     except Exception as e:
         raise xlib.ProgramException('B002', e, sentence, conn)
 
@@ -912,13 +1399,13 @@ def insert_go_cross_references_row(conn, row_dict):
     Insert a row into table "go_cross_references".
     '''
 
-    sentence = f'''
-                INSERT INTO go_cross_references
-                    (go_id, go_term, external_db, external_id, external_desc)
-                    VALUES ('{row_dict["go_id"]}', '{row_dict["go_term"]}', '{row_dict["external_db"]}', '{row_dict["external_id"]}', '{row_dict["external_desc"]}');
-                '''
+    sentence = '''
+               INSERT INTO go_cross_references
+                   (go_id, go_term, external_db, external_id, external_desc)
+                   VALUES (?, ?, ?, ?, ?);
+               '''
     try:
-        conn.execute(sentence)
+        conn.execute(sentence, (row_dict['go_id'], row_dict['go_term'], row_dict['external_db'], row_dict['external_id'], row_dict['external_desc']))
     except Exception as e:
         raise xlib.ProgramException('B002', e, sentence, conn)
 
@@ -1012,23 +1499,131 @@ def get_cross_references_dict(conn, go_id_list, external_db):
     return cross_references_dict
 
 #-------------------------------------------------------------------------------
-# table "interpro_interpro2go"
-#-------------------------------------------------------------------------------
 
-def drop_interpro_interpro2go(conn):
+def get_cross_references_batch_dict(conn, go_id_list):
     '''
-    Drop the table "interpro_interpro2go" (if it exists).
+    Get a dictionary of cross_references lists corresponding to rows with a Gene Ontology identification list from the table "go_cross_references".
     '''
 
+    # initialize the cross_references batch dictionary
+    cross_references_batch_dict = {}
+
+    # load the Gene Ontology identification list into the temporary table "id_list"
+    load_id_list(conn, go_id_list)
+
+    # select rows from the table "go_cross_references"
     sentence = '''
-               DROP TABLE IF EXISTS interpro_interpro2go;
+               SELECT go_id, go_term, external_db, external_id, external_desc
+                   FROM go_cross_references
+                   WHERE go_id IN (SELECT id FROM temp.id_list)
+                   ORDER BY go_id, rowid;
                '''
     try:
-        conn.execute(sentence)
+        rows = conn.execute(sentence)
     except Exception as e:
         raise xlib.ProgramException('B002', e, sentence, conn)
 
-#-------------------------------------------------------------------------------
+    # add cross references data to the list of each Gene Ontology identification
+    for row in rows:
+        cross_references_batch_dict.setdefault(row[0], []).append({'go_id':row[0], 'go_term':row[1], 'external_db':row[2], 'external_id':row[3], 'external_desc':row[4]})
+
+    # return the cross references batch dictionary
+    return cross_references_batch_dict
+
+#-------------------------------------------------------------------------------
+
+class GoCrossReferenceResolver():
+    '''
+    This class resolves the cross references of Gene Ontology identification lists keeping in memory
+    the rows of each Gene Ontology identification grouped by external database and the result
+    of each Gene Ontology identification set, so all external databases are answered in one lookup.
+    '''
+
+    #---------------
+
+    def __init__(self, conn):
+
+        self.conn = conn
+        self.go_external_db_dict = {}
+        self.go_id_set_dict = {}
+
+    #---------------
+
+    def add_go_id_list(self, go_id_list):
+        '''
+        Load the cross references of the Gene Ontology identifications of a list that are not in memory yet.
+        '''
+
+        # get the Gene Ontology identifications not loaded
+        new_go_id_list = sorted({go_id for go_id in go_id_list if go_id not in self.go_external_db_dict})
+
+        # load their cross references grouped by external database (an empty dictionary when there are not cross references)
+        if new_go_id_list != []:
+            cross_references_batch_dict = get_cross_references_batch_dict(self.conn, new_go_id_list)
+            for go_id in new_go_id_list:
+                external_db_dict = {}
+                for row_dict in cross_references_batch_dict.get(go_id, []):
+                    external_db_dict.setdefault(row_dict['external_db'], []).append(row_dict)
+                self.go_external_db_dict[go_id] = external_db_dict
+
+    #---------------
+
+    def get_item_dicts(self, go_id_list):
+        '''
+        Get a dictionary with the cross references dictionary of each external database corresponding to a Gene Ontology identification list
+        (each cross references dictionary has the rows in the same order and without duplicates as in get_cross_references_dict).
+        '''
+
+        # get the Gene Ontology identification set
+        go_id_set = frozenset(go_id_list)
+
+        # return the result of the set if it was previously resolved
+        item_dicts = self.go_id_set_dict.get(go_id_set)
+        if item_dicts is not None:
+            return item_dicts
+
+        # load the cross references of the Gene Ontology identifications not loaded
+        self.add_go_id_list(go_id_set)
+
+        # build the cross references dictionary of each external database
+        item_dicts = {}
+        row_set_dict = {}
+        for go_id in sorted(go_id_set):
+            for (external_db, row_dict_list) in self.go_external_db_dict[go_id].items():
+                cross_references_dict = item_dicts.setdefault(external_db, {})
+                row_set = row_set_dict.setdefault(external_db, set())
+                for row_dict in row_dict_list:
+                    row = (row_dict['go_id'], row_dict['go_term'], row_dict['external_db'], row_dict['external_id'], row_dict['external_desc'])
+                    if row not in row_set:
+                        row_set.add(row)
+                        cross_references_dict[len(cross_references_dict)] = row_dict
+
+        # save the result of the set
+        self.go_id_set_dict[go_id_set] = item_dicts
+
+        # return the dictionary of cross references dictionaries
+        return item_dicts
+
+    #---------------
+
+#-------------------------------------------------------------------------------
+# table "interpro_interpro2go"
+#-------------------------------------------------------------------------------
+
+def drop_interpro_interpro2go(conn):
+    '''
+    Drop the table "interpro_interpro2go" (if it exists).
+    '''
+
+    sentence = '''
+               DROP TABLE IF EXISTS interpro_interpro2go;
+               '''
+    try:
+        conn.execute(sentence)
+    except Exception as e:
+        raise xlib.ProgramException('B002', e, sentence, conn)
+
+#-------------------------------------------------------------------------------
 
 def create_interpro_interpro2go(conn):
     '''
@@ -1086,13 +1681,13 @@ def insert_interpro_interpro2go_row(conn, row_dict):
     Insert a row into table "interpro_interpro2go".
     '''
 
-    sentence = f'''
-                INSERT INTO interpro_interpro2go
-                    (interpro_id, interpro_desc, go_desc, go_id)
-                    VALUES ('{row_dict["interpro_id"]}', '{row_dict["interpro_desc"]}', '{row_dict["go_desc"]}', '{row_dict["go_id"]}');
-                '''
+    sentence = '''
+               INSERT INTO interpro_interpro2go
+                   (interpro_id, interpro_desc, go_desc, go_id)
+                   VALUES (?, ?, ?, ?);
+               '''
     try:
-        conn.execute(sentence)
+        conn.execute(sentence, (row_dict['interpro_id'], row_dict['interpro_desc'], row_dict['go_desc'], row_dict['go_id']))
     except Exception as e:
         raise xlib.ProgramException('B002', e, sentence, conn)
 
@@ -1178,6 +1773,44 @@ def get_interpro2go_dict(conn, interpro_id):
     # return the gene2go dictionary
     return interpro2go_dict
 
+#-------------------------------------------------------------------------------
+
+def get_interpro2go_batch_dict(conn, interpro_id_list):
+    '''
+    Get a dictionary of interpro2go dictionaries corresponding to rows with a InterPro identification list from the table "interpro_interpro2go".
+    '''
+
+    # initialize the interpro2go batch dictionary
+    interpro2go_batch_dict = {}
+
+    # initialize the set of rows already added
+    row_set = set()
+
+    # load the identification list into the temporary table "id_list"
+    load_id_list(conn, interpro_id_list)
+
+    # select rows from the table "interpro_interpro2go"
+    sentence = '''
+               SELECT interpro_id, go_id, go_desc
+                   FROM interpro_interpro2go
+                   WHERE interpro_id IN (SELECT id FROM temp.id_list)
+                   ORDER BY interpro_id, go_id, rowid;
+               '''
+    try:
+        rows = conn.execute(sentence)
+    except Exception as e:
+        raise xlib.ProgramException('B002', e, sentence, conn)
+
+    # add annotation data without duplicates to the dictionary of each identification
+    for row in rows:
+        if row not in row_set:
+            row_set.add(row)
+            interpro2go_dict = interpro2go_batch_dict.setdefault(row[0], {})
+            interpro2go_dict[len(interpro2go_dict)] = {'go_id':row[1], 'go_desc':row[2]}
+
+    # return the interpro2go batch dictionary
+    return interpro2go_batch_dict
+
 #-------------------------------------------------------------------------------
 # table "ncbi_gene2go"
 #-------------------------------------------------------------------------------
@@ -1238,13 +1871,13 @@ def insert_ncbi_gene2go_row(conn, row_dict):
     Insert a row into table "ncbi_gene2go".
     '''
 
-    sentence = f'''
-                INSERT INTO ncbi_gene2go
-                    (gene_id, go_id, evidence, go_term, category)
-                    VALUES ({row_dict["gene_id"]}, '{row_dict["go_id"]}', '{row_dict["evidence"]}', '{row_dict["go_term"]}', '{row_dict["category"]}');
-                '''
+    sentence = '''
+               INSERT INTO ncbi_gene2go
+                   (gene_id, go_id, evidence, go_term, category)
+                   VALUES (?, ?, ?, ?, ?);
+               '''
     try:
-        conn.execute(sentence)
+        conn.execute(sentence, (row_dict['gene_id'], row_dict['go_id'], row_dict['evidence'], row_dict['go_term'], row_dict['category']))
     except Exception as e:
         raise xlib.ProgramException('B002', e, sentence, conn)
 
@@ -1329,6 +1962,44 @@ def get_gene2go_dict(conn, gene_id):
     # return the gene2go dictionary
     return gene2go_dict
 
+#-------------------------------------------------------------------------------
+
+def get_gene2go_batch_dict(conn, gene_id_list):
+    '''
+    Get a dictionary of gene2go dictionaries corresponding to rows with a gene identification list from the table "ncbi_gene2go".
+    '''
+
+    # initialize the gene2go batch dictionary
+    gene2go_batch_dict = {}
+
+    # initialize the set of rows already added
+    row_set = set()
+
+    # load the identification list into the temporary table "id_list"
+    load_id_list(conn, gene_id_list)
+
+    # select rows from the table "ncbi_gene2go"
+    sentence = '''
+               SELECT gene_id, go_id, evidence, go_term, category
+                   FROM ncbi_gene2go
+                   WHERE gene_id IN (SELECT id FROM temp.id_list)
+                   ORDER BY gene_id, rowid;
+               '''
+    try:
+        rows = conn.execute(sentence)
+    except Exception as e:
+        raise xlib.ProgramException('B002', e, sentence, conn)
+
+    # add annotation data without duplicates to the dictionary of each identification
+    for row in rows:
+        if row not in row_set:
+            row_set.add(row)
+            gene2go_dict = gene2go_batch_dict.setdefault(row[0], {})
+            gene2go_dict[len(gene2go_dict)] = {'gene_id':row[0], 'go_id':row[1], 'evidence':row[2], 'go_term':row[3], 'category':row[4]}
+
+    # return the gene2go batch dictionary
+    return gene2go_batch_dict
+
 #-------------------------------------------------------------------------------
 # table "kegg_ids"
 #-------------------------------------------------------------------------------
@@ -1387,13 +2058,13 @@ def insert_kegg_ids_row(conn, row_dict):
     Insert a row into table "kegg_ids"
     '''
 
-    sentence = f'''
-                INSERT INTO kegg_ids
-                    (kegg_id, desc, ec_id)
-                    VALUES ('{row_dict["kegg_id"]}', '{row_dict["desc"]}', '{row_dict["ec_id"]}');
-                '''
+    sentence = '''
+               INSERT INTO kegg_ids
+                   (kegg_id, desc, ec_id)
+                   VALUES (?, ?, ?);
+               '''
     try:
-        conn.execute(sentence)
+        conn.execute(sentence, (row_dict['kegg_id'], row_dict['desc'], row_dict['ec_id']))
     except Exception as e:
         raise xlib.ProgramException('B002', e, sentence, conn)
 
@@ -1534,13 +2205,13 @@ def insert_ncbi_gene2refseq_row(conn, row_dict):
     Insert a row into table "ncbi_gene2refseq".
     '''
 
-    sentence = f'''
-                INSERT INTO ncbi_gene2refseq
-                    (gene_id, status, rna_nucleotide_accession, protein_accession, genomic_nucleotide_accession, gene_symbol)
-                    VALUES ({row_dict["gene_id"]}, '{row_dict["status"]}', '{row_dict["rna_nucleotide_accession"]}', '{row_dict["protein_accession"]}', '{row_dict["genomic_nucleotide_accession"]}', '{row_dict["gene_symbol"]}');
-                '''
+    sentence = '''
+               INSERT INTO ncbi_gene2refseq
+                   (gene_id, status, rna_nucleotide_accession, protein_accession, genomic_nucleotide_accession, gene_symbol)
+                   VALUES (?, ?, ?, ?, ?, ?);
+               '''
     try:
-        conn.execute(sentence)
+        conn.execute(sentence, (row_dict['gene_id'], row_dict['status'], row_dict['rna_nucleotide_accession'], row_dict['protein_accession'], row_dict['genomic_nucleotide_accession'], row_dict['gene_symbol']))
     except Exception as e:
         raise xlib.ProgramException('B002', e, sentence, conn)
 
@@ -1625,6 +2296,44 @@ def get_gene2refseq_dict(conn, protein_accession):
     # return the gene2refseq dictionary
     return gene2refseq_dict
 
+#-------------------------------------------------------------------------------
+
+def get_gene2refseq_batch_dict(conn, protein_accession_list):
+    '''
+    Get a dictionary of gene2refseq dictionaries corresponding to rows with a protein accesion list from the table "ncbi_gene2refseq".
+    '''
+
+    # initialize the gene2refseq batch dictionary
+    gene2refseq_batch_dict = {}
+
+    # initialize the set of rows already added
+    row_set = set()
+
+    # load the identification list into the temporary table "id_list"
+    load_id_list(conn, protein_accession_list)
+
+    # select rows from the table "ncbi_gene2refseq"
+    sentence = '''
+               SELECT protein_accession, gene_id, status, rna_nucleotide_accession, genomic_nucleotide_accession, gene_symbol
+                   FROM ncbi_gene2refseq
+                   WHERE protein_accession IN (SELECT id FROM temp.id_list)
+                   ORDER BY protein_accession, rowid;
+               '''
+    try:
+        rows = conn.execute(sentence)
+    except Exception as e:
+        raise xlib.ProgramException('B002', e, sentence, conn)
+
+    # add annotation data without duplicates to the dictionary of each identification
+    for row in rows:
+        if row not in row_set:
+            row_set.add(row)
+            gene2refseq_dict = gene2refseq_batch_dict.setdefault(row[0], {})
+            gene2refseq_dict[len(gene2refseq_dict)] = {'gene_id':row[1], 'status':row[2], 'rna_nucleotide_accession':row[3], 'genomic_nucleotide_accession':row[4], 'gene_symbol':row[5]}
+
+    # return the gene2refseq batch dictionary
+    return gene2refseq_batch_dict
+
 #-------------------------------------------------------------------------------
 # table "plaza_gene_description"
 #-------------------------------------------------------------------------------
@@ -1670,13 +2379,13 @@ def insert_plaza_gene_description_row(conn, row_dict):
     Insert a row into table "plaza_gene_description".
     '''
 
-    sentence = f'''
-                INSERT INTO plaza_gene_description
-                    (dataset_id, gene_id, plaza_species_id, desc_type, desc)
-                    VALUES ('{row_dict["dataset_id"]}', '{row_dict["gene_id"]}', '{row_dict["plaza_species_id"]}', '{row_dict["desc_type"]}', '{row_dict["desc"]}');
-                '''
+    sentence = '''
+               INSERT INTO plaza_gene_description
+                   (dataset_id, gene_id, plaza_species_id, desc_type, desc)
+                   VALUES (?, ?, ?, ?, ?);
+               '''
     try:
-        conn.execute(sentence)
+        conn.execute(sentence, (row_dict['dataset_id'], row_dict['gene_id'], row_dict['plaza_species_id'], row_dict['desc_type'], row_dict['desc']))
     except Exception as e:
         raise xlib.ProgramException('B002', e, sentence, conn)
 
@@ -1837,13 +2546,13 @@ def insert_plaza_go_row(conn, row_dict):
     Insert a row into table "plaza_go".
     '''
 
-    sentence = f'''
-                INSERT INTO plaza_go
-                    (dataset_id, id, plaza_species_id, gene_id, go_id, evidence, desc)
-                    VALUES ('{row_dict["dataset_id"]}', '{row_dict["id"]}', '{row_dict["plaza_species_id"]}', '{row_dict["gene_id"]}', '{row_dict["go_id"]}', '{row_dict["evidence"]}', '{row_dict["desc"]}');
-                '''
+    sentence = '''
+               INSERT INTO plaza_go
+                   (dataset_id, id, plaza_species_id, gene_id, go_id, evidence, desc)
+                   VALUES (?, ?, ?, ?, ?, ?, ?);
+               '''
     try:
-        conn.execute(sentence)
+        conn.execute(sentence, (row_dict['dataset_id'], row_dict['id'], row_dict['plaza_species_id'], row_dict['gene_id'], row_dict['go_id'], row_dict['evidence'], row_dict['desc']))
     except Exception as e:
         raise xlib.ProgramException('B002', e, sentence, conn)
 
@@ -1954,6 +2663,45 @@ def get_go_dict(conn, dataset_id, gene_id):
     # return the Gene Ontology dictionary
     return go_dict
 
+#-------------------------------------------------------------------------------
+
+def get_go_batch_dict(conn, dataset_id, gene_id_list):
+    '''
+    Get a dictionary of Gene Ontology dictionaries corresponding to rows with a dataset identification and a gene identification list from the table "plaza_go".
+    '''
+
+    # initialize the Gene Ontology batch dictionary
+    go_batch_dict = {}
+
+    # initialize the set of rows already added
+    row_set = set()
+
+    # load the identification list into the temporary table "id_list"
+    load_id_list(conn, gene_id_list)
+
+    # select rows from the table "plaza_go"
+    sentence = '''
+               SELECT gene_id, plaza_species_id, go_id, evidence, desc
+                   FROM plaza_go
+                   WHERE dataset_id = ?
+                     AND gene_id IN (SELECT id FROM temp.id_list)
+                   ORDER BY gene_id, rowid;
+               '''
+    try:
+        rows = conn.execute(sentence, (dataset_id,))
+    except Exception as e:
+        raise xlib.ProgramException('B002', e, sentence, conn)
+
+    # add annotation data without duplicates to the dictionary of each identification
+    for row in rows:
+        if row not in row_set:
+            row_set.add(row)
+            go_dict = go_batch_dict.setdefault(row[0], {})
+            go_dict[len(go_dict)] = {'plaza_species_id':row[1], 'go_id':row[2], 'evidence':row[3], 'desc':row[4]}
+
+    # return the Gene Ontology batch dictionary
+    return go_batch_dict
+
 #-------------------------------------------------------------------------------
 # table "plaza_interpro"
 #-------------------------------------------------------------------------------
@@ -2005,13 +2753,13 @@ def insert_plaza_interpro_row(conn, row_dict):
     Insert a row into table "plaza_interpro".
     '''
 
-    sentence = f'''
-                INSERT INTO plaza_interpro
-                    (dataset_id, id, motif_id, plaza_species_id, gene_id, start, stop, score, source, domain_id, desc)
-                    VALUES ('{row_dict["dataset_id"]}', '{row_dict["id"]}', '{row_dict["motif_id"]}', '{row_dict["plaza_species_id"]}', '{row_dict["gene_id"]}', {row_dict["start"]}, {row_dict["stop"]}, {row_dict["score"]}, '{row_dict["source"]}', '{row_dict["domain_id"]}', '{row_dict["desc"]}');
-                '''
+    sentence = '''
+               INSERT INTO plaza_interpro
+                   (dataset_id, id, motif_id, plaza_species_id, gene_id, start, stop, score, source, domain_id, desc)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?);
+               '''
     try:
-        conn.execute(sentence)
+        conn.execute(sentence, (row_dict['dataset_id'], row_dict['id'], row_dict['motif_id'], row_dict['plaza_species_id'], row_dict['gene_id'], row_dict['start'], row_dict['stop'], row_dict['score'], row_dict['source'], row_dict['domain_id'], row_dict['desc']))
     except Exception as e:
         raise xlib.ProgramException('B002', e, sentence, conn)
 
@@ -2121,6 +2869,45 @@ def get_interpro_dict(conn, dataset_id, gene_id):
     # return the Interpro dictionary
     return interpro_dict
 
+#-------------------------------------------------------------------------------
+
+def get_interpro_batch_dict(conn, dataset_id, gene_id_list):
+    '''
+    Get a dictionary of InterPro dictionaries corresponding to rows with a dataset identification and a gene identification list from the table "plaza_interpro".
+    '''
+
+    # initialize the InterPro batch dictionary
+    interpro_batch_dict = {}
+
+    # initialize the set of rows already added
+    row_set = set()
+
+    # load the identification list into the temporary table "id_list"
+    load_id_list(conn, gene_id_list)
+
+    # select rows from the table "plaza_interpro"
+    sentence = '''
+               SELECT gene_id, plaza_species_id, motif_id, desc
+                   FROM plaza_interpro
+                   WHERE dataset_id = ?
+                     AND gene_id IN (SELECT id FROM temp.id_list)
+                   ORDER BY gene_id, rowid;
+               '''
+    try:
+        rows = conn.execute(sentence, (dataset_id,))
+    except Exception as e:
+        raise xlib.ProgramException('B002', e, sentence, conn)
+
+    # add annotation data without duplicates to the dictionary of each identification
+    for row in rows:
+        if row not in row_set:
+            row_set.add(row)
+            interpro_dict = interpro_batch_dict.setdefault(row[0], {})
+            interpro_dict[len(interpro_dict)] = {'plaza_species_id':row[1], 'motif_id':row[2], 'desc':row[3]}
+
+    # return the InterPro batch dictionary
+    return interpro_batch_dict
+
 #-------------------------------------------------------------------------------
 # table "plaza_mapman"
 #-------------------------------------------------------------------------------
@@ -2166,13 +2953,13 @@ def insert_plaza_mapman_row(conn, row_dict):
     Insert a row into table "plaza_mapman".
     '''
 
-    sentence = f'''
-                INSERT INTO plaza_mapman
-                    (dataset_id, plaza_species_id, gene_id, mapman_id, desc)
-                    VALUES ('{row_dict["dataset_id"]}', '{row_dict["plaza_species_id"]}', '{row_dict["gene_id"]}', '{row_dict["mapman_id"]}', '{row_dict["desc"]}');
-                '''
+    sentence = '''
+               INSERT INTO plaza_mapman
+                   (dataset_id, plaza_species_id, gene_id, mapman_id, desc)
+                   VALUES (?, ?, ?, ?, ?);
+               '''
     try:
-        conn.execute(sentence)
+        conn.execute(sentence, (row_dict['dataset_id'], row_dict['plaza_species_id'], row_dict['gene_id'], row_dict['mapman_id'], row_dict['desc']))
     except Exception as e:
         raise xlib.ProgramException('B002', e, sentence, conn)
 
@@ -2283,6 +3070,184 @@ def get_mapman_dict(conn, dataset_id, gene_id):
     # return the Gene Ontology dictionary
     return mapman_dict
 
+#-------------------------------------------------------------------------------
+
+def get_mapman_batch_dict(conn, dataset_id, gene_id_list):
+    '''
+    Get a dictionary of MapMan dictionaries corresponding to rows with a dataset identification and a gene identification list from the table "plaza_mapman".
+    '''
+
+    # initialize the MapMan batch dictionary
+    mapman_batch_dict = {}
+
+    # initialize the set of rows already added
+    row_set = set()
+
+    # load the identification list into the temporary table "id_list"
+    load_id_list(conn, gene_id_list)
+
+    # select rows from the table "plaza_mapman"
+    sentence = '''
+               SELECT gene_id, plaza_species_id, mapman_id, desc
+                   FROM plaza_mapman
+                   WHERE dataset_id = ?
+                     AND gene_id IN (SELECT id FROM temp.id_list)
+                   ORDER BY gene_id, rowid;
+               '''
+    try:
+        rows = conn.execute(sentence, (dataset_id,))
+    except Exception as e:
+        raise xlib.ProgramException('B002', e, sentence, conn)
+
+    # add annotation data without duplicates to the dictionary of each identification
+    for row in rows:
+        if row not in row_set:
+            row_set.add(row)
+            mapman_dict = mapman_batch_dict.setdefault(row[0], {})
+            mapman_dict[len(mapman_dict)] = {'plaza_species_id':row[1], 'mapman_id':row[2], 'desc':row[3]}
+
+    # return the MapMan batch dictionary
+    return mapman_batch_dict
+
+#-------------------------------------------------------------------------------
+# cache of tables "plaza_go", "plaza_interpro" and "plaza_mapman"
+#-------------------------------------------------------------------------------
+
+def get_plaza_gene_tuple_dict(conn, table_name, column_list, dataset_id):
+    '''
+    Get a dictionary with the row tuples (values of the column list) of each gene identification
+    corresponding to a dataset identification from a PLAZA table ("plaza_go", "plaza_interpro" or "plaza_mapman").
+    '''
+
+    # initialize the gene tuple dictionary
+    gene_tuple_dict = {}
+
+    # initialize the set of rows already added
+    row_set = set()
+
+    # select rows from the table
+    sentence = f'''
+                SELECT gene_id, {', '.join(column_list)}
+                    FROM {table_name}
+                    WHERE dataset_id = '{dataset_id}'
+                    ORDER BY gene_id, rowid;
+                '''
+    try:
+        rows = conn.execute(sentence)
+    except Exception as e:
+        raise xlib.ProgramException('B002', e, sentence, conn)
+
+    # add row tuples without duplicates to the list of each gene identification
+    for row in rows:
+        if row not in row_set:
+            row_set.add(row)
+            gene_tuple_dict.setdefault(row[0], []).append(row[1:])
+
+    # convert the lists to tuples
+    for gene_id in gene_tuple_dict.keys():
+        gene_tuple_dict[gene_id] = tuple(gene_tuple_dict[gene_id])
+
+    # return the gene tuple dictionary
+    return gene_tuple_dict
+
+#-------------------------------------------------------------------------------
+
+class PlazaAnnotationCache():
+    '''
+    This class gets the Gene Ontology, InterPro and MapMan data of PLAZA genes keeping them in memory:
+    all genes of the dataset are preloaded (mode "ALL") or the least recently used ones are discarded
+    when the cache is full (mode "LRU"); in mode "NONE", the tables are queried in every call.
+    '''
+
+    #---------------
+
+    GO_COLUMN_LIST = ['plaza_species_id', 'go_id', 'evidence', 'desc']
+    INTERPRO_COLUMN_LIST = ['plaza_species_id', 'motif_id', 'desc']
+    MAPMAN_COLUMN_LIST = ['plaza_species_id', 'mapman_id', 'desc']
+
+    #---------------
+
+    def __init__(self, conn, dataset_id, cache_mode, cache_size=None):
+
+        self.conn = conn
+        self.dataset_id = dataset_id
+        self.cache_mode = cache_mode
+        self.cache_size = xlib.Const.DEFAULT_CACHE_SIZE if cache_size is None else cache_size
+        self.gene_data_dict = collections.OrderedDict()
+        self.hit_counter = 0
+        self.miss_counter = 0
+
+        # preload the data of all genes of the dataset
+        if self.cache_mode == 'ALL':
+            go_tuple_dict = get_plaza_gene_tuple_dict(conn, 'plaza_go', self.GO_COLUMN_LIST, dataset_id)
+            interpro_tuple_dict = get_plaza_gene_tuple_dict(conn, 'plaza_interpro', self.INTERPRO_COLUMN_LIST, dataset_id)
+            mapman_tuple_dict = get_plaza_gene_tuple_dict(conn, 'plaza_mapman', self.MAPMAN_COLUMN_LIST, dataset_id)
+            for gene_id in set(go_tuple_dict.keys()) | set(interpro_tuple_dict.keys()) | set(mapman_tuple_dict.keys()):
+                self.gene_data_dict[gene_id] = (go_tuple_dict.get(gene_id, ()), interpro_tuple_dict.get(gene_id, ()), mapman_tuple_dict.get(gene_id, ()))
+
+    #---------------
+
+    def get_batch_dicts(self, gene_id_list):
+        '''
+        Get the Gene Ontology, InterPro and MapMan batch dictionaries of a gene identification list
+        with the same structure as get_go_batch_dict(), get_interpro_batch_dict() and get_mapman_batch_dict().
+        '''
+
+        # in mode "NONE", query the tables
+        if self.cache_mode == 'NONE':
+            self.miss_counter += len(gene_id_list)
+            go_batch_dict = get_go_batch_dict(self.conn, self.dataset_id, gene_id_list)
+            interpro_batch_dict = get_interpro_batch_dict(self.conn, self.dataset_id, gene_id_list)
+            mapman_batch_dict = get_mapman_batch_dict(self.conn, self.dataset_id, gene_id_list)
+            return go_batch_dict, interpro_batch_dict, mapman_batch_dict
+
+        # get the data of the genes found in the cache
+        # (in mode "ALL", a gene not found has not data in the dataset)
+        gene_data_dict = {}
+        missing_gene_id_list = []
+        for gene_id in gene_id_list:
+            gene_data = self.gene_data_dict.get(gene_id)
+            if gene_data is not None:
+                self.hit_counter += 1
+                self.gene_data_dict.move_to_end(gene_id)
+                gene_data_dict[gene_id] = gene_data
+            elif self.cache_mode == 'ALL':
+                self.hit_counter += 1
+            else:
+                self.miss_counter += 1
+                missing_gene_id_list.append(gene_id)
+
+        # in mode "LRU", query the tables for the genes not found in the cache, add their data to the cache and discard the least recently used ones
+        if missing_gene_id_list != []:
+            go_batch_dict = get_go_batch_dict(self.conn, self.dataset_id, missing_gene_id_list)
+            interpro_batch_dict = get_interpro_batch_dict(self.conn, self.dataset_id, missing_gene_id_list)
+            mapman_batch_dict = get_mapman_batch_dict(self.conn, self.dataset_id, missing_gene_id_list)
+            for gene_id in missing_gene_id_list:
+                go_tuple = tuple([tuple([row_dict[column] for column in self.GO_COLUMN_LIST]) for row_dict in go_batch_dict.get(gene_id, {}).values()])
+                interpro_tuple = tuple([tuple([row_dict[column] for column in self.INTERPRO_COLUMN_LIST]) for row_dict in interpro_batch_dict.get(gene_id, {}).values()])
+                mapman_tuple = tuple([tuple([row_dict[column] for column in self.MAPMAN_COLUMN_LIST]) for row_dict in mapman_batch_dict.get(gene_id, {}).values()])
+                gene_data_dict[gene_id] = (go_tuple, interpro_tuple, mapman_tuple)
+                self.gene_data_dict[gene_id] = gene_data_dict[gene_id]
+            while len(self.gene_data_dict) > self.cache_size:
+                self.gene_data_dict.popitem(last=False)
+
+        # build the batch dictionaries from the row tuples
+        go_batch_dict = {}
+        interpro_batch_dict = {}
+        mapman_batch_dict = {}
+        for (gene_id, (go_tuple, interpro_tuple, mapman_tuple)) in gene_data_dict.items():
+            if go_tuple != ():
+                go_batch_dict[gene_id] = {i:dict(zip(self.GO_COLUMN_LIST, row)) for (i, row) in enumerate(go_tuple)}
+            if interpro_tuple != ():
+                interpro_batch_dict[gene_id] = {i:dict(zip(self.INTERPRO_COLUMN_LIST, row)) for (i, row) in enumerate(interpro_tuple)}
+            if mapman_tuple != ():
+                mapman_batch_dict[gene_id] = {i:dict(zip(self.MAPMAN_COLUMN_LIST, row)) for (i, row) in enumerate(mapman_tuple)}
+
+        # return the batch dictionaries
+        return go_batch_dict, interpro_batch_dict, mapman_batch_dict
+
+    #---------------
+
 #-------------------------------------------------------------------------------
 # table "species"
 #-------------------------------------------------------------------------------
@@ -2345,18 +3310,46 @@ def insert_species_row(conn, row_dict):
     Insert a row into table "species".
     '''
 
-    sentence = f'''
-                INSERT INTO species
-                    (species_name, family_name, phylum_name, kingdom_name, superkingdom_name, tax_id, plaza_species_id)
-                    VALUES ('{row_dict["species_name"]}', '{row_dict["family_name"]}', '{row_dict["phylum_name"]}', '{row_dict["kingdom_name"]}', '{row_dict["superkingdom_name"]}', '{row_dict["tax_id"]}', '{row_dict["plaza_species_id"]}');
-                '''
+    sentence = '''
+               INSERT INTO species
+                   (species_name, family_name, phylum_name, kingdom_name, superkingdom_name, tax_id, plaza_species_id)
+                   VALUES (?, ?, ?, ?, ?, ?, ?);
+               '''
     try:
-        conn.execute(sentence)
+        conn.execute(sentence, (row_dict['species_name'], row_dict['family_name'], row_dict['phylum_name'], row_dict['kingdom_name'], row_dict['superkingdom_name'], row_dict['tax_id'], row_dict['plaza_species_id']))
     except Exception as e:
         raise xlib.ProgramException('B002', e, sentence, conn)
 
 #-------------------------------------------------------------------------------
 
+def save_pending_species(conn, species_row_list, species_name_list):
+    '''
+    Insert the species rows and the species names not found in the taxonomy server that were got with read-only
+    connections (the species inserted meanwhile by other process are ignored) and save changes into the database.
+    '''
+
+    # insert the rows into table "species"
+    if species_row_list != []:
+        sentence = '''
+                   INSERT OR IGNORE INTO species
+                       (species_name, family_name, phylum_name, kingdom_name, superkingdom_name, tax_id, plaza_species_id)
+                       VALUES (?, ?, ?, ?, ?, ?, ?);
+                   '''
+        try:
+            conn.executemany(sentence, [(row_dict['species_name'], row_dict['family_name'], row_dict['phylum_name'], row_dict['kingdom_name'], row_dict['superkingdom_name'], row_dict['tax_id'], row_dict['plaza_species_id']) for row_dict in species_row_list])
+        except Exception as e:
+            raise xlib.ProgramException('B002', e, sentence, conn)
+
+    # insert the species names into table "taxonomy_not_found"
+    if species_name_list != []:
+        create_taxonomy_not_found(conn)
+        insert_taxonomy_not_found_rows(conn, species_name_list)
+
+    # save changes into the database
+    conn.commit()
+
+#-------------------------------------------------------------------------------
+
 def check_species(conn):
     '''
     Check if table "species" exists and if there are rows.
@@ -2488,6 +3481,750 @@ def get_plaza_species_dict(conn):
     # return the PLAZA species dictionary
     return plaza_species_dict
 
+#-------------------------------------------------------------------------------
+# table "taxonomy_lineages"
+#-------------------------------------------------------------------------------
+
+def drop_taxonomy_lineages(conn):
+    '''
+    Drop the table "taxonomy_lineages" (if it exists).
+    '''
+
+    sentence = '''
+               DROP TABLE IF EXISTS taxonomy_lineages;
+               '''
+    try:
+        conn.execute(sentence)
+    except Exception as e:
+        raise xlib.ProgramException('B002', e, sentence, conn)
+
+#-------------------------------------------------------------------------------
+
+def create_taxonomy_lineages(conn):
+    '''
+    Create table "taxonomy_lineages".
+    '''
+    
+    sentence = '''
+               CREATE TABLE taxonomy_lineages (
+                   tax_id            INTEGER NOT NULL,
+                   species_name      TEXT NOT NULL,
+                   family_name       TEXT NOT NULL,
+                   phylum_name       TEXT NOT NULL,
+                   kingdom_name      TEXT NOT NULL,
+                   superkingdom_name TEXT NOT NULL);
+               '''
+    try:
+        conn.execute(sentence)
+    except Exception as e:
+        raise xlib.ProgramException('B002', e, sentence, conn)
+
+#-------------------------------------------------------------------------------
+
+def create_taxonomy_lineages_index(conn):
+    '''
+    Create the index "taxonomy_lineages_index" with the columns "species_name" and "tax_id" on the table "taxonomy_lineages".
+    '''
+    
+    sentence = '''
+               CREATE INDEX taxonomy_lineages_index
+                   ON taxonomy_lineages (species_name, tax_id);
+               '''
+    try:
+        conn.execute(sentence)
+    except Exception as e:
+        raise xlib.ProgramException('B002', e, sentence, conn)
+
+#-------------------------------------------------------------------------------
+
+def check_taxonomy_lineages(conn):
+    '''
+    Check if table "taxonomy_lineages" exists and if there are rows.
+    '''
+
+    # check if table "taxonomy_lineages" exists
+    control = 1 if is_object_found(conn, 'table', 'taxonomy_lineages') else 0
+
+    # check if there are rows when the table "taxonomy_lineages" exists
+    if control == 1:
+
+        # select the row number
+        sentence = '''
+                   SELECT EXISTS
+                       (SELECT 1
+                           FROM taxonomy_lineages
+                           LIMIT 1);
+                   '''
+        try:
+            rows = conn.execute(sentence)
+        except Exception as e:
+            raise xlib.ProgramException('B002', e, sentence, conn)
+
+        # get the row number
+        for row in rows:
+            control = int(row[0])
+            break
+
+    # return the row number
+    return control
+
+#-------------------------------------------------------------------------------
+
+def get_taxonomy_lineage_dict(conn, species_name):
+    '''
+    Get a dictionary with the taxonomy lineage of a species name from the table "taxonomy_lineages"
+    (if the name is shared by several taxa, the one with the lowest taxonomy identification is taken).
+    '''
+
+    # initialize the taxonomy lineage dictionary
+    taxonomy_lineage_dict = {}
+
+    # select the row of the species name from the table "taxonomy_lineages"
+    sentence = '''
+               SELECT tax_id, family_name, phylum_name, kingdom_name, superkingdom_name
+                   FROM taxonomy_lineages
+                   WHERE species_name = ?
+                   ORDER BY tax_id
+                   LIMIT 1;
+               '''
+    try:
+        rows = conn.execute(sentence, (species_name,))
+    except Exception as e:
+        raise xlib.ProgramException('B002', e, sentence, conn)
+
+    # add row data to the dictionary
+    for row in rows:
+        taxonomy_lineage_dict = {'species_name': species_name, 'tax_id': str(row[0]), 'family_name': row[1], 'phylum_name': row[2], 'kingdom_name': row[3], 'superkingdom_name': row[4]}
+
+    # return the taxonomy lineage dictionary
+    return taxonomy_lineage_dict
+
+#-------------------------------------------------------------------------------
+# table "taxonomy_not_found"
+#-------------------------------------------------------------------------------
+
+def create_taxonomy_not_found(conn):
+    '''
+    Create table "taxonomy_not_found" (if it does not exist).
+    '''
+    
+    sentence = '''
+               CREATE TABLE IF NOT EXISTS taxonomy_not_found (
+                   species_name   TEXT PRIMARY KEY,
+                   query_datetime TEXT NOT NULL);
+               '''
+    try:
+        conn.execute(sentence)
+    except Exception as e:
+        raise xlib.ProgramException('B002', e, sentence, conn)
+
+#-------------------------------------------------------------------------------
+
+def insert_taxonomy_not_found_rows(conn, species_name_list):
+    '''
+    Insert (or replace) the species names not found in the taxonomy server into table "taxonomy_not_found" with the current date and time.
+    '''
+
+    sentence = '''
+               INSERT OR REPLACE INTO taxonomy_not_found
+                   (species_name, query_datetime)
+                   VALUES (?, datetime('now'));
+               '''
+    try:
+        conn.executemany(sentence, [(species_name,) for species_name in species_name_list])
+    except Exception as e:
+        raise xlib.ProgramException('B002', e, sentence, conn)
+
+#-------------------------------------------------------------------------------
+
+def get_taxonomy_not_found_set(conn, expiration_days=None):
+    '''
+    Get the set of species names not found in the taxonomy server in the queries of the last days.
+    '''
+
+    # initialize the species name set
+    species_name_set = set()
+
+    # set the expiration days
+    if expiration_days is None:
+        expiration_days = xlib.Const.TAXONOMY_NOT_FOUND_EXPIRATION_DAYS
+
+    # select rows from the table "taxonomy_not_found" when it exists
+    if is_object_found(conn, 'table', 'taxonomy_not_found'):
+        sentence = '''
+                   SELECT species_name
+                       FROM taxonomy_not_found
+                       WHERE query_datetime >= datetime('now', ?);
+                   '''
+        try:
+            rows = conn.execute(sentence, (f'-{expiration_days} days',))
+        except Exception as e:
+            raise xlib.ProgramException('B002', e, sentence, conn)
+
+        # add the species names to the set
+        for row in rows:
+            species_name_set.add(row[0])
+
+    # return the species name set
+    return species_name_set
+
+#-------------------------------------------------------------------------------
+
+def is_taxonomy_not_found(conn, species_name, expiration_days=None):
+    '''
+    Check if a species name was not found in the taxonomy server in a query of the last days.
+    '''
+
+    # set the expiration days
+    if expiration_days is None:
+        expiration_days = xlib.Const.TAXONOMY_NOT_FOUND_EXPIRATION_DAYS
+
+    # check the table "taxonomy_not_found" exists
+    if not is_object_found(conn, 'table', 'taxonomy_not_found'):
+        return False
+
+    # check if the species name was not found in a recent query
+    sentence = '''
+               SELECT EXISTS
+                   (SELECT 1
+                       FROM taxonomy_not_found
+                       WHERE species_name = ?
+                         AND query_datetime >= datetime('now', ?)
+                       LIMIT 1);
+               '''
+    try:
+        rows = conn.execute(sentence, (species_name, f'-{expiration_days} days'))
+    except Exception as e:
+        raise xlib.ProgramException('B002', e, sentence, conn)
+
+    # get the control value
+    for row in rows:
+        control = int(row[0])
+        break
+
+    # return the control value
+    return control == 1
+
+#-------------------------------------------------------------------------------
+# results database: table "annotation_files"
+#-------------------------------------------------------------------------------
+
+def create_annotation_files(conn):
+    '''
+    Create table "annotation_files" of a results database (if it does not exist) and add the columns of the file status
+    when the table was created by a previous version (its rows have not file status and they are never valid).
+    '''
+
+    sentence = '''
+               CREATE TABLE IF NOT EXISTS annotation_files (
+                   annotation_file TEXT PRIMARY KEY,
+                   type            TEXT NOT NULL,
+                   record_number   INTEGER NOT NULL,
+                   file_size       INTEGER,
+                   file_mtime_ns   INTEGER);
+               '''
+    try:
+        conn.execute(sentence)
+    except Exception as e:
+        raise xlib.ProgramException('B002', e, sentence, conn)
+
+    # add the columns of the file status (if they do not exist)
+    column_name_list = [row[1] for row in conn.execute('PRAGMA table_info(annotation_files)')]
+    for column_name in ['file_size', 'file_mtime_ns']:
+        if column_name not in column_name_list:
+            sentence = f'''
+                        ALTER TABLE annotation_files
+                            ADD COLUMN {column_name} INTEGER;
+                        '''
+            try:
+                conn.execute(sentence)
+            except Exception as e:
+                raise xlib.ProgramException('B002', e, sentence, conn)
+
+#-------------------------------------------------------------------------------
+
+def insert_annotation_files_row(conn, row_dict):
+    '''
+    Insert (or replace) a row into table "annotation_files" of a results database.
+    '''
+
+    sentence = '''
+               INSERT OR REPLACE INTO annotation_files
+                   (annotation_file, type, record_number, file_size, file_mtime_ns)
+                   VALUES (?, ?, ?, ?, ?);
+               '''
+    try:
+        conn.execute(sentence, (row_dict['annotation_file'], row_dict['type'], row_dict['record_number'], row_dict['file_size'], row_dict['file_mtime_ns']))
+    except Exception as e:
+        raise xlib.ProgramException('B002', e, sentence, conn)
+
+#-------------------------------------------------------------------------------
+
+def get_annotation_files_dict(conn, annotation_file):
+    '''
+    Get the data dictionary of an annotation file from table "annotation_files" of a results database
+    (it is empty when the annotation file is not saved in the database).
+    '''
+
+    # initialize the data dictionary
+    data_dict = {}
+
+    # select the row of the annotation file when the table exists (and it has the columns of the file status)
+    if is_object_found(conn, 'table', 'annotation_files') and 'file_mtime_ns' in [row[1] for row in conn.execute('PRAGMA table_info(annotation_files)')]:
+        sentence = '''
+                   SELECT annotation_file, type, record_number, file_size, file_mtime_ns
+                       FROM annotation_files
+                       WHERE annotation_file = ?;
+                   '''
+        try:
+            rows = conn.execute(sentence, (annotation_file,))
+        except Exception as e:
+            raise xlib.ProgramException('B002', e, sentence, conn)
+
+        # add the row data to the dictionary
+        for row in rows:
+            data_dict = {'annotation_file': row[0], 'type': row[1], 'record_number': row[2], 'file_size': row[3], 'file_mtime_ns': row[4]}
+
+    # return the data dictionary
+    return data_dict
+
+#-------------------------------------------------------------------------------
+# results database: table "annotations"
+#-------------------------------------------------------------------------------
+
+def create_annotations(conn):
+    '''
+    Create table "annotations" of a results database (if it does not exist): the annotation records
+    are saved with the columns of the merged annotation files.
+    '''
+
+    column_text = ',\n'.join([f'                   {column:<36} TEXT NOT NULL' for column in xlib.get_annotation_column_list('MERGER')])
+    sentence = f'''
+                CREATE TABLE IF NOT EXISTS annotations (
+                   annotation_file                      TEXT NOT NULL,
+                   record_num                           INTEGER NOT NULL,
+{column_text});
+                '''
+    try:
+        conn.execute(sentence)
+    except Exception as e:
+        raise xlib.ProgramException('B002', e, sentence, conn)
+
+#-------------------------------------------------------------------------------
+
+def create_annotations_index(conn):
+    '''
+    Create the indexes "annotations_index" (columns "annotation_file" and "record_num"), "annotations_seq_id_index"
+    (column "seq_id") and "annotations_species_index" (column "species") on the table "annotations" (if they do not exist).
+    '''
+
+    sentence_list = [
+        '''
+        CREATE UNIQUE INDEX IF NOT EXISTS annotations_index
+            ON annotations (annotation_file, record_num);
+        ''',
+        '''
+        CREATE INDEX IF NOT EXISTS annotations_seq_id_index
+            ON annotations (seq_id);
+        ''',
+        '''
+        CREATE INDEX IF NOT EXISTS annotations_species_index
+            ON annotations (species);
+        ''',
+        ]
+    for sentence in sentence_list:
+        try:
+            conn.execute(sentence)
+        except Exception as e:
+            raise xlib.ProgramException('B002', e, sentence, conn)
+
+#-------------------------------------------------------------------------------
+
+def get_annotations_rows(conn, annotation_file, is_go_annotated=False):
+    '''
+    Get the rows (tuples with the values of the columns of the merged annotation files) of an annotation file
+    from table "annotations" of a results database in the order of the file; when is_go_annotated is True,
+    only the rows with GO identifications are got.
+    '''
+
+    sentence = f'''
+                SELECT {', '.join(xlib.get_annotation_column_list('MERGER'))}
+                    FROM annotations
+                    WHERE annotation_file = ?
+                      {"AND go_id <> ''" if is_go_annotated else ''}
+                    ORDER BY record_num;
+                '''
+    try:
+        rows = conn.execute(sentence, (annotation_file,))
+    except Exception as e:
+        raise xlib.ProgramException('B002', e, sentence, conn)
+
+    # return the rows
+    return rows
+
+#-------------------------------------------------------------------------------
+
+def get_annotations_rows_by_id(conn, annotation_file, id_list, get_id):
+    '''
+    Get the rows of an annotation file from table "annotations" of a results database (in the order of the file)
+    whose identification is in a list, where the identification of a row is got applying the function get_id
+    to its key ("nt_seq_id-aa_seq_id-hit_num-hsp_num").
+    '''
+
+    # register the function that gets the identification of a key
+    conn.create_function('get_id', 1, get_id, deterministic=True)
+
+    # load the identifications in a temporal table (the query-only guard is disabled while it is loaded)
+    set_query_only(conn, False)
+    sentence = '''
+               CREATE TEMP TABLE IF NOT EXISTS extract_ids (
+                   id TEXT PRIMARY KEY);
+               '''
+    try:
+        conn.execute(sentence)
+        conn.execute('DELETE FROM extract_ids;')
+    except Exception as e:
+        raise xlib.ProgramException('B002', e, sentence, conn)
+    sentence = '''
+               INSERT OR IGNORE INTO extract_ids (id) VALUES (?);
+               '''
+    try:
+        conn.executemany(sentence, [(id,) for id in id_list])
+    except Exception as e:
+        raise xlib.ProgramException('B002', e, sentence, conn)
+    set_query_only(conn, True)
+
+    # select the rows whose identification is in the temporal table
+    sentence = f'''
+                SELECT {', '.join(xlib.get_annotation_column_list('MERGER'))}
+                    FROM annotations
+                    WHERE annotation_file = ?
+                      AND get_id(nt_seq_id || '-' || aa_seq_id || '-' || hit_num || '-' || hsp_num) IN (SELECT id FROM extract_ids)
+                    ORDER BY record_num;
+                '''
+    try:
+        rows = conn.execute(sentence, (annotation_file,))
+    except Exception as e:
+        raise xlib.ProgramException('B002', e, sentence, conn)
+
+    # return the rows
+    return rows
+
+#-------------------------------------------------------------------------------
+# results database: tables "annotation_go_ids" and "annotation_interpro_ids"
+#-------------------------------------------------------------------------------
+
+def create_annotation_ontology_ids(conn):
+    '''
+    Create tables "annotation_go_ids" and "annotation_interpro_ids" of a results database (if they do not exist)
+    and their indexes on the ontology identification: each row is an identification of an annotation record.
+    '''
+
+    for ontology in ['go', 'interpro']:
+        sentence_list = [
+            f'''
+             CREATE TABLE IF NOT EXISTS annotation_{ontology}_ids (
+                 annotation_file TEXT NOT NULL,
+                 record_num      INTEGER NOT NULL,
+                 seq_id          TEXT NOT NULL,
+                 {ontology}_id{' ' * (14 - len(ontology))} TEXT NOT NULL);
+             ''',
+            f'''
+             CREATE INDEX IF NOT EXISTS annotation_{ontology}_ids_index
+                 ON annotation_{ontology}_ids ({ontology}_id);
+             ''',
+            f'''
+             CREATE INDEX IF NOT EXISTS annotation_{ontology}_ids_file_index
+                 ON annotation_{ontology}_ids (annotation_file, record_num);
+             ''',
+            ]
+        for sentence in sentence_list:
+            try:
+                conn.execute(sentence)
+            except Exception as e:
+                raise xlib.ProgramException('B002', e, sentence, conn)
+
+#-------------------------------------------------------------------------------
+
+def delete_results_annotation_file_rows(conn, annotation_file):
+    '''
+    Delete the rows of an annotation file from the tables of a results database.
+    '''
+
+    for table_name in ['annotation_files', 'annotations', 'annotation_go_ids', 'annotation_interpro_ids']:
+        sentence = f'''
+                    DELETE FROM {table_name}
+                        WHERE annotation_file = ?;
+                    '''
+        try:
+            conn.execute(sentence, (annotation_file,))
+        except Exception as e:
+            raise xlib.ProgramException('B002', e, sentence, conn)
+
+#-------------------------------------------------------------------------------
+# alignment cache: table "alignment_cache"
+#-------------------------------------------------------------------------------
+
+def create_alignment_cache(conn):
+    '''
+    Create table "alignment_cache" of an alignment cache database (if it does not exist): the alignment result
+    of a sequence is saved by the key of the target database and aligner parameters and the hash of the sequence.
+    '''
+
+    sentence = '''
+               CREATE TABLE IF NOT EXISTS alignment_cache (
+                   alignment_key TEXT NOT NULL,
+                   seq_hash      TEXT NOT NULL,
+                   result        TEXT NOT NULL,
+                   PRIMARY KEY (alignment_key, seq_hash))
+                   WITHOUT ROWID;
+               '''
+    try:
+        conn.execute(sentence)
+    except Exception as e:
+        raise xlib.ProgramException('B002', e, sentence, conn)
+
+#-------------------------------------------------------------------------------
+
+def insert_alignment_cache_rows(conn, row_list):
+    '''
+    Insert (or replace) rows (tuples with the alignment key, the sequence hash and the result) into table "alignment_cache"
+    and save changes into the database.
+    '''
+
+    sentence = '''
+               INSERT OR REPLACE INTO alignment_cache
+                   (alignment_key, seq_hash, result)
+                   VALUES (?, ?, ?);
+               '''
+    try:
+        conn.executemany(sentence, row_list)
+    except Exception as e:
+        raise xlib.ProgramException('B002', e, sentence, conn)
+    conn.commit()
+
+#-------------------------------------------------------------------------------
+
+def get_alignment_cache_dict(conn, alignment_key, seq_hash_list):
+    '''
+    Get a dictionary with the results saved in table "alignment_cache" of a list of sequence hashes
+    (the hashes not found are not in the dictionary).
+    '''
+
+    # initialize the alignment cache dictionary
+    alignment_cache_dict = {}
+
+    # load the sequence hashes in the temporary table "id_list"
+    load_id_list(conn, seq_hash_list)
+
+    # query
+    sentence = '''
+               SELECT seq_hash, result
+                   FROM alignment_cache
+                   WHERE alignment_key = ?
+                     AND seq_hash IN (SELECT id FROM temp.id_list);
+               '''
+    try:
+        rows = conn.execute(sentence, (alignment_key,))
+    except Exception as e:
+        raise xlib.ProgramException('B002', e, sentence, conn)
+
+    # add row data to the dictionary
+    for row in rows:
+        alignment_cache_dict[row[0]] = row[1]
+
+    # return the alignment cache dictionary
+    return alignment_cache_dict
+
+#-------------------------------------------------------------------------------
+# reference changes: table "reference_changes"
+#-------------------------------------------------------------------------------
+
+def create_reference_changes(conn):
+    '''
+    Create table "reference_changes" (if it does not exist): it saves the time of the last change of the reference
+    annotation data of each gene of a group (a PLAZA dataset) with the fingerprint of its data; the changes of a whole
+    group (Gene Ontology or InterPro data) are saved with an empty gene identification.
+    '''
+
+    sentence = '''
+               CREATE TABLE IF NOT EXISTS reference_changes (
+                   group_id    TEXT NOT NULL,
+                   gene_id     TEXT NOT NULL,
+                   fingerprint TEXT NOT NULL,
+                   changed_at  REAL NOT NULL,
+                   PRIMARY KEY (group_id, gene_id))
+                   WITHOUT ROWID;
+               '''
+    try:
+        conn.execute(sentence)
+    except Exception as e:
+        raise xlib.ProgramException('B002', e, sentence, conn)
+
+#-------------------------------------------------------------------------------
+
+def check_reference_changes(conn):
+    '''
+    Check if table "reference_changes" exists.
+    '''
+
+    return is_object_found(conn, 'table', 'reference_changes')
+
+#-------------------------------------------------------------------------------
+
+def save_reference_group_change(conn, group_id):
+    '''
+    Save the change of the reference annotation data of a whole group in table "reference_changes"
+    and save changes into the database.
+    '''
+
+    # create table "reference_changes" (if it does not exist)
+    create_reference_changes(conn)
+
+    # insert (or replace) the row of the group
+    sentence = '''
+               INSERT OR REPLACE INTO reference_changes
+                   (group_id, gene_id, fingerprint, changed_at)
+                   VALUES (?, '', '', ?);
+               '''
+    try:
+        conn.execute(sentence, (group_id, time.time()))
+    except Exception as e:
+        raise xlib.ProgramException('B002', e, sentence, conn)
+    conn.commit()
+
+#-------------------------------------------------------------------------------
+
+def save_plaza_reference_changes(conn, dataset_id):
+    '''
+    Save in table "reference_changes" the genes of a PLAZA dataset whose description, Gene Ontology, InterPro or MapMan
+    data changed since the previous load (the fingerprint of the data of each gene is compared with the saved one;
+    the deleted genes are saved with an empty fingerprint), save changes into the database and return the number
+    of changed genes.
+    '''
+
+    # create table "reference_changes" (if it does not exist)
+    create_reference_changes(conn)
+
+    # get the saved fingerprint of each gene of the dataset
+    sentence = '''
+               SELECT gene_id, fingerprint
+                   FROM reference_changes
+                   WHERE group_id = ?
+                     AND gene_id <> '';
+               '''
+    try:
+        rows = conn.execute(sentence, (dataset_id,))
+    except Exception as e:
+        raise xlib.ProgramException('B002', e, sentence, conn)
+    old_fingerprint_dict = {row[0]: row[1] for row in rows}
+
+    # get the data of each gene of the dataset sorted by gene identification (the NULL values are got as empty strings
+    # because a NULL value would make NULL the concatenation of all columns)
+    sentence = '''
+               SELECT gene_id, 'D', COALESCE(plaza_species_id, '') || '|' || COALESCE(desc_type, '') || '|' || COALESCE(desc, '')
+                   FROM plaza_gene_description
+                   WHERE dataset_id = ?
+               UNION ALL
+               SELECT gene_id, 'G', COALESCE(plaza_species_id, '') || '|' || COALESCE(go_id, '') || '|' || COALESCE(evidence, '') || '|' || COALESCE(desc, '')
+                   FROM plaza_go
+                   WHERE dataset_id = ?
+               UNION ALL
+               SELECT gene_id, 'I', COALESCE(plaza_species_id, '') || '|' || COALESCE(motif_id, '') || '|' || COALESCE(start, '') || '|' || COALESCE(stop, '') || '|' || COALESCE(score, '') || '|' || COALESCE(source, '') || '|' || COALESCE(domain_id, '') || '|' || COALESCE(desc, '')
+                   FROM plaza_interpro
+                   WHERE dataset_id = ?
+               UNION ALL
+               SELECT gene_id, 'M', COALESCE(plaza_species_id, '') || '|' || COALESCE(mapman_id, '') || '|' || COALESCE(desc, '')
+                   FROM plaza_mapman
+                   WHERE dataset_id = ?
+               ORDER BY 1, 2, 3;
+               '''
+    try:
+        rows = conn.execute(sentence, (dataset_id, dataset_id, dataset_id, dataset_id))
+    except Exception as e:
+        raise xlib.ProgramException('B002', e, sentence, conn)
+
+    # get the genes whose fingerprint changed
+    changed_at = time.time()
+    row_list = []
+    gene_id_set = set()
+    current_gene_id = None
+    fingerprint = None
+    for row in itertools.chain(rows, [(None, None, None)]):
+        if row[0] != current_gene_id:
+            if current_gene_id is not None:
+                gene_id_set.add(current_gene_id)
+                if old_fingerprint_dict.get(current_gene_id) != fingerprint.hexdigest():
+                    row_list.append((dataset_id, current_gene_id, fingerprint.hexdigest(), changed_at))
+            current_gene_id = row[0]
+            fingerprint = hashlib.sha256()
+        if row[0] is not None:
+            fingerprint.update(f'{row[1]}|{row[2]}\n'.encode('utf-8'))
+
+    # get the deleted genes
+    for (gene_id, old_fingerprint) in old_fingerprint_dict.items():
+        if gene_id not in gene_id_set and old_fingerprint != '':
+            row_list.append((dataset_id, gene_id, '', changed_at))
+
+    # insert (or replace) the rows of the changed genes
+    sentence = '''
+               INSERT OR REPLACE INTO reference_changes
+                   (group_id, gene_id, fingerprint, changed_at)
+                   VALUES (?, ?, ?, ?);
+               '''
+    try:
+        conn.executemany(sentence, row_list)
+    except Exception as e:
+        raise xlib.ProgramException('B002', e, sentence, conn)
+    conn.commit()
+
+    # return the number of changed genes
+    return len(row_list)
+
+#-------------------------------------------------------------------------------
+
+def get_reference_group_change_list(conn, since):
+    '''
+    Get the list of groups whose reference annotation data changed as a whole after a time (seconds since the epoch).
+    '''
+
+    sentence = '''
+               SELECT group_id
+                   FROM reference_changes
+                   WHERE gene_id = ''
+                     AND changed_at > ?
+                   ORDER BY group_id;
+               '''
+    try:
+        rows = conn.execute(sentence, (since,))
+    except Exception as e:
+        raise xlib.ProgramException('B002', e, sentence, conn)
+
+    # return the group list
+    return [row[0] for row in rows]
+
+#-------------------------------------------------------------------------------
+
+def get_reference_changed_gene_id_set(conn, group_id, since):
+    '''
+    Get the set of genes of a group whose reference annotation data changed after a time (seconds since the epoch).
+    '''
+
+    sentence = '''
+               SELECT gene_id
+                   FROM reference_changes
+                   WHERE group_id = ?
+                     AND gene_id <> ''
+                     AND changed_at > ?;
+               '''
+    try:
+        rows = conn.execute(sentence, (group_id, since))
+    except Exception as e:
+        raise xlib.ProgramException('B002', e, sentence, conn)
+
+    # return the gene identification set
+    return {row[0] for row in rows}
+
 #-------------------------------------------------------------------------------
 
 if __name__ == '__main__':
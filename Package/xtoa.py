@@ -24,6 +24,7 @@ console mode and gui mode.
 
 #-------------------------------------------------------------------------------
 
+import datetime
 import pathlib
 import os
 import re
@@ -126,6 +127,7 @@ def create_toa_config_file(toa_dir=None, miniconda3_dir=None, db_dir=None, resul
                 file_id.write(f'GYMNO_01_DIAMOND_DB_DIR={db_dir}/PLAZA/gymno_01-diamond-db\n')
                 file_id.write(f'GYMNO_01_DIAMOND_DB_FILE={db_dir}/PLAZA/gymno_01-diamond-db/gymno_01\n')
                 file_id.write(f'GYMNO_01_BLAST_XML=$OUTPUT_DIR/gymno_01-alignment.xml\n')
+                file_id.write(f'GYMNO_01_BLAST_TSV=$OUTPUT_DIR/gymno_01-alignment.tsv\n')
                 file_id.write( 'GYMNO_01_ANNOTATION_FILE=$OUTPUT_DIR/gymno_01-annotation.csv\n')
                 file_id.write( 'GYMNO_01_NON_ANNOTATED_TRANSCRIPT_FILE=$OUTPUT_DIR/gymno_01-nonann-transcripts.fasta\n')
                 file_id.write( 'GYMNO_01_NON_ANNOTATED_PEPTIDE_FILE=$OUTPUT_DIR/gymno_01-nonann-peptides.fasta\n')
@@ -150,6 +152,7 @@ def create_toa_config_file(toa_dir=None, miniconda3_dir=None, db_dir=None, resul
                 file_id.write(f'DICOTS_04_DIAMOND_DB_DIR={db_dir}/PLAZA/dicots_04-diamond-db\n')
                 file_id.write(f'DICOTS_04_DIAMOND_DB_FILE={db_dir}/PLAZA/dicots_04-diamond-db/dicots_04\n')
                 file_id.write( 'DICOTS_04_BLAST_XML=$OUTPUT_DIR/dicots_04-alignment.xml\n')
+                file_id.write( 'DICOTS_04_BLAST_TSV=$OUTPUT_DIR/dicots_04-alignment.tsv\n')
                 file_id.write( 'DICOTS_04_ANNOTATION_FILE=$OUTPUT_DIR/dicots_04-annotation.csv\n')
                 file_id.write( 'DICOTS_04_NON_ANNOTATED_TRANSCRIPT_FILE=$OUTPUT_DIR/dicots_04-nonann-transcripts.fasta\n')
                 file_id.write( 'DICOTS_04_NON_ANNOTATED_PEPTIDE_FILE=$OUTPUT_DIR/dicots_04-nonann-peptides.fasta\n')
@@ -174,6 +177,7 @@ def create_toa_config_file(toa_dir=None, miniconda3_dir=None, db_dir=None, resul
                 file_id.write(f'MONOCOTS_04_DIAMOND_DB_DIR={db_dir}/PLAZA/monocots_04-diamond-db\n')
                 file_id.write(f'MONOCOTS_04_DIAMOND_DB_FILE={db_dir}/PLAZA/monocots_04-diamond-db/monocots_04\n')
                 file_id.write( 'MONOCOTS_04_BLAST_XML=$OUTPUT_DIR/monocots_04-alignment.xml\n')
+                file_id.write( 'MONOCOTS_04_BLAST_TSV=$OUTPUT_DIR/monocots_04-alignment.tsv\n')
                 file_id.write( 'MONOCOTS_04_ANNOTATION_FILE=$OUTPUT_DIR/monocots_04-annotation.csv\n')
                 file_id.write( 'MONOCOTS_04_NON_ANNOTATED_TRANSCRIPT_FILE=$OUTPUT_DIR/monocots_04-nonann-transcripts.fasta\n')
                 file_id.write( 'MONOCOTS_04_NON_ANNOTATED_PEPTIDE_FILE=$OUTPUT_DIR/monocots_04-nonann-peptides.fasta\n')
@@ -190,6 +194,7 @@ def create_toa_config_file(toa_dir=None, miniconda3_dir=None, db_dir=None, resul
                 file_id.write(f'REFSEQ_PLANT_DIAMOND_DB_FILE={db_dir}/NCBI/refseq_plant-diamond-db/refseq_plant\n')
                 file_id.write(f'REFSEQ_PLANT_FILE_LIST={db_dir}/NCBI/refseq_plant-file-list.txt\n')
                 file_id.write( 'REFSEQ_PLANT_BLAST_XML=$OUTPUT_DIR/refseq_plant-alignment.xml\n')
+                file_id.write( 'REFSEQ_PLANT_BLAST_TSV=$OUTPUT_DIR/refseq_plant-alignment.tsv\n')
                 file_id.write( 'REFSEQ_PLANT_ANNOTATION_FILE=$OUTPUT_DIR/refseq_plant-annotation.csv\n')
                 file_id.write( 'REFSEQ_PLANT_NON_ANNOTATED_TRANSCRIPT_FILE=$OUTPUT_DIR/refseq_plant-nonann-transcripts.fasta\n')
                 file_id.write( 'REFSEQ_PLANT_NON_ANNOTATED_PEPTIDE_FILE=$OUTPUT_DIR/refseq_plant-nonann-peptides.fasta\n')
@@ -215,8 +220,10 @@ def create_toa_config_file(toa_dir=None, miniconda3_dir=None, db_dir=None, resul
                 file_id.write(f'NT_BLASTPLUS_DB_DIR={db_dir}/NCBI/nt-blastplus-db\n')
                 file_id.write(f'NT_BLASTPLUS_DB_FILE={db_dir}/NCBI/nt-blastplus-db/nt\n')
                 file_id.write( 'NT_BLAST_XML=$OUTPUT_DIR/nt-alignment.xml\n')
+                file_id.write( 'NT_BLAST_TSV=$OUTPUT_DIR/nt-alignment.tsv\n')
                 file_id.write( 'NT_VIRIDIPLANTAE_ANNOTATION_FILE=$OUTPUT_DIR/nt-viridiplantae-annotation.csv\n')
                 file_id.write( 'NT_CONTAMINATION_ANNOTATION_FILE=$OUTPUT_DIR/nt-contamination-annotation.csv\n')
+                file_id.write( 'NT_CLASSIFICATION_FILE=$OUTPUT_DIR/nt-classification.csv\n')
                 file_id.write( 'NT_NON_ANNOTATED_TRANSCRIPT_FILE=$OUTPUT_DIR/nt-nonann-transcripts.fasta\n')
                 file_id.write( '\n')
                 file_id.write( '# NCBI Nucleotide GenInfo identifier lists\n')
@@ -233,8 +240,10 @@ def create_toa_config_file(toa_dir=None, miniconda3_dir=None, db_dir=None, resul
                 file_id.write(f'NR_DIAMOND_DB_DIR={db_dir}/NCBI/nr-diamond-db\n')
                 file_id.write(f'NR_DIAMOND_DB_FILE={db_dir}/NCBI/nr-diamond-db/nr\n')
                 file_id.write( 'NR_BLAST_XML=$OUTPUT_DIR/nr-alignment.xml\n')
+                file_id.write( 'NR_BLAST_TSV=$OUTPUT_DIR/nr-alignment.tsv\n')
                 file_id.write( 'NR_VIRIDIPLANTAE_ANNOTATION_FILE=$OUTPUT_DIR/nr-viridiplantae-annotation.csv\n')
                 file_id.write( 'NR_CONTAMINATION_ANNOTATION_FILE=$OUTPUT_DIR/nr-contamination-annotation.csv\n')
+                file_id.write( 'NR_CLASSIFICATION_FILE=$OUTPUT_DIR/nr-classification.csv\n')
                 file_id.write( 'NR_NON_ANNOTATED_PEPTIDE_FILE=$OUTPUT_DIR/nr-nonann-peptides.fasta\n')
                 file_id.write( '\n')
                 file_id.write( '# NCBI Protein GenInfo identifier lists\n')
@@ -282,6 +291,7 @@ def create_toa_config_file(toa_dir=None, miniconda3_dir=None, db_dir=None, resul
                 file_id.write( 'MERGED_ANNOTATION_FILE=$OUTPUT_DIR/merged-annotation.csv\n')
                 file_id.write( 'PLANT_ANNOTATION_FILE=$OUTPUT_DIR/plant-annotation.csv\n')
                 file_id.write( 'MERGED_BLAST_XML=$OUTPUT_DIR/merged-alignment.xml\n')
+                file_id.write( 'MERGED_BLAST_TSV=$OUTPUT_DIR/merged-alignment.tsv\n')
                 # -- file_id.write( 'RESTOREDIDS_MERGED_BLAST_XML=$OUTPUT_DIR/restoredids-merged-alignment.xml\n')
                 file_id.write( '\n')
                 file_id.write( '# statistics\n')
@@ -289,6 +299,9 @@ def create_toa_config_file(toa_dir=None, miniconda3_dir=None, db_dir=None, resul
                 file_id.write( 'STATS_DIR=$OUTPUT_DIR/stats\n')
                 file_id.write( 'STATS_BASE_NAME=stats\n')
                 file_id.write( 'ANNOTATION_STATS_FILE=$OUTPUT_DIR/stats/stats.csv\n')
+                file_id.write( '\n')
+                file_id.write( '# results database\n')
+                file_id.write( 'RESULTS_DB=$OUTPUT_DIR/results.db\n')
         except Exception as e:
             error_list.append(f'*** EXCEPTION: "{e}".')
             error_list.append(f'*** ERROR: The file {toa_config_file} can not be created.')
@@ -1018,6 +1031,7 @@ def build_rebuild_toa_database_script(current_run_dir):
                     script_file_id.write( '    /usr/bin/time \\\n')
                     script_file_id.write( '        $MINICONDA_BIN_DIR/python3 $TOA_DIR/rebuild-database.py \\\n')
                     script_file_id.write( '            --db=$TOA_DB \\\n')
+                    script_file_id.write( '            --upgrade-indexes=Y \\\n')
                     script_file_id.write( '            --verbose=N \\\n')
                     script_file_id.write( '            --trace=N\n')
                     script_file_id.write( '    RC=$?\n')
@@ -1846,6 +1860,7 @@ def build_basic_data_load_script(current_run_dir):
                     script_file_id.write( '    /usr/bin/time \\\n')
                     script_file_id.write( '        $MINICONDA_BIN_DIR/python3 $TOA_DIR/load-basic-data.py \\\n')
                     script_file_id.write( '            --db=$TOA_DB \\\n')
+                    script_file_id.write( '            --db-profile=BULK-LOAD \\\n')
                     script_file_id.write( '            --datasets=$DATASET_FILE \\\n')
                     script_file_id.write( '            --species=$SPECIES_FILE \\\n')
                     script_file_id.write( '            --ecids=$EC_IDS_FILE \\\n')
@@ -2401,6 +2416,8 @@ def build_gymno_01_load_script(current_run_dir):
                     script_file_id.write( '    /usr/bin/time \\\n')
                     script_file_id.write( '        $MINICONDA_BIN_DIR/python3 $TOA_DIR/load-plaza-data.py \\\n')
                     script_file_id.write( '            --db=$TOA_DB \\\n')
+                    script_file_id.write( '            --db-profile=BULK-LOAD \\\n')
+                    script_file_id.write( '            --index-mode=DEFERRED \\\n')
                     script_file_id.write( '            --dataset=gymno_01 \\\n')
                     script_file_id.write( '            --species=all \\\n')
                     script_file_id.write( '            --genedesc=$GYMNO_01_GENEDESC_DIR \\\n')
@@ -2958,6 +2975,8 @@ def build_dicots_04_load_script(current_run_dir):
                     script_file_id.write( '    /usr/bin/time \\\n')
                     script_file_id.write( '        $MINICONDA_BIN_DIR/python3 $TOA_DIR/load-plaza-data.py \\\n')
                     script_file_id.write( '            --db=$TOA_DB \\\n')
+                    script_file_id.write( '            --db-profile=BULK-LOAD \\\n')
+                    script_file_id.write( '            --index-mode=DEFERRED \\\n')
                     script_file_id.write( '            --dataset=dicots_04 \\\n')
                     script_file_id.write( '            --species=all \\\n')
                     script_file_id.write( '            --genedesc=$DICOTS_04_GENEDESC_DIR \\\n')
@@ -3515,6 +3534,8 @@ def build_monocots_04_load_script(current_run_dir):
                     script_file_id.write( '    /usr/bin/time \\\n')
                     script_file_id.write( '        $MINICONDA_BIN_DIR/python3 $TOA_DIR/load-plaza-data.py \\\n')
                     script_file_id.write( '            --db=$TOA_DB \\\n')
+                    script_file_id.write( '            --db-profile=BULK-LOAD \\\n')
+                    script_file_id.write( '            --index-mode=DEFERRED \\\n')
                     script_file_id.write( '            --dataset=monocots_04 \\\n')
                     script_file_id.write( '            --species=all \\\n')
                     script_file_id.write( '            --genedesc=$MONOCOTS_04_GENEDESC_DIR \\\n')
@@ -3935,6 +3956,24 @@ def build_taxonomy_download_script(current_run_dir):
                     script_file_id.write( '    echo "Taxids ared downloaded."\n')
                     script_file_id.write( '}\n')
                     script_file_id.write( '#-------------------------------------------------------------------------------\n')
+                    script_file_id.write( 'function load_taxonomy_data\n')
+                    script_file_id.write( '{\n')
+                    script_file_id.write(f'    cd {current_run_dir}\n')
+                    script_file_id.write( '    echo "$SEP"\n')
+                    script_file_id.write( '    echo "Loading NCBI Taxonomy lineages into TOA database ..."\n')
+                    script_file_id.write( '    /usr/bin/time \\\n')
+                    script_file_id.write( '        $MINICONDA_BIN_DIR/python3 $TOA_DIR/load-taxonomy-data.py \\\n')
+                    script_file_id.write( '            --db=$TOA_DB \\\n')
+                    script_file_id.write( '            --db-profile=BULK-LOAD \\\n')
+                    script_file_id.write( '            --names=$TAXONOMY_TAXONNAMES_FILE \\\n')
+                    script_file_id.write( '            --nodes=$TAXONOMY_TAXONNODES_FILE \\\n')
+                    script_file_id.write( '            --verbose=N \\\n')
+                    script_file_id.write( '            --trace=N\n')
+                    script_file_id.write( '    RC=$?\n')
+                    script_file_id.write( '    if [ $RC -ne 0 ]; then manage_error load-taxonomy-data.py $RC; fi\n')
+                    script_file_id.write( '    echo "Data are loaded."\n')
+                    script_file_id.write( '}\n')
+                    script_file_id.write( '#-------------------------------------------------------------------------------\n')
                     script_file_id.write( 'function end\n')
                     script_file_id.write( '{\n')
                     script_file_id.write( '    END_DATETIME=`date +%s`\n')
@@ -3971,6 +4010,7 @@ def build_taxonomy_download_script(current_run_dir):
                     script_file_id.write( '#-------------------------------------------------------------------------------\n')
                     script_file_id.write( 'init\n')
                     script_file_id.write( 'download_taxonomy_data\n')
+                    script_file_id.write( 'load_taxonomy_data\n')
                     script_file_id.write( 'end\n')
         except Exception as e:
             error_list.append(f'*** EXCEPTION: "{e}".')
@@ -5110,6 +5150,7 @@ def build_gene_load_script(current_run_dir):
                     script_file_id.write( '    /usr/bin/time \\\n')
                     script_file_id.write( '        $MINICONDA_BIN_DIR/python3 $TOA_DIR/load-ncbi-data.py \\\n')
                     script_file_id.write( '            --db=$TOA_DB \\\n')
+                    script_file_id.write( '            --db-profile=BULK-LOAD \\\n')
                     script_file_id.write( '            --dataset=gene \\\n')
                     script_file_id.write( '            --gene2refseq=$GENE_GENE2REFSEQ_FILE \\\n')
                     script_file_id.write( '            --gene2go=$GENE_GENE2GO_FILE \\\n')
@@ -5435,6 +5476,7 @@ def build_interpro_load_script(current_run_dir):
                     script_file_id.write( '    /usr/bin/time \\\n')
                     script_file_id.write( '        $MINICONDA_BIN_DIR/python3 $TOA_DIR/load-interpro-data.py \\\n')
                     script_file_id.write( '            --db=$TOA_DB \\\n')
+                    script_file_id.write( '            --db-profile=BULK-LOAD \\\n')
                     script_file_id.write( '            --interpro2go=$INTERPRO_INTERPRO2GO_FILE \\\n')
                     script_file_id.write( '            --verbose=N \\\n')
                     script_file_id.write( '            --trace=N\n')
@@ -5798,6 +5840,7 @@ def build_go_load_script(current_run_dir):
                     script_file_id.write( '    /usr/bin/time \\\n')
                     script_file_id.write( '        $MINICONDA_BIN_DIR/python3 $TOA_DIR/load-go-data.py \\\n')
                     script_file_id.write( '            --db=$TOA_DB \\\n')
+                    script_file_id.write( '            --db-profile=BULK-LOAD \\\n')
                     script_file_id.write( '            --ontology=$GO_ONTOLOGY_FILE \\\n')
                     script_file_id.write( '            --ec2go=$GO_EC2GO_FILE \\\n')
                     script_file_id.write( '            --kegg2go=$GO_KEGG2GO_FILE \\\n')
@@ -5998,7 +6041,10 @@ def create_pipeline_config_file(pipeline_type, transcriptome_dir='', transcripto
                 file_id.write( '{0:<50} {1}\n'.format(f'alignment_tool = {xlib.get_blastplus_name()}', f'# tool used in blastx alignments: {xlib.get_alignment_tool_code_list_text()}; blastn alignments will use BLAST+'))
             elif pipeline_type == xlib.get_toa_process_pipeline_aminoacid_code():
                 file_id.write( '{0:<50} {1}\n'.format(f'alignment_tool = {xlib.get_blastplus_name()}', f'# tool used in blastp alignments: {xlib.get_alignment_tool_code_list_text()}'))
+            file_id.write( '{0:<50} {1}\n'.format('alignment_format = 5', f'# format of the alignment files: {xlib.get_alignment_format_code_list_text()}'))
             file_id.write( '{0:<50} {1}\n'.format('threads = 4', '# number of threads for use'))
+            file_id.write( '{0:<50} {1}\n'.format('chunks = 1', '# number of sequence chunks aligned and annotated concurrently (chunked mode); 1 if it is not used'))
+            file_id.write( '{0:<50} {1}\n'.format('alignment_cache = N', f'# use of the alignment cache: {xlib.get_alignment_cache_code_list_text()}'))
             file_id.write( '\n')
             file_id.write( '# This section has the information to set the NCBI BLAST+ parameters\n')
             file_id.write( '[BLAST+ parameters]\n')
@@ -6194,6 +6240,12 @@ def check_pipeline_config_file(pipeline_type, strict):
                 error_list.append(f'*** ERROR: the key "alignment_tool" has to be {xlib.get_alignment_tool_code_list_text()}.')
                 OK = False
 
+            # check section "pipeline parameters" - key "alignment_format" (it is optional in order to accept config files of previous versions)
+            alignment_format = pipeline_option_dict.get('pipeline parameters', {}).get('alignment_format', not_found)
+            if alignment_format != not_found and not xlib.check_code(alignment_format, xlib.get_alignment_format_code_list(), case_sensitive=False):
+                error_list.append(f'*** ERROR: the key "alignment_format" has to be {xlib.get_alignment_format_code_list_text()}.')
+                OK = False
+
             # check section "pipeline parameters" - key "threads"
             threads = pipeline_option_dict.get('pipeline parameters', {}).get('threads', not_found)
             if threads == not_found:
@@ -6203,6 +6255,18 @@ def check_pipeline_config_file(pipeline_type, strict):
                 error_list.append('*** ERROR: the key "threads" has to be an integer number greater than or equal to 1.')
                 OK = False
 
+            # check section "pipeline parameters" - key "chunks" (it is optional in order to accept config files of previous versions)
+            chunks = pipeline_option_dict.get('pipeline parameters', {}).get('chunks', not_found)
+            if chunks != not_found and not xlib.check_int(chunks, minimum=1):
+                error_list.append('*** ERROR: the key "chunks" has to be an integer number greater than or equal to 1.')
+                OK = False
+
+            # check section "pipeline parameters" - key "alignment_cache" (it is optional in order to accept config files of previous versions)
+            alignment_cache = pipeline_option_dict.get('pipeline parameters', {}).get('alignment_cache', not_found)
+            if alignment_cache != not_found and not xlib.check_code(alignment_cache, xlib.get_alignment_cache_code_list(), case_sensitive=False):
+                error_list.append(f'*** ERROR: the key "alignment_cache" has to be {xlib.get_alignment_cache_code_list_text()}.')
+                OK = False
+
         # check section "BLAST+ parameters"
         if 'BLAST+ parameters' not in sections_list:
             error_list.append('*** ERROR: the section "BLAST+ parameters" is not found.')
@@ -6832,7 +6896,10 @@ def build_nucleotide_pipeline_script(current_run_dir):
     transcriptome_dir = pipeline_option_dict['identification']['transcriptome_dir']
     transcriptome_file = pipeline_option_dict['identification']['transcriptome_file']
     alignment_tool = pipeline_option_dict['pipeline parameters']['alignment_tool']
+    alignment_format = pipeline_option_dict['pipeline parameters'].get('alignment_format', '5')
     threads = pipeline_option_dict['pipeline parameters']['threads']
+    chunks = int(pipeline_option_dict['pipeline parameters'].get('chunks', '1'))
+    alignment_cache = pipeline_option_dict['pipeline parameters'].get('alignment_cache', 'N').upper()
     blastplus_evalue = pipeline_option_dict['BLAST+ parameters']['evalue']
     blastplus_max_target_seqs = pipeline_option_dict['BLAST+ parameters']['max_target_seqs']
     blastplus_max_hsps = pipeline_option_dict['BLAST+ parameters']['max_hsps']
@@ -6872,6 +6939,23 @@ def build_nucleotide_pipeline_script(current_run_dir):
     for database in database_list:
         non_annotation_file_list.append(f'${database.upper()}_NON_ANNOTATED_TRANSCRIPT_FILE')
 
+    # get the chunk list (0 when the chunked mode is not used), the aligner threads and the annotation workers
+    # (in the chunked mode, a thread is reserved to load and annotate a chunk while the aligner processes the next one;
+    # otherwise, a thread is reserved to run the single-thread steps, as the alignment merger, while the sequences are annotated)
+    chunk_list = [0] if chunks == 1 else list(range(1, chunks + 1))
+    alignment_threads = int(threads) if chunks == 1 else max(int(threads) - 1, 1)
+    annotation_workers = max(int(threads) - 1, 1) if chunks == 1 else 1
+
+    # get the suffix of the alignment file variables and the output format parameters of BLAST+ and DIAMOND
+    if alignment_format == '5':
+        blast_file_suffix = 'XML'
+        blastplus_outfmt = '5'
+        diamond_outfmt = '5'
+    else:
+        blast_file_suffix = 'TSV'
+        blastplus_outfmt = f'"6 {xlib.get_blast_tabular_column_list_text()}"'
+        diamond_outfmt = f'6 {xlib.get_blast_tabular_column_list_text()}'
+
     # write the script
     if OK:
         try:
@@ -6885,6 +6969,10 @@ def build_nucleotide_pipeline_script(current_run_dir):
                 script_file_id.write( '\n')
                 script_file_id.write( '# pipeline parameters\n')
                 script_file_id.write(f'THREADS={threads}\n')
+                script_file_id.write(f'CHUNKS={chunks}\n')
+                script_file_id.write(f'ALIGNMENT_THREADS={alignment_threads}\n')
+                if alignment_cache == 'Y':
+                    script_file_id.write(f'ALIGNMENT_CACHE_DB={xlib.get_alignment_cache_db(toa_config_dict["TOA_DB"])}\n')
                 script_file_id.write( '\n')
                 script_file_id.write( '# BLAST+ parameters\n')
                 script_file_id.write(f'BLASTPLUS_EVALUE={blastplus_evalue}\n')
@@ -6916,6 +7004,7 @@ def build_nucleotide_pipeline_script(current_run_dir):
                 script_file_id.write(f'STATUS_DIR={xlib.get_status_dir(current_run_dir)}\n')
                 script_file_id.write(f'SCRIPT_STATUS_OK={xlib.get_status_ok(current_run_dir)}\n')
                 script_file_id.write(f'SCRIPT_STATUS_WRONG={xlib.get_status_wrong(current_run_dir)}\n')
+                script_file_id.write(f'STEP_FILE={xlib.get_pipeline_step_file(current_run_dir)}\n')
                 script_file_id.write( 'mkdir -p $STATUS_DIR\n')
                 script_file_id.write( 'if [ -f $SCRIPT_STATUS_OK ]; then rm $SCRIPT_STATUS_OK; fi\n')
                 script_file_id.write( 'if [ -f $SCRIPT_STATUS_WRONG ]; then rm $SCRIPT_STATUS_WRONG; fi\n')
@@ -6935,7 +7024,9 @@ def build_nucleotide_pipeline_script(current_run_dir):
                 script_file_id.write( '    echo "$SEP"\n')
                 script_file_id.write(f'    echo "ALIGNMENT TOOLS (blastp and blastx): {alignment_tool}"\n')
                 script_file_id.write(f'    echo "ALIGNMENT TOOLS (blastn): {xlib.get_blastplus_name()}"\n')
+                script_file_id.write(f'    echo "ALIGNMENT FORMAT: {alignment_format}"\n')
                 script_file_id.write( '    echo "THREADS: $THREADS"\n')
+                script_file_id.write( '    echo "CHUNKS: $CHUNKS"\n')
                 script_file_id.write( '    echo "$SEP"\n')
                 script_file_id.write( '    echo "BLAST+ EVALUE: $BLASTPLUS_EVALUE"\n')
                 script_file_id.write( '    echo "BLAST+ MAX_TARGET_SEQS: $BLASTPLUS_MAX_TARGET_SEQS"\n')
@@ -6974,249 +7065,394 @@ def build_nucleotide_pipeline_script(current_run_dir):
                 script_file_id.write( '        touch $STEP_STATUS\n')
                 script_file_id.write( '    fi\n')
                 script_file_id.write( '}\n')
-                for i in range(len(database_list)):
-                    current_code = database_list[i]
-                    previus_code = database_list[i - 1] if i > 0 else ''
+                if chunks > 1:
                     script_file_id.write( '#-------------------------------------------------------------------------------\n')
-                    script_file_id.write(f'function align_transcripts_{current_code}_proteome\n')
+                    script_file_id.write( 'function split_transcriptome_file\n')
                     script_file_id.write( '{\n')
                     script_file_id.write( '    cd $OUTPUT_DIR\n')
-                    script_file_id.write(f'    STEP_STATUS=$STATUS_DIR/align_transcripts_{current_code}_proteome.ok\n')
+                    script_file_id.write( '    STEP_STATUS=$STATUS_DIR/split_transcriptome_file.ok\n')
                     script_file_id.write( '    echo "$SEP"\n')
-                    script_file_id.write(f'    echo "ALIGNMENT OF TRANSCRIPTS TO {current_code.upper()} PROTEOME"\n')
+                    script_file_id.write( '    echo "SPLIT OF THE TRANSCRIPTOME FILE IN CHUNKS"\n')
                     script_file_id.write( '    if [ -f $STEP_STATUS ]; then\n')
                     script_file_id.write( '        echo "This step was previously run."\n')
                     script_file_id.write( '    else\n')
-                    script_file_id.write( '        echo "Aligning transcripts ..."\n')
-                    if current_code in ['gymno_01', 'dicots_04', 'monocots_04', 'refseq_plant']:
-                        if alignment_tool == xlib.get_blastplus_name():
-                            script_file_id.write( '        source activate blast\n')
-                            script_file_id.write(f'        export BLASTDB=${current_code.upper()}_BLASTPLUS_DB_DIR\n')
+                    script_file_id.write( '        echo "Splitting sequences ..."\n')
+                    script_file_id.write( '        /usr/bin/time \\\n')
+                    script_file_id.write( '            $MINICONDA_BIN_DIR/python3 $TOA_DIR/split-fasta-file.py \\\n')
+                    script_file_id.write( '                --fasta=$REIDENTIFIED_TRANSCRIPTOME_FILE \\\n')
+                    script_file_id.write( '                --chunks=$CHUNKS \\\n')
+                    script_file_id.write( '                --verbose=N \\\n')
+                    script_file_id.write( '                --trace=N\n')
+                    script_file_id.write( '        RC=$?\n')
+                    script_file_id.write( '        if [ $RC -ne 0 ]; then manage_error split-fasta-file.py $RC; fi\n')
+                    script_file_id.write( '        echo "Sequences are split."\n')
+                    script_file_id.write( '        touch $STEP_STATUS\n')
+                    script_file_id.write( '    fi\n')
+                    script_file_id.write( '}\n')
+                for chunk in chunk_list:
+                    for i in range(len(database_list)):
+                        current_code = database_list[i]
+                        previus_code = database_list[i - 1] if i > 0 else ''
+                        step_suffix = '' if chunk == 0 else f'_chunk{chunk}'
+                        file_suffix = '' if chunk == 0 else xlib.get_chunk_file('', chunk)
+                        title_suffix = '' if chunk == 0 else f' (CHUNK {chunk})'
+                        annotation_results_db = '$RESULTS_DB' if chunk == 0 else 'NONE'
+                        # set the query and output files of the alignment and the ones of the aligner (the cache misses when the alignment cache is used)
+                        alignment_query_file = f'$REIDENTIFIED_TRANSCRIPTOME_FILE{file_suffix}' if i == 0 else f'${previus_code.upper()}_NON_ANNOTATED_TRANSCRIPT_FILE{file_suffix}'
+                        alignment_output_file = f'${current_code.upper()}_BLAST_{blast_file_suffix}{file_suffix}'
+                        aligner_query_file = f'{alignment_output_file}.misses.fasta' if alignment_cache == 'Y' else alignment_query_file
+                        aligner_output_file = f'{alignment_output_file}.misses' if alignment_cache == 'Y' else alignment_output_file
+                        aligner_indent = '    ' if alignment_cache == 'Y' else ''
+                        # set the target database and the aligner parameters of the key of the alignment cache
+                        if current_code == 'nt':
+                            alignment_cache_database = '$NT_BLASTPLUS_DB_DIR/$NT_BLASTPLUS_DB_NAME'
+                            alignment_cache_parameters = f'blastn -evalue $BLASTPLUS_EVALUE -max_target_seqs $BLASTPLUS_MAX_TARGET_SEQS -max_hsps $BLASTPLUS_MAX_HSPS -qcov_hsp_perc $BLASTPLUS_QCOV_HSP_PERC $BLASTPLUS_OTHER_PARAMETERS_BLASTN -outfmt {alignment_format}'
+                        elif alignment_tool == xlib.get_blastplus_name():
+                            alignment_cache_database = f'${current_code.upper()}_BLASTPLUS_DB_DIR/${current_code.upper()}_BLASTPLUS_DB_NAME'
+                            alignment_cache_parameters = f'blastx -evalue $BLASTPLUS_EVALUE -max_target_seqs $BLASTPLUS_MAX_TARGET_SEQS -max_hsps $BLASTPLUS_MAX_HSPS -qcov_hsp_perc $BLASTPLUS_QCOV_HSP_PERC $BLASTPLUS_OTHER_PARAMETERS_BLASTX -outfmt {alignment_format}'
+                        elif alignment_tool == xlib.get_diamond_name():
+                            alignment_cache_database = f'${current_code.upper()}_DIAMOND_DB_FILE'
+                            alignment_cache_parameters = f'diamond blastx --evalue $DIAMOND_EVALUE --max-target-seqs $DIAMOND_MAX_TARGET_SEQS --max-hsps $DIAMOND_MAX_HSPS $DIAMOND_OTHER_PARAMETERS_BLASTX --outfmt {alignment_format}'
+                        script_file_id.write( '#-------------------------------------------------------------------------------\n')
+                        script_file_id.write(f'function align_transcripts_{current_code}_proteome{step_suffix}\n')
+                        script_file_id.write( '{\n')
+                        script_file_id.write( '    cd $OUTPUT_DIR\n')
+                        script_file_id.write(f'    STEP_STATUS=$STATUS_DIR/align_transcripts_{current_code}_proteome{step_suffix}.ok\n')
+                        script_file_id.write( '    echo "$SEP"\n')
+                        script_file_id.write(f'    echo "ALIGNMENT OF TRANSCRIPTS TO {current_code.upper()} PROTEOME{title_suffix}"\n')
+                        script_file_id.write( '    if [ -f $STEP_STATUS ]; then\n')
+                        script_file_id.write( '        echo "This step was previously run."\n')
+                        script_file_id.write( '    else\n')
+                        if alignment_cache == 'Y':
+                            script_file_id.write( '        echo "Looking up the sequences in the alignment cache ..."\n')
                             script_file_id.write( '        /usr/bin/time \\\n')
-                            script_file_id.write( '            blastx \\\n')
-                            script_file_id.write( '                -num_threads $THREADS \\\n')
-                            script_file_id.write(f'                -db ${current_code.upper()}_BLASTPLUS_DB_NAME \\\n')
-                            if i == 0:
-                                script_file_id.write( '                -query $REIDENTIFIED_TRANSCRIPTOME_FILE \\\n')
-                            else:
-                                script_file_id.write(f'                -query ${previus_code.upper()}_NON_ANNOTATED_TRANSCRIPT_FILE \\\n')
-                            script_file_id.write( '                -evalue $BLASTPLUS_EVALUE \\\n')
-                            script_file_id.write( '                -max_target_seqs $BLASTPLUS_MAX_TARGET_SEQS \\\n')
-                            script_file_id.write( '                -max_hsps $BLASTPLUS_MAX_HSPS \\\n')
-                            script_file_id.write( '                -qcov_hsp_perc $BLASTPLUS_QCOV_HSP_PERC \\\n')
-                            if blastplus_other_parameters_blastx.upper() != 'NONE':
-                                parameter_list = [x.strip() for x in blastplus_other_parameters_blastx.split(';')]
-                                for parameter in parameter_list:
-                                    if parameter.find('=') > 0:
-                                        pattern = r'^--(.+)=(.+)$'
-                                        mo = re.search(pattern, parameter)
-                                        parameter_name = mo.group(1).strip()
-                                        parameter_value = mo.group(2).strip()
-                                        script_file_id.write(f'                -{parameter_name} {parameter_value} \\\n')
-                                    else:
-                                        pattern = r'^--(.+)$'
-                                        mo = re.search(pattern, parameter)
-                                        parameter_name = mo.group(1).strip()
-                                        script_file_id.write(f'                -{parameter_name} \\\n')
-                            script_file_id.write( '                -outfmt 5 \\\n')
-                            script_file_id.write(f'                -out ${current_code.upper()}_BLAST_XML\n')
+                            script_file_id.write( '            $MINICONDA_BIN_DIR/python3 $TOA_DIR/lookup-alignment-cache.py \\\n')
+                            script_file_id.write( '                --cache=$ALIGNMENT_CACHE_DB \\\n')
+                            script_file_id.write(f'                --seqs={alignment_query_file} \\\n')
+                            script_file_id.write(f'                --database={alignment_cache_database} \\\n')
+                            script_file_id.write(f'                --parameters="{alignment_cache_parameters}" \\\n')
+                            script_file_id.write(f'                --misses={aligner_query_file} \\\n')
+                            script_file_id.write( '                --verbose=N \\\n')
+                            script_file_id.write( '                --trace=N\n')
                             script_file_id.write( '        RC=$?\n')
-                            script_file_id.write( '        if [ $RC -ne 0 ]; then manage_error blastx $RC; fi\n')
-                            script_file_id.write( '        echo "Alignment is done."\n')
-                            script_file_id.write( '        conda deactivate\n')
-                        elif alignment_tool == xlib.get_diamond_name():
-                            if i == 0:
-                                script_file_id.write( '        if [[ -s $REIDENTIFIED_TRANSCRIPTOME_FILE ]]; then\n')
-                            else:
-                                script_file_id.write(f'        if [[ -s ${previus_code.upper()}_NON_ANNOTATED_TRANSCRIPT_FILE ]]; then\n')
-                            script_file_id.write( '            source activate diamond\n')
-                            script_file_id.write( '            /usr/bin/time \\\n')
-                            script_file_id.write( '                diamond blastx \\\n')
-                            script_file_id.write( '                    --threads $THREADS \\\n')
-                            script_file_id.write(f'                    --db ${current_code.upper()}_DIAMOND_DB_FILE \\\n')
-                            if i == 0:
-                                script_file_id.write( '                    --query $REIDENTIFIED_TRANSCRIPTOME_FILE \\\n')
-                            else:
-                                script_file_id.write(f'                    --query ${previus_code.upper()}_NON_ANNOTATED_TRANSCRIPT_FILE \\\n')
-                            script_file_id.write( '                    --evalue $DIAMOND_EVALUE \\\n')
-                            script_file_id.write( '                    --max-target-seqs $DIAMOND_MAX_TARGET_SEQS \\\n')
-                            script_file_id.write( '                    --max-hsps $DIAMOND_MAX_HSPS \\\n')
-                            if diamond_other_parameters_blastx.upper() != 'NONE':
-                                parameter_list = [x.strip() for x in diamond_other_parameters_blastx.split(';')]
+                            script_file_id.write( '        if [ $RC -ne 0 ]; then manage_error lookup-alignment-cache.py $RC; fi\n')
+                            script_file_id.write( '        echo "Sequences are looked up."\n')
+                        script_file_id.write( '        echo "Aligning transcripts ..."\n')
+                        if current_code in ['gymno_01', 'dicots_04', 'monocots_04', 'refseq_plant']:
+                            if alignment_tool == xlib.get_blastplus_name():
+                                if alignment_cache == 'Y':
+                                    script_file_id.write(f'        if [[ -s {aligner_query_file} ]]; then\n')
+                                script_file_id.write(f'{aligner_indent}        source activate blast\n')
+                                script_file_id.write(f'{aligner_indent}        export BLASTDB=${current_code.upper()}_BLASTPLUS_DB_DIR\n')
+                                script_file_id.write(f'{aligner_indent}        /usr/bin/time \\\n')
+                                script_file_id.write(f'{aligner_indent}            blastx \\\n')
+                                script_file_id.write(f'{aligner_indent}                -num_threads $ALIGNMENT_THREADS \\\n')
+                                script_file_id.write(f'{aligner_indent}                -db ${current_code.upper()}_BLASTPLUS_DB_NAME \\\n')
+                                script_file_id.write(f'{aligner_indent}                -query {aligner_query_file} \\\n')
+                                script_file_id.write(f'{aligner_indent}                -evalue $BLASTPLUS_EVALUE \\\n')
+                                script_file_id.write(f'{aligner_indent}                -max_target_seqs $BLASTPLUS_MAX_TARGET_SEQS \\\n')
+                                script_file_id.write(f'{aligner_indent}                -max_hsps $BLASTPLUS_MAX_HSPS \\\n')
+                                script_file_id.write(f'{aligner_indent}                -qcov_hsp_perc $BLASTPLUS_QCOV_HSP_PERC \\\n')
+                                if blastplus_other_parameters_blastx.upper() != 'NONE':
+                                    parameter_list = [x.strip() for x in blastplus_other_parameters_blastx.split(';')]
+                                    for parameter in parameter_list:
+                                        if parameter.find('=') > 0:
+                                            pattern = r'^--(.+)=(.+)$'
+                                            mo = re.search(pattern, parameter)
+                                            parameter_name = mo.group(1).strip()
+                                            parameter_value = mo.group(2).strip()
+                                            script_file_id.write(f'{aligner_indent}                -{parameter_name} {parameter_value} \\\n')
+                                        else:
+                                            pattern = r'^--(.+)$'
+                                            mo = re.search(pattern, parameter)
+                                            parameter_name = mo.group(1).strip()
+                                            script_file_id.write(f'{aligner_indent}                -{parameter_name} \\\n')
+                                script_file_id.write(f'{aligner_indent}                -outfmt {blastplus_outfmt} \\\n')
+                                script_file_id.write(f'{aligner_indent}                -out {aligner_output_file}\n')
+                                script_file_id.write(f'{aligner_indent}        RC=$?\n')
+                                script_file_id.write(f'{aligner_indent}        if [ $RC -ne 0 ]; then manage_error blastx $RC; fi\n')
+                                if alignment_cache == 'Y':
+                                    script_file_id.write( '        else\n')
+                                    script_file_id.write(f'            touch {aligner_output_file}\n')
+                                    script_file_id.write( '        fi\n')
+                                script_file_id.write( '        echo "Alignment is done."\n')
+                                script_file_id.write( '        conda deactivate\n')
+                            elif alignment_tool == xlib.get_diamond_name():
+                                script_file_id.write(f'        if [[ -s {aligner_query_file} ]]; then\n')
+                                script_file_id.write( '            source activate diamond\n')
+                                script_file_id.write( '            /usr/bin/time \\\n')
+                                script_file_id.write( '                diamond blastx \\\n')
+                                script_file_id.write( '                    --threads $ALIGNMENT_THREADS \\\n')
+                                script_file_id.write(f'                    --db ${current_code.upper()}_DIAMOND_DB_FILE \\\n')
+                                script_file_id.write(f'                    --query {aligner_query_file} \\\n')
+                                script_file_id.write( '                    --evalue $DIAMOND_EVALUE \\\n')
+                                script_file_id.write( '                    --max-target-seqs $DIAMOND_MAX_TARGET_SEQS \\\n')
+                                script_file_id.write( '                    --max-hsps $DIAMOND_MAX_HSPS \\\n')
+                                if diamond_other_parameters_blastx.upper() != 'NONE':
+                                    parameter_list = [x.strip() for x in diamond_other_parameters_blastx.split(';')]
+                                    for parameter in parameter_list:
+                                        if parameter.find('=') > 0:
+                                            pattern = r'^--(.+)=(.+)$'
+                                            mo = re.search(pattern, parameter)
+                                            parameter_name = mo.group(1).strip()
+                                            parameter_value = mo.group(2).strip()
+                                            script_file_id.write(f'                    --{parameter_name} {parameter_value} \\\n')
+                                        else:
+                                            pattern = r'^--(.+)$'
+                                            mo = re.search(pattern, parameter)
+                                            parameter_name = mo.group(1).strip()
+                                            script_file_id.write(f'                    --{parameter_name} \\\n')
+                                script_file_id.write(f'                    --outfmt {diamond_outfmt} \\\n')
+                                script_file_id.write(f'                    --out {aligner_output_file}\n')
+                                script_file_id.write( '            RC=$?\n')
+                                script_file_id.write( '            if [ $RC -ne 0 ]; then manage_error diamond-blastx $RC; fi\n')
+                                script_file_id.write( '        else\n')
+                                script_file_id.write(f'            touch {aligner_output_file}\n')
+                                script_file_id.write( '        fi\n')
+                                script_file_id.write( '        echo "Alignment is done."\n')
+                                script_file_id.write( '        conda deactivate\n')
+                        elif current_code == 'nt':
+                            if alignment_cache == 'Y':
+                                script_file_id.write(f'        if [[ -s {aligner_query_file} ]]; then\n')
+                            script_file_id.write(f'{aligner_indent}        source activate blast\n')
+                            script_file_id.write(f'{aligner_indent}        export BLASTDB=$NT_BLASTPLUS_DB_DIR\n')
+                            script_file_id.write(f'{aligner_indent}        /usr/bin/time \\\n')
+                            script_file_id.write(f'{aligner_indent}            blastn \\\n')
+                            script_file_id.write(f'{aligner_indent}                -num_threads $ALIGNMENT_THREADS \\\n')
+                            script_file_id.write(f'{aligner_indent}                -db $NT_BLASTPLUS_DB_NAME \\\n')
+                            script_file_id.write(f'{aligner_indent}                -query {aligner_query_file} \\\n')
+                            script_file_id.write(f'{aligner_indent}                -evalue $BLASTPLUS_EVALUE \\\n')
+                            script_file_id.write(f'{aligner_indent}                -max_target_seqs $BLASTPLUS_MAX_TARGET_SEQS \\\n')
+                            script_file_id.write(f'{aligner_indent}                -max_hsps $BLASTPLUS_MAX_HSPS \\\n')
+                            script_file_id.write(f'{aligner_indent}                -qcov_hsp_perc $BLASTPLUS_QCOV_HSP_PERC \\\n')
+                            if blastplus_other_parameters_blastn.upper() != 'NONE':
+                                parameter_list = [x.strip() for x in blastplus_other_parameters_blastn.split(';')]
                                 for parameter in parameter_list:
                                     if parameter.find('=') > 0:
                                         pattern = r'^--(.+)=(.+)$'
                                         mo = re.search(pattern, parameter)
                                         parameter_name = mo.group(1).strip()
                                         parameter_value = mo.group(2).strip()
-                                        script_file_id.write(f'                    --{parameter_name} {parameter_value} \\\n')
+                                        script_file_id.write(f'{aligner_indent}                -{parameter_name} {parameter_value} \\\n')
                                     else:
                                         pattern = r'^--(.+)$'
                                         mo = re.search(pattern, parameter)
                                         parameter_name = mo.group(1).strip()
-                                        script_file_id.write(f'                    --{parameter_name} \\\n')
-                            script_file_id.write( '                    --outfmt 5 \\\n')
-                            script_file_id.write(f'                    --out ${current_code.upper()}_BLAST_XML\n')
-                            script_file_id.write( '            RC=$?\n')
-                            script_file_id.write( '            if [ $RC -ne 0 ]; then manage_error diamond-blastx $RC; fi\n')
-                            script_file_id.write( '        else\n')
-                            script_file_id.write(f'            touch ${current_code.upper()}_BLAST_XML\n')
-                            script_file_id.write( '        fi\n')
+                                        script_file_id.write(f'{aligner_indent}                -{parameter_name} \\\n')
+                            script_file_id.write(f'{aligner_indent}                -outfmt {blastplus_outfmt} \\\n')
+                            script_file_id.write(f'{aligner_indent}                -out {aligner_output_file}\n')
+                            script_file_id.write(f'{aligner_indent}        RC=$?\n')
+                            script_file_id.write(f'{aligner_indent}        if [ $RC -ne 0 ]; then manage_error blastn $RC; fi\n')
+                            if alignment_cache == 'Y':
+                                script_file_id.write( '        else\n')
+                                script_file_id.write(f'            touch {aligner_output_file}\n')
+                                script_file_id.write( '        fi\n')
                             script_file_id.write( '        echo "Alignment is done."\n')
                             script_file_id.write( '        conda deactivate\n')
-                    elif current_code == 'nt':
-                        script_file_id.write( '        source activate blast\n')
-                        script_file_id.write(f'        export BLASTDB=$NT_BLASTPLUS_DB_DIR\n')
+                        if alignment_cache == 'Y':
+                            script_file_id.write( '        echo "Updating the alignment cache and writing the alignment file ..."\n')
+                            script_file_id.write( '        /usr/bin/time \\\n')
+                            script_file_id.write( '            $MINICONDA_BIN_DIR/python3 $TOA_DIR/update-alignment-cache.py \\\n')
+                            script_file_id.write( '                --cache=$ALIGNMENT_CACHE_DB \\\n')
+                            script_file_id.write(f'                --seqs={alignment_query_file} \\\n')
+                            script_file_id.write(f'                --database={alignment_cache_database} \\\n')
+                            script_file_id.write(f'                --parameters="{alignment_cache_parameters}" \\\n')
+                            script_file_id.write(f'                --misses={aligner_query_file} \\\n')
+                            script_file_id.write(f'                --malignment={aligner_output_file} \\\n')
+                            script_file_id.write(f'                --format={alignment_format} \\\n')
+                            script_file_id.write(f'                --alignment={alignment_output_file} \\\n')
+                            script_file_id.write( '                --verbose=N \\\n')
+                            script_file_id.write( '                --trace=N\n')
+                            script_file_id.write( '        RC=$?\n')
+                            script_file_id.write( '        if [ $RC -ne 0 ]; then manage_error update-alignment-cache.py $RC; fi\n')
+                            script_file_id.write( '        echo "The alignment cache is updated."\n')
+                        if len(database_list) == 1 and chunks == 1:
+                            script_file_id.write( '        echo "Restoring sequence identifications in alignment file ..."\n')
+                            script_file_id.write( '        /usr/bin/time \\\n')
+                            script_file_id.write( '            $MINICONDA_BIN_DIR/python3 $TOA_DIR/restore-ids.py \\\n')
+                            script_file_id.write(f'                --in=${current_code.upper()}_BLAST_{blast_file_suffix} \\\n')
+                            script_file_id.write(f'                --format={blast_file_suffix} \\\n')
+                            script_file_id.write( '                --relationships=$TOA_TRANSCRIPTOME_RELATIONSHIP_FILE \\\n')
+                            script_file_id.write( '                --relationships2=NONE \\\n')
+                            script_file_id.write(f'                --out=$MERGED_BLAST_{blast_file_suffix} \\\n')
+                            script_file_id.write( '                --verbose=N \\\n')
+                            script_file_id.write( '                --trace=N\n')
+                            script_file_id.write( '        RC=$?\n')
+                            script_file_id.write( '        if [ $RC -ne 0 ]; then manage_error restore-ids.py $RC; fi\n')
+                            script_file_id.write( '        echo "Identifications are restored."\n')
+                        script_file_id.write( '        touch $STEP_STATUS\n')
+                        script_file_id.write( '    fi\n')
+                        script_file_id.write( '}\n')
+                        script_file_id.write( '#-------------------------------------------------------------------------------\n')
+                        script_file_id.write(f'function load_alignment_{current_code}_proteome{step_suffix}\n')
+                        script_file_id.write( '{\n')
+                        script_file_id.write( '    cd $OUTPUT_DIR\n')
+                        script_file_id.write(f'    STEP_STATUS=$STATUS_DIR/load_alignment_{current_code}_proteome{step_suffix}.ok\n')
+                        script_file_id.write( '    echo "$SEP"\n')
+                        script_file_id.write(f'    echo "LOAD OF TRANSCRIPT ALIGNMENT TO {current_code.upper()} PROTEOME INTO TOA DATABASE{title_suffix}"\n')
+                        script_file_id.write( '    if [ -f $STEP_STATUS ]; then\n')
+                        script_file_id.write( '        echo "This step was previously run."\n')
+                        script_file_id.write( '    else\n')
+                        script_file_id.write( '        echo "Loading alignmnet data ..."\n')
                         script_file_id.write( '        /usr/bin/time \\\n')
-                        script_file_id.write( '            blastn \\\n')
-                        script_file_id.write( '                -num_threads $THREADS \\\n')
-                        script_file_id.write(f'                -db $NT_BLASTPLUS_DB_NAME \\\n')
-                        if i == 0:
-                            script_file_id.write( '                -query $REIDENTIFIED_TRANSCRIPTOME_FILE \\\n')
+                        script_file_id.write( '            $MINICONDA_BIN_DIR/python3 $TOA_DIR/load-blast-data.py \\\n')
+                        script_file_id.write( '                --db=$TOA_DB \\\n')
+                        script_file_id.write( '                --db-profile=BULK-LOAD \\\n')
+                        script_file_id.write(f'                --dataset={current_code} \\\n')
+                        script_file_id.write(f'                --format={alignment_format} \\\n')
+                        script_file_id.write(f'                --blast=${current_code.upper()}_BLAST_{blast_file_suffix}{file_suffix} \\\n')
+                        if chunk > 0:
+                            if i == 0:
+                                script_file_id.write(f'                --seqs=$REIDENTIFIED_TRANSCRIPTOME_FILE{file_suffix} \\\n')
+                            else:
+                                script_file_id.write(f'                --seqs=${previus_code.upper()}_NON_ANNOTATED_TRANSCRIPT_FILE{file_suffix} \\\n')
+                        if current_code == 'nt':
+                            script_file_id.write(f'                --aligner={xlib.get_blastplus_name()} \\\n')
                         else:
-                            script_file_id.write(f'                -query ${previus_code.upper()}_NON_ANNOTATED_TRANSCRIPT_FILE \\\n')
-                        script_file_id.write( '                -evalue $BLASTPLUS_EVALUE \\\n')
-                        script_file_id.write( '                -max_target_seqs $BLASTPLUS_MAX_TARGET_SEQS \\\n')
-                        script_file_id.write( '                -max_hsps $BLASTPLUS_MAX_HSPS \\\n')
-                        script_file_id.write( '                -qcov_hsp_perc $BLASTPLUS_QCOV_HSP_PERC \\\n')
-                        if blastplus_other_parameters_blastn.upper() != 'NONE':
-                            parameter_list = [x.strip() for x in blastplus_other_parameters_blastn.split(';')]
-                            for parameter in parameter_list:
-                                if parameter.find('=') > 0:
-                                    pattern = r'^--(.+)=(.+)$'
-                                    mo = re.search(pattern, parameter)
-                                    parameter_name = mo.group(1).strip()
-                                    parameter_value = mo.group(2).strip()
-                                    script_file_id.write(f'                -{parameter_name} {parameter_value} \\\n')
-                                else:
-                                    pattern = r'^--(.+)$'
-                                    mo = re.search(pattern, parameter)
-                                    parameter_name = mo.group(1).strip()
-                                    script_file_id.write(f'                -{parameter_name} \\\n')
-                        script_file_id.write( '                -outfmt 5 \\\n')
-                        script_file_id.write(f'                -out ${current_code.upper()}_BLAST_XML\n')
+                            script_file_id.write(f'                --aligner={alignment_tool} \\\n')
+                        script_file_id.write( '                --verbose=N \\\n')
+                        script_file_id.write( '                --trace=N\n')
                         script_file_id.write( '        RC=$?\n')
-                        script_file_id.write( '        if [ $RC -ne 0 ]; then manage_error blastn $RC; fi\n')
-                        script_file_id.write( '        echo "Alignment is done."\n')
-                        script_file_id.write( '        conda deactivate\n')
-                    if len(database_list) == 1:
-                        script_file_id.write( '        echo "Restoring sequence identifications in alignment file ..."\n')
+                        script_file_id.write( '        if [ $RC -ne 0 ]; then manage_error load-blast-data.py $RC; fi\n')
+                        script_file_id.write( '        echo "Data are loaded."\n')
+                        script_file_id.write( '        touch $STEP_STATUS\n')
+                        script_file_id.write( '    fi\n')
+                        script_file_id.write( '}\n')
+                        script_file_id.write( '#-------------------------------------------------------------------------------\n')
+                        script_file_id.write(f'function annotate_transcripts_{current_code}{step_suffix}\n')
+                        script_file_id.write( '{\n')
+                        script_file_id.write( '    cd $OUTPUT_DIR\n')
+                        script_file_id.write(f'    STEP_STATUS=$STATUS_DIR/annotate_transcripts_{current_code}{step_suffix}.ok\n')
+                        script_file_id.write( '    echo "$SEP"\n')
+                        script_file_id.write(f'    echo "ANNOTATION OF TRANSCRIPTS WITH {current_code.upper()}{title_suffix}"\n')
+                        script_file_id.write( '    if [ -f $STEP_STATUS ]; then\n')
+                        script_file_id.write( '        echo "This step was previously run."\n')
+                        script_file_id.write( '    else\n')
+                        script_file_id.write( '        echo "Annotating transcripts ..."\n')
                         script_file_id.write( '        /usr/bin/time \\\n')
-                        script_file_id.write( '            $MINICONDA_BIN_DIR/python3 $TOA_DIR/restore-ids.py \\\n')
-                        script_file_id.write(f'                --in=${current_code.upper()}_BLAST_XML \\\n')
-                        script_file_id.write( '                --format=XML \\\n')
+                        script_file_id.write( '            $MINICONDA_BIN_DIR/python3 $TOA_DIR/annotate-sequences.py \\\n')
+                        script_file_id.write( '                --db=$TOA_DB \\\n')
+                        script_file_id.write( '                --db-profile=READ-ONLY \\\n')
+                        script_file_id.write(f'                --dataset={current_code} \\\n')
+                        if current_code == 'nt':
+                            script_file_id.write(f'                --aligner=BLAST+ \\\n')
+                        else:
+                            script_file_id.write(f'                --aligner={alignment_tool} \\\n')
+                        if i == 0:
+                            script_file_id.write(f'                --seqs=$REIDENTIFIED_TRANSCRIPTOME_FILE{file_suffix} \\\n')
+                        else:
+                            script_file_id.write(f'                --seqs=${previus_code.upper()}_NON_ANNOTATED_TRANSCRIPT_FILE{file_suffix} \\\n')
                         script_file_id.write( '                --relationships=$TOA_TRANSCRIPTOME_RELATIONSHIP_FILE \\\n')
                         script_file_id.write( '                --relationships2=NONE \\\n')
-                        script_file_id.write( '                --out=$MERGED_BLAST_XML \\\n')
+                        if current_code == 'nt':
+                            script_file_id.write(f'                --annotation=$NT_VIRIDIPLANTAE_ANNOTATION_FILE{file_suffix} \\\n')
+                            script_file_id.write(f'                --annotation2=$NT_CONTAMINATION_ANNOTATION_FILE{file_suffix} \\\n')
+                            script_file_id.write(f'                --classification=$NT_CLASSIFICATION_FILE{file_suffix} \\\n')
+                        else:
+                            script_file_id.write(f'                --annotation=${current_code.upper()}_ANNOTATION_FILE{file_suffix} \\\n')
+                            script_file_id.write(f'                --annotation2=NONE \\\n')
+                            script_file_id.write(f'                --classification=NONE \\\n')
+                        script_file_id.write(f'                --nonann=${current_code.upper()}_NON_ANNOTATED_TRANSCRIPT_FILE{file_suffix} \\\n')
+                        script_file_id.write(f'                --workers={annotation_workers} \\\n')
+                        script_file_id.write(f'                --results-db={annotation_results_db} \\\n')
+                        script_file_id.write( '                --changed-since=${REANNOTATION_CHANGED_SINCE:-NONE} \\\n')
                         script_file_id.write( '                --verbose=N \\\n')
                         script_file_id.write( '                --trace=N\n')
                         script_file_id.write( '        RC=$?\n')
-                        script_file_id.write( '        if [ $RC -ne 0 ]; then manage_error restore-ids.py $RC; fi\n')
-                        script_file_id.write( '        echo "Identifications are restored."\n')
-                    script_file_id.write( '        touch $STEP_STATUS\n')
-                    script_file_id.write( '    fi\n')
-                    script_file_id.write( '}\n')
-                    script_file_id.write( '#-------------------------------------------------------------------------------\n')
-                    script_file_id.write(f'function load_alignment_{current_code}_proteome\n')
-                    script_file_id.write( '{\n')
-                    script_file_id.write( '    cd $OUTPUT_DIR\n')
-                    script_file_id.write(f'    STEP_STATUS=$STATUS_DIR/load_alignment_{current_code}_proteome.ok\n')
-                    script_file_id.write( '    echo "$SEP"\n')
-                    script_file_id.write(f'    echo "LOAD OF TRANSCRIPT ALIGNMENT TO {current_code.upper()} PROTEOME INTO TOA DATABASE"\n')
-                    script_file_id.write( '    if [ -f $STEP_STATUS ]; then\n')
-                    script_file_id.write( '        echo "This step was previously run."\n')
-                    script_file_id.write( '    else\n')
-                    script_file_id.write( '        echo "Loading alignmnet data ..."\n')
-                    script_file_id.write( '        /usr/bin/time \\\n')
-                    script_file_id.write( '            $MINICONDA_BIN_DIR/python3 $TOA_DIR/load-blast-data.py \\\n')
-                    script_file_id.write( '                --db=$TOA_DB \\\n')
-                    script_file_id.write(f'                --dataset={current_code} \\\n')
-                    script_file_id.write( '                --format=5 \\\n')
-                    script_file_id.write(f'                --blast=${current_code.upper()}_BLAST_XML \\\n')
-                    script_file_id.write( '                --verbose=N \\\n')
-                    script_file_id.write( '                --trace=N\n')
-                    script_file_id.write( '        RC=$?\n')
-                    script_file_id.write( '        if [ $RC -ne 0 ]; then manage_error load-blast-data.py $RC; fi\n')
-                    script_file_id.write( '        echo "Data are loaded."\n')
-                    script_file_id.write( '        touch $STEP_STATUS\n')
-                    script_file_id.write( '    fi\n')
-                    script_file_id.write( '}\n')
-                    script_file_id.write( '#-------------------------------------------------------------------------------\n')
-                    script_file_id.write(f'function annotate_transcripts_{current_code}\n')
-                    script_file_id.write( '{\n')
-                    script_file_id.write( '    cd $OUTPUT_DIR\n')
-                    script_file_id.write(f'    STEP_STATUS=$STATUS_DIR/annotate_transcripts_{current_code}.ok\n')
-                    script_file_id.write( '    echo "$SEP"\n')
-                    script_file_id.write(f'    echo "ANNOTATION OF TRANSCRIPTS WITH {current_code.upper()}"\n')
-                    script_file_id.write( '    if [ -f $STEP_STATUS ]; then\n')
-                    script_file_id.write( '        echo "This step was previously run."\n')
-                    script_file_id.write( '    else\n')
-                    script_file_id.write( '        echo "Annotating transcripts ..."\n')
-                    script_file_id.write( '        /usr/bin/time \\\n')
-                    script_file_id.write( '            $MINICONDA_BIN_DIR/python3 $TOA_DIR/annotate-sequences.py \\\n')
-                    script_file_id.write( '                --db=$TOA_DB \\\n')
-                    script_file_id.write(f'                --dataset={current_code} \\\n')
-                    if current_code == 'nt':
-                        script_file_id.write(f'                --aligner=BLAST+ \\\n')
-                    else:
-                        script_file_id.write(f'                --aligner={alignment_tool} \\\n')
-                    if i == 0:
-                        script_file_id.write( '                --seqs=$REIDENTIFIED_TRANSCRIPTOME_FILE \\\n')
-                    else:
-                        script_file_id.write(f'                --seqs=${previus_code.upper()}_NON_ANNOTATED_TRANSCRIPT_FILE \\\n')
-                    script_file_id.write( '                --relationships=$TOA_TRANSCRIPTOME_RELATIONSHIP_FILE \\\n')
-                    script_file_id.write( '                --relationships2=NONE \\\n')
-                    if current_code == 'nt':
-                        script_file_id.write(f'                --annotation=$NT_VIRIDIPLANTAE_ANNOTATION_FILE \\\n')
-                        script_file_id.write(f'                --annotation2=$NT_CONTAMINATION_ANNOTATION_FILE \\\n')
-                    else:
-                        script_file_id.write(f'                --annotation=${current_code.upper()}_ANNOTATION_FILE \\\n')
-                        script_file_id.write(f'                --annotation2=NONE \\\n')
-                    script_file_id.write(f'                --nonann=${current_code.upper()}_NON_ANNOTATED_TRANSCRIPT_FILE \\\n')
-                    script_file_id.write( '                --verbose=N \\\n')
-                    script_file_id.write( '                --trace=N\n')
-                    script_file_id.write( '        RC=$?\n')
-                    script_file_id.write( '        if [ $RC -ne 0 ]; then manage_error annotate-sequences.py $RC; fi\n')
-                    script_file_id.write( '        echo "Annotation is done."\n')
-                    if len(database_list) == 1:
-                        if current_code == 'nt':
-                            script_file_id.write( '        ANNOTATION_FILE_TMP=$NT_VIRIDIPLANTAE_ANNOTATION_FILE.tmp\n')
-                            script_file_id.write( '        echo "Deleting the header record of $NT_VIRIDIPLANTAE_ANNOTATION_FILE ..."\n')
+                        script_file_id.write( '        if [ $RC -ne 0 ]; then manage_error annotate-sequences.py $RC; fi\n')
+                        script_file_id.write( '        echo "Annotation is done."\n')
+                        if len(database_list) == 1 and chunks == 1:
+                            if current_code == 'nt':
+                                script_file_id.write( '        ANNOTATION_FILE_TMP=$NT_VIRIDIPLANTAE_ANNOTATION_FILE.tmp\n')
+                                script_file_id.write( '        echo "Deleting the header record of $NT_VIRIDIPLANTAE_ANNOTATION_FILE ..."\n')
+                                script_file_id.write( '        /usr/bin/time \\\n')
+                                script_file_id.write( '            tail -n +2 $NT_VIRIDIPLANTAE_ANNOTATION_FILE > $ANNOTATION_FILE_TMP\n')
+                            else:
+                                script_file_id.write(f'        ANNOTATION_FILE_TMP=${current_code.upper()}_ANNOTATION_FILE.tmp\n')
+                                script_file_id.write(f'        echo "Deleting the header record of ${current_code.upper()}_ANNOTATION_FILE ..."\n')
+                                script_file_id.write( '        /usr/bin/time \\\n')
+                                script_file_id.write(f'            tail -n +2 ${current_code.upper()}_ANNOTATION_FILE > $ANNOTATION_FILE_TMP\n')
+                            script_file_id.write( '        RC=$?\n')
+                            script_file_id.write( '        if [ $RC -ne 0 ]; then manage_error tail $RC; fi\n')
+                            script_file_id.write( '        echo "Record is deleted."\n')
+                            script_file_id.write( '        echo "Creating plant annotation file ..."\n')
                             script_file_id.write( '        /usr/bin/time \\\n')
-                            script_file_id.write( '            tail -n +2 $NT_VIRIDIPLANTAE_ANNOTATION_FILE > $ANNOTATION_FILE_TMP\n')
+                            script_file_id.write( '            $MINICONDA_BIN_DIR/python3 $TOA_DIR/merge-annotation-files.py \\\n')
+                            script_file_id.write( '            --file1=$ANNOTATION_FILE_TMP \\\n')
+                            script_file_id.write(f'            --type1={database_type_dict[database_list[0]]} \\\n')
+                            script_file_id.write( '            --file2=NONE \\\n')
+                            script_file_id.write( '            --type2=NONE \\\n')
+                            script_file_id.write( '            --operation=SAVE1 \\\n')
+                            script_file_id.write( '            --mfile=$PLANT_ANNOTATION_FILE \\\n')
+                            script_file_id.write( '            --header=Y \\\n')
+                            script_file_id.write( '            --results-db=$RESULTS_DB \\\n')
+                            script_file_id.write( '            --verbose=N \\\n')
+                            script_file_id.write( '            --trace=N\n')
+                            script_file_id.write( '        RC=$?\n')
+                            script_file_id.write( '        if [ $RC -ne 0 ]; then manage_error merge-annotation-files.py $RC; fi\n')
+                            script_file_id.write( '        echo "File is created."\n')
+                            script_file_id.write( '        echo "Deleting temporal file  ..."\n')
+                            script_file_id.write( '        /usr/bin/time \\\n')
+                            script_file_id.write( '            rm $ANNOTATION_FILE_TMP\n')
+                            script_file_id.write( '        RC=$?\n')
+                            script_file_id.write( '        if [ $RC -ne 0 ]; then manage_error rm $RC; fi\n')
+                            script_file_id.write( '        echo "File is deleted."\n')
+                        script_file_id.write( '        touch $STEP_STATUS\n')
+                        script_file_id.write( '    fi\n')
+                        script_file_id.write( '}\n')
+                if chunks > 1:
+                    for current_code in database_list:
+                        join_file_list = []
+                        if alignment_format != '5':
+                            join_file_list.append((f'${current_code.upper()}_BLAST_TSV', 'TSV', 'NONE'))
+                        if current_code == 'nt':
+                            join_file_list.append(('$NT_VIRIDIPLANTAE_ANNOTATION_FILE', 'ANNOTATION', '$RESULTS_DB'))
+                            join_file_list.append(('$NT_CONTAMINATION_ANNOTATION_FILE', 'ANNOTATION', '$RESULTS_DB'))
+                            join_file_list.append(('$NT_CLASSIFICATION_FILE', 'CSV', 'NONE'))
                         else:
-                            script_file_id.write(f'        ANNOTATION_FILE_TMP=${current_code.upper()}_ANNOTATION_FILE.tmp\n')
-                            script_file_id.write(f'        echo "Deleting the header record of ${current_code.upper()}_ANNOTATION_FILE ..."\n')
+                            join_file_list.append((f'${current_code.upper()}_ANNOTATION_FILE', 'ANNOTATION', '$RESULTS_DB'))
+                        join_file_list.append((f'${current_code.upper()}_NON_ANNOTATED_TRANSCRIPT_FILE', 'FASTA', 'NONE'))
+                        script_file_id.write( '#-------------------------------------------------------------------------------\n')
+                        script_file_id.write(f'function join_chunks_{current_code}\n')
+                        script_file_id.write( '{\n')
+                        script_file_id.write( '    cd $OUTPUT_DIR\n')
+                        script_file_id.write(f'    STEP_STATUS=$STATUS_DIR/join_chunks_{current_code}.ok\n')
+                        script_file_id.write( '    echo "$SEP"\n')
+                        script_file_id.write(f'    echo "JOIN OF CHUNK FILES OF {current_code.upper()}"\n')
+                        script_file_id.write( '    if [ -f $STEP_STATUS ]; then\n')
+                        script_file_id.write( '        echo "This step was previously run."\n')
+                        script_file_id.write( '    else\n')
+                        if alignment_format == '5':
+                            blast_xml_list = [f'${current_code.upper()}_BLAST_XML{xlib.get_chunk_file("", chunk)}' for chunk in chunk_list]
+                            script_file_id.write(f'        echo "Joining chunk files of `basename ${current_code.upper()}_BLAST_XML` ..."\n')
                             script_file_id.write( '        /usr/bin/time \\\n')
-                            script_file_id.write(f'            tail -n +2 ${current_code.upper()}_ANNOTATION_FILE > $ANNOTATION_FILE_TMP\n')
-                        script_file_id.write( '        RC=$?\n')
-                        script_file_id.write( '        if [ $RC -ne 0 ]; then manage_error tail $RC; fi\n')
-                        script_file_id.write( '        echo "Record is deleted."\n')
-                        script_file_id.write( '        echo "Creating plant annotation file ..."\n')
-                        script_file_id.write( '        /usr/bin/time \\\n')
-                        script_file_id.write( '            $MINICONDA_BIN_DIR/python3 $TOA_DIR/merge-annotation-files.py \\\n')
-                        script_file_id.write( '            --file1=$ANNOTATION_FILE_TMP \\\n')
-                        script_file_id.write(f'            --type1={database_type_dict[database_list[0]]} \\\n')
-                        script_file_id.write( '            --file2=NONE \\\n')
-                        script_file_id.write( '            --type2=NONE \\\n')
-                        script_file_id.write( '            --operation=SAVE1 \\\n')
-                        script_file_id.write( '            --mfile=$PLANT_ANNOTATION_FILE \\\n')
-                        script_file_id.write( '            --header=Y \\\n')
-                        script_file_id.write( '            --verbose=N \\\n')
-                        script_file_id.write( '            --trace=N\n')
-                        script_file_id.write( '        RC=$?\n')
-                        script_file_id.write( '        if [ $RC -ne 0 ]; then manage_error merge-annotation-files.py $RC; fi\n')
-                        script_file_id.write( '        echo "File is created."\n')
-                        script_file_id.write( '        echo "Deleting temporal file  ..."\n')
-                        script_file_id.write( '        /usr/bin/time \\\n')
-                        script_file_id.write( '            rm $ANNOTATION_FILE_TMP\n')
-                        script_file_id.write( '        RC=$?\n')
-                        script_file_id.write( '        if [ $RC -ne 0 ]; then manage_error rm $RC; fi\n')
-                        script_file_id.write( '        echo "File is deleted."\n')
-                    script_file_id.write( '        touch $STEP_STATUS\n')
-                    script_file_id.write( '    fi\n')
-                    script_file_id.write( '}\n')
-                if len(database_list) > 1:
+                            script_file_id.write( '            $MINICONDA_BIN_DIR/python3 $TOA_DIR/merge-xml-files.py \\\n')
+                            script_file_id.write(f'                --list={",".join(blast_xml_list)} \\\n')
+                            script_file_id.write( '                --relationships=NONE \\\n')
+                            script_file_id.write( '                --relationships2=NONE \\\n')
+                            script_file_id.write(f'                --mfile=${current_code.upper()}_BLAST_XML \\\n')
+                            script_file_id.write( '                --verbose=N \\\n')
+                            script_file_id.write( '                --trace=N\n')
+                            script_file_id.write( '        RC=$?\n')
+                            script_file_id.write( '        if [ $RC -ne 0 ]; then manage_error merge-xml-files.py $RC; fi\n')
+                            script_file_id.write( '        echo "Files are joined."\n')
+                        for (join_file, join_format, join_results_db) in join_file_list:
+                            script_file_id.write(f'        echo "Joining chunk files of `basename {join_file}` ..."\n')
+                            script_file_id.write( '        /usr/bin/time \\\n')
+                            script_file_id.write( '            $MINICONDA_BIN_DIR/python3 $TOA_DIR/join-chunk-files.py \\\n')
+                            script_file_id.write(f'                --file={join_file} \\\n')
+                            script_file_id.write( '                --chunks=$CHUNKS \\\n')
+                            script_file_id.write(f'                --format={join_format} \\\n')
+                            script_file_id.write(f'                --results-db={join_results_db} \\\n')
+                            script_file_id.write( '                --verbose=N \\\n')
+                            script_file_id.write( '                --trace=N\n')
+                            script_file_id.write( '        RC=$?\n')
+                            script_file_id.write( '        if [ $RC -ne 0 ]; then manage_error join-chunk-files.py $RC; fi\n')
+                            script_file_id.write( '        echo "Files are joined."\n')
+                        script_file_id.write( '        touch $STEP_STATUS\n')
+                        script_file_id.write( '    fi\n')
+                        script_file_id.write( '}\n')
+                if len(database_list) > 1 or chunks > 1:
                     script_file_id.write( '#-------------------------------------------------------------------------------\n')
                     script_file_id.write( 'function merge_alignment_files\n')
                     script_file_id.write( '{\n')
@@ -7228,19 +7464,39 @@ def build_nucleotide_pipeline_script(current_run_dir):
                     script_file_id.write( '        echo "This step was previously run."\n')
                     script_file_id.write( '    else\n')
                     script_file_id.write( '        echo "Merging alignment files ..."\n')
-                    script_file_id.write( '        /usr/bin/time \\\n')
-                    script_file_id.write( '            $MINICONDA_BIN_DIR/python3 $TOA_DIR/merge-xml-files.py \\\n')
-                    blast_xml_list = []
-                    for database_code in database_list:
-                        blast_xml_list.append(f'${database_code.upper()}_BLAST_XML')
-                    script_file_id.write(f'                --list={",".join(blast_xml_list)} \\\n')
-                    script_file_id.write( '                --relationships=$TOA_TRANSCRIPTOME_RELATIONSHIP_FILE \\\n')
-                    script_file_id.write( '                --relationships2=NONE \\\n')
-                    script_file_id.write( '                --mfile=$MERGED_BLAST_XML \\\n')
-                    script_file_id.write( '                --verbose=N \\\n')
-                    script_file_id.write( '                --trace=N\n')
-                    script_file_id.write( '        RC=$?\n')
-                    script_file_id.write( '        if [ $RC -ne 0 ]; then manage_error merge-xml-files.py $RC; fi\n')
+                    if alignment_format == '5':
+                        script_file_id.write( '        /usr/bin/time \\\n')
+                        script_file_id.write( '            $MINICONDA_BIN_DIR/python3 $TOA_DIR/merge-xml-files.py \\\n')
+                        blast_xml_list = []
+                        for database_code in database_list:
+                            blast_xml_list.append(f'${database_code.upper()}_BLAST_XML')
+                        script_file_id.write(f'                --list={",".join(blast_xml_list)} \\\n')
+                        script_file_id.write( '                --relationships=$TOA_TRANSCRIPTOME_RELATIONSHIP_FILE \\\n')
+                        script_file_id.write( '                --relationships2=NONE \\\n')
+                        script_file_id.write( '                --mfile=$MERGED_BLAST_XML \\\n')
+                        script_file_id.write( '                --verbose=N \\\n')
+                        script_file_id.write( '                --trace=N\n')
+                        script_file_id.write( '        RC=$?\n')
+                        script_file_id.write( '        if [ $RC -ne 0 ]; then manage_error merge-xml-files.py $RC; fi\n')
+                    else:
+                        blast_tsv_list = []
+                        for database_code in database_list:
+                            blast_tsv_list.append(f'${database_code.upper()}_BLAST_TSV')
+                        script_file_id.write(f'        cat {" ".join(blast_tsv_list)} > $MERGED_BLAST_TSV".tmp"\n')
+                        script_file_id.write( '        RC=$?\n')
+                        script_file_id.write( '        if [ $RC -ne 0 ]; then manage_error cat $RC; fi\n')
+                        script_file_id.write( '        /usr/bin/time \\\n')
+                        script_file_id.write( '            $MINICONDA_BIN_DIR/python3 $TOA_DIR/restore-ids.py \\\n')
+                        script_file_id.write( '                --in=$MERGED_BLAST_TSV".tmp" \\\n')
+                        script_file_id.write( '                --format=TSV \\\n')
+                        script_file_id.write( '                --relationships=$TOA_TRANSCRIPTOME_RELATIONSHIP_FILE \\\n')
+                        script_file_id.write( '                --relationships2=NONE \\\n')
+                        script_file_id.write( '                --out=$MERGED_BLAST_TSV \\\n')
+                        script_file_id.write( '                --verbose=N \\\n')
+                        script_file_id.write( '                --trace=N\n')
+                        script_file_id.write( '        RC=$?\n')
+                        script_file_id.write( '        if [ $RC -ne 0 ]; then manage_error restore-ids.py $RC; fi\n')
+                        script_file_id.write( '        rm -f $MERGED_BLAST_TSV".tmp"\n')
                     script_file_id.write( '        echo "Files are merged."\n')
                     script_file_id.write( '        touch $STEP_STATUS\n')
                     script_file_id.write( '    fi\n')
@@ -7258,108 +7514,49 @@ def build_nucleotide_pipeline_script(current_run_dir):
                     for database_code in database_list2:
                         script_file_id.write(f'        {database_code.upper()}_ANNOTATION_FILE_TMP=${database_code.upper()}_ANNOTATION_FILE".tmp"\n')
                         script_file_id.write(f'        {database_code.upper()}_ANNOTATION_FILE_SORTED=${database_code.upper()}_ANNOTATION_FILE".sorted"\n')
-                    tmp_file_list = []
-                    for i in range(len(database_list2) - 2):
-                        script_file_id.write(f'        MERGED_ANNOTATION_FILE_TMP{i + 1}=$MERGED_ANNOTATION_FILE".tmp{i + 1}"\n')
-                        tmp_file_list.append(f'$MERGED_ANNOTATION_FILE_TMP{i + 1}')
-                    script_file_id.write(f'        echo "Deleting the header record of `basename ${database_list2[0].upper()}_ANNOTATION_FILE` ..."\n')
-                    script_file_id.write( '        /usr/bin/time \\\n')
-                    script_file_id.write(f'            tail -n +2 ${database_list2[0].upper()}_ANNOTATION_FILE > ${database_list2[0].upper()}_ANNOTATION_FILE_TMP\n')
-                    script_file_id.write( '        RC=$?\n')
-                    script_file_id.write( '        if [ $RC -ne 0 ]; then manage_error tail $RC; fi\n')
-                    script_file_id.write( '        echo "Record is deleted."\n')
-                    script_file_id.write(f'        echo "Sorting data records of `basename ${database_list2[0].upper()}_ANNOTATION_FILE` ..."\n')
-                    script_file_id.write( '        /usr/bin/time \\\n')
-                    script_file_id.write(f'            sort --field-separator=";" --key=2,5 < ${database_list2[0].upper()}_ANNOTATION_FILE_TMP > ${database_list2[0].upper()}_ANNOTATION_FILE_SORTED\n')
-                    script_file_id.write( '        RC=$?\n')
-                    script_file_id.write( '        if [ $RC -ne 0 ]; then manage_error sort $RC; fi\n')
-                    script_file_id.write( '        echo "Records are sorted."\n')
-                    script_file_id.write(f'        echo "Deleting the header record of `basename ${database_list2[1].upper()}_ANNOTATION_FILE` ..."\n')
-                    script_file_id.write( '        /usr/bin/time \\\n')
-                    script_file_id.write(f'            tail -n +2 ${database_list2[1].upper()}_ANNOTATION_FILE > ${database_list2[1].upper()}_ANNOTATION_FILE_TMP\n')
-                    script_file_id.write( '        RC=$?\n')
-                    script_file_id.write( '        echo "Record is deleted."\n')
-                    script_file_id.write( '        if [ $RC -ne 0 ]; then manage_error tail $RC; fi\n')
-                    script_file_id.write(f'        echo "Sorting data records of `basename ${database_list2[1].upper()}_ANNOTATION_FILE` ..."\n')
-                    script_file_id.write( '        /usr/bin/time \\\n')
-                    script_file_id.write(f'            sort --field-separator=";" --key=2,5 < ${database_list2[1].upper()}_ANNOTATION_FILE_TMP > ${database_list2[1].upper()}_ANNOTATION_FILE_SORTED\n')
-                    script_file_id.write( '        RC=$?\n')
-                    script_file_id.write( '        if [ $RC -ne 0 ]; then manage_error sort $RC; fi\n')
-                    script_file_id.write( '        echo "Records are sorted."\n')
-                    script_file_id.write(f'        echo "Merging `basename ${database_list2[0].upper()}_ANNOTATION_FILE` and `basename ${database_list2[1].upper()}_ANNOTATION_FILE` ..."\n')
+                    for database_code in database_list2:
+                        script_file_id.write(f'        echo "Checking the manifest of `basename ${database_code.upper()}_ANNOTATION_FILE` ..."\n')
+                        script_file_id.write(f'        if $MINICONDA_BIN_DIR/python3 $TOA_DIR/check-annotation-manifest.py --annotation=${database_code.upper()}_ANNOTATION_FILE --verbose=N --trace=N; then\n')
+                        script_file_id.write(f'            {database_code.upper()}_ANNOTATION_FILE_SORTED=${database_code.upper()}_ANNOTATION_FILE\n')
+                        script_file_id.write( '        else\n')
+                        script_file_id.write(f'            echo "Deleting the header record of `basename ${database_code.upper()}_ANNOTATION_FILE` ..."\n')
+                        script_file_id.write( '            /usr/bin/time \\\n')
+                        script_file_id.write(f'                tail -n +2 ${database_code.upper()}_ANNOTATION_FILE > ${database_code.upper()}_ANNOTATION_FILE_TMP\n')
+                        script_file_id.write( '            RC=$?\n')
+                        script_file_id.write( '            if [ $RC -ne 0 ]; then manage_error tail $RC; fi\n')
+                        script_file_id.write( '            echo "Record is deleted."\n')
+                        script_file_id.write(f'            echo "Sorting data records of `basename ${database_code.upper()}_ANNOTATION_FILE` ..."\n')
+                        script_file_id.write( '            /usr/bin/time \\\n')
+                        script_file_id.write(f'                sort --field-separator=";" --key=2,5 < ${database_code.upper()}_ANNOTATION_FILE_TMP > ${database_code.upper()}_ANNOTATION_FILE_SORTED\n')
+                        script_file_id.write( '            RC=$?\n')
+                        script_file_id.write( '            if [ $RC -ne 0 ]; then manage_error sort $RC; fi\n')
+                        script_file_id.write( '            echo "Records are sorted."\n')
+                        script_file_id.write( '        fi\n')
+                    sorted_file_list = [f'${database_code.upper()}_ANNOTATION_FILE_SORTED' for database_code in database_list2]
+                    type_list = [database_type_dict[database_code] for database_code in database_list]
+                    script_file_id.write( '        echo "Merging annotation files ..."\n')
                     script_file_id.write( '        /usr/bin/time \\\n')
                     script_file_id.write( '            $MINICONDA_BIN_DIR/python3 $TOA_DIR/merge-annotation-files.py \\\n')
-                    script_file_id.write(f'                --file1=${database_list2[0].upper()}_ANNOTATION_FILE_SORTED \\\n')
-                    script_file_id.write(f'                --type1={database_type_dict[database_list[0]]} \\\n')
-                    script_file_id.write(f'                --file2=${database_list2[1].upper()}_ANNOTATION_FILE_SORTED \\\n')
-                    script_file_id.write(f'                --type2={database_type_dict[database_list[1]]} \\\n')
-                    script_file_id.write( '                --operation=1AND2 \\\n')
-                    if len(database_list2) > 2:
-                        script_file_id.write( '                --mfile=$MERGED_ANNOTATION_FILE_TMP1 \\\n')
-                        script_file_id.write( '                --header=N \\\n')
-                    else:
-                        script_file_id.write( '                --mfile=$PLANT_ANNOTATION_FILE \\\n')
-                        script_file_id.write( '                --header=Y \\\n')
+                    script_file_id.write(f'                --list={",".join(sorted_file_list)} \\\n')
+                    script_file_id.write(f'                --types={",".join(type_list)} \\\n')
+                    script_file_id.write( '                --operation=ALL \\\n')
+                    script_file_id.write( '                --mfile=$PLANT_ANNOTATION_FILE \\\n')
+                    script_file_id.write( '                --header=Y \\\n')
+                    script_file_id.write( '                --results-db=$RESULTS_DB \\\n')
                     script_file_id.write( '                --verbose=N \\\n')
                     script_file_id.write( '                --trace=N\n')
                     script_file_id.write( '        RC=$?\n')
                     script_file_id.write( '        if [ $RC -ne 0 ]; then manage_error merge-annotation-files.py $RC; fi\n')
                     script_file_id.write( '        echo "Files are merged."\n')
-                    script_file_id.write(f'        echo "Deleting temporal files of `basename ${database_list2[0].upper()}_ANNOTATION_FILE` ..."\n')
-                    script_file_id.write( '        /usr/bin/time \\\n')
-                    script_file_id.write(f'            rm ${database_list2[0].upper()}_ANNOTATION_FILE_TMP ${database_list2[0].upper()}_ANNOTATION_FILE_SORTED\n')
-                    script_file_id.write( '        RC=$?\n')
-                    script_file_id.write( '        if [ $RC -ne 0 ]; then manage_error rm $RC; fi\n')
-                    script_file_id.write( '        echo "Files are deleted."\n')
-                    script_file_id.write(f'        echo "Deleting temporal files of `basename ${database_list2[1].upper()}_ANNOTATION_FILE` ..."\n')
-                    script_file_id.write( '        /usr/bin/time \\\n')
-                    script_file_id.write(f'            rm ${database_list2[1].upper()}_ANNOTATION_FILE_TMP ${database_list2[1].upper()}_ANNOTATION_FILE_SORTED\n')
-                    script_file_id.write( '        RC=$?\n')
-                    script_file_id.write( '        if [ $RC -ne 0 ]; then manage_error rm $RC; fi\n')
-                    script_file_id.write( '        echo "Files are deleted."\n')
-                    for i in range(2, len(database_list2)):
-                        script_file_id.write(f'        echo "Deleting the header record of `basename ${database_list2[i].upper()}_ANNOTATION_FILE` ..."\n')
-                        script_file_id.write( '        /usr/bin/time \\\n')
-                        script_file_id.write(f'            tail -n +2 ${database_list2[i].upper()}_ANNOTATION_FILE > ${database_list2[i].upper()}_ANNOTATION_FILE_TMP\n')
-                        script_file_id.write( '        RC=$?\n')
-                        script_file_id.write( '        echo "Record is deleted."\n')
-                        script_file_id.write( '        if [ $RC -ne 0 ]; then manage_error tail $RC; fi\n')
-                        script_file_id.write(f'        echo "Sorting data records of `basename ${database_list2[i].upper()}_ANNOTATION_FILE` ..."\n')
-                        script_file_id.write( '        /usr/bin/time \\\n')
-                        script_file_id.write(f'            sort --field-separator=";" --key=2,5 < ${database_list2[i].upper()}_ANNOTATION_FILE_TMP > ${database_list2[i].upper()}_ANNOTATION_FILE_SORTED\n')
-                        script_file_id.write( '        RC=$?\n')
-                        script_file_id.write( '        if [ $RC -ne 0 ]; then manage_error sort $RC; fi\n')
-                        script_file_id.write( '        echo "Records are sorted."\n')
-                        script_file_id.write(f'        echo "Adding annotation of `basename ${database_list2[i].upper()}_ANNOTATION_FILE` to the merged annotation file ..."\n')
-                        script_file_id.write( '        /usr/bin/time \\\n')
-                        script_file_id.write( '            $MINICONDA_BIN_DIR/python3 $TOA_DIR/merge-annotation-files.py \\\n')
-                        script_file_id.write(f'                --file1=$MERGED_ANNOTATION_FILE_TMP{i - 1} \\\n')
-                        script_file_id.write( '                --type1=MERGER \\\n')
-                        script_file_id.write(f'                --file2=${database_list2[i].upper()}_ANNOTATION_FILE_SORTED \\\n')
-                        script_file_id.write(f'                --type2={database_type_dict[database_list[i]]} \\\n')
-                        script_file_id.write( '                --operation=1AND2 \\\n')
-                        if i < len(database_list2) - 1:
-                            script_file_id.write(f'                --mfile=$MERGED_ANNOTATION_FILE_TMP{i} \\\n')
-                            script_file_id.write( '                --header=N \\\n')
-                        else:
-                            script_file_id.write( '                --mfile=$PLANT_ANNOTATION_FILE \\\n')
-                            script_file_id.write( '                --header=Y \\\n')
-                        script_file_id.write( '                --verbose=N \\\n')
-                        script_file_id.write( '                --trace=N\n')
-                        script_file_id.write( '        RC=$?\n')
-                        script_file_id.write( '        if [ $RC -ne 0 ]; then manage_error merge-annotation-files.py $RC; fi\n')
-                        script_file_id.write( '        echo "Files are merged."\n')
-                        script_file_id.write(f'        echo "Deleting temporal files of `basename ${database_list2[i].upper()}_ANNOTATION_FILE` ..."\n')
-                        script_file_id.write( '        /usr/bin/time \\\n')
-                        script_file_id.write(f'            rm ${database_list2[i].upper()}_ANNOTATION_FILE_TMP ${database_list2[i].upper()}_ANNOTATION_FILE_SORTED\n')
-                        script_file_id.write( '        RC=$?\n')
-                        script_file_id.write( '        if [ $RC -ne 0 ]; then manage_error rm $RC; fi\n')
-                        script_file_id.write( '        echo "Files are deleted."\n')
-                    script_file_id.write( '        echo "Deleting temporal annotation files ..."\n')
-                    script_file_id.write( '        /usr/bin/time \\\n')
-                    script_file_id.write(f'            rm {" ".join(tmp_file_list)}\n')
-                    script_file_id.write( '        if [ $RC -ne 0 ]; then manage_error rm $RC; fi\n')
-                    script_file_id.write( '        echo "Files are deleted."\n')
+                    for database_code in database_list2:
+                        script_file_id.write(f'        if [ "${database_code.upper()}_ANNOTATION_FILE_SORTED" != "${database_code.upper()}_ANNOTATION_FILE" ]; then\n')
+                        script_file_id.write(f'            echo "Deleting temporal files of `basename ${database_code.upper()}_ANNOTATION_FILE` ..."\n')
+                        script_file_id.write( '            /usr/bin/time \\\n')
+                        script_file_id.write(f'                rm ${database_code.upper()}_ANNOTATION_FILE_TMP ${database_code.upper()}_ANNOTATION_FILE_SORTED\n')
+                        script_file_id.write( '            RC=$?\n')
+                        script_file_id.write( '            if [ $RC -ne 0 ]; then manage_error rm $RC; fi\n')
+                        script_file_id.write( '            echo "Files are deleted."\n')
+                        script_file_id.write( '        fi\n')
                     script_file_id.write( '        touch $STEP_STATUS\n')
                     script_file_id.write( '    fi\n')
                     script_file_id.write( '}\n')
@@ -7439,6 +7636,7 @@ def build_nucleotide_pipeline_script(current_run_dir):
                     script_file_id.write(f'                --annotation=${database_list[0].upper()}_ANNOTATION_FILE \\\n')
                     script_file_id.write(f'                --type={database_type_dict[database_list[0]]} \\\n')
                 script_file_id.write( '                --stats=$ANNOTATION_STATS_FILE \\\n')
+                script_file_id.write( '                --results-db=$RESULTS_DB \\\n')
                 script_file_id.write( '                --verbose=N \\\n')
                 script_file_id.write( '                --trace=N\n')
                 script_file_id.write( '        RC=$?\n')
@@ -7448,6 +7646,24 @@ def build_nucleotide_pipeline_script(current_run_dir):
                 script_file_id.write( '    fi\n')
                 script_file_id.write( '}\n')
                 script_file_id.write( '#-------------------------------------------------------------------------------\n')
+                script_file_id.write( 'function run_steps\n')
+                script_file_id.write( '{\n')
+                script_file_id.write( '    cd $OUTPUT_DIR\n')
+                script_file_id.write( '    echo "$SEP"\n')
+                script_file_id.write( '    echo "Running pipeline steps ..."\n')
+                script_file_id.write( '    $MINICONDA_BIN_DIR/python3 $TOA_DIR/run-pipeline-steps.py \\\n')
+                script_file_id.write(f'        --script=$OUTPUT_DIR/{os.path.basename(get_nucleotide_pipeline_script())} \\\n')
+                script_file_id.write( '        --steps=$STEP_FILE \\\n')
+                script_file_id.write( '        --rundir=$OUTPUT_DIR \\\n')
+                script_file_id.write( '        --threads=$THREADS \\\n')
+                script_file_id.write( '        --verbose=N \\\n')
+                script_file_id.write( '        --trace=N\n')
+                script_file_id.write( '    RC=$?\n')
+                script_file_id.write( '    if [ $RC -ne 0 ]; then manage_error run-pipeline-steps.py $RC; fi\n')
+                script_file_id.write( '    echo "$SEP"\n')
+                script_file_id.write( '    echo "Pipeline steps are run."\n')
+                script_file_id.write( '}\n')
+                script_file_id.write( '#-------------------------------------------------------------------------------\n')
                 script_file_id.write( 'function end\n')
                 script_file_id.write( '{\n')
                 script_file_id.write( '    END_DATETIME=`date +%s`\n')
@@ -7482,33 +7698,17 @@ def build_nucleotide_pipeline_script(current_run_dir):
                 script_file_id.write( '    FORMATTED_DURATION=`printf "%03d:%02d:%02d\\n" $HH $MM $SS`\n')
                 script_file_id.write( '}\n')
                 script_file_id.write( '#-------------------------------------------------------------------------------\n')
+                script_file_id.write( '# run only the step passed as argument (the script is called with a step by the step executor)\n')
+                script_file_id.write( 'if [ $# -eq 1 ]; then\n')
+                script_file_id.write( '    INIT_DATETIME=`date +%s`\n')
+                script_file_id.write( '    $1\n')
+                script_file_id.write( '    exit 0\n')
+                script_file_id.write( 'fi\n')
+                script_file_id.write( '#-------------------------------------------------------------------------------\n')
                 script_file_id.write( 'init\n')
                 script_file_id.write( '\n')
-                script_file_id.write( '# re-identify sequences of the transcriptome file\n')
-                script_file_id.write( 'reidentify_transcript_sequences\n')
-                script_file_id.write( '\n')
-                for i in range(len(database_list)):
-                    current_code = database_list[i]
-                    previus_code = database_list[i - 1] if i > 0 else ''
-                    if i == 0:
-                        script_file_id.write(f'# complete transcriptome -> {current_code}\n')
-                    else:
-                        script_file_id.write(f'# transcripts not annotated with {previus_code} -> {current_code}\n')
-                    script_file_id.write(f'align_transcripts_{current_code}_proteome\n')
-                    script_file_id.write(f'load_alignment_{current_code}_proteome\n')
-                    script_file_id.write(f'annotate_transcripts_{current_code}\n')
-                    script_file_id.write( '\n')
-                if len(database_list) > 1:
-                    script_file_id.write( '# merged files\n')
-                    script_file_id.write( 'merge_alignment_files\n')
-                    script_file_id.write( 'merge_annotation_files\n')
-                    script_file_id.write( '# -- split_merged_plant_annotation_file\n')
-                    script_file_id.write( '\n')
-                script_file_id.write( '# transcriptome with plant transcripts\n')
-                script_file_id.write( 'purge_transcriptome\n')
-                script_file_id.write( '\n')
-                script_file_id.write( '# annotation statistics\n')
-                script_file_id.write( 'calculate_annotation_stats\n')
+                script_file_id.write( '# run the pipeline steps declared in the step file (the steps with ready inputs run concurrently)\n')
+                script_file_id.write( 'run_steps\n')
                 script_file_id.write( '\n')
                 script_file_id.write( 'end\n')
         except Exception as e:
@@ -7516,6 +7716,110 @@ def build_nucleotide_pipeline_script(current_run_dir):
             error_list.append(f'*** ERROR: The file {get_nucleotide_pipeline_script()} can not be created.')
             OK = False
 
+    # build the step file
+    if OK:
+        step_list = get_nucleotide_pipeline_step_list(database_list, database_list2, blast_file_suffix, threads, chunks)
+        (OK, error_list) = build_pipeline_step_file(current_run_dir, step_list)
+
+    # return the control variable and the error list
+    return (OK, error_list)
+
+#-------------------------------------------------------------------------------
+
+def get_nucleotide_pipeline_step_list(database_list, database_list2, blast_file_suffix, threads, chunks):
+    '''
+    Get the step list of a nucleotide pipeline with the inputs, outputs and thread number of each step.
+    '''
+
+    # initialize the step list
+    step_list = []
+
+    # get the chunk list (0 when the chunked mode is not used) and the thread number of the alignment and annotation steps
+    # (the annotation steps use the thread number of their workers, so a single-thread step can run alongside them)
+    chunk_list = [0] if chunks == 1 else list(range(1, chunks + 1))
+    alignment_threads = int(threads) if chunks == 1 else max(int(threads) - 1, 1)
+    annotation_threads = max(int(threads) - 1, 1) if chunks == 1 else 1
+
+    # re-identify sequences of the transcriptome file
+    step_list.append({'name': 'reidentify_transcript_sequences', 'input_list': ['TRANSCRIPTOME_FILE'], 'output_list': ['REIDENTIFIED_TRANSCRIPTOME_FILE', 'TOA_TRANSCRIPTOME_RELATIONSHIP_FILE'], 'threads': 1})
+
+    # split the re-identified transcriptome file in chunks (chunked mode)
+    if chunks > 1:
+        step_list.append({'name': 'split_transcriptome_file', 'input_list': ['REIDENTIFIED_TRANSCRIPTOME_FILE'], 'output_list': [f'REIDENTIFIED_TRANSCRIPTOME_FILE{xlib.get_chunk_file("", chunk)}' for chunk in chunk_list], 'threads': 1})
+
+    # align, load and annotate the sequences of each chunk (or all of them when the chunked mode is not used) with each database
+    # (sequences of the chunk or sequences not annotated with the previous database)
+    for chunk in chunk_list:
+        step_suffix = '' if chunk == 0 else f'_chunk{chunk}'
+        file_suffix = '' if chunk == 0 else xlib.get_chunk_file('', chunk)
+        for i in range(len(database_list)):
+            current_code = database_list[i]
+            seq_file = f'REIDENTIFIED_TRANSCRIPTOME_FILE{file_suffix}' if i == 0 else f'{database_list[i - 1].upper()}_NON_ANNOTATED_TRANSCRIPT_FILE{file_suffix}'
+            alignment_input_list = [seq_file]
+            alignment_output_list = [f'{current_code.upper()}_BLAST_{blast_file_suffix}{file_suffix}']
+            load_input_list = [f'{current_code.upper()}_BLAST_{blast_file_suffix}{file_suffix}'] + ([] if chunk == 0 else [seq_file])
+            annotation_output_list = ['NT_VIRIDIPLANTAE_ANNOTATION_FILE', 'NT_CONTAMINATION_ANNOTATION_FILE', 'NT_CLASSIFICATION_FILE'] if current_code == 'nt' else [f'{current_code.upper()}_ANNOTATION_FILE']
+            annotation_output_list = [f'{annotation_output}{file_suffix}' for annotation_output in annotation_output_list] + [f'{current_code.upper()}_NON_ANNOTATED_TRANSCRIPT_FILE{file_suffix}']
+            if chunks == 1:
+                annotation_output_list.append('RESULTS_DB')
+            if len(database_list) == 1 and chunks == 1:
+                alignment_input_list += ['TOA_TRANSCRIPTOME_RELATIONSHIP_FILE']
+                alignment_output_list.append(f'MERGED_BLAST_{blast_file_suffix}')
+                annotation_output_list.append('PLANT_ANNOTATION_FILE')
+            step_list.append({'name': f'align_transcripts_{current_code}_proteome{step_suffix}', 'input_list': alignment_input_list, 'output_list': alignment_output_list, 'dataset': current_code, 'threads': alignment_threads})
+            step_list.append({'name': f'load_alignment_{current_code}_proteome{step_suffix}', 'input_list': load_input_list, 'output_list': ['TOA_DB'], 'dataset': current_code, 'threads': 1})
+            step_list.append({'name': f'annotate_transcripts_{current_code}{step_suffix}', 'input_list': ['TOA_DB', seq_file, 'TOA_TRANSCRIPTOME_RELATIONSHIP_FILE'], 'output_list': annotation_output_list, 'dataset': current_code, 'threads': annotation_threads})
+
+    # join the chunk files of each database in the database files (chunked mode)
+    if chunks > 1:
+        for current_code in database_list:
+            join_file_list = [f'{current_code.upper()}_BLAST_{blast_file_suffix}']
+            join_file_list += ['NT_VIRIDIPLANTAE_ANNOTATION_FILE', 'NT_CONTAMINATION_ANNOTATION_FILE', 'NT_CLASSIFICATION_FILE'] if current_code == 'nt' else [f'{current_code.upper()}_ANNOTATION_FILE']
+            join_file_list.append(f'{current_code.upper()}_NON_ANNOTATED_TRANSCRIPT_FILE')
+            step_list.append({'name': f'join_chunks_{current_code}', 'input_list': [f'{join_file}{xlib.get_chunk_file("", chunk)}' for join_file in join_file_list for chunk in chunk_list], 'output_list': join_file_list + ['RESULTS_DB'], 'dataset': current_code, 'threads': 1})
+
+    # merge the alignment and annotation files
+    if len(database_list) > 1 or chunks > 1:
+        step_list.append({'name': 'merge_alignment_files', 'input_list': [f'{database_code.upper()}_BLAST_{blast_file_suffix}' for database_code in database_list] + ['TOA_TRANSCRIPTOME_RELATIONSHIP_FILE'], 'output_list': [f'MERGED_BLAST_{blast_file_suffix}'], 'threads': 1})
+        step_list.append({'name': 'merge_annotation_files', 'input_list': [f'{database_code.upper()}_ANNOTATION_FILE' for database_code in database_list2], 'output_list': ['PLANT_ANNOTATION_FILE', 'RESULTS_DB'], 'threads': 1})
+
+    # purge the transcriptome removing the non-annotated transcripts
+    step_list.append({'name': 'purge_transcriptome', 'input_list': ['REIDENTIFIED_TRANSCRIPTOME_FILE', f'{database_list[len(database_list) - 1].upper()}_NON_ANNOTATED_TRANSCRIPT_FILE', 'TOA_TRANSCRIPTOME_RELATIONSHIP_FILE'], 'output_list': ['PURGED_TRANSCRIPTOME_FILE'], 'threads': 1})
+
+    # calculate the annotation statistics
+    step_list.append({'name': 'calculate_annotation_stats', 'input_list': ['TOA_DB', 'TRANSCRIPTOME_FILE', 'PLANT_ANNOTATION_FILE', 'RESULTS_DB'] + [f'{database_code.upper()}_NON_ANNOTATED_TRANSCRIPT_FILE' for database_code in database_list], 'output_list': ['ANNOTATION_STATS_FILE'], 'threads': 1})
+
+    # return the step list
+    return step_list
+
+#-------------------------------------------------------------------------------
+
+def build_pipeline_step_file(current_run_dir, step_list):
+    '''
+    Build the step file of a pipeline process: a section by step, in the order of a sequential run, with its
+    inputs and outputs (the script variables of the files and databases read and written by the step), its
+    thread number and the dataset that it processes (NONE when it is not a dataset step).
+    '''
+
+    # initialize the control variable and the error list
+    OK = True
+    error_list = []
+
+    # write the step file
+    try:
+        with open(xlib.get_pipeline_step_file(current_run_dir), mode='w', encoding='iso-8859-1', newline='\n') as file_id:
+            for step_dict in step_list:
+                file_id.write(f'[{step_dict["name"]}]\n')
+                file_id.write(f'inputs = {",".join(step_dict["input_list"])}\n')
+                file_id.write(f'outputs = {",".join(step_dict["output_list"])}\n')
+                file_id.write(f'threads = {step_dict["threads"]}\n')
+                file_id.write(f'dataset = {step_dict.get("dataset", "NONE")}\n')
+                file_id.write( '\n')
+    except Exception as e:
+        error_list.append(f'*** EXCEPTION: "{e}".')
+        error_list.append(f'*** ERROR: The file {xlib.get_pipeline_step_file(current_run_dir)} can not be created.')
+        OK = False
+
     # return the control variable and the error list
     return (OK, error_list)
 
@@ -7597,7 +7901,10 @@ def build_aminoacid_pipeline_script(current_run_dir):
     transcriptome_dir = pipeline_option_dict['identification']['transcriptome_dir']
     transcriptome_file = pipeline_option_dict['identification']['transcriptome_file']
     alignment_tool = pipeline_option_dict['pipeline parameters']['alignment_tool']
+    alignment_format = pipeline_option_dict['pipeline parameters'].get('alignment_format', '5')
     threads = pipeline_option_dict['pipeline parameters']['threads']
+    chunks = int(pipeline_option_dict['pipeline parameters'].get('chunks', '1'))
+    alignment_cache = pipeline_option_dict['pipeline parameters'].get('alignment_cache', 'N').upper()
     blastplus_evalue = pipeline_option_dict['BLAST+ parameters']['evalue']
     blastplus_max_target_seqs = pipeline_option_dict['BLAST+ parameters']['max_target_seqs']
     blastplus_max_hsps = pipeline_option_dict['BLAST+ parameters']['max_hsps']
@@ -7636,6 +7943,23 @@ def build_aminoacid_pipeline_script(current_run_dir):
     for database in database_list:
         non_annotation_file_list.append(f'${database.upper()}_NON_ANNOTATED_PEPTIDE_FILE')
 
+    # get the chunk list (0 when the chunked mode is not used), the aligner threads and the annotation workers
+    # (in the chunked mode, a thread is reserved to load and annotate a chunk while the aligner processes the next one;
+    # otherwise, a thread is reserved to run the single-thread steps, as the alignment merger, while the sequences are annotated)
+    chunk_list = [0] if chunks == 1 else list(range(1, chunks + 1))
+    alignment_threads = int(threads) if chunks == 1 else max(int(threads) - 1, 1)
+    annotation_workers = max(int(threads) - 1, 1) if chunks == 1 else 1
+
+    # get the suffix of the alignment file variables and the output format parameters of BLAST+ and DIAMOND
+    if alignment_format == '5':
+        blast_file_suffix = 'XML'
+        blastplus_outfmt = '5'
+        diamond_outfmt = '5'
+    else:
+        blast_file_suffix = 'TSV'
+        blastplus_outfmt = f'"6 {xlib.get_blast_tabular_column_list_text()}"'
+        diamond_outfmt = f'6 {xlib.get_blast_tabular_column_list_text()}'
+
     # write the script
     if OK:
         try:
@@ -7649,6 +7973,10 @@ def build_aminoacid_pipeline_script(current_run_dir):
                 script_file_id.write( '\n')
                 script_file_id.write( '# pipeline parameters\n')
                 script_file_id.write(f'THREADS={threads}\n')
+                script_file_id.write(f'CHUNKS={chunks}\n')
+                script_file_id.write(f'ALIGNMENT_THREADS={alignment_threads}\n')
+                if alignment_cache == 'Y':
+                    script_file_id.write(f'ALIGNMENT_CACHE_DB={xlib.get_alignment_cache_db(toa_config_dict["TOA_DB"])}\n')
                 script_file_id.write( '\n')
                 script_file_id.write( '# BLAST+ parameters\n')
                 script_file_id.write(f'BLASTPLUS_EVALUE={blastplus_evalue}\n')
@@ -7679,6 +8007,7 @@ def build_aminoacid_pipeline_script(current_run_dir):
                 script_file_id.write(f'STATUS_DIR={xlib.get_status_dir(current_run_dir)}\n')
                 script_file_id.write(f'SCRIPT_STATUS_OK={xlib.get_status_ok(current_run_dir)}\n')
                 script_file_id.write(f'SCRIPT_STATUS_WRONG={xlib.get_status_wrong(current_run_dir)}\n')
+                script_file_id.write(f'STEP_FILE={xlib.get_pipeline_step_file(current_run_dir)}\n')
                 script_file_id.write( 'mkdir -p $STATUS_DIR\n')
                 script_file_id.write( 'if [ -f $SCRIPT_STATUS_OK ]; then rm $SCRIPT_STATUS_OK; fi\n')
                 script_file_id.write( 'if [ -f $SCRIPT_STATUS_WRONG ]; then rm $SCRIPT_STATUS_WRONG; fi\n')
@@ -7698,7 +8027,9 @@ def build_aminoacid_pipeline_script(current_run_dir):
                 script_file_id.write(f'    echo "ALIGNMENT DATASETS: {database_list_text}"\n')
                 script_file_id.write( '    echo "$SEP"\n')
                 script_file_id.write(f'    echo "ALIGNMENT TOOLS (blastp): {alignment_tool}"\n')
+                script_file_id.write(f'    echo "ALIGNMENT FORMAT: {alignment_format}"\n')
                 script_file_id.write( '    echo "THREADS: $THREADS"\n')
+                script_file_id.write( '    echo "CHUNKS: $CHUNKS"\n')
                 script_file_id.write( '    echo "$SEP"\n')
                 script_file_id.write( '    echo "BLAST+ EVALUE: $BLASTPLUS_EVALUE"\n')
                 script_file_id.write( '    echo "BLAST+ MAX_TARGET_SEQS: $BLASTPLUS_MAX_TARGET_SEQS"\n')
@@ -7808,210 +8139,346 @@ def build_aminoacid_pipeline_script(current_run_dir):
                 script_file_id.write( '        touch $STEP_STATUS\n')
                 script_file_id.write( '    fi\n')
                 script_file_id.write( '}\n')
-                for i in range(len(database_list)):
-                    current_code = database_list[i]
-                    previus_code = database_list[i - 1] if i > 0 else ''
+                if chunks > 1:
                     script_file_id.write( '#-------------------------------------------------------------------------------\n')
-                    script_file_id.write(f'function align_peptides_{current_code}_proteome\n')
+                    script_file_id.write( 'function split_peptide_file\n')
                     script_file_id.write( '{\n')
                     script_file_id.write( '    cd $OUTPUT_DIR\n')
-                    script_file_id.write(f'    STEP_STATUS=$STATUS_DIR/align_peptides_{current_code}_proteome.ok\n')
+                    script_file_id.write( '    STEP_STATUS=$STATUS_DIR/split_peptide_file.ok\n')
                     script_file_id.write( '    echo "$SEP"\n')
-                    script_file_id.write(f'    echo "ALIGNMENT OF PEPTIDES TO {current_code.upper()} PROTEOME"\n')
+                    script_file_id.write( '    echo "SPLIT OF THE PEPTIDE FILE IN CHUNKS"\n')
                     script_file_id.write( '    if [ -f $STEP_STATUS ]; then\n')
                     script_file_id.write( '        echo "This step was previously run."\n')
                     script_file_id.write( '    else\n')
-                    script_file_id.write( '        source activate blast\n')
-                    script_file_id.write( '        echo "Aligning peptides ..."\n')
-                    if alignment_tool == xlib.get_blastplus_name():
-                        script_file_id.write(f'        export BLASTDB=${current_code.upper()}_BLASTPLUS_DB_DIR\n')
-                        script_file_id.write( '        /usr/bin/time \\\n')
-                        script_file_id.write( '            blastp \\\n')
-                        script_file_id.write( '                -num_threads $THREADS \\\n')
-                        script_file_id.write(f'                -db ${current_code.upper()}_BLASTPLUS_DB_NAME \\\n')
-                        if i == 0:
-                            script_file_id.write( '                -query $REIDENTIFIED_PEPTIDE_FILE \\\n')
-                        else:
-                            script_file_id.write(f'                -query ${previus_code.upper()}_NON_ANNOTATED_PEPTIDE_FILE \\\n')
-                        script_file_id.write( '                -evalue $BLASTPLUS_EVALUE \\\n')
-                        script_file_id.write( '                -max_target_seqs $BLASTPLUS_MAX_TARGET_SEQS \\\n')
-                        script_file_id.write( '                -max_hsps $BLASTPLUS_MAX_HSPS \\\n')
-                        script_file_id.write( '                -qcov_hsp_perc $BLASTPLUS_QCOV_HSP_PERC \\\n')
-                        script_file_id.write( '                -outfmt 5 \\\n')
-                        if blastplus_other_parameters_blastp.upper() != 'NONE':
-                            parameter_list = [x.strip() for x in blastplus_other_parameters_blastp.split(';')]
-                            for parameter in parameter_list:
-                                if parameter.find('=') > 0:
-                                    pattern = r'^--(.+)=(.+)$'
-                                    mo = re.search(pattern, parameter)
-                                    parameter_name = mo.group(1).strip()
-                                    parameter_value = mo.group(2).strip()
-                                    script_file_id.write(f'                -{parameter_name} {parameter_value} \\\n')
-                                else:
-                                    pattern = r'^--(.+)$'
-                                    mo = re.search(pattern, parameter)
-                                    parameter_name = mo.group(1).strip()
-                                    script_file_id.write(f'                -{parameter_name} \\\n')
-                        script_file_id.write(f'                -out ${current_code.upper()}_BLAST_XML\n')
-                        script_file_id.write( '        RC=$?\n')
-                        script_file_id.write( '        if [ $RC -ne 0 ]; then manage_error blastp $RC; fi\n')
-                        script_file_id.write( '        echo "Alignment is done."\n')
-                        script_file_id.write( '        conda deactivate\n')
-                    elif alignment_tool == xlib.get_diamond_name():
-                        if i == 0:
-                            script_file_id.write( '        if [[ -s $REIDENTIFIED_PEPTIDE_FILE ]]; then\n')
-                        else:
-                            script_file_id.write(f'        if [[ -s ${previus_code.upper()}_NON_ANNOTATED_PEPTIDE_FILE ]]; then\n')
-                        script_file_id.write( '            source activate diamond\n')
-                        script_file_id.write( '            /usr/bin/time \\\n')
-                        script_file_id.write( '                diamond blastp \\\n')
-                        script_file_id.write( '                    --threads $THREADS \\\n')
-                        script_file_id.write(f'                    --db ${current_code.upper()}_DIAMOND_DB_FILE \\\n')
-                        if i == 0:
-                            script_file_id.write( '                    --query $REIDENTIFIED_PEPTIDE_FILE \\\n')
-                        else:
-                            script_file_id.write(f'                    --query ${previus_code.upper()}_NON_ANNOTATED_PEPTIDE_FILE \\\n')
-                        script_file_id.write( '                    --evalue $DIAMOND_EVALUE \\\n')
-                        script_file_id.write( '                    --max-target-seqs $DIAMOND_MAX_TARGET_SEQS \\\n')
-                        script_file_id.write( '                    --max-hsps $DIAMOND_MAX_HSPS \\\n')
-                        if diamond_other_parameters_blastp.upper() != 'NONE':
-                            parameter_list = [x.strip() for x in diamond_other_parameters_blastp.split(';')]
-                            for parameter in parameter_list:
-                                if parameter.find('=') > 0:
-                                    pattern = r'^--(.+)=(.+)$'
-                                    mo = re.search(pattern, parameter)
-                                    parameter_name = mo.group(1).strip()
-                                    parameter_value = mo.group(2).strip()
-                                    script_file_id.write(f'                --{parameter_name} {parameter_value} \\\n')
-                                else:
-                                    pattern = r'^--(.+)$'
-                                    mo = re.search(pattern, parameter)
-                                    parameter_name = mo.group(1).strip()
-                                    script_file_id.write(f'                --{parameter_name} \\\n')
-                        script_file_id.write( '                    --outfmt 5 \\\n')
-                        script_file_id.write(f'                    --out ${current_code.upper()}_BLAST_XML\n')
-                        script_file_id.write( '            RC=$?\n')
-                        script_file_id.write( '            if [ $RC -ne 0 ]; then manage_error diamond-blastp $RC; fi\n')
-                        script_file_id.write( '        else\n')
-                        script_file_id.write(f'            touch ${current_code.upper()}_BLAST_XML\n')
-                        script_file_id.write( '        fi\n')
-                        script_file_id.write( '        echo "Alignment is done."\n')
-                        script_file_id.write( '        conda deactivate\n')
-                    if len(database_list) == 1:
-                        script_file_id.write( '        echo "Restoring sequence identifications in alignment file ..."\n')
-                        script_file_id.write( '        /usr/bin/time \\\n')
-                        script_file_id.write( '            $MINICONDA_BIN_DIR/python3 $TOA_DIR/restore-ids.py \\\n')
-                        script_file_id.write(f'                --in=${current_code.upper()}_BLAST_XML \\\n')
-                        script_file_id.write( '                --format=XML \\\n')
-                        script_file_id.write( '                --relationships=$TOA_TRANSCRIPTOME_RELATIONSHIP_FILE \\\n')
-                        script_file_id.write( '                --relationships2=$TOA_TRANSDECODER_RELATIONSHIP_FILE \\\n')
-                        script_file_id.write( '                --out=$MERGED_BLAST_XML \\\n')
-                        script_file_id.write( '                --verbose=N \\\n')
-                        script_file_id.write( '                --trace=N\n')
-                        script_file_id.write( '        RC=$?\n')
-                        script_file_id.write( '        if [ $RC -ne 0 ]; then manage_error restore-ids.py $RC; fi\n')
-                        script_file_id.write( '        echo "Identifications are restored."\n')
-                    script_file_id.write( '        touch $STEP_STATUS\n')
-                    script_file_id.write( '    fi\n')
-                    script_file_id.write( '}\n')
-                    script_file_id.write( '#-------------------------------------------------------------------------------\n')
-                    script_file_id.write(f'function load_alignment_{current_code}_proteome\n')
-                    script_file_id.write( '{\n')
-                    script_file_id.write( '    cd $OUTPUT_DIR\n')
-                    script_file_id.write(f'    STEP_STATUS=$STATUS_DIR/load_alignment_{current_code}_proteome.ok\n')
-                    script_file_id.write( '    echo "$SEP"\n')
-                    script_file_id.write(f'    echo "LOAD OF PEPTIDE ALIGNMENT TO {current_code.upper()} PROTEOME INTO TOA DATABASE"\n')
-                    script_file_id.write( '    if [ -f $STEP_STATUS ]; then\n')
-                    script_file_id.write( '        echo "This step was previously run."\n')
-                    script_file_id.write( '    else\n')
-                    script_file_id.write( '        echo "Loading alignmnet data ..."\n')
+                    script_file_id.write( '        echo "Splitting sequences ..."\n')
                     script_file_id.write( '        /usr/bin/time \\\n')
-                    script_file_id.write( '            $MINICONDA_BIN_DIR/python3 $TOA_DIR/load-blast-data.py \\\n')
-                    script_file_id.write( '                --db=$TOA_DB \\\n')
-                    script_file_id.write(f'                --dataset={current_code} \\\n')
-                    script_file_id.write( '                --format=5 \\\n')
-                    script_file_id.write(f'                --blast=${current_code.upper()}_BLAST_XML \\\n')
+                    script_file_id.write( '            $MINICONDA_BIN_DIR/python3 $TOA_DIR/split-fasta-file.py \\\n')
+                    script_file_id.write( '                --fasta=$REIDENTIFIED_PEPTIDE_FILE \\\n')
+                    script_file_id.write( '                --chunks=$CHUNKS \\\n')
                     script_file_id.write( '                --verbose=N \\\n')
                     script_file_id.write( '                --trace=N\n')
                     script_file_id.write( '        RC=$?\n')
-                    script_file_id.write( '        if [ $RC -ne 0 ]; then manage_error load-blast-data.py $RC; fi\n')
-                    script_file_id.write( '        echo "Data are loaded."\n')
+                    script_file_id.write( '        if [ $RC -ne 0 ]; then manage_error split-fasta-file.py $RC; fi\n')
+                    script_file_id.write( '        echo "Sequences are split."\n')
                     script_file_id.write( '        touch $STEP_STATUS\n')
                     script_file_id.write( '    fi\n')
                     script_file_id.write( '}\n')
-                    script_file_id.write( '#-------------------------------------------------------------------------------\n')
-                    script_file_id.write(f'function annotate_peptides_{current_code}\n')
-                    script_file_id.write( '{\n')
-                    script_file_id.write( '    cd $OUTPUT_DIR\n')
-                    script_file_id.write(f'    STEP_STATUS=$STATUS_DIR/annotate_peptides_{current_code}.ok\n')
-                    script_file_id.write( '    echo "$SEP"\n')
-                    script_file_id.write(f'    echo "ANNOTATION OF PEPTIDES WITH {current_code.upper()}"\n')
-                    script_file_id.write( '    if [ -f $STEP_STATUS ]; then\n')
-                    script_file_id.write( '        echo "This step was previously run."\n')
-                    script_file_id.write( '    else\n')
-                    script_file_id.write( '        echo "Annotating peptides ..."\n')
-                    script_file_id.write( '        /usr/bin/time \\\n')
-                    script_file_id.write( '            $MINICONDA_BIN_DIR/python3 $TOA_DIR/annotate-sequences.py \\\n')
-                    script_file_id.write( '                --db=$TOA_DB \\\n')
-                    script_file_id.write(f'                --dataset={current_code} \\\n')
-                    script_file_id.write(f'                --aligner={alignment_tool} \\\n')
-                    if i == 0:
-                        script_file_id.write( '                --seqs=$REIDENTIFIED_PEPTIDE_FILE \\\n')
-                    else:
-                        script_file_id.write(f'                --seqs=${previus_code.upper()}_NON_ANNOTATED_PEPTIDE_FILE \\\n')
-                    script_file_id.write( '                --relationships=$TOA_TRANSCRIPTOME_RELATIONSHIP_FILE \\\n')
-                    script_file_id.write( '                --relationships2=$TOA_TRANSDECODER_RELATIONSHIP_FILE \\\n')
-                    if current_code == 'nr':
-                        script_file_id.write(f'                --annotation=$NR_VIRIDIPLANTAE_ANNOTATION_FILE \\\n')
-                        script_file_id.write(f'                --annotation2=$NR_CONTAMINATION_ANNOTATION_FILE \\\n')
-                    else:
-                        script_file_id.write(f'                --annotation=${current_code.upper()}_ANNOTATION_FILE \\\n')
-                        script_file_id.write(f'                --annotation2=NONE \\\n')
-                    script_file_id.write(f'                --nonann=${current_code.upper()}_NON_ANNOTATED_PEPTIDE_FILE \\\n')
-                    script_file_id.write( '                --verbose=N \\\n')
-                    script_file_id.write( '                --trace=N\n')
-                    script_file_id.write( '        RC=$?\n')
-                    script_file_id.write( '        if [ $RC -ne 0 ]; then manage_error annotate-sequences.py $RC; fi\n')
-                    script_file_id.write( '        echo "Annotation is done."\n')
-                    if len(database_list) == 1:
-                        if current_code == 'nr':
-                            script_file_id.write( '        ANNOTATION_FILE_TMP=$NR_VIRIDIPLANTAE_ANNOTATION_FILE.tmp\n')
-                            script_file_id.write( '        echo "Deleting the header record of $NR_VIRIDIPLANTAE_ANNOTATION_FILE ..."\n')
+                for chunk in chunk_list:
+                    for i in range(len(database_list)):
+                        current_code = database_list[i]
+                        previus_code = database_list[i - 1] if i > 0 else ''
+                        step_suffix = '' if chunk == 0 else f'_chunk{chunk}'
+                        file_suffix = '' if chunk == 0 else xlib.get_chunk_file('', chunk)
+                        title_suffix = '' if chunk == 0 else f' (CHUNK {chunk})'
+                        annotation_results_db = '$RESULTS_DB' if chunk == 0 else 'NONE'
+                        # set the query and output files of the alignment and the ones of the aligner (the cache misses when the alignment cache is used)
+                        alignment_query_file = f'$REIDENTIFIED_PEPTIDE_FILE{file_suffix}' if i == 0 else f'${previus_code.upper()}_NON_ANNOTATED_PEPTIDE_FILE{file_suffix}'
+                        alignment_output_file = f'${current_code.upper()}_BLAST_{blast_file_suffix}{file_suffix}'
+                        aligner_query_file = f'{alignment_output_file}.misses.fasta' if alignment_cache == 'Y' else alignment_query_file
+                        aligner_output_file = f'{alignment_output_file}.misses' if alignment_cache == 'Y' else alignment_output_file
+                        aligner_indent = '    ' if alignment_cache == 'Y' else ''
+                        # set the target database and the aligner parameters of the key of the alignment cache
+                        if alignment_tool == xlib.get_blastplus_name():
+                            alignment_cache_database = f'${current_code.upper()}_BLASTPLUS_DB_DIR/${current_code.upper()}_BLASTPLUS_DB_NAME'
+                            alignment_cache_parameters = f'blastp -evalue $BLASTPLUS_EVALUE -max_target_seqs $BLASTPLUS_MAX_TARGET_SEQS -max_hsps $BLASTPLUS_MAX_HSPS -qcov_hsp_perc $BLASTPLUS_QCOV_HSP_PERC $BLASTPLUS_OTHER_PARAMETERS_BLASTP -outfmt {alignment_format}'
+                        elif alignment_tool == xlib.get_diamond_name():
+                            alignment_cache_database = f'${current_code.upper()}_DIAMOND_DB_FILE'
+                            alignment_cache_parameters = f'diamond blastp --evalue $DIAMOND_EVALUE --max-target-seqs $DIAMOND_MAX_TARGET_SEQS --max-hsps $DIAMOND_MAX_HSPS $DIAMOND_OTHER_PARAMETERS_BLASTP --outfmt {alignment_format}'
+                        script_file_id.write( '#-------------------------------------------------------------------------------\n')
+                        script_file_id.write(f'function align_peptides_{current_code}_proteome{step_suffix}\n')
+                        script_file_id.write( '{\n')
+                        script_file_id.write( '    cd $OUTPUT_DIR\n')
+                        script_file_id.write(f'    STEP_STATUS=$STATUS_DIR/align_peptides_{current_code}_proteome{step_suffix}.ok\n')
+                        script_file_id.write( '    echo "$SEP"\n')
+                        script_file_id.write(f'    echo "ALIGNMENT OF PEPTIDES TO {current_code.upper()} PROTEOME{title_suffix}"\n')
+                        script_file_id.write( '    if [ -f $STEP_STATUS ]; then\n')
+                        script_file_id.write( '        echo "This step was previously run."\n')
+                        script_file_id.write( '    else\n')
+                        if alignment_cache == 'Y':
+                            script_file_id.write( '        echo "Looking up the sequences in the alignment cache ..."\n')
                             script_file_id.write( '        /usr/bin/time \\\n')
-                            script_file_id.write( '            tail -n +2 $NR_VIRIDIPLANTAE_ANNOTATION_FILE > $ANNOTATION_FILE_TMP\n')
-                        else:
-                            script_file_id.write(f'        ANNOTATION_FILE_TMP=${current_code.upper()}_ANNOTATION_FILE.tmp\n')
-                            script_file_id.write(f'        echo "Deleting the header record of ${current_code.upper()}_ANNOTATION_FILE ..."\n')
+                            script_file_id.write( '            $MINICONDA_BIN_DIR/python3 $TOA_DIR/lookup-alignment-cache.py \\\n')
+                            script_file_id.write( '                --cache=$ALIGNMENT_CACHE_DB \\\n')
+                            script_file_id.write(f'                --seqs={alignment_query_file} \\\n')
+                            script_file_id.write(f'                --database={alignment_cache_database} \\\n')
+                            script_file_id.write(f'                --parameters="{alignment_cache_parameters}" \\\n')
+                            script_file_id.write(f'                --misses={aligner_query_file} \\\n')
+                            script_file_id.write( '                --verbose=N \\\n')
+                            script_file_id.write( '                --trace=N\n')
+                            script_file_id.write( '        RC=$?\n')
+                            script_file_id.write( '        if [ $RC -ne 0 ]; then manage_error lookup-alignment-cache.py $RC; fi\n')
+                            script_file_id.write( '        echo "Sequences are looked up."\n')
+                        script_file_id.write( '        source activate blast\n')
+                        script_file_id.write( '        echo "Aligning peptides ..."\n')
+                        if alignment_tool == xlib.get_blastplus_name():
+                            if alignment_cache == 'Y':
+                                script_file_id.write(f'        if [[ -s {aligner_query_file} ]]; then\n')
+                            script_file_id.write(f'{aligner_indent}        export BLASTDB=${current_code.upper()}_BLASTPLUS_DB_DIR\n')
+                            script_file_id.write(f'{aligner_indent}        /usr/bin/time \\\n')
+                            script_file_id.write(f'{aligner_indent}            blastp \\\n')
+                            script_file_id.write(f'{aligner_indent}                -num_threads $ALIGNMENT_THREADS \\\n')
+                            script_file_id.write(f'{aligner_indent}                -db ${current_code.upper()}_BLASTPLUS_DB_NAME \\\n')
+                            script_file_id.write(f'{aligner_indent}                -query {aligner_query_file} \\\n')
+                            script_file_id.write(f'{aligner_indent}                -evalue $BLASTPLUS_EVALUE \\\n')
+                            script_file_id.write(f'{aligner_indent}                -max_target_seqs $BLASTPLUS_MAX_TARGET_SEQS \\\n')
+                            script_file_id.write(f'{aligner_indent}                -max_hsps $BLASTPLUS_MAX_HSPS \\\n')
+                            script_file_id.write(f'{aligner_indent}                -qcov_hsp_perc $BLASTPLUS_QCOV_HSP_PERC \\\n')
+                            script_file_id.write(f'{aligner_indent}                -outfmt {blastplus_outfmt} \\\n')
+                            if blastplus_other_parameters_blastp.upper() != 'NONE':
+                                parameter_list = [x.strip() for x in blastplus_other_parameters_blastp.split(';')]
+                                for parameter in parameter_list:
+                                    if parameter.find('=') > 0:
+                                        pattern = r'^--(.+)=(.+)$'
+                                        mo = re.search(pattern, parameter)
+                                        parameter_name = mo.group(1).strip()
+                                        parameter_value = mo.group(2).strip()
+                                        script_file_id.write(f'{aligner_indent}                -{parameter_name} {parameter_value} \\\n')
+                                    else:
+                                        pattern = r'^--(.+)$'
+                                        mo = re.search(pattern, parameter)
+                                        parameter_name = mo.group(1).strip()
+                                        script_file_id.write(f'{aligner_indent}                -{parameter_name} \\\n')
+                            script_file_id.write(f'{aligner_indent}                -out {aligner_output_file}\n')
+                            script_file_id.write(f'{aligner_indent}        RC=$?\n')
+                            script_file_id.write(f'{aligner_indent}        if [ $RC -ne 0 ]; then manage_error blastp $RC; fi\n')
+                            if alignment_cache == 'Y':
+                                script_file_id.write( '        else\n')
+                                script_file_id.write(f'            touch {aligner_output_file}\n')
+                                script_file_id.write( '        fi\n')
+                            script_file_id.write( '        echo "Alignment is done."\n')
+                            script_file_id.write( '        conda deactivate\n')
+                        elif alignment_tool == xlib.get_diamond_name():
+                            script_file_id.write(f'        if [[ -s {aligner_query_file} ]]; then\n')
+                            script_file_id.write( '            source activate diamond\n')
+                            script_file_id.write( '            /usr/bin/time \\\n')
+                            script_file_id.write( '                diamond blastp \\\n')
+                            script_file_id.write( '                    --threads $ALIGNMENT_THREADS \\\n')
+                            script_file_id.write(f'                    --db ${current_code.upper()}_DIAMOND_DB_FILE \\\n')
+                            script_file_id.write(f'                    --query {aligner_query_file} \\\n')
+                            script_file_id.write( '                    --evalue $DIAMOND_EVALUE \\\n')
+                            script_file_id.write( '                    --max-target-seqs $DIAMOND_MAX_TARGET_SEQS \\\n')
+                            script_file_id.write( '                    --max-hsps $DIAMOND_MAX_HSPS \\\n')
+                            if diamond_other_parameters_blastp.upper() != 'NONE':
+                                parameter_list = [x.strip() for x in diamond_other_parameters_blastp.split(';')]
+                                for parameter in parameter_list:
+                                    if parameter.find('=') > 0:
+                                        pattern = r'^--(.+)=(.+)$'
+                                        mo = re.search(pattern, parameter)
+                                        parameter_name = mo.group(1).strip()
+                                        parameter_value = mo.group(2).strip()
+                                        script_file_id.write(f'                --{parameter_name} {parameter_value} \\\n')
+                                    else:
+                                        pattern = r'^--(.+)$'
+                                        mo = re.search(pattern, parameter)
+                                        parameter_name = mo.group(1).strip()
+                                        script_file_id.write(f'                --{parameter_name} \\\n')
+                            script_file_id.write(f'                    --outfmt {diamond_outfmt} \\\n')
+                            script_file_id.write(f'                    --out {aligner_output_file}\n')
+                            script_file_id.write( '            RC=$?\n')
+                            script_file_id.write( '            if [ $RC -ne 0 ]; then manage_error diamond-blastp $RC; fi\n')
+                            script_file_id.write( '        else\n')
+                            script_file_id.write(f'            touch {aligner_output_file}\n')
+                            script_file_id.write( '        fi\n')
+                            script_file_id.write( '        echo "Alignment is done."\n')
+                            script_file_id.write( '        conda deactivate\n')
+                        if alignment_cache == 'Y':
+                            script_file_id.write( '        echo "Updating the alignment cache and writing the alignment file ..."\n')
                             script_file_id.write( '        /usr/bin/time \\\n')
-                            script_file_id.write(f'            tail -n +2 ${current_code.upper()}_ANNOTATION_FILE > $ANNOTATION_FILE_TMP\n')
-                        script_file_id.write( '        RC=$?\n')
-                        script_file_id.write( '        if [ $RC -ne 0 ]; then manage_error tail $RC; fi\n')
-                        script_file_id.write( '        echo "Record is deleted."\n')
-                        script_file_id.write( '        echo "Creating plant annotation file ..."\n')
+                            script_file_id.write( '            $MINICONDA_BIN_DIR/python3 $TOA_DIR/update-alignment-cache.py \\\n')
+                            script_file_id.write( '                --cache=$ALIGNMENT_CACHE_DB \\\n')
+                            script_file_id.write(f'                --seqs={alignment_query_file} \\\n')
+                            script_file_id.write(f'                --database={alignment_cache_database} \\\n')
+                            script_file_id.write(f'                --parameters="{alignment_cache_parameters}" \\\n')
+                            script_file_id.write(f'                --misses={aligner_query_file} \\\n')
+                            script_file_id.write(f'                --malignment={aligner_output_file} \\\n')
+                            script_file_id.write(f'                --format={alignment_format} \\\n')
+                            script_file_id.write(f'                --alignment={alignment_output_file} \\\n')
+                            script_file_id.write( '                --verbose=N \\\n')
+                            script_file_id.write( '                --trace=N\n')
+                            script_file_id.write( '        RC=$?\n')
+                            script_file_id.write( '        if [ $RC -ne 0 ]; then manage_error update-alignment-cache.py $RC; fi\n')
+                            script_file_id.write( '        echo "The alignment cache is updated."\n')
+                        if len(database_list) == 1 and chunks == 1:
+                            script_file_id.write( '        echo "Restoring sequence identifications in alignment file ..."\n')
+                            script_file_id.write( '        /usr/bin/time \\\n')
+                            script_file_id.write( '            $MINICONDA_BIN_DIR/python3 $TOA_DIR/restore-ids.py \\\n')
+                            script_file_id.write(f'                --in=${current_code.upper()}_BLAST_{blast_file_suffix} \\\n')
+                            script_file_id.write(f'                --format={blast_file_suffix} \\\n')
+                            script_file_id.write( '                --relationships=$TOA_TRANSCRIPTOME_RELATIONSHIP_FILE \\\n')
+                            script_file_id.write( '                --relationships2=$TOA_TRANSDECODER_RELATIONSHIP_FILE \\\n')
+                            script_file_id.write(f'                --out=$MERGED_BLAST_{blast_file_suffix} \\\n')
+                            script_file_id.write( '                --verbose=N \\\n')
+                            script_file_id.write( '                --trace=N\n')
+                            script_file_id.write( '        RC=$?\n')
+                            script_file_id.write( '        if [ $RC -ne 0 ]; then manage_error restore-ids.py $RC; fi\n')
+                            script_file_id.write( '        echo "Identifications are restored."\n')
+                        script_file_id.write( '        touch $STEP_STATUS\n')
+                        script_file_id.write( '    fi\n')
+                        script_file_id.write( '}\n')
+                        script_file_id.write( '#-------------------------------------------------------------------------------\n')
+                        script_file_id.write(f'function load_alignment_{current_code}_proteome{step_suffix}\n')
+                        script_file_id.write( '{\n')
+                        script_file_id.write( '    cd $OUTPUT_DIR\n')
+                        script_file_id.write(f'    STEP_STATUS=$STATUS_DIR/load_alignment_{current_code}_proteome{step_suffix}.ok\n')
+                        script_file_id.write( '    echo "$SEP"\n')
+                        script_file_id.write(f'    echo "LOAD OF PEPTIDE ALIGNMENT TO {current_code.upper()} PROTEOME INTO TOA DATABASE{title_suffix}"\n')
+                        script_file_id.write( '    if [ -f $STEP_STATUS ]; then\n')
+                        script_file_id.write( '        echo "This step was previously run."\n')
+                        script_file_id.write( '    else\n')
+                        script_file_id.write( '        echo "Loading alignmnet data ..."\n')
                         script_file_id.write( '        /usr/bin/time \\\n')
-                        script_file_id.write( '            $MINICONDA_BIN_DIR/python3 $TOA_DIR/merge-annotation-files.py \\\n')
-                        script_file_id.write( '            --file1=$ANNOTATION_FILE_TMP \\\n')
-                        script_file_id.write(f'            --type1={database_type_dict[database_list[0]]} \\\n')
-                        script_file_id.write( '            --file2=NONE \\\n')
-                        script_file_id.write( '            --type2=NONE \\\n')
-                        script_file_id.write( '            --operation=SAVE1 \\\n')
-                        script_file_id.write( '            --mfile=$PLANT_ANNOTATION_FILE \\\n')
-                        script_file_id.write( '            --header=Y \\\n')
-                        script_file_id.write( '            --verbose=N \\\n')
-                        script_file_id.write( '            --trace=N\n')
+                        script_file_id.write( '            $MINICONDA_BIN_DIR/python3 $TOA_DIR/load-blast-data.py \\\n')
+                        script_file_id.write( '                --db=$TOA_DB \\\n')
+                        script_file_id.write( '                --db-profile=BULK-LOAD \\\n')
+                        script_file_id.write(f'                --dataset={current_code} \\\n')
+                        script_file_id.write(f'                --format={alignment_format} \\\n')
+                        script_file_id.write(f'                --blast=${current_code.upper()}_BLAST_{blast_file_suffix}{file_suffix} \\\n')
+                        if chunk > 0:
+                            if i == 0:
+                                script_file_id.write(f'                --seqs=$REIDENTIFIED_PEPTIDE_FILE{file_suffix} \\\n')
+                            else:
+                                script_file_id.write(f'                --seqs=${previus_code.upper()}_NON_ANNOTATED_PEPTIDE_FILE{file_suffix} \\\n')
+                        script_file_id.write(f'                --aligner={alignment_tool} \\\n')
+                        script_file_id.write( '                --verbose=N \\\n')
+                        script_file_id.write( '                --trace=N\n')
                         script_file_id.write( '        RC=$?\n')
-                        script_file_id.write( '        if [ $RC -ne 0 ]; then manage_error merge-annotation-files.py $RC; fi\n')
-                        script_file_id.write( '        echo "File is created."\n')
-                        script_file_id.write( '        echo "Deleting temporal file  ..."\n')
+                        script_file_id.write( '        if [ $RC -ne 0 ]; then manage_error load-blast-data.py $RC; fi\n')
+                        script_file_id.write( '        echo "Data are loaded."\n')
+                        script_file_id.write( '        touch $STEP_STATUS\n')
+                        script_file_id.write( '    fi\n')
+                        script_file_id.write( '}\n')
+                        script_file_id.write( '#-------------------------------------------------------------------------------\n')
+                        script_file_id.write(f'function annotate_peptides_{current_code}{step_suffix}\n')
+                        script_file_id.write( '{\n')
+                        script_file_id.write( '    cd $OUTPUT_DIR\n')
+                        script_file_id.write(f'    STEP_STATUS=$STATUS_DIR/annotate_peptides_{current_code}{step_suffix}.ok\n')
+                        script_file_id.write( '    echo "$SEP"\n')
+                        script_file_id.write(f'    echo "ANNOTATION OF PEPTIDES WITH {current_code.upper()}{title_suffix}"\n')
+                        script_file_id.write( '    if [ -f $STEP_STATUS ]; then\n')
+                        script_file_id.write( '        echo "This step was previously run."\n')
+                        script_file_id.write( '    else\n')
+                        script_file_id.write( '        echo "Annotating peptides ..."\n')
                         script_file_id.write( '        /usr/bin/time \\\n')
-                        script_file_id.write( '            rm $ANNOTATION_FILE_TMP\n')
+                        script_file_id.write( '            $MINICONDA_BIN_DIR/python3 $TOA_DIR/annotate-sequences.py \\\n')
+                        script_file_id.write( '                --db=$TOA_DB \\\n')
+                        script_file_id.write( '                --db-profile=READ-ONLY \\\n')
+                        script_file_id.write(f'                --dataset={current_code} \\\n')
+                        script_file_id.write(f'                --aligner={alignment_tool} \\\n')
+                        if i == 0:
+                            script_file_id.write(f'                --seqs=$REIDENTIFIED_PEPTIDE_FILE{file_suffix} \\\n')
+                        else:
+                            script_file_id.write(f'                --seqs=${previus_code.upper()}_NON_ANNOTATED_PEPTIDE_FILE{file_suffix} \\\n')
+                        script_file_id.write( '                --relationships=$TOA_TRANSCRIPTOME_RELATIONSHIP_FILE \\\n')
+                        script_file_id.write( '                --relationships2=$TOA_TRANSDECODER_RELATIONSHIP_FILE \\\n')
+                        if current_code == 'nr':
+                            script_file_id.write(f'                --annotation=$NR_VIRIDIPLANTAE_ANNOTATION_FILE{file_suffix} \\\n')
+                            script_file_id.write(f'                --annotation2=$NR_CONTAMINATION_ANNOTATION_FILE{file_suffix} \\\n')
+                            script_file_id.write(f'                --classification=$NR_CLASSIFICATION_FILE{file_suffix} \\\n')
+                        else:
+                            script_file_id.write(f'                --annotation=${current_code.upper()}_ANNOTATION_FILE{file_suffix} \\\n')
+                            script_file_id.write(f'                --annotation2=NONE \\\n')
+                            script_file_id.write(f'                --classification=NONE \\\n')
+                        script_file_id.write(f'                --nonann=${current_code.upper()}_NON_ANNOTATED_PEPTIDE_FILE{file_suffix} \\\n')
+                        script_file_id.write(f'                --workers={annotation_workers} \\\n')
+                        script_file_id.write(f'                --results-db={annotation_results_db} \\\n')
+                        script_file_id.write( '                --changed-since=${REANNOTATION_CHANGED_SINCE:-NONE} \\\n')
+                        script_file_id.write( '                --verbose=N \\\n')
+                        script_file_id.write( '                --trace=N\n')
                         script_file_id.write( '        RC=$?\n')
-                        script_file_id.write( '        if [ $RC -ne 0 ]; then manage_error rm $RC; fi\n')
-                        script_file_id.write( '        echo "File is deleted."\n')
-                    script_file_id.write( '        touch $STEP_STATUS\n')
-                    script_file_id.write( '    fi\n')
-                    script_file_id.write( '}\n')
-                if len(database_list) > 1:
+                        script_file_id.write( '        if [ $RC -ne 0 ]; then manage_error annotate-sequences.py $RC; fi\n')
+                        script_file_id.write( '        echo "Annotation is done."\n')
+                        if len(database_list) == 1 and chunks == 1:
+                            if current_code == 'nr':
+                                script_file_id.write( '        ANNOTATION_FILE_TMP=$NR_VIRIDIPLANTAE_ANNOTATION_FILE.tmp\n')
+                                script_file_id.write( '        echo "Deleting the header record of $NR_VIRIDIPLANTAE_ANNOTATION_FILE ..."\n')
+                                script_file_id.write( '        /usr/bin/time \\\n')
+                                script_file_id.write( '            tail -n +2 $NR_VIRIDIPLANTAE_ANNOTATION_FILE > $ANNOTATION_FILE_TMP\n')
+                            else:
+                                script_file_id.write(f'        ANNOTATION_FILE_TMP=${current_code.upper()}_ANNOTATION_FILE.tmp\n')
+                                script_file_id.write(f'        echo "Deleting the header record of ${current_code.upper()}_ANNOTATION_FILE ..."\n')
+                                script_file_id.write( '        /usr/bin/time \\\n')
+                                script_file_id.write(f'            tail -n +2 ${current_code.upper()}_ANNOTATION_FILE > $ANNOTATION_FILE_TMP\n')
+                            script_file_id.write( '        RC=$?\n')
+                            script_file_id.write( '        if [ $RC -ne 0 ]; then manage_error tail $RC; fi\n')
+                            script_file_id.write( '        echo "Record is deleted."\n')
+                            script_file_id.write( '        echo "Creating plant annotation file ..."\n')
+                            script_file_id.write( '        /usr/bin/time \\\n')
+                            script_file_id.write( '            $MINICONDA_BIN_DIR/python3 $TOA_DIR/merge-annotation-files.py \\\n')
+                            script_file_id.write( '            --file1=$ANNOTATION_FILE_TMP \\\n')
+                            script_file_id.write(f'            --type1={database_type_dict[database_list[0]]} \\\n')
+                            script_file_id.write( '            --file2=NONE \\\n')
+                            script_file_id.write( '            --type2=NONE \\\n')
+                            script_file_id.write( '            --operation=SAVE1 \\\n')
+                            script_file_id.write( '            --mfile=$PLANT_ANNOTATION_FILE \\\n')
+                            script_file_id.write( '            --header=Y \\\n')
+                            script_file_id.write( '            --results-db=$RESULTS_DB \\\n')
+                            script_file_id.write( '            --verbose=N \\\n')
+                            script_file_id.write( '            --trace=N\n')
+                            script_file_id.write( '        RC=$?\n')
+                            script_file_id.write( '        if [ $RC -ne 0 ]; then manage_error merge-annotation-files.py $RC; fi\n')
+                            script_file_id.write( '        echo "File is created."\n')
+                            script_file_id.write( '        echo "Deleting temporal file  ..."\n')
+                            script_file_id.write( '        /usr/bin/time \\\n')
+                            script_file_id.write( '            rm $ANNOTATION_FILE_TMP\n')
+                            script_file_id.write( '        RC=$?\n')
+                            script_file_id.write( '        if [ $RC -ne 0 ]; then manage_error rm $RC; fi\n')
+                            script_file_id.write( '        echo "File is deleted."\n')
+                        script_file_id.write( '        touch $STEP_STATUS\n')
+                        script_file_id.write( '    fi\n')
+                        script_file_id.write( '}\n')
+                if chunks > 1:
+                    for current_code in database_list:
+                        join_file_list = []
+                        if alignment_format != '5':
+                            join_file_list.append((f'${current_code.upper()}_BLAST_TSV', 'TSV', 'NONE'))
+                        if current_code == 'nr':
+                            join_file_list.append(('$NR_VIRIDIPLANTAE_ANNOTATION_FILE', 'ANNOTATION', '$RESULTS_DB'))
+                            join_file_list.append(('$NR_CONTAMINATION_ANNOTATION_FILE', 'ANNOTATION', '$RESULTS_DB'))
+                            join_file_list.append(('$NR_CLASSIFICATION_FILE', 'CSV', 'NONE'))
+                        else:
+                            join_file_list.append((f'${current_code.upper()}_ANNOTATION_FILE', 'ANNOTATION', '$RESULTS_DB'))
+                        join_file_list.append((f'${current_code.upper()}_NON_ANNOTATED_PEPTIDE_FILE', 'FASTA', 'NONE'))
+                        script_file_id.write( '#-------------------------------------------------------------------------------\n')
+                        script_file_id.write(f'function join_chunks_{current_code}\n')
+                        script_file_id.write( '{\n')
+                        script_file_id.write( '    cd $OUTPUT_DIR\n')
+                        script_file_id.write(f'    STEP_STATUS=$STATUS_DIR/join_chunks_{current_code}.ok\n')
+                        script_file_id.write( '    echo "$SEP"\n')
+                        script_file_id.write(f'    echo "JOIN OF CHUNK FILES OF {current_code.upper()}"\n')
+                        script_file_id.write( '    if [ -f $STEP_STATUS ]; then\n')
+                        script_file_id.write( '        echo "This step was previously run."\n')
+                        script_file_id.write( '    else\n')
+                        if alignment_format == '5':
+                            blast_xml_list = [f'${current_code.upper()}_BLAST_XML{xlib.get_chunk_file("", chunk)}' for chunk in chunk_list]
+                            script_file_id.write(f'        echo "Joining chunk files of `basename ${current_code.upper()}_BLAST_XML` ..."\n')
+                            script_file_id.write( '        /usr/bin/time \\\n')
+                            script_file_id.write( '            $MINICONDA_BIN_DIR/python3 $TOA_DIR/merge-xml-files.py \\\n')
+                            script_file_id.write(f'                --list={",".join(blast_xml_list)} \\\n')
+                            script_file_id.write( '                --relationships=NONE \\\n')
+                            script_file_id.write( '                --relationships2=NONE \\\n')
+                            script_file_id.write(f'                --mfile=${current_code.upper()}_BLAST_XML \\\n')
+                            script_file_id.write( '                --verbose=N \\\n')
+                            script_file_id.write( '                --trace=N\n')
+                            script_file_id.write( '        RC=$?\n')
+                            script_file_id.write( '        if [ $RC -ne 0 ]; then manage_error merge-xml-files.py $RC; fi\n')
+                            script_file_id.write( '        echo "Files are joined."\n')
+                        for (join_file, join_format, join_results_db) in join_file_list:
+                            script_file_id.write(f'        echo "Joining chunk files of `basename {join_file}` ..."\n')
+                            script_file_id.write( '        /usr/bin/time \\\n')
+                            script_file_id.write( '            $MINICONDA_BIN_DIR/python3 $TOA_DIR/join-chunk-files.py \\\n')
+                            script_file_id.write(f'                --file={join_file} \\\n')
+                            script_file_id.write( '                --chunks=$CHUNKS \\\n')
+                            script_file_id.write(f'                --format={join_format} \\\n')
+                            script_file_id.write(f'                --results-db={join_results_db} \\\n')
+                            script_file_id.write( '                --verbose=N \\\n')
+                            script_file_id.write( '                --trace=N\n')
+                            script_file_id.write( '        RC=$?\n')
+                            script_file_id.write( '        if [ $RC -ne 0 ]; then manage_error join-chunk-files.py $RC; fi\n')
+                            script_file_id.write( '        echo "Files are joined."\n')
+                        script_file_id.write( '        touch $STEP_STATUS\n')
+                        script_file_id.write( '    fi\n')
+                        script_file_id.write( '}\n')
+                if len(database_list) > 1 or chunks > 1:
                     script_file_id.write( '#-------------------------------------------------------------------------------\n')
                     script_file_id.write( 'function merge_alignment_files\n')
                     script_file_id.write( '{\n')
@@ -8023,19 +8490,39 @@ def build_aminoacid_pipeline_script(current_run_dir):
                     script_file_id.write( '        echo "This step was previously run."\n')
                     script_file_id.write( '    else\n')
                     script_file_id.write( '        echo "Merging alignment files ..."\n')
-                    script_file_id.write( '        /usr/bin/time \\\n')
-                    script_file_id.write( '            $MINICONDA_BIN_DIR/python3 $TOA_DIR/merge-xml-files.py \\\n')
-                    blast_xml_list = []
-                    for database_code in database_list:
-                        blast_xml_list.append(f'${database_code.upper()}_BLAST_XML')
-                    script_file_id.write(f'                --list={",".join(blast_xml_list)} \\\n')
-                    script_file_id.write( '                --relationships=$TOA_TRANSCRIPTOME_RELATIONSHIP_FILE \\\n')
-                    script_file_id.write( '                --relationships2=$TOA_TRANSDECODER_RELATIONSHIP_FILE \\\n')
-                    script_file_id.write( '                --mfile=$MERGED_BLAST_XML \\\n')
-                    script_file_id.write( '                --verbose=N \\\n')
-                    script_file_id.write( '                --trace=N\n')
-                    script_file_id.write( '        RC=$?\n')
-                    script_file_id.write( '        if [ $RC -ne 0 ]; then manage_error merge-xml-files.py $RC; fi\n')
+                    if alignment_format == '5':
+                        script_file_id.write( '        /usr/bin/time \\\n')
+                        script_file_id.write( '            $MINICONDA_BIN_DIR/python3 $TOA_DIR/merge-xml-files.py \\\n')
+                        blast_xml_list = []
+                        for database_code in database_list:
+                            blast_xml_list.append(f'${database_code.upper()}_BLAST_XML')
+                        script_file_id.write(f'                --list={",".join(blast_xml_list)} \\\n')
+                        script_file_id.write( '                --relationships=$TOA_TRANSCRIPTOME_RELATIONSHIP_FILE \\\n')
+                        script_file_id.write( '                --relationships2=$TOA_TRANSDECODER_RELATIONSHIP_FILE \\\n')
+                        script_file_id.write( '                --mfile=$MERGED_BLAST_XML \\\n')
+                        script_file_id.write( '                --verbose=N \\\n')
+                        script_file_id.write( '                --trace=N\n')
+                        script_file_id.write( '        RC=$?\n')
+                        script_file_id.write( '        if [ $RC -ne 0 ]; then manage_error merge-xml-files.py $RC; fi\n')
+                    else:
+                        blast_tsv_list = []
+                        for database_code in database_list:
+                            blast_tsv_list.append(f'${database_code.upper()}_BLAST_TSV')
+                        script_file_id.write(f'        cat {" ".join(blast_tsv_list)} > $MERGED_BLAST_TSV".tmp"\n')
+                        script_file_id.write( '        RC=$?\n')
+                        script_file_id.write( '        if [ $RC -ne 0 ]; then manage_error cat $RC; fi\n')
+                        script_file_id.write( '        /usr/bin/time \\\n')
+                        script_file_id.write( '            $MINICONDA_BIN_DIR/python3 $TOA_DIR/restore-ids.py \\\n')
+                        script_file_id.write( '                --in=$MERGED_BLAST_TSV".tmp" \\\n')
+                        script_file_id.write( '                --format=TSV \\\n')
+                        script_file_id.write( '                --relationships=$TOA_TRANSCRIPTOME_RELATIONSHIP_FILE \\\n')
+                        script_file_id.write( '                --relationships2=$TOA_TRANSDECODER_RELATIONSHIP_FILE \\\n')
+                        script_file_id.write( '                --out=$MERGED_BLAST_TSV \\\n')
+                        script_file_id.write( '                --verbose=N \\\n')
+                        script_file_id.write( '                --trace=N\n')
+                        script_file_id.write( '        RC=$?\n')
+                        script_file_id.write( '        if [ $RC -ne 0 ]; then manage_error restore-ids.py $RC; fi\n')
+                        script_file_id.write( '        rm -f $MERGED_BLAST_TSV".tmp"\n')
                     script_file_id.write( '        echo "Files are merged."\n')
                     script_file_id.write( '        touch $STEP_STATUS\n')
                     script_file_id.write( '    fi\n')
@@ -8053,108 +8540,49 @@ def build_aminoacid_pipeline_script(current_run_dir):
                     for database_code in database_list2:
                         script_file_id.write(f'        {database_code.upper()}_ANNOTATION_FILE_TMP=${database_code.upper()}_ANNOTATION_FILE".tmp"\n')
                         script_file_id.write(f'        {database_code.upper()}_ANNOTATION_FILE_SORTED=${database_code.upper()}_ANNOTATION_FILE".sorted"\n')
-                    tmp_file_list = []
-                    for i in range(len(database_list2) - 2):
-                        script_file_id.write(f'        MERGED_ANNOTATION_FILE_TMP{i + 1}=$MERGED_ANNOTATION_FILE".tmp{i + 1}"\n')
-                        tmp_file_list.append(f'$MERGED_ANNOTATION_FILE_TMP{i + 1}')
-                    script_file_id.write(f'        echo "Deleting the header record of `basename ${database_list2[0].upper()}_ANNOTATION_FILE` ..."\n')
-                    script_file_id.write( '        /usr/bin/time \\\n')
-                    script_file_id.write(f'            tail -n +2 ${database_list2[0].upper()}_ANNOTATION_FILE > ${database_list2[0].upper()}_ANNOTATION_FILE_TMP\n')
-                    script_file_id.write( '        RC=$?\n')
-                    script_file_id.write( '        if [ $RC -ne 0 ]; then manage_error tail $RC; fi\n')
-                    script_file_id.write( '        echo "Record is deleted."\n')
-                    script_file_id.write(f'        echo "Sorting data records of `basename ${database_list2[0].upper()}_ANNOTATION_FILE` ..."\n')
-                    script_file_id.write( '        /usr/bin/time \\\n')
-                    script_file_id.write(f'            sort --field-separator=";" --key=2,5 < ${database_list2[0].upper()}_ANNOTATION_FILE_TMP > ${database_list2[0].upper()}_ANNOTATION_FILE_SORTED\n')
-                    script_file_id.write( '        RC=$?\n')
-                    script_file_id.write( '        if [ $RC -ne 0 ]; then manage_error sort $RC; fi\n')
-                    script_file_id.write( '        echo "Records are sorted."\n')
-                    script_file_id.write(f'        echo "Deleting the header record of `basename ${database_list2[1].upper()}_ANNOTATION_FILE` ..."\n')
-                    script_file_id.write( '        /usr/bin/time \\\n')
-                    script_file_id.write(f'            tail -n +2 ${database_list2[1].upper()}_ANNOTATION_FILE > ${database_list2[1].upper()}_ANNOTATION_FILE_TMP\n')
-                    script_file_id.write( '        RC=$?\n')
-                    script_file_id.write( '        echo "Record is deleted."\n')
-                    script_file_id.write( '        if [ $RC -ne 0 ]; then manage_error tail $RC; fi\n')
-                    script_file_id.write(f'        echo "Sorting data records of `basename ${database_list2[1].upper()}_ANNOTATION_FILE` ..."\n')
-                    script_file_id.write( '        /usr/bin/time \\\n')
-                    script_file_id.write(f'            sort --field-separator=";" --key=2,5 < ${database_list2[1].upper()}_ANNOTATION_FILE_TMP > ${database_list2[1].upper()}_ANNOTATION_FILE_SORTED\n')
-                    script_file_id.write( '        RC=$?\n')
-                    script_file_id.write( '        if [ $RC -ne 0 ]; then manage_error sort $RC; fi\n')
-                    script_file_id.write( '        echo "Records are sorted."\n')
-                    script_file_id.write(f'        echo "Merging `basename ${database_list2[0].upper()}_ANNOTATION_FILE` and `basename ${database_list2[1].upper()}_ANNOTATION_FILE` ..."\n')
+                    for database_code in database_list2:
+                        script_file_id.write(f'        echo "Checking the manifest of `basename ${database_code.upper()}_ANNOTATION_FILE` ..."\n')
+                        script_file_id.write(f'        if $MINICONDA_BIN_DIR/python3 $TOA_DIR/check-annotation-manifest.py --annotation=${database_code.upper()}_ANNOTATION_FILE --verbose=N --trace=N; then\n')
+                        script_file_id.write(f'            {database_code.upper()}_ANNOTATION_FILE_SORTED=${database_code.upper()}_ANNOTATION_FILE\n')
+                        script_file_id.write( '        else\n')
+                        script_file_id.write(f'            echo "Deleting the header record of `basename ${database_code.upper()}_ANNOTATION_FILE` ..."\n')
+                        script_file_id.write( '            /usr/bin/time \\\n')
+                        script_file_id.write(f'                tail -n +2 ${database_code.upper()}_ANNOTATION_FILE > ${database_code.upper()}_ANNOTATION_FILE_TMP\n')
+                        script_file_id.write( '            RC=$?\n')
+                        script_file_id.write( '            if [ $RC -ne 0 ]; then manage_error tail $RC; fi\n')
+                        script_file_id.write( '            echo "Record is deleted."\n')
+                        script_file_id.write(f'            echo "Sorting data records of `basename ${database_code.upper()}_ANNOTATION_FILE` ..."\n')
+                        script_file_id.write( '            /usr/bin/time \\\n')
+                        script_file_id.write(f'                sort --field-separator=";" --key=2,5 < ${database_code.upper()}_ANNOTATION_FILE_TMP > ${database_code.upper()}_ANNOTATION_FILE_SORTED\n')
+                        script_file_id.write( '            RC=$?\n')
+                        script_file_id.write( '            if [ $RC -ne 0 ]; then manage_error sort $RC; fi\n')
+                        script_file_id.write( '            echo "Records are sorted."\n')
+                        script_file_id.write( '        fi\n')
+                    sorted_file_list = [f'${database_code.upper()}_ANNOTATION_FILE_SORTED' for database_code in database_list2]
+                    type_list = [database_type_dict[database_code] for database_code in database_list]
+                    script_file_id.write( '        echo "Merging annotation files ..."\n')
                     script_file_id.write( '        /usr/bin/time \\\n')
                     script_file_id.write( '            $MINICONDA_BIN_DIR/python3 $TOA_DIR/merge-annotation-files.py \\\n')
-                    script_file_id.write(f'                --file1=${database_list2[0].upper()}_ANNOTATION_FILE_SORTED \\\n')
-                    script_file_id.write(f'                --type1={database_type_dict[database_list[0]]} \\\n')
-                    script_file_id.write(f'                --file2=${database_list2[1].upper()}_ANNOTATION_FILE_SORTED \\\n')
-                    script_file_id.write(f'                --type2={database_type_dict[database_list[1]]} \\\n')
-                    script_file_id.write( '                --operation=1AND2 \\\n')
-                    if len(database_list2) > 2:
-                        script_file_id.write( '                --mfile=$MERGED_ANNOTATION_FILE_TMP1 \\\n')
-                        script_file_id.write( '                --header=N \\\n')
-                    else:
-                        script_file_id.write( '                --mfile=$PLANT_ANNOTATION_FILE \\\n')
-                        script_file_id.write( '                --header=Y \\\n')
+                    script_file_id.write(f'                --list={",".join(sorted_file_list)} \\\n')
+                    script_file_id.write(f'                --types={",".join(type_list)} \\\n')
+                    script_file_id.write( '                --operation=ALL \\\n')
+                    script_file_id.write( '                --mfile=$PLANT_ANNOTATION_FILE \\\n')
+                    script_file_id.write( '                --header=Y \\\n')
+                    script_file_id.write( '                --results-db=$RESULTS_DB \\\n')
                     script_file_id.write( '                --verbose=N \\\n')
                     script_file_id.write( '                --trace=N\n')
                     script_file_id.write( '        RC=$?\n')
                     script_file_id.write( '        if [ $RC -ne 0 ]; then manage_error merge-annotation-files.py $RC; fi\n')
                     script_file_id.write( '        echo "Files are merged."\n')
-                    script_file_id.write(f'        echo "Deleting temporal files of `basename ${database_list2[0].upper()}_ANNOTATION_FILE` ..."\n')
-                    script_file_id.write( '        /usr/bin/time \\\n')
-                    script_file_id.write(f'            rm ${database_list2[0].upper()}_ANNOTATION_FILE_TMP ${database_list2[0].upper()}_ANNOTATION_FILE_SORTED\n')
-                    script_file_id.write( '        RC=$?\n')
-                    script_file_id.write( '        if [ $RC -ne 0 ]; then manage_error rm $RC; fi\n')
-                    script_file_id.write( '        echo "Files are deleted."\n')
-                    script_file_id.write(f'        echo "Deleting temporal files of `basename ${database_list2[1].upper()}_ANNOTATION_FILE` ..."\n')
-                    script_file_id.write( '        /usr/bin/time \\\n')
-                    script_file_id.write(f'            rm ${database_list2[1].upper()}_ANNOTATION_FILE_TMP ${database_list2[1].upper()}_ANNOTATION_FILE_SORTED\n')
-                    script_file_id.write( '        RC=$?\n')
-                    script_file_id.write( '        if [ $RC -ne 0 ]; then manage_error rm $RC; fi\n')
-                    script_file_id.write( '        echo "Files are deleted."\n')
-                    for i in range(2, len(database_list2)):
-                        script_file_id.write(f'        echo "Deleting the header record of `basename ${database_list2[i].upper()}_ANNOTATION_FILE` ..."\n')
-                        script_file_id.write( '        /usr/bin/time \\\n')
-                        script_file_id.write(f'            tail -n +2 ${database_list2[i].upper()}_ANNOTATION_FILE > ${database_list2[i].upper()}_ANNOTATION_FILE_TMP\n')
-                        script_file_id.write( '        RC=$?\n')
-                        script_file_id.write( '        echo "Record is deleted."\n')
-                        script_file_id.write( '        if [ $RC -ne 0 ]; then manage_error tail $RC; fi\n')
-                        script_file_id.write(f'        echo "Sorting data records of `basename ${database_list2[i].upper()}_ANNOTATION_FILE` ..."\n')
-                        script_file_id.write( '        /usr/bin/time \\\n')
-                        script_file_id.write(f'            sort --field-separator=";" --key=2,5 < ${database_list2[i].upper()}_ANNOTATION_FILE_TMP > ${database_list2[i].upper()}_ANNOTATION_FILE_SORTED\n')
-                        script_file_id.write( '        RC=$?\n')
-                        script_file_id.write( '        if [ $RC -ne 0 ]; then manage_error sort $RC; fi\n')
-                        script_file_id.write( '        echo "Records are sorted."\n')
-                        script_file_id.write(f'        echo "Adding annotation of `basename ${database_list2[i].upper()}_ANNOTATION_FILE` to the merged annotation file ..."\n')
-                        script_file_id.write( '        /usr/bin/time \\\n')
-                        script_file_id.write( '            $MINICONDA_BIN_DIR/python3 $TOA_DIR/merge-annotation-files.py \\\n')
-                        script_file_id.write(f'                --file1=$MERGED_ANNOTATION_FILE_TMP{i - 1} \\\n')
-                        script_file_id.write( '                --type1=MERGER \\\n')
-                        script_file_id.write(f'                --file2=${database_list2[i].upper()}_ANNOTATION_FILE_SORTED \\\n')
-                        script_file_id.write(f'                --type2={database_type_dict[database_list[i]]} \\\n')
-                        script_file_id.write( '                --operation=1AND2 \\\n')
-                        if i < len(database_list2) - 1:
-                            script_file_id.write(f'                --mfile=$MERGED_ANNOTATION_FILE_TMP{i} \\\n')
-                            script_file_id.write( '                --header=N \\\n')
-                        else:
-                            script_file_id.write( '                --mfile=$PLANT_ANNOTATION_FILE \\\n')
-                            script_file_id.write( '                --header=Y \\\n')
-                        script_file_id.write( '                --verbose=N \\\n')
-                        script_file_id.write( '                --trace=N\n')
-                        script_file_id.write( '        RC=$?\n')
-                        script_file_id.write( '        if [ $RC -ne 0 ]; then manage_error merge-annotation-files.py $RC; fi\n')
-                        script_file_id.write( '        echo "Files are merged."\n')
-                        script_file_id.write(f'        echo "Deleting temporal files of `basename ${database_list2[i].upper()}_ANNOTATION_FILE` ..."\n')
-                        script_file_id.write( '        /usr/bin/time \\\n')
-                        script_file_id.write(f'            rm ${database_list2[i].upper()}_ANNOTATION_FILE_TMP ${database_list2[i].upper()}_ANNOTATION_FILE_SORTED\n')
-                        script_file_id.write( '        RC=$?\n')
-                        script_file_id.write( '        if [ $RC -ne 0 ]; then manage_error rm $RC; fi\n')
-                        script_file_id.write( '        echo "Files are deleted."\n')
-                    script_file_id.write( '        echo "Deleting temporal annotation files ..."\n')
-                    script_file_id.write( '        /usr/bin/time \\\n')
-                    script_file_id.write(f'            rm {" ".join(tmp_file_list)}\n')
-                    script_file_id.write( '        if [ $RC -ne 0 ]; then manage_error rm $RC; fi\n')
-                    script_file_id.write( '        echo "Files are deleted."\n')
+                    for database_code in database_list2:
+                        script_file_id.write(f'        if [ "${database_code.upper()}_ANNOTATION_FILE_SORTED" != "${database_code.upper()}_ANNOTATION_FILE" ]; then\n')
+                        script_file_id.write(f'            echo "Deleting temporal files of `basename ${database_code.upper()}_ANNOTATION_FILE` ..."\n')
+                        script_file_id.write( '            /usr/bin/time \\\n')
+                        script_file_id.write(f'                rm ${database_code.upper()}_ANNOTATION_FILE_TMP ${database_code.upper()}_ANNOTATION_FILE_SORTED\n')
+                        script_file_id.write( '            RC=$?\n')
+                        script_file_id.write( '            if [ $RC -ne 0 ]; then manage_error rm $RC; fi\n')
+                        script_file_id.write( '            echo "Files are deleted."\n')
+                        script_file_id.write( '        fi\n')
                     script_file_id.write( '        touch $STEP_STATUS\n')
                     script_file_id.write( '    fi\n')
                     script_file_id.write( '}\n')
@@ -8208,6 +8636,7 @@ def build_aminoacid_pipeline_script(current_run_dir):
                     script_file_id.write(f'                --annotation=${database_list[0].upper()}_ANNOTATION_FILE \\\n')
                     script_file_id.write(f'                --type={database_type_dict[database_list[0]]} \\\n')
                 script_file_id.write( '                --stats=$ANNOTATION_STATS_FILE \\\n')
+                script_file_id.write( '                --results-db=$RESULTS_DB \\\n')
                 script_file_id.write( '                --verbose=N \\\n')
                 script_file_id.write( '                --trace=N\n')
                 script_file_id.write( '        RC=$?\n')
@@ -8217,6 +8646,24 @@ def build_aminoacid_pipeline_script(current_run_dir):
                 script_file_id.write( '    fi\n')
                 script_file_id.write( '}\n')
                 script_file_id.write( '#-------------------------------------------------------------------------------\n')
+                script_file_id.write( 'function run_steps\n')
+                script_file_id.write( '{\n')
+                script_file_id.write( '    cd $OUTPUT_DIR\n')
+                script_file_id.write( '    echo "$SEP"\n')
+                script_file_id.write( '    echo "Running pipeline steps ..."\n')
+                script_file_id.write( '    $MINICONDA_BIN_DIR/python3 $TOA_DIR/run-pipeline-steps.py \\\n')
+                script_file_id.write(f'        --script=$OUTPUT_DIR/{os.path.basename(get_aminoacid_pipeline_script())} \\\n')
+                script_file_id.write( '        --steps=$STEP_FILE \\\n')
+                script_file_id.write( '        --rundir=$OUTPUT_DIR \\\n')
+                script_file_id.write( '        --threads=$THREADS \\\n')
+                script_file_id.write( '        --verbose=N \\\n')
+                script_file_id.write( '        --trace=N\n')
+                script_file_id.write( '    RC=$?\n')
+                script_file_id.write( '    if [ $RC -ne 0 ]; then manage_error run-pipeline-steps.py $RC; fi\n')
+                script_file_id.write( '    echo "$SEP"\n')
+                script_file_id.write( '    echo "Pipeline steps are run."\n')
+                script_file_id.write( '}\n')
+                script_file_id.write( '#-------------------------------------------------------------------------------\n')
                 script_file_id.write( 'function end\n')
                 script_file_id.write( '{\n')
                 script_file_id.write( '    END_DATETIME=`date +%s`\n')
@@ -8251,37 +8698,17 @@ def build_aminoacid_pipeline_script(current_run_dir):
                 script_file_id.write( '    FORMATTED_DURATION=`printf "%03d:%02d:%02d\\n" $HH $MM $SS`\n')
                 script_file_id.write( '}\n')
                 script_file_id.write( '#-------------------------------------------------------------------------------\n')
+                script_file_id.write( '# run only the step passed as argument (the script is called with a step by the step executor)\n')
+                script_file_id.write( 'if [ $# -eq 1 ]; then\n')
+                script_file_id.write( '    INIT_DATETIME=`date +%s`\n')
+                script_file_id.write( '    $1\n')
+                script_file_id.write( '    exit 0\n')
+                script_file_id.write( 'fi\n')
+                script_file_id.write( '#-------------------------------------------------------------------------------\n')
                 script_file_id.write( 'init\n')
                 script_file_id.write( '\n')
-                script_file_id.write( '# re-identify sequences of the transcriptome file\n')
-                script_file_id.write( 'reidentify_transcript_sequences\n')
-                script_file_id.write( '\n')
-                script_file_id.write( '# extract the long open reading frames and predict coding regions\n')
-                script_file_id.write( 'extract_orfs\n')
-                script_file_id.write( 'predict_coding_regions\n')
-                script_file_id.write( '\n')
-                script_file_id.write( '# re-identify sequences of the peptide file\n')
-                script_file_id.write( 'reidentify_peptide_sequences\n')
-                script_file_id.write( '\n')
-                for i in range(len(database_list)):
-                    current_code = database_list[i]
-                    previus_code = database_list[i - 1] if i > 0 else ''
-                    if i == 0:
-                        script_file_id.write(f'# complete peptide sequences -> {current_code}\n')
-                    else:
-                        script_file_id.write(f'# peptide sequences not annotated with {previus_code} -> {current_code}\n')
-                    script_file_id.write(f'align_peptides_{current_code}_proteome\n')
-                    script_file_id.write(f'load_alignment_{current_code}_proteome\n')
-                    script_file_id.write(f'annotate_peptides_{current_code}\n')
-                    script_file_id.write( '\n')
-                if len(database_list) > 1:
-                    script_file_id.write( '# merged files\n')
-                    script_file_id.write( 'merge_alignment_files\n')
-                    script_file_id.write( 'merge_annotation_files\n')
-                    script_file_id.write( '# -- split_merged_plant_annotation_file\n')
-                    script_file_id.write( '\n')
-                script_file_id.write( '# annotation statistics\n')
-                script_file_id.write( 'calculate_annotation_stats\n')
+                script_file_id.write( '# run the pipeline steps declared in the step file (the steps with ready inputs run concurrently)\n')
+                script_file_id.write( 'run_steps\n')
                 script_file_id.write( '\n')
                 script_file_id.write( 'end\n')
         except Exception as e:
@@ -8289,11 +8716,88 @@ def build_aminoacid_pipeline_script(current_run_dir):
             error_list.append(f'*** ERROR: The file {get_aminoacid_pipeline_script()} can not be created.')
             OK = False
 
+    # build the step file
+    if OK:
+        step_list = get_aminoacid_pipeline_step_list(database_list, database_list2, blast_file_suffix, threads, chunks)
+        (OK, error_list) = build_pipeline_step_file(current_run_dir, step_list)
+
     # return the control variable and the error list
     return (OK, error_list)
 
 #-------------------------------------------------------------------------------
 
+def get_aminoacid_pipeline_step_list(database_list, database_list2, blast_file_suffix, threads, chunks):
+    '''
+    Get the step list of an amino acid pipeline with the inputs, outputs and thread number of each step.
+    '''
+
+    # initialize the step list
+    step_list = []
+
+    # get the chunk list (0 when the chunked mode is not used) and the thread number of the alignment and annotation steps
+    # (the annotation steps use the thread number of their workers, so a single-thread step can run alongside them)
+    chunk_list = [0] if chunks == 1 else list(range(1, chunks + 1))
+    alignment_threads = int(threads) if chunks == 1 else max(int(threads) - 1, 1)
+    annotation_threads = max(int(threads) - 1, 1) if chunks == 1 else 1
+
+    # re-identify sequences of the transcriptome file
+    step_list.append({'name': 'reidentify_transcript_sequences', 'input_list': ['TRANSCRIPTOME_FILE'], 'output_list': ['REIDENTIFIED_TRANSCRIPTOME_FILE', 'TOA_TRANSCRIPTOME_RELATIONSHIP_FILE'], 'threads': 1})
+
+    # extract the long open reading frames and predict coding regions
+    step_list.append({'name': 'extract_orfs', 'input_list': ['REIDENTIFIED_TRANSCRIPTOME_FILE'], 'output_list': ['TRANSDECODER_OUTPUT_DIR'], 'threads': 1})
+    step_list.append({'name': 'predict_coding_regions', 'input_list': ['REIDENTIFIED_TRANSCRIPTOME_FILE', 'TRANSDECODER_OUTPUT_DIR'], 'output_list': ['PEPTIDE_FILE'], 'threads': 1})
+
+    # re-identify sequences of the peptide file
+    step_list.append({'name': 'reidentify_peptide_sequences', 'input_list': ['PEPTIDE_FILE'], 'output_list': ['REIDENTIFIED_PEPTIDE_FILE', 'TOA_TRANSDECODER_RELATIONSHIP_FILE'], 'threads': 1})
+
+    # split the re-identified peptide file in chunks (chunked mode)
+    if chunks > 1:
+        step_list.append({'name': 'split_peptide_file', 'input_list': ['REIDENTIFIED_PEPTIDE_FILE'], 'output_list': [f'REIDENTIFIED_PEPTIDE_FILE{xlib.get_chunk_file("", chunk)}' for chunk in chunk_list], 'threads': 1})
+
+    # align, load and annotate the sequences of each chunk (or all of them when the chunked mode is not used) with each database
+    # (sequences of the chunk or sequences not annotated with the previous database)
+    for chunk in chunk_list:
+        step_suffix = '' if chunk == 0 else f'_chunk{chunk}'
+        file_suffix = '' if chunk == 0 else xlib.get_chunk_file('', chunk)
+        for i in range(len(database_list)):
+            current_code = database_list[i]
+            seq_file = f'REIDENTIFIED_PEPTIDE_FILE{file_suffix}' if i == 0 else f'{database_list[i - 1].upper()}_NON_ANNOTATED_PEPTIDE_FILE{file_suffix}'
+            alignment_input_list = [seq_file]
+            alignment_output_list = [f'{current_code.upper()}_BLAST_{blast_file_suffix}{file_suffix}']
+            load_input_list = [f'{current_code.upper()}_BLAST_{blast_file_suffix}{file_suffix}'] + ([] if chunk == 0 else [seq_file])
+            annotation_output_list = ['NR_VIRIDIPLANTAE_ANNOTATION_FILE', 'NR_CONTAMINATION_ANNOTATION_FILE', 'NR_CLASSIFICATION_FILE'] if current_code == 'nr' else [f'{current_code.upper()}_ANNOTATION_FILE']
+            annotation_output_list = [f'{annotation_output}{file_suffix}' for annotation_output in annotation_output_list] + [f'{current_code.upper()}_NON_ANNOTATED_PEPTIDE_FILE{file_suffix}']
+            if chunks == 1:
+                annotation_output_list.append('RESULTS_DB')
+            if len(database_list) == 1 and chunks == 1:
+                alignment_input_list += ['TOA_TRANSCRIPTOME_RELATIONSHIP_FILE', 'TOA_TRANSDECODER_RELATIONSHIP_FILE']
+                alignment_output_list.append(f'MERGED_BLAST_{blast_file_suffix}')
+                annotation_output_list.append('PLANT_ANNOTATION_FILE')
+            step_list.append({'name': f'align_peptides_{current_code}_proteome{step_suffix}', 'input_list': alignment_input_list, 'output_list': alignment_output_list, 'dataset': current_code, 'threads': alignment_threads})
+            step_list.append({'name': f'load_alignment_{current_code}_proteome{step_suffix}', 'input_list': load_input_list, 'output_list': ['TOA_DB'], 'dataset': current_code, 'threads': 1})
+            step_list.append({'name': f'annotate_peptides_{current_code}{step_suffix}', 'input_list': ['TOA_DB', seq_file, 'TOA_TRANSCRIPTOME_RELATIONSHIP_FILE', 'TOA_TRANSDECODER_RELATIONSHIP_FILE'], 'output_list': annotation_output_list, 'dataset': current_code, 'threads': annotation_threads})
+
+    # join the chunk files of each database in the database files (chunked mode)
+    if chunks > 1:
+        for current_code in database_list:
+            join_file_list = [f'{current_code.upper()}_BLAST_{blast_file_suffix}']
+            join_file_list += ['NR_VIRIDIPLANTAE_ANNOTATION_FILE', 'NR_CONTAMINATION_ANNOTATION_FILE', 'NR_CLASSIFICATION_FILE'] if current_code == 'nr' else [f'{current_code.upper()}_ANNOTATION_FILE']
+            join_file_list.append(f'{current_code.upper()}_NON_ANNOTATED_PEPTIDE_FILE')
+            step_list.append({'name': f'join_chunks_{current_code}', 'input_list': [f'{join_file}{xlib.get_chunk_file("", chunk)}' for join_file in join_file_list for chunk in chunk_list], 'output_list': join_file_list + ['RESULTS_DB'], 'dataset': current_code, 'threads': 1})
+
+    # merge the alignment and annotation files
+    if len(database_list) > 1 or chunks > 1:
+        step_list.append({'name': 'merge_alignment_files', 'input_list': [f'{database_code.upper()}_BLAST_{blast_file_suffix}' for database_code in database_list] + ['TOA_TRANSCRIPTOME_RELATIONSHIP_FILE', 'TOA_TRANSDECODER_RELATIONSHIP_FILE'], 'output_list': [f'MERGED_BLAST_{blast_file_suffix}'], 'threads': 1})
+        step_list.append({'name': 'merge_annotation_files', 'input_list': [f'{database_code.upper()}_ANNOTATION_FILE' for database_code in database_list2], 'output_list': ['PLANT_ANNOTATION_FILE', 'RESULTS_DB'], 'threads': 1})
+
+    # calculate the annotation statistics
+    step_list.append({'name': 'calculate_annotation_stats', 'input_list': ['TOA_DB', 'TRANSCRIPTOME_FILE', 'PEPTIDE_FILE', 'PLANT_ANNOTATION_FILE', 'RESULTS_DB'] + [f'{database_code.upper()}_NON_ANNOTATED_PEPTIDE_FILE' for database_code in database_list], 'output_list': ['ANNOTATION_STATS_FILE'], 'threads': 1})
+
+    # return the step list
+    return step_list
+
+#-------------------------------------------------------------------------------
+
 def build_aminoacid_pipeline_starter(current_run_dir):
     '''
     Build the starter of the script to process a amino acid pipeline.
@@ -8402,6 +8906,184 @@ def restart_pipeline_process(pipeline_type, pipeline_dataset_id, log, function=N
 
 #-------------------------------------------------------------------------------
 
+def reannotate_pipeline_process(pipeline_type, pipeline_dataset_id, changed_only, log, function=None):
+    '''
+    Annotate again a pipeline run with the reference annotation data currently loaded in the TOA database: the alignment
+    and alignment load steps are not run again and the annotation steps and the following ones are run again with the
+    alignments of the run saved in the TOA database (all sequences or only the ones whose hits have reference annotation
+    data changed since the previous annotation).
+    '''
+
+    # initialize the control variable
+    OK = True
+
+    # warn that the log window does not have to be closed
+    if not isinstance(log, xlib.DevStdOut):
+        log.write('This process might take several minutes. Do not close this window, please wait!\n')
+
+    # get the dictionary of TOA configuration.
+    toa_config_dict = get_toa_config_dict()
+
+    # get the starter to nucleotide pipelines
+    if pipeline_type == xlib.get_toa_process_pipeline_nucleotide_code():
+        starter = get_nucleotide_pipeline_starter()
+
+    # get the starter to amino acid pipelines
+    elif pipeline_type == xlib.get_toa_process_pipeline_aminoacid_code():
+        starter = get_aminoacid_pipeline_starter()
+
+    # get the current run directory
+    current_run_dir = f'{toa_config_dict["RESULT_DIR"]}/{xlib.get_toa_result_pipeline_dir()}/{pipeline_dataset_id}'
+
+    # check the pipeline run
+    log.write(f'{xlib.get_separator()}\n')
+    log.write(f'Checking the pipeline run {pipeline_dataset_id} ...\n')
+    if not os.path.isfile(xlib.get_status_ok(current_run_dir)):
+        log.write(f'*** ERROR: The pipeline run {pipeline_dataset_id} has not ended OK.\n')
+        OK = False
+    elif not os.path.isfile(xlib.get_pipeline_step_file(current_run_dir)):
+        log.write(f'*** ERROR: The pipeline run {pipeline_dataset_id} does not have a step file.\n')
+        OK = False
+
+    # check that the alignments of the run are the last ones loaded in the TOA database
+    if OK:
+        step_list = xlib.get_pipeline_step_list(xlib.get_pipeline_step_file(current_run_dir))
+        (OK, error_list) = check_pipeline_alignment_load(current_run_dir, step_list)
+        for error in error_list:
+            log.write(f'{error}\n')
+    if OK:
+        log.write('The pipeline run is OK.\n')
+
+    # get the time of the previous annotation when only the sequences with changed reference annotation data are annotated
+    if OK:
+        changed_since = get_pipeline_annotation_time(current_run_dir, step_list) if changed_only == 'Y' else 'NONE'
+        if changed_since == 'NONE':
+            log.write('All sequences are going to be annotated again.\n')
+        else:
+            log.write(f'The sequences with reference annotation data changed since {datetime.datetime.fromtimestamp(changed_since).strftime("%Y-%m-%d %H:%M:%S")} are going to be annotated again.\n')
+
+    # delete the OK status files of the annotation steps and the following ones
+    if OK:
+        log.write(f'{xlib.get_separator()}\n')
+        log.write('Deleting the status of the annotation steps ...\n')
+        for step in get_pipeline_annotation_step_list(step_list):
+            if os.path.isfile(xlib.get_step_status_ok(current_run_dir, step)):
+                os.remove(xlib.get_step_status_ok(current_run_dir, step))
+                log.write(f'{step}\n')
+        log.write('The status is deleted.\n')
+
+    # submit the script (the step executor does not run again the steps with an OK status file)
+    if OK:
+        log.write(f'{xlib.get_separator()}\n')
+        log.write(f'Submitting the process script {current_run_dir}/{os.path.basename(starter)} ...\n')
+        command = f'REANNOTATION_CHANGED_SINCE={changed_since} {current_run_dir}/{os.path.basename(starter)} &'
+        rc = xlib.run_command(command, log)
+        if rc == 0:
+            log.write('The script is submitted.\n')
+        else:
+            log.write(f'*** ERROR: RC {rc} in command -> {command}\n')
+            OK = False
+
+    # warn that the log window can be closed
+    if not isinstance(log, xlib.DevStdOut):
+        log.write(f'{xlib.get_separator()}\n')
+        log.write('You can close this window now.\n')
+
+    # execute final function
+    if function is not None:
+        function()
+
+    # return the control variable
+    return OK
+
+#-------------------------------------------------------------------------------
+
+def get_pipeline_annotation_step_list(step_list):
+    '''
+    Get the steps of a pipeline run to be run in its re-annotation: the annotation steps and the steps that read,
+    directly or indirectly, their outputs, except the alignment and alignment load steps.
+    '''
+
+    # initialize the annotation step list and the set of their outputs
+    annotation_step_list = []
+    annotation_output_set = set()
+
+    # get the annotation steps in the order of the step list
+    for step_dict in step_list:
+        if step_dict['name'].startswith('align_') or step_dict['name'].startswith('load_alignment_'):
+            continue
+        if step_dict['name'].startswith('annotate_') or not annotation_output_set.isdisjoint(step_dict['input_list']):
+            annotation_step_list.append(step_dict['name'])
+            annotation_output_set.update(step_dict['output_list'])
+
+    # return the annotation step list
+    return annotation_step_list
+
+#-------------------------------------------------------------------------------
+
+def check_pipeline_alignment_load(current_run_dir, step_list):
+    '''
+    Check that the alignments of a pipeline run are the ones saved in the TOA database: the alignments of a dataset
+    are replaced when another pipeline run loads the alignments of the same dataset.
+    '''
+
+    # initialize the control variable and the error list
+    OK = True
+    error_list = []
+
+    # get the time of the last alignment load of each dataset of the run
+    load_time_dict = {}
+    for step_dict in step_list:
+        if step_dict['name'].startswith('load_alignment_'):
+            step_ok = xlib.get_step_status_ok(current_run_dir, step_dict['name'])
+            if not os.path.isfile(step_ok):
+                error_list.append(f'*** ERROR: The step {step_dict["name"]} has not ended OK.')
+                OK = False
+            else:
+                load_time_dict[step_dict['dataset']] = max(load_time_dict.get(step_dict['dataset'], 0), os.path.getmtime(step_ok))
+
+    # check that the other pipeline runs did not load later alignments of the same datasets
+    if OK:
+        pipeline_dir = os.path.dirname(os.path.normpath(current_run_dir))
+        for subdir in sorted(os.listdir(pipeline_dir)):
+            run_dir = os.path.join(pipeline_dir, subdir)
+            if os.path.normpath(run_dir) == os.path.normpath(current_run_dir) or not os.path.isfile(xlib.get_pipeline_step_file(run_dir)):
+                continue
+            for step_dict in xlib.get_pipeline_step_list(xlib.get_pipeline_step_file(run_dir)):
+                step_ok = xlib.get_step_status_ok(run_dir, step_dict['name'])
+                if step_dict['name'].startswith('load_alignment_') and step_dict['dataset'] in load_time_dict and os.path.isfile(step_ok) and os.path.getmtime(step_ok) > load_time_dict[step_dict['dataset']]:
+                    error_list.append(f'*** ERROR: The alignments of the dataset {step_dict["dataset"]} were loaded later by the pipeline run {subdir}.')
+                    OK = False
+                    break
+
+    # return the control variable and the error list
+    return (OK, error_list)
+
+#-------------------------------------------------------------------------------
+
+def get_pipeline_annotation_time(current_run_dir, step_list):
+    '''
+    Get the time (seconds since the epoch) of the previous annotation of a pipeline run: the start of the first
+    annotation step got from the metrics records or, when they do not exist, the end of the first alignment load.
+    '''
+
+    # get the start time of the last run of each step from the metrics records
+    start_dict = {data_dict['step']: data_dict['start'] for data_dict in xlib.get_pipeline_metrics_record_list(current_run_dir)}
+
+    # get the start time of the first annotation step
+    annotation_step_list = [step_dict['name'] for step_dict in step_list if step_dict['name'].startswith('annotate_')]
+    if annotation_step_list != [] and all(step in start_dict for step in annotation_step_list):
+        annotation_time = min(datetime.datetime.strptime(start_dict[step], '%Y-%m-%d %H:%M:%S').timestamp() for step in annotation_step_list)
+
+    # otherwise, get the end time of the first alignment load step
+    else:
+        annotation_time = min(os.path.getmtime(xlib.get_step_status_ok(current_run_dir, step_dict['name'])) for step_dict in step_list if step_dict['name'].startswith('load_alignment_'))
+
+    # return the annotation time
+    return annotation_time
+
+#-------------------------------------------------------------------------------
+
 def get_nucleotide_annotation_database_code_list():
     '''
     Get the code list of "nucleotide_annotation_database".
@@ -8817,6 +9499,7 @@ def build_annotation_merger_script(current_run_dir):
                 script_file_id.write(f'        --operation={merger_operation} \\\n')
                 script_file_id.write( '        --mfile=$PLANT_ANNOTATION_FILE \\\n')
                 script_file_id.write( '        --header=Y \\\n')
+                script_file_id.write( '        --results-db=$RESULTS_DB \\\n')
                 script_file_id.write( '        --verbose=N \\\n')
                 script_file_id.write( '        --trace=N\n')
                 script_file_id.write( '    RC=$?\n')
@@ -8850,6 +9533,7 @@ def build_annotation_merger_script(current_run_dir):
                 script_file_id.write( '                --annotation=$PLANT_ANNOTATION_FILE \\\n')
                 script_file_id.write( '                --type=MERGER \\\n')
                 script_file_id.write( '                --stats=$ANNOTATION_STATS_FILE \\\n')
+                script_file_id.write( '                --results-db=$RESULTS_DB \\\n')
                 script_file_id.write( '                --verbose=N \\\n')
                 script_file_id.write( '                --trace=N\n')
                 script_file_id.write( '        RC=$?\n')